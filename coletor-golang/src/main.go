@@ -2,6 +2,7 @@ package main
 
 import (
 	"encoding/json"
+	"flag"
 	"fmt"
 	"log"
 	"os"
@@ -38,12 +39,26 @@ type DadosHardware struct {
 	DataColeta         string   `json:"dataColeta,omitempty"`
 }
 
+// Opções de linha de comando
+var somenteJSON = flag.Bool("json", false, "Coleta sem interface e imprime o resultado em JSON na saída padrão")
+
 func main() {
+	flag.Parse()
 	log.Println("Iniciando coleta de dados de hardware...")
 
 	// Coletar dados de hardware
 	dadosHardware := coletarDadosHardware()
 
+	// Sem interface: o JSON vai numa única linha, a última da saída padrão (mesmo formato do coletor Python)
+	if *somenteJSON {
+		dadosJson, err := json.Marshal(dadosHardware)
+		if err != nil {
+			log.Fatalf("Erro ao gerar o JSON: %v", err)
+		}
+		fmt.Println(string(dadosJson))
+		return
+	}
+
 	// A lógica de exibir o formulário e processar os dados agora está encapsulada em ExibirFormulario
 	// que irá bloquear a thread principal até que a UI seja fechada.
 	ui.ExibirFormulario(dadosHardware, func(dadosCompletos map[string]interface{}) {
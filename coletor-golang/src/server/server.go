@@ -77,8 +77,8 @@ func EnviarDados(url string, dados map[string]interface{}) (bool, string) {
 	}
 	defer resp.Body.Close()
 	
-	// Verificar status da resposta
-	if resp.StatusCode != http.StatusCreated {
+	// Verificar status da resposta (202: servidor com diário de ingestão)
+	if resp.StatusCode != http.StatusCreated && resp.StatusCode != http.StatusAccepted {
 		return false, fmt.Sprintf("Erro ao enviar dados. Código: %d", resp.StatusCode)
 	}
 	
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Modo agente dos coletores: série temporal de utilização com baixo custo.
+
+Em vez de uma única leitura no momento da coleta, o agente fica residente e
+amostra CPU, RAM, uso do disco e E/S de disco via psutil em intervalos fixos.
+As amostras da hora corrente ficam em um buffer circular em memória; ao virar
+a hora elas são reduzidas a um agregado de tamanho fixo (mínimo, média, p95 e
+máximo de cada métrica) e o buffer é descartado. Os agregados são enviados ao
+servidor em lotes.
+
+Orçamento de recursos: o processo roda com prioridade baixa, o buffer e a
+fila de envio têm tamanho máximo, e se o próprio agente passar do orçamento
+de CPU o intervalo de amostragem é aumentado automaticamente.
+"""
+
+import os
+import math
+import time
+import uuid
+import random
+from collections import deque
+from datetime import datetime, timezone
+
+import psutil
+
+import rede
+
+INTERVALO_AMOSTRA = 10          # segundos entre amostras
+INTERVALO_ENVIO = 3600          # segundos entre envios de lotes
+INTERVALO_AMOSTRA_MAXIMO = 120  # limite do ajuste automático
+SEGUNDOS_AGREGADO = 3600        # cada agregado cobre uma hora
+ORCAMENTO_CPU = 0.5             # % de uma CPU que o agente pode usar
+ORCAMENTO_RAM_MB = 60           # memória residente máxima do agente
+MAXIMO_PENDENTES = 24 * 7       # agregados guardados com o servidor fora do ar
+TAMANHO_LOTE = 48               # agregados por requisição
+INTERVALO_ATUALIZACAO = 24 * 3600  # segundos entre consultas ao manifesto de atualização
+
+METRICAS = ("cpu", "ram", "disco", "leitura", "escrita")
+
+
+def reduzir_prioridade():
+    """Coloca o processo do agente em prioridade baixa para não disputar com o usuário."""
+    try:
+        processo = psutil.Process()
+        if os.name == "nt":
+            processo.nice(psutil.IDLE_PRIORITY_CLASS)
+        else:
+            processo.nice(19)
+    except Exception as e:
+        print(f"Não foi possível reduzir a prioridade do agente: {e}")
+
+
+def percentil(valores_ordenados, p):
+    """Percentil pelo método do posto mais próximo (lista já ordenada)."""
+    if not valores_ordenados:
+        return None
+    posto = max(1, math.ceil(p / 100 * len(valores_ordenados)))
+    return valores_ordenados[posto - 1]
+
+
+def resumir(valores):
+    """Mínimo, média, p95 e máximo de uma lista de valores."""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return {"min": None, "media": None, "p95": None, "max": None}
+    return {
+        "min": round(ordenados[0], 2),
+        "media": round(sum(ordenados) / len(ordenados), 2),
+        "p95": round(percentil(ordenados, 95), 2),
+        "max": round(ordenados[-1], 2),
+    }
+
+
+def caminho_disco_principal():
+    """Raiz do disco do sistema (C:\\ no Windows, / no Linux)."""
+    if os.name == "nt":
+        return os.environ.get("SystemDrive", "C:") + "\\"
+    return "/"
+
+
+class Amostrador:
+    """Lê uma amostra de utilização por chamada, sem bloquear."""
+
+    def __init__(self, disco=None):
+        self.disco = disco or caminho_disco_principal()
+        self.ultimo_io = psutil.disk_io_counters()
+        self.ultimo_instante = time.monotonic()
+        # A primeira chamada de cpu_percent(None) só inicia a medição
+        psutil.cpu_percent(interval=None)
+
+    def amostrar(self):
+        agora = time.monotonic()
+        decorrido = max(agora - self.ultimo_instante, 1e-6)
+
+        leitura = escrita = None
+        io = psutil.disk_io_counters()
+        if io is not None and self.ultimo_io is not None:
+            leitura = max(0, io.read_bytes - self.ultimo_io.read_bytes) / decorrido
+            escrita = max(0, io.write_bytes - self.ultimo_io.write_bytes) / decorrido
+        self.ultimo_io = io
+        self.ultimo_instante = agora
+
+        try:
+            disco = psutil.disk_usage(self.disco).percent
+        except OSError:
+            disco = None
+
+        return {
+            "cpu": psutil.cpu_percent(interval=None),
+            "ram": psutil.virtual_memory().percent,
+            "disco": disco,
+            "leitura": leitura,
+            "escrita": escrita,
+        }
+
+
+class BufferHorario:
+    """Buffer circular das amostras da hora corrente, reduzido a um agregado ao virar a hora."""
+
+    def __init__(self, capacidade):
+        self.amostras = {metrica: deque(maxlen=capacidade) for metrica in METRICAS}
+        self.contagem = 0
+        self.inicio = None
+
+    def adicionar(self, instante, amostra):
+        """Adiciona uma amostra. Retorna o agregado da hora anterior quando a hora vira."""
+        janela = int(instante // SEGUNDOS_AGREGADO) * SEGUNDOS_AGREGADO
+        agregado = None
+        if self.inicio is not None and janela != self.inicio:
+            agregado = self.fechar()
+        if self.inicio is None:
+            self.inicio = janela
+
+        for metrica in METRICAS:
+            if amostra.get(metrica) is not None:
+                self.amostras[metrica].append(amostra[metrica])
+        self.contagem += 1
+        return agregado
+
+    def fechar(self):
+        """Reduz as amostras acumuladas a um agregado e esvazia o buffer."""
+        if self.inicio is None or self.contagem == 0:
+            return None
+
+        agregado = {
+            "inicio": datetime.fromtimestamp(self.inicio, timezone.utc).isoformat(),
+            "fim": datetime.fromtimestamp(self.inicio + SEGUNDOS_AGREGADO, timezone.utc).isoformat(),
+            "amostras": self.contagem,
+        }
+        for metrica in METRICAS:
+            agregado[metrica] = resumir(self.amostras[metrica])
+            self.amostras[metrica].clear()
+
+        self.contagem = 0
+        self.inicio = None
+        return agregado
+
+
+def enviar_lote(url, nome_dispositivo, pendentes, execucao=None):
+    """Envia até TAMANHO_LOTE agregados pendentes. Retorna quantos foram aceitos.
+
+    `execucao` identifica esta execução do agente: o servidor guarda separadas as
+    partes da mesma hora enviadas por execuções diferentes (reinício no meio da hora).
+    """
+    lote = list(pendentes)[:TAMANHO_LOTE]
+    if not lote:
+        return 0
+    corpo = {"nomeDispositivo": nome_dispositivo, "agregados": lote}
+    if execucao:
+        corpo["execucao"] = execucao
+    try:
+        resposta = rede.requisitar_com_backoff("POST", url, json=corpo, timeout=15)
+        if resposta.status_code in (200, 201):
+            for _ in lote:
+                pendentes.popleft()
+            return len(lote)
+        print(f"Erro ao enviar utilização. Código: {resposta.status_code}")
+    except Exception as e:
+        print(f"Erro ao enviar utilização: {e}")
+    return 0
+
+
+def executar(url, nome_dispositivo, intervalo_amostra=INTERVALO_AMOSTRA,
+             intervalo_envio=INTERVALO_ENVIO, orcamento_cpu=ORCAMENTO_CPU,
+             orcamento_ram_mb=ORCAMENTO_RAM_MB, ciclos=None, atualizar=None,
+             intervalo_atualizacao=INTERVALO_ATUALIZACAO):
+    """Laço principal do agente.
+
+    Args:
+        url: Endpoint que recebe os agregados (POST /api/utilizacao).
+        nome_dispositivo: Identificação da máquina no inventário.
+        intervalo_amostra: Segundos entre amostras (aumenta se o orçamento de CPU estourar).
+        intervalo_envio: Segundos entre envios; cada envio tem jitter de até 10%.
+        orcamento_cpu: Percentual máximo de uma CPU usado pelo próprio agente.
+        orcamento_ram_mb: Memória residente máxima; acima disso os agregados mais antigos são descartados.
+        ciclos: Número de amostras antes de encerrar (None = indefinido).
+        atualizar: Função chamada a cada `intervalo_atualizacao` segundos; se retornar True
+            o agente envia o que tem pendente e encerra para ser reiniciado.
+
+    Retorna True quando encerrou por causa de uma atualização.
+    """
+    reduzir_prioridade()
+    processo = psutil.Process()
+    amostrador = Amostrador()
+    capacidade = math.ceil(SEGUNDOS_AGREGADO / intervalo_amostra)
+    buffer = BufferHorario(capacidade)
+    pendentes = deque(maxlen=MAXIMO_PENDENTES)
+    execucao = str(uuid.uuid4())
+
+    proximo_envio = time.monotonic() + intervalo_envio * random.uniform(0.5, 1.0)
+    cpu_anterior = sum(processo.cpu_times()[:2])
+    relogio_anterior = time.monotonic()
+    executados = 0
+    atualizado = False
+    proxima_atualizacao = time.monotonic() + intervalo_atualizacao * random.uniform(0.1, 1.0)
+
+    print(f"Agente iniciado: amostra a cada {intervalo_amostra} s, envio a cada {intervalo_envio} s.")
+    try:
+        while ciclos is None or executados < ciclos:
+            agregado = buffer.adicionar(time.time(), amostrador.amostrar())
+            if agregado is not None:
+                pendentes.append(agregado)
+            executados += 1
+
+            if pendentes and time.monotonic() >= proximo_envio:
+                enviar_lote(url, nome_dispositivo, pendentes, execucao)
+                proximo_envio = time.monotonic() + intervalo_envio * random.uniform(0.9, 1.1)
+
+            if atualizar is not None and time.monotonic() >= proxima_atualizacao:
+                proxima_atualizacao = time.monotonic() + intervalo_atualizacao * random.uniform(0.9, 1.1)
+                if atualizar():
+                    atualizado = True
+                    break
+
+            # Orçamento de CPU: fração do tempo de relógio gasta pelo próprio agente
+            cpu_atual = sum(processo.cpu_times()[:2])
+            relogio_atual = time.monotonic()
+            uso = 100 * (cpu_atual - cpu_anterior) / max(relogio_atual - relogio_anterior, 1e-6)
+            cpu_anterior, relogio_anterior = cpu_atual, relogio_atual
+            if uso > orcamento_cpu and intervalo_amostra < INTERVALO_AMOSTRA_MAXIMO:
+                intervalo_amostra = min(INTERVALO_AMOSTRA_MAXIMO, intervalo_amostra * 2)
+                print(f"Agente acima do orçamento de CPU ({uso:.2f}%). Intervalo de amostra: {intervalo_amostra} s.")
+
+            # Orçamento de RAM: descarta os agregados mais antigos ainda não enviados
+            if processo.memory_info().rss > orcamento_ram_mb * 1024 * 1024 and pendentes:
+                for _ in range(max(1, len(pendentes) // 2)):
+                    pendentes.popleft()
+                print("Agente acima do orçamento de memória. Agregados antigos descartados.")
+
+            time.sleep(intervalo_amostra)
+    except KeyboardInterrupt:
+        print("\nAgente interrompido.")
+    finally:
+        # Hora parcial também é enviada ao encerrar
+        agregado = buffer.fechar()
+        if agregado is not None:
+            pendentes.append(agregado)
+        while pendentes and enviar_lote(url, nome_dispositivo, pendentes, execucao):
+            pass
+    return atualizado
+
+
+def adicionar_argumentos(parser):
+    """Adiciona as opções do modo agente a um argparse.ArgumentParser."""
+    parser.add_argument("--agente", action="store_true",
+                        help="Fica residente enviando a utilização agregada por hora (sem interface)")
+    parser.add_argument("--intervalo-amostra", type=float, default=INTERVALO_AMOSTRA, metavar="SEGUNDOS",
+                        help=f"Intervalo entre amostras no modo agente (padrão: {INTERVALO_AMOSTRA})")
+    parser.add_argument("--intervalo-envio", type=float, default=INTERVALO_ENVIO, metavar="SEGUNDOS",
+                        help=f"Intervalo entre envios no modo agente (padrão: {INTERVALO_ENVIO})")
+    return parser
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Atualização automática do executável do coletor.
+
+O servidor publica em /download/manifesto.json o SHA-256 de cada executável.
+O coletor empacotado compara esse hash com o do próprio executável e só baixa
+quando ele mudou; o manifesto é consultado com If-None-Match, então na maior
+parte das vezes a resposta é um 304 sem corpo.
+
+Um download interrompido continua de onde parou: os bytes já recebidos ficam
+em <executável>.novo.parcial e a próxima tentativa pede só o restante com
+Range + If-Range (se o executável do servidor mudou nesse meio tempo, o
+servidor devolve o arquivo inteiro). O arquivo só substitui o executável
+depois de conferido o hash.
+
+Só age no executável empacotado (PyInstaller); rodando como script não faz nada.
+"""
+
+import os
+import sys
+import hashlib
+
+import requests
+
+import rede
+
+PLATAFORMA = "windows" if os.name == "nt" else "linux"
+TAMANHO_BLOCO = 256 * 1024
+ATIVADA = os.environ.get("INVENTARIO_ATUALIZACAO", "1") != "0"
+
+# ETag do último manifesto recebido (consultas seguintes usam If-None-Match)
+_etag_manifesto = None
+
+
+def executavel_atual():
+    """Caminho do executável empacotado, ou None quando rodando como script."""
+    if getattr(sys, "frozen", False):
+        return os.path.abspath(sys.executable)
+    return None
+
+
+def hash_arquivo(caminho):
+    """SHA-256 (hex) de um arquivo, lido em blocos."""
+    hash_ = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO), b""):
+            hash_.update(bloco)
+    return hash_.hexdigest()
+
+
+def limpar_antigo(caminho_exe):
+    """Remove o executável anterior deixado por uma atualização no Windows."""
+    try:
+        os.remove(caminho_exe + ".antigo")
+    except OSError:
+        pass
+
+
+def consultar_manifesto(base_url):
+    """Entrada do manifesto para esta plataforma, ou None (sem mudança, sem executável ou erro)."""
+    global _etag_manifesto
+    cabecalhos = {"If-None-Match": _etag_manifesto} if _etag_manifesto else {}
+    try:
+        resposta = rede.requisitar_com_backoff("GET", f"{base_url}/download/manifesto.json",
+                                               headers=cabecalhos, timeout=15)
+    except Exception as e:
+        print(f"Erro ao consultar o manifesto de atualização: {e}")
+        return None
+    if resposta.status_code == 304:
+        return None
+    if resposta.status_code != 200:
+        print(f"Erro ao consultar o manifesto de atualização. Código: {resposta.status_code}")
+        return None
+    _etag_manifesto = resposta.headers.get("ETag")
+    return resposta.json().get(PLATAFORMA)
+
+
+def baixar(url, destino, sha256):
+    """Baixa `url` em `destino`, continuando um download parcial da mesma versão.
+
+    Retorna True se o arquivo completo confere com `sha256`.
+    """
+    parcial = destino + ".parcial"
+    etag = f'"{sha256}"'
+    cabecalhos = {}
+
+    # Trecho já baixado só serve se for da mesma versão (o ETag é o hash)
+    try:
+        with open(parcial + ".etag", encoding="utf-8") as arquivo:
+            etag_parcial = arquivo.read().strip()
+        recebidos = os.path.getsize(parcial)
+    except OSError:
+        etag_parcial, recebidos = None, 0
+    if etag_parcial == etag and recebidos > 0:
+        cabecalhos = {"Range": f"bytes={recebidos}-", "If-Range": etag}
+
+    try:
+        with requests.get(url, headers=cabecalhos, stream=True, timeout=30) as resposta:
+            if resposta.status_code == 416:
+                # Parcial já completo (ou corrompido): confere abaixo ou recomeça na próxima
+                modo = None
+            elif resposta.status_code == 206:
+                modo = "ab"
+            elif resposta.status_code == 200:
+                modo = "wb"
+            else:
+                print(f"Erro ao baixar a atualização. Código: {resposta.status_code}")
+                return False
+
+            if modo is not None:
+                # Sempre o hash do manifesto: o ETag da resposta pode vir como "<hash>-gzip" ou
+                # "<hash>-br" e então nunca conferiria com o parcial na próxima tentativa
+                with open(parcial + ".etag", "w", encoding="utf-8") as arquivo:
+                    arquivo.write(etag)
+                with open(parcial, modo) as arquivo:
+                    # iter_content já descomprime gzip/br: o arquivo tem sempre os bytes originais
+                    for bloco in resposta.iter_content(TAMANHO_BLOCO):
+                        arquivo.write(bloco)
+    except (requests.exceptions.RequestException, OSError) as e:
+        print(f"Download da atualização interrompido ({e}); continua na próxima tentativa.")
+        return False
+
+    if not os.path.exists(parcial) or hash_arquivo(parcial) != sha256:
+        print("Atualização baixada não confere com o hash do manifesto; será baixada novamente.")
+        for caminho in (parcial, parcial + ".etag"):
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+        return False
+
+    os.replace(parcial, destino)
+    os.remove(parcial + ".etag")
+    return True
+
+
+def substituir(caminho_exe, novo):
+    """Troca o executável em uso pelo novo.
+
+    No Windows o executável em execução não pode ser sobrescrito, mas pode ser
+    renomeado: ele vira <exe>.antigo e é apagado na próxima execução.
+    """
+    if os.name == "nt":
+        limpar_antigo(caminho_exe)
+        os.replace(caminho_exe, caminho_exe + ".antigo")
+    else:
+        os.chmod(novo, 0o755)
+    os.replace(novo, caminho_exe)
+
+
+def verificar(base_url):
+    """Baixa e instala a versão do servidor se o hash for diferente. Retorna True se atualizou."""
+    global _etag_manifesto
+    caminho_exe = executavel_atual()
+    if caminho_exe is None or not ATIVADA:
+        return False
+    limpar_antigo(caminho_exe)
+
+    entrada = consultar_manifesto(base_url)
+    if not entrada or entrada.get("sha256") == hash_arquivo(caminho_exe):
+        return False
+
+    print(f"Nova versão do coletor disponível ({entrada['sha256'][:12]}). Baixando...")
+    novo = caminho_exe + ".novo"
+    try:
+        if not baixar(f"{base_url}{entrada['url']}", novo, entrada["sha256"]):
+            _etag_manifesto = None  # sem If-None-Match: a próxima consulta tenta de novo
+            return False
+        substituir(caminho_exe, novo)
+    except OSError as e:
+        print(f"Erro ao substituir o executável: {e}")
+        _etag_manifesto = None
+        return False
+    print("Coletor atualizado.")
+    return True
+
+
+def reiniciar():
+    """Executa de novo o executável (já atualizado) com os mesmos argumentos."""
+    caminho_exe = executavel_atual()
+    os.execv(caminho_exe, [caminho_exe] + sys.argv[1:])
+
+
+def adicionar_argumentos(parser):
+    """Adiciona a opção --atualizar a um argparse.ArgumentParser."""
+    parser.add_argument("--atualizar", action="store_true",
+                        help="Baixa a versão do coletor publicada no servidor, se for diferente, e sai")
+    return parser
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Leitura da saída de ferramentas do sistema no formato "chave: valor".
+
+lscpu, /proc/cpuinfo, dmidecode, xrandr --verbose e o script PowerShell de
+monitores escrevem linhas "chave: valor", agrupadas em blocos separados por
+linha em branco ou abertos por uma linha de cabeçalho, às vezes com seções
+recuadas (o EDID do xrandr, as flags do dmidecode). As funções deste módulo
+percorrem o texto uma única vez e comparam chaves por igualdade: "CPU(s)"
+não casa com "NUMA node0 CPU(s)" nem com "On-line CPU(s) list".
+
+Cada linha é dividida com métodos de str (no CPython, bem mais rápidos que
+uma expressão regular por linha); expressões regulares ficam para os
+cabeçalhos de bloco e para o lsblk -P, compiladas uma vez. Medição contra os
+laços antigos: `python medir_analisadores.py`.
+"""
+
+import re
+
+# lsblk -P: NOME="valor" (caracteres especiais vêm como \xNN)
+_PAR = re.compile(r'([A-Z0-9:_-]+)="((?:[^"\\]|\\.)*)"')
+_ESCAPE_LSBLK = re.compile(r"\\x([0-9a-fA-F]{2})")
+
+_ESPACOS = " \t"
+
+
+def _linhas(texto):
+    """Gera (recuo, chave, valor, livre) de cada linha; linhas em branco vêm como (0, None, None, "").
+
+    É "chave: valor" a linha cujo primeiro ":" vem seguido de espaço ou do fim
+    da linha ("EDID:"); as demais são texto livre ("Memory Device", "0x48").
+    """
+    for linha in texto.splitlines():
+        sem_recuo = linha.lstrip()
+        if not sem_recuo:
+            yield 0, None, None, ""
+            continue
+        chave, separador, resto = sem_recuo.partition(":")
+        if separador and chave and (not resto or resto[0] in _ESPACOS):
+            yield len(linha) - len(sem_recuo), chave.rstrip(), resto.strip(), None
+        else:
+            yield len(linha) - len(sem_recuo), None, None, sem_recuo.rstrip()
+
+
+def chaves_valores(texto, chaves=None):
+    """Dicionário {chave: valor} das linhas "chave: valor" do texto (vale a primeira ocorrência).
+
+    Com `chaves`, só essas são guardadas e a leitura para assim que todas aparecerem.
+    """
+    procuradas = set(chaves) if chaves is not None else None
+    campos = {}
+    for _, chave, valor, _ in _linhas(texto):
+        if chave is None or chave in campos:
+            continue
+        if procuradas is not None:
+            if chave not in procuradas:
+                continue
+            campos[chave] = valor
+            if len(campos) == len(procuradas):
+                break
+        else:
+            campos[chave] = valor
+    return campos
+
+
+def blocos(texto, inicio=None, recuado=False):
+    """Gera os blocos do texto como {"cabecalho", "titulos", "campos"}.
+
+    Sem `inicio`, blocos são separados por linhas em branco (dmidecode,
+    /proc/cpuinfo). Com `inicio` (expressão compilada), cada linha sem recuo
+    que casa abre um bloco e o match fica em "cabecalho"; linhas anteriores ao
+    primeiro início são ignoradas. Com `recuado=True` o bloco só contém linhas
+    recuadas e termina na primeira linha sem recuo (seções do xrandr).
+
+    "titulos" guarda as linhas que não são "chave: valor" ("Memory Device",
+    "---FIM_MONITOR---"). Uma chave sem valor recebe as linhas mais recuadas
+    que a seguem, unidas por "\\n" (o EDID em hexadecimal, por exemplo).
+    """
+    bloco = None
+    campos = titulos = None
+    aberta = None           # chave sem valor à espera das linhas recuadas
+    recuo_aberta = 0
+    continuacao = []
+
+    # Mesmo critério de _linhas, repetido aqui sem o gerador intermediário (este é o laço quente)
+    for linha in texto.splitlines():
+        sem_recuo = linha.lstrip()
+        recuo = len(linha) - len(sem_recuo)
+        chave, separador, valor = sem_recuo.partition(":")
+        if separador and chave and (not valor or valor[0] in _ESPACOS):
+            chave = chave.rstrip()
+            valor = valor.strip()
+        else:
+            chave = None
+            sem_recuo = sem_recuo.rstrip()
+
+        if aberta is not None:
+            if sem_recuo and recuo > recuo_aberta:
+                continuacao.append(sem_recuo if chave is None else f"{chave}: {valor}")
+                continue
+            if aberta not in campos:
+                campos[aberta] = "\n".join(continuacao)
+            aberta = None
+
+        if inicio is not None:
+            if recuo == 0 and sem_recuo:
+                cabecalho = inicio.match(sem_recuo if chave is None else f"{chave}: {valor}")
+                if cabecalho or recuado:
+                    if bloco is not None:
+                        yield bloco
+                    bloco = None
+                    if cabecalho:
+                        bloco = {"cabecalho": cabecalho, "titulos": [], "campos": {}}
+                        campos, titulos = bloco["campos"], bloco["titulos"]
+                    continue
+            if bloco is None or not sem_recuo:
+                continue
+        elif not sem_recuo:
+            if bloco is not None:
+                yield bloco
+            bloco = None
+            continue
+        elif bloco is None:
+            bloco = {"cabecalho": None, "titulos": [], "campos": {}}
+            campos, titulos = bloco["campos"], bloco["titulos"]
+
+        if chave is None:
+            titulos.append(sem_recuo)
+        elif valor:
+            if chave not in campos:
+                campos[chave] = valor
+        else:
+            aberta, recuo_aberta, continuacao = chave, recuo, []
+
+    if aberta is not None and aberta not in campos:
+        campos[aberta] = "\n".join(continuacao)
+    if bloco is not None:
+        yield bloco
+
+
+def pares(texto):
+    """Gera um dicionário por linha no formato NOME="valor" (lsblk -P)."""
+    for linha in texto.splitlines():
+        campos = {nome: _ESCAPE_LSBLK.sub(lambda m: chr(int(m.group(1), 16)), valor)
+                  for nome, valor in _PAR.findall(linha)}
+        if campos:
+            yield campos
@@ -0,0 +1,450 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Gerador de carga para o servidor de inventário.
+
+Simula uma frota de coletores enviando dados ao mesmo tempo: para cada
+máquina sintética repete o fluxo de `enviar_dados` (GET verificar-cadastro
+seguido de POST hardware-data) com taxa e concorrência configuráveis, e ao
+final informa vazão, taxa de erro e latências p50/p95/p99 por endpoint.
+
+Usa apenas a biblioteca padrão (asyncio). Exemplos:
+
+    python carga_servidor.py --url http://localhost:3000 --total 2000 --taxa 100 --concorrencia 50
+    python carga_servidor.py --servidor-local --total 500
+
+Com `--servidor-local` o teste roda contra um substituto em processo que
+implementa os mesmos endpoints sobre SQLite, útil para validar o gerador
+sem Node.js/MySQL.
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import sqlite3
+import asyncio
+import argparse
+from urllib.parse import urlsplit, quote, unquote
+
+SECRETARIAS = [
+    "Administração",
+    "Educação",
+    "Saúde",
+    "Segurança",
+    "Infraestrutura",
+    "Meio Ambiente",
+    "Assistência Social"
+]
+
+MODELOS_CPU = [
+    ("Intel", "Intel(R) Core(TM) i5-10400 CPU @ 2.90GHz", "10ª Geração", 6, 12),
+    ("Intel", "Intel(R) Core(TM) i3-7100 CPU @ 3.90GHz", "7ª Geração", 2, 4),
+    ("Intel", "12th Gen Intel(R) Core(TM) i7-12700", "12ª Geração", 12, 20),
+    ("AMD", "AMD Ryzen 5 5600G with Radeon Graphics", None, 6, 12),
+]
+
+MODELOS_DISCO = [
+    ("KINGSTON SA400S37240G", "SSD", 240),
+    ("ST1000DM010-2EP102", "HDD", 1000),
+    ("Samsung SSD 980 500GB", "SSD", 500),
+    ("WDC WD5000AAKX-00ERMA0", "HDD", 500),
+]
+
+
+# ---------------------------------------------------------------------------
+# Payloads sintéticos (mesmo formato de coletar_dados_hardware + formulário)
+# ---------------------------------------------------------------------------
+
+def gerar_processador(rng):
+    fabricante, nome, geracao, nucleos, threads = rng.choice(MODELOS_CPU)
+    info = f"Fabricante: {fabricante}\n"
+    info += f"Modelo: {nome}\n"
+    if geracao:
+        info += f"Geração: {geracao}\n"
+    info += "Arquitetura: 64-bit\n"
+    info += "Socket: LGA1200\n"
+    info += f"Núcleos: {nucleos}\n"
+    info += f"Threads: {threads}\n"
+    info += f"Frequência máxima: {rng.choice([2900, 3400, 3900])}.00 MHz\n"
+    info += f"Utilização atual: {rng.uniform(0, 100):.1f}%"
+    return info
+
+
+def gerar_disco(rng):
+    total = rng.choice([240, 480, 1000])
+    usado = rng.uniform(0.1, 0.95) * total
+    uso_info = f"Disco principal: {usado:.2f} GB / {total:.2f} GB ({usado / total * 100:.1f}% usado)"
+
+    discos = []
+    for _ in range(rng.randint(1, 3)):
+        modelo, tipo, capacidade = rng.choice(MODELOS_DISCO)
+        info = f"Disco: {modelo}\n"
+        info += "Fabricante: (Unidades de disco padrão)\n"
+        info += f"Tipo: {tipo}\n"
+        info += "Interface: SCSI\n"
+        info += f"Capacidade: {capacidade * 0.93:.2f} GB\n"
+        particoes = []
+        for letra in "CDEFG"[:rng.randint(1, 3)]:
+            tamanho = capacidade * 0.93 / 2
+            livre = rng.uniform(0.05, 0.9) * tamanho
+            particoes.append(f"Unidade {letra}: {livre:.2f} GB livre de {tamanho:.2f} GB "
+                             f"({100 - livre / tamanho * 100:.1f}% usado)")
+        info += "\nPartições:\n - " + "\n - ".join(particoes)
+        discos.append(info)
+
+    return f"{uso_info}\n\n\n" + "\n\n".join(discos)
+
+
+def gerar_ram(rng):
+    modulos = rng.choice([1, 2, 4])
+    capacidade = rng.choice([4, 8, 16])
+    total = modulos * capacidade
+    usado = rng.uniform(0.2, 0.9) * total
+    detalhes = []
+    for _ in range(modulos):
+        info = f"Módulo: {capacidade:.2f} GB\n"
+        info += f"Frequência: {rng.choice([2400, 2666, 3200])} MHz\n"
+        info += f"Fabricante: {rng.choice(['Kingston', 'Samsung', 'SK Hynix'])}\n"
+        info += f"Tipo: {rng.choice(['DDR3', 'DDR4'])}\n"
+        info += f"Part Number: {''.join(rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ0123456789') for _ in range(16))}"
+        detalhes.append(info)
+    return f"{usado:.2f} GB / {total:.2f} GB ({usado / total * 100:.1f}% usado)\n\n" + "\n\n".join(detalhes)
+
+
+def gerar_monitores(rng):
+    monitores = []
+    for _ in range(rng.randint(0, 3)):
+        info = f"Monitor: {rng.choice(['LG FHD', 'E2220', 'AOC 22B1H', 'SyncMaster'])}\n"
+        info += f"Fabricante: {rng.choice(['GSM', 'DEL', 'AOC', 'SAM'])}\n"
+        info += f"Tamanho: {rng.choice(['21.5', '23.8', '18.5'])} polegadas"
+        monitores.append(info)
+    if not monitores:
+        monitores.append("Nenhum monitor detectado.")
+    return f"Total de monitores detectados: {len(monitores)}\n\n" + "\n\n".join(monitores)
+
+
+def gerar_payload(indice, rng, prefixo="CARGA"):
+    """Gera os dados de uma máquina sintética, com tamanhos variados."""
+    return {
+        "usuarioLogado": f"usuario{indice}",
+        "nomeDispositivo": f"{prefixo}-PC-{indice:06d}",
+        "processador": gerar_processador(rng),
+        "disco": gerar_disco(rng),
+        "ram": gerar_ram(rng),
+        "monitores": gerar_monitores(rng),
+        "secretaria": rng.choice(SECRETARIAS),
+        "setor": f"Setor {rng.randint(1, 40)}",
+        "matricula": f"{prefixo[:2]}{indice:08d}",
+        "nomeCompleto": f"Servidor de Teste {indice}"
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cliente HTTP/1.1 mínimo sobre asyncio
+# ---------------------------------------------------------------------------
+
+async def requisitar(host, porta, metodo, caminho, corpo=None, timeout=10):
+    """Executa uma requisição HTTP e retorna (status, corpo em bytes).
+
+    Abre uma conexão por requisição, como o `requests.get/post` dos coletores.
+    """
+    dados = b""
+    cabecalhos = [f"{metodo} {caminho} HTTP/1.1", f"Host: {host}:{porta}", "Connection: close"]
+    if corpo is not None:
+        dados = json.dumps(corpo).encode("utf-8")
+        cabecalhos += ["Content-Type: application/json", f"Content-Length: {len(dados)}"]
+
+    async def executar():
+        leitor, escritor = await asyncio.open_connection(host, porta)
+        try:
+            escritor.write(("\r\n".join(cabecalhos) + "\r\n\r\n").encode("latin-1") + dados)
+            await escritor.drain()
+
+            linha_status = await leitor.readline()
+            status = int(linha_status.split()[1])
+
+            tamanho = None
+            chunked = False
+            while True:
+                linha = await leitor.readline()
+                if linha in (b"\r\n", b"\n", b""):
+                    break
+                nome, _, valor = linha.decode("latin-1").partition(":")
+                nome = nome.strip().lower()
+                if nome == "content-length":
+                    tamanho = int(valor.strip())
+                elif nome == "transfer-encoding" and "chunked" in valor.lower():
+                    chunked = True
+
+            if chunked:
+                resposta = b""
+                while True:
+                    tamanho_bloco = int((await leitor.readline()).strip() or b"0", 16)
+                    if tamanho_bloco == 0:
+                        break
+                    resposta += await leitor.readexactly(tamanho_bloco)
+                    await leitor.readline()
+            elif tamanho is not None:
+                resposta = await leitor.readexactly(tamanho)
+            else:
+                resposta = await leitor.read()
+
+            return status, resposta
+        finally:
+            escritor.close()
+
+    return await asyncio.wait_for(executar(), timeout)
+
+
+# ---------------------------------------------------------------------------
+# Execução da carga e estatísticas
+# ---------------------------------------------------------------------------
+
+def percentil(valores_ordenados, p):
+    """Percentil pelo método nearest-rank."""
+    if not valores_ordenados:
+        return 0.0
+    posicao = max(0, min(len(valores_ordenados), math.ceil(p / 100 * len(valores_ordenados))) - 1)
+    return valores_ordenados[posicao]
+
+
+def novo_endpoint():
+    return {"latencias": [], "erros": 0, "status": {}}
+
+
+def registrar(estatisticas, endpoint, inicio, status=None, erro=None):
+    dados = estatisticas.setdefault(endpoint, novo_endpoint())
+    dados["latencias"].append((time.perf_counter() - inicio) * 1000)
+    chave = str(status) if status is not None else type(erro).__name__
+    dados["status"][chave] = dados["status"].get(chave, 0) + 1
+    if erro is not None or status >= 400:
+        dados["erros"] += 1
+
+
+async def simular_coletor(host, porta, payload, estatisticas, timeout, agendado=None):
+    """Repete o fluxo de enviar_dados: verificação e, se não houver cadastro, envio.
+
+    A latência da verificação conta a partir de `agendado` (horário previsto da
+    chegada), incluindo a espera por uma vaga de concorrência.
+    """
+    caminho = (f"/api/verificar-cadastro/{quote(payload['nomeDispositivo'], safe='')}"
+               f"/{quote(payload['matricula'], safe='')}")
+    inicio = agendado if agendado is not None else time.perf_counter()
+    try:
+        status, corpo = await requisitar(host, porta, "GET", caminho, timeout=timeout)
+        registrar(estatisticas, "verificar-cadastro", inicio, status=status)
+        if status == 200 and json.loads(corpo or b"{}").get("jaExiste"):
+            return
+    except Exception as e:
+        registrar(estatisticas, "verificar-cadastro", inicio, erro=e)
+        return
+
+    inicio = time.perf_counter()
+    try:
+        status, _ = await requisitar(host, porta, "POST", "/api/hardware-data", payload, timeout=timeout)
+        registrar(estatisticas, "hardware-data", inicio, status=status)
+    except Exception as e:
+        registrar(estatisticas, "hardware-data", inicio, erro=e)
+
+
+async def executar_carga(url, total, taxa, concorrencia, timeout=10, semente=None, prefixo=None):
+    """Dispara `total` coletores sintéticos a `taxa` chegadas/s, limitados a `concorrencia` simultâneos."""
+    partes = urlsplit(url)
+    host, porta = partes.hostname, partes.port or 80
+    rng = random.Random(semente)
+    prefixo = prefixo or f"CARGA{int(time.time()) % 100000}"
+
+    estatisticas = {}
+    limite = asyncio.Semaphore(concorrencia)
+    tarefas = []
+
+    async def executar_um(payload, agendado):
+        async with limite:
+            await simular_coletor(host, porta, payload, estatisticas, timeout, agendado)
+
+    inicio = time.perf_counter()
+    for indice in range(total):
+        # Chegadas em ritmo fixo (carga em malha aberta). A latência é medida a partir
+        # do horário previsto: com o servidor lento, o tempo na fila do semáforo entra
+        # no p95/p99 em vez de ficar escondido (omissão coordenada)
+        agendado = inicio + indice / taxa if taxa else time.perf_counter()
+        if taxa:
+            atraso = agendado - time.perf_counter()
+            if atraso > 0:
+                await asyncio.sleep(atraso)
+        tarefas.append(asyncio.create_task(executar_um(gerar_payload(indice, rng, prefixo), agendado)))
+
+    await asyncio.gather(*tarefas)
+    duracao = time.perf_counter() - inicio
+
+    return montar_relatorio(estatisticas, duracao, total, taxa, concorrencia)
+
+
+def montar_relatorio(estatisticas, duracao, total, taxa, concorrencia):
+    relatorio = {
+        "maquinas": total,
+        "taxaAlvo": taxa,
+        "concorrencia": concorrencia,
+        "duracaoSegundos": round(duracao, 3),
+        "endpoints": {}
+    }
+    for endpoint, dados in estatisticas.items():
+        latencias = sorted(dados["latencias"])
+        quantidade = len(latencias)
+        relatorio["endpoints"][endpoint] = {
+            "requisicoes": quantidade,
+            "vazaoPorSegundo": round(quantidade / duracao, 2) if duracao else 0,
+            "taxaErro": round(dados["erros"] / quantidade, 4) if quantidade else 0,
+            "status": dados["status"],
+            "latenciaMs": {
+                "p50": round(percentil(latencias, 50), 2),
+                "p95": round(percentil(latencias, 95), 2),
+                "p99": round(percentil(latencias, 99), 2),
+                "max": round(latencias[-1], 2) if latencias else 0
+            }
+        }
+    return relatorio
+
+
+def formatar_relatorio(relatorio):
+    linhas = [
+        f"Máquinas simuladas: {relatorio['maquinas']} "
+        f"(taxa alvo: {relatorio['taxaAlvo'] or 'ilimitada'}/s, concorrência: {relatorio['concorrencia']})",
+        f"Duração: {relatorio['duracaoSegundos']:.2f} s",
+        ""
+    ]
+    for endpoint, dados in relatorio["endpoints"].items():
+        latencia = dados["latenciaMs"]
+        linhas.append(f"{endpoint}:")
+        linhas.append(f"  requisições: {dados['requisicoes']}  vazão: {dados['vazaoPorSegundo']}/s  "
+                      f"erros: {dados['taxaErro'] * 100:.2f}%")
+        linhas.append(f"  latência (ms): p50 {latencia['p50']}  p95 {latencia['p95']}  "
+                      f"p99 {latencia['p99']}  máx {latencia['max']}")
+        linhas.append(f"  status: {dados['status']}")
+    return "\n".join(linhas)
+
+
+# ---------------------------------------------------------------------------
+# Servidor substituto (mesma API de server/index.js sobre SQLite)
+# ---------------------------------------------------------------------------
+
+async def iniciar_servidor_local(porta=0, caminho_banco=":memory:"):
+    """Inicia um servidor HTTP em processo com os endpoints usados pelos coletores."""
+    banco = sqlite3.connect(caminho_banco, check_same_thread=False)
+    banco.execute("""
+        CREATE TABLE IF NOT EXISTS hardware_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            secretaria TEXT NOT NULL, setor TEXT NOT NULL, matricula TEXT NOT NULL,
+            usuarioLogado TEXT NOT NULL, nomeCompleto TEXT NOT NULL, nomeDispositivo TEXT NOT NULL,
+            processador TEXT, disco TEXT, ram TEXT, monitores TEXT,
+            dataColeta TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    banco.execute("CREATE INDEX IF NOT EXISTS idx_nome ON hardware_data (nomeDispositivo)")
+    banco.execute("CREATE INDEX IF NOT EXISTS idx_matricula ON hardware_data (matricula)")
+
+    def responder(escritor, status, corpo):
+        dados = json.dumps(corpo).encode("utf-8")
+        escritor.write(
+            f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(dados)}\r\nConnection: close\r\n\r\n".encode("latin-1") + dados
+        )
+
+    async def atender(leitor, escritor):
+        try:
+            metodo, caminho, _ = (await leitor.readline()).decode("latin-1").split(" ", 2)
+            tamanho = 0
+            while True:
+                linha = await leitor.readline()
+                if linha in (b"\r\n", b"\n", b""):
+                    break
+                nome, _, valor = linha.decode("latin-1").partition(":")
+                if nome.strip().lower() == "content-length":
+                    tamanho = int(valor.strip())
+            corpo = await leitor.readexactly(tamanho) if tamanho else b""
+
+            partes = [unquote(p) for p in caminho.split("/") if p]
+            if metodo == "GET" and len(partes) == 4 and partes[:2] == ["api", "verificar-cadastro"]:
+                maquina = banco.execute("SELECT COUNT(*) FROM hardware_data WHERE nomeDispositivo = ?",
+                                        (partes[2],)).fetchone()[0] > 0
+                matricula = banco.execute("SELECT COUNT(*) FROM hardware_data WHERE matricula = ?",
+                                          (partes[3],)).fetchone()[0] > 0
+                responder(escritor, 200, {"maquinaExiste": maquina, "matriculaExiste": matricula,
+                                          "jaExiste": maquina or matricula})
+            elif metodo == "POST" and partes == ["api", "hardware-data"]:
+                d = json.loads(corpo or b"{}")
+                campos = ["secretaria", "setor", "matricula", "usuarioLogado", "nomeCompleto", "nomeDispositivo"]
+                if not all(d.get(c) for c in campos):
+                    responder(escritor, 400, {"success": False, "message": "Dados incompletos."})
+                else:
+                    cursor = banco.execute(
+                        "INSERT INTO hardware_data (secretaria, setor, matricula, usuarioLogado, nomeCompleto, "
+                        "nomeDispositivo, processador, disco, ram, monitores) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [d.get(c) for c in campos] + [d.get("processador"), d.get("disco"), d.get("ram"),
+                                                      json.dumps(d.get("monitores"))]
+                    )
+                    banco.commit()
+                    responder(escritor, 201, {"success": True, "id": cursor.lastrowid})
+            else:
+                responder(escritor, 404, {"success": False})
+            await escritor.drain()
+        except Exception as e:
+            print(f"Erro no servidor local: {e}")
+        finally:
+            escritor.close()
+
+    servidor = await asyncio.start_server(atender, "127.0.0.1", porta)
+    return servidor, servidor.sockets[0].getsockname()[1]
+
+
+async def executar(args):
+    servidor = None
+    url = args.url
+    if args.servidor_local:
+        servidor, porta = await iniciar_servidor_local(caminho_banco=args.banco_local)
+        url = f"http://127.0.0.1:{porta}"
+        print(f"Servidor local (SQLite) em {url}")
+
+    try:
+        return await executar_carga(url, args.total, args.taxa, args.concorrencia,
+                                    timeout=args.timeout, semente=args.semente, prefixo=args.prefixo)
+    finally:
+        if servidor:
+            servidor.close()
+            await servidor.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga para o servidor de inventário")
+    parser.add_argument("--url", default="http://localhost:3000", help="URL base do servidor")
+    parser.add_argument("--total", type=int, default=1000, help="Quantidade de máquinas simuladas")
+    parser.add_argument("--taxa", type=float, default=50,
+                        help="Chegadas por segundo (0 = todas de uma vez)")
+    parser.add_argument("--concorrencia", type=int, default=50, help="Máximo de coletores simultâneos")
+    parser.add_argument("--timeout", type=float, default=10, help="Timeout por requisição (s), como nos coletores")
+    parser.add_argument("--semente", type=int, default=None, help="Semente para payloads reprodutíveis")
+    parser.add_argument("--prefixo", default=None, help="Prefixo dos nomes de dispositivo gerados")
+    parser.add_argument("--servidor-local", action="store_true",
+                        help="Roda contra um servidor substituto em processo (SQLite)")
+    parser.add_argument("--banco-local", default=":memory:", help="Arquivo SQLite do servidor substituto")
+    parser.add_argument("--saida-json", help="Grava o relatório em JSON neste arquivo")
+    args = parser.parse_args()
+
+    relatorio = asyncio.run(executar(args))
+    print(formatar_relatorio(relatorio))
+
+    if args.saida_json:
+        with open(args.saida_json, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"\nRelatório salvo em: {args.saida_json}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperação cancelada pelo usuário.")
+        sys.exit(1)
@@ -2,20 +2,40 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
 import sys
 import platform
 import json
 import socket
+import argparse
 import psutil
 import requests
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
+from contextlib import nullcontext
 
-# Configuração
-SERVER_BASE_URL = "http://localhost:3000"
+import agente
+import atualizacao
+import blocos
+import offline
+import perfil
+import processador
+import rede
+import saude_discos
+import wql
+import programas
+import sondas
+
+# Configuração (INVENTARIO_SERVIDOR aponta para outro servidor ou para o retransmissor da unidade)
+SERVER_BASE_URL = os.environ.get("INVENTARIO_SERVIDOR", "http://localhost:3000")
 SERVER_URL = f"{SERVER_BASE_URL}/api/hardware-data"
 VERIFICAR_URL = f"{SERVER_BASE_URL}/api/verificar-cadastro/"
+HISTORICO_URL = f"{SERVER_BASE_URL}/api/hardware-data/snapshot"
+UTILIZACAO_URL = f"{SERVER_BASE_URL}/api/utilizacao"
+
+# Cabeçalho de cada monitor na saída de coletar_monitores.ps1 (ver blocos.py)
+INICIO_MONITOR_POWERSHELL = re.compile(r"MONITOR_\d+$")
 
 def obter_usuario_logado():
     """Obtém o nome do usuário atualmente logado na máquina."""
@@ -62,109 +82,78 @@ def obter_nome_dispositivo():
     """Obtém o nome do dispositivo."""
     return platform.node()
 
+def obter_conexao_wmi():
+    """Abre uma única conexão WMI compartilhada pelas sondas que dependem dela."""
+    import wmi
+    # As consultas passam por wql.consultar (projeção de propriedades, medida no modo --profile)
+    return wmi.WMI()
+
 def obter_info_processador():
-    """Obtém informações detalhadas do processador, incluindo fabricante, modelo e geração."""
+    """Obtém informações detalhadas do processador, incluindo fabricante, modelo e geração.
+
+    Lê o registro e GetLogicalProcessorInformationEx em vez do Win32_Processor (ver processador.py).
+    """
     try:
-        # Informações básicas via psutil
-        cpu_percent = psutil.cpu_percent(interval=1)
         cpu_freq = psutil.cpu_freq()
-        if cpu_freq:
-            freq_atual = f"{cpu_freq.current:.2f} MHz"
-            if cpu_freq.max:
-                freq_max = f"{cpu_freq.max:.2f} MHz"
-            else:
-                freq_max = "N/A"
-        else:
-            freq_atual = "N/A"
-            freq_max = "N/A"
-        
-        # Informações básicas via platform
-        cpu_info_basic = platform.processor()
-        
-        # Informações detalhadas via WMI
+        freq_max = f"{cpu_freq.max:.2f} MHz" if cpu_freq and cpu_freq.max else "N/A"
+        freq_atual = f"{cpu_freq.current:.2f} MHz" if cpu_freq else "N/A"
+        cpu_percent = processador.utilizacao()
+
         try:
-            import wmi
-            w = wmi.WMI()
-            
-            # Obter informações do processador via WMI
-            for proc in w.Win32_Processor():
-                # Fabricante (Intel, AMD, etc.)
-                fabricante = proc.Manufacturer.strip() if proc.Manufacturer else "Não disponível"
-                if "intel" in fabricante.lower():
-                    fabricante = "Intel"
-                elif "amd" in fabricante.lower():
-                    fabricante = "AMD"
-                
-                # Nome completo do processador
-                nome = proc.Name.strip() if proc.Name else "Não disponível"
-                
-                # Modelo e família
-                modelo = proc.Description.strip() if proc.Description else nome
-                familia = f"Família {proc.Family}" if proc.Family else "Não disponível"
-                
-                # Identificar geração para processadores Intel
-                geracao = "Não identificada"
-                if "intel" in fabricante.lower() and nome:
-                    # Extrair geração de processadores Intel Core
-                    if "core" in nome.lower():
-                        # Verificar se contém a geração no nome (ex: "12th Gen")
-                        if "gen" in nome.lower():
-                            for parte in nome.lower().split():
-                                if "gen" in parte and parte[0].isdigit():
-                                    num_gen = ''.join(filter(str.isdigit, parte))
-                                    if num_gen:
-                                        geracao = f"{num_gen}ª Geração"
-                                        break
-                        # Se não encontrou pelo método acima, tentar pelo modelo
-                        elif "i3" in nome.lower() or "i5" in nome.lower() or "i7" in nome.lower() or "i9" in nome.lower():
-                            # Tentar extrair o número da geração (geralmente o primeiro ou primeiros dígitos do modelo)
-                            partes = nome.split("-")
-                            if len(partes) > 1:
-                                num_modelo = partes[1].strip()
-                                if num_modelo and len(num_modelo) >= 4:
-                                    # Para processadores mais recentes (10ª geração ou superior)
-                                    if num_modelo[0:2].isdigit() and int(num_modelo[0:2]) >= 10:
-                                        geracao = f"{num_modelo[0:2]}ª Geração"
-                                    # Para processadores mais antigos (1ª a 9ª geração)
-                                    elif num_modelo[0].isdigit():
-                                        geracao = f"{num_modelo[0]}ª Geração"
-                
-                # Número de núcleos e threads
-                nucleos = proc.NumberOfCores if hasattr(proc, 'NumberOfCores') and proc.NumberOfCores else "N/A"
-                threads = proc.NumberOfLogicalProcessors if hasattr(proc, 'NumberOfLogicalProcessors') and proc.NumberOfLogicalProcessors else "N/A"
-                
-                # Socket
-                socket = proc.SocketDesignation if hasattr(proc, 'SocketDesignation') and proc.SocketDesignation else "N/A"
-                
-                # Arquitetura
-                arquitetura = "64-bit" if proc.AddressWidth == 64 else "32-bit" if proc.AddressWidth == 32 else "N/A"
-                
-                # Formatar saída detalhada
-                info_detalhada = f"Fabricante: {fabricante}\n"
-                info_detalhada += f"Modelo: {nome}\n"
-                if geracao != "Não identificada":
-                    info_detalhada += f"Geração: {geracao}\n"
-                info_detalhada += f"Arquitetura: {arquitetura}\n"
-                info_detalhada += f"Socket: {socket}\n"
-                info_detalhada += f"Núcleos: {nucleos}\n"
-                info_detalhada += f"Threads: {threads}\n"
-                info_detalhada += f"Frequência máxima: {freq_max}\n"
-                info_detalhada += f"Utilização atual: {cpu_percent}%"
-                
-                return info_detalhada
-            
-            # Se não encontrou processador via WMI, retorna informações básicas
-            return f"{cpu_info_basic} (Utilização: {cpu_percent}%, Frequência: {freq_atual})"
-            
-        except Exception as wmi_erro:
-            print(f"Erro ao obter detalhes do processador via WMI: {wmi_erro}")
-            return f"{cpu_info_basic} (Utilização: {cpu_percent}%, Frequência: {freq_atual})"
-            
+            cpu = processador.ler()
+        except Exception as erro:
+            print(f"Erro ao ler o processador no registro: {erro}")
+            return f"{platform.processor()} (Utilização: {cpu_percent}%, Frequência: {freq_atual})"
+
+        identificacao = cpu["identificacao"]
+        topologia = cpu["topologia"]
+        if freq_max == "N/A" and cpu["mhz"]:
+            freq_max = f"{float(cpu['mhz']):.2f} MHz"
+        geracao = processador.descrever_geracao(identificacao)
+
+        # Formatar saída detalhada
+        info_detalhada = f"Fabricante: {identificacao.fabricante or cpu['fabricante_cpuid'] or 'Não disponível'}\n"
+        info_detalhada += f"Modelo: {cpu['marca'] or platform.processor() or 'Não disponível'}\n"
+        if identificacao.familia:
+            info_detalhada += f"Família: {identificacao.familia}\n"
+        if geracao:
+            info_detalhada += f"Geração: {geracao}\n"
+        if identificacao.microarquitetura:
+            info_detalhada += f"Microarquitetura: {identificacao.microarquitetura}\n"
+        info_detalhada += f"Arquitetura: {processador.arquitetura()}\n"
+        info_detalhada += f"Soquetes: {topologia.soquetes}\n"
+        info_detalhada += f"Núcleos: {processador.descrever_nucleos(topologia)}\n"
+        info_detalhada += f"Threads: {topologia.threads}\n"
+        info_detalhada += f"Frequência máxima: {freq_max}\n"
+        info_detalhada += f"Utilização atual: {cpu_percent}%"
+
+        return info_detalhada
+
     except Exception as e:
         print(f"Erro ao obter informações do processador: {e}")
         return "Erro ao obter informações do processador"
 
-def obter_info_disco():
+def _particoes_por_disco(w):
+    """Unidades lógicas de cada disco físico: {DeviceID sem o prefixo \\\\.\\: [Win32_LogicalDisk]}.
+
+    Três consultas no total, em vez de percorrer as associações (e buscar cada
+    unidade) uma vez por disco.
+    """
+    unidades = {unidade.DeviceID: unidade for unidade in wql.consultar(w, "disco", "Win32_LogicalDisk")}
+    logicas_por_particao = {}
+    for ligacao in wql.consultar(w, "disco", "Win32_LogicalDiskToPartition"):
+        logicas_por_particao.setdefault(wql.chave_referencia(ligacao.Antecedent), []).append(
+            wql.chave_referencia(ligacao.Dependent))
+
+    por_disco = {}
+    for ligacao in wql.consultar(w, "disco", "Win32_DiskDriveToDiskPartition"):
+        disco = (wql.chave_referencia(ligacao.Antecedent) or "").replace('\\\\.\\', '')
+        for id_unidade in logicas_por_particao.get(wql.chave_referencia(ligacao.Dependent), []):
+            if id_unidade in unidades:
+                por_disco.setdefault(disco, []).append(unidades[id_unidade])
+    return por_disco
+
+def obter_info_disco(conexao_wmi=None):
     """Obtém informações detalhadas de todos os discos, incluindo tipo (HDD/SSD), modelo e velocidade."""
     try:
         # Informações básicas do disco principal via psutil
@@ -175,12 +164,21 @@ def obter_info_disco():
         
         # Informações detalhadas de todos os discos via WMI
         try:
-            import wmi
-            w = wmi.WMI()
+            if conexao_wmi is None:
+                conexao_wmi = obter_conexao_wmi()
+            w = conexao_wmi
             discos_detalhes = []
             
+            # Unidades lógicas de cada disco, lidas uma única vez para todos os discos
+            try:
+                unidades_por_disco = _particoes_por_disco(w)
+            except Exception as e:
+                print(f"Erro ao obter partições: {e}")
+                unidades_por_disco = {}
+            
             # Coleta informações de cada disco físico
-            for disco in w.Win32_DiskDrive():
+            for disco in wql.consultar(w, "disco", "Win32_DiskDrive"):
+                unidades = unidades_por_disco.get(disco.DeviceID.replace('\\\\.\\', ''), [])
                 # Modelo e fabricante
                 modelo = disco.Model.strip() if disco.Model else "Não disponível"
                 fabricante = disco.Manufacturer.strip() if disco.Manufacturer else "Não disponível"
@@ -205,16 +203,11 @@ def obter_info_disco():
                         tipo_disco = "HDD"
                     else:
                         # Tentar identificar pelo MediaType
-                        for disk_to_partition in w.Win32_DiskDriveToDiskPartition():
-                            if disk_to_partition.Antecedent.DeviceID.replace('\\\\.\\', '') == disco.DeviceID.replace('\\\\.\\', ''):
-                                for partition_to_logical in w.Win32_LogicalDiskToPartition():
-                                    if partition_to_logical.Antecedent.DeviceID == disk_to_partition.Dependent.DeviceID:
-                                        logical_disk = w.Win32_LogicalDisk(DeviceID=partition_to_logical.Dependent.DeviceID)[0]
-                                        if hasattr(logical_disk, 'MediaType'):
-                                            if logical_disk.MediaType == 12:
-                                                tipo_disco = "SSD"
-                                            else:
-                                                tipo_disco = "HDD"
+                        for logical_disk in unidades:
+                            if logical_disk.MediaType == 12:
+                                tipo_disco = "SSD"
+                            else:
+                                tipo_disco = "HDD"
                 except Exception as e:
                     print(f"Erro ao determinar tipo de disco: {e}")
                 
@@ -229,16 +222,12 @@ def obter_info_disco():
                 # Partições associadas a este disco
                 particoes = []
                 try:
-                    for disk_to_partition in w.Win32_DiskDriveToDiskPartition():
-                        if disk_to_partition.Antecedent.DeviceID.replace('\\\\.\\', '') == disco.DeviceID.replace('\\\\.\\', ''):
-                            for partition_to_logical in w.Win32_LogicalDiskToPartition():
-                                if partition_to_logical.Antecedent.DeviceID == disk_to_partition.Dependent.DeviceID:
-                                    logical_disk = w.Win32_LogicalDisk(DeviceID=partition_to_logical.Dependent.DeviceID)[0]
-                                    if logical_disk.Size:
-                                        tamanho_particao_gb = int(logical_disk.Size) / (1024**3)
-                                        livre_particao_gb = int(logical_disk.FreeSpace) / (1024**3) if logical_disk.FreeSpace else 0
-                                        usado_percent = 100 - (livre_particao_gb / tamanho_particao_gb * 100) if tamanho_particao_gb > 0 else 0
-                                        particoes.append(f"Unidade {logical_disk.DeviceID}: {livre_particao_gb:.2f} GB livre de {tamanho_particao_gb:.2f} GB ({usado_percent:.1f}% usado)")
+                    for logical_disk in unidades:
+                        if logical_disk.Size:
+                            tamanho_particao_gb = int(logical_disk.Size) / (1024**3)
+                            livre_particao_gb = int(logical_disk.FreeSpace) / (1024**3) if logical_disk.FreeSpace else 0
+                            usado_percent = 100 - (livre_particao_gb / tamanho_particao_gb * 100) if tamanho_particao_gb > 0 else 0
+                            particoes.append(f"Unidade {logical_disk.DeviceID}: {livre_particao_gb:.2f} GB livre de {tamanho_particao_gb:.2f} GB ({usado_percent:.1f}% usado)")
                 except Exception as e:
                     print(f"Erro ao obter partições: {e}")
                 
@@ -267,7 +256,7 @@ def obter_info_disco():
         print(f"Erro ao obter informações do disco: {e}")
         return "Erro ao obter informações do disco"
 
-def obter_info_ram():
+def obter_info_ram(conexao_wmi=None):
     """Obtém informações detalhadas da memória RAM, incluindo capacidade, frequência, fabricante, tipo e part number."""
     try:
         # Informações básicas de uso da RAM via psutil
@@ -278,8 +267,9 @@ def obter_info_ram():
         
         # Informações detalhadas via WMI
         try:
-            import wmi
-            w = wmi.WMI()
+            if conexao_wmi is None:
+                conexao_wmi = obter_conexao_wmi()
+            w = conexao_wmi
             ram_detalhes = []
             
             # Mapeamento de tipos de memória
@@ -315,7 +305,7 @@ def obter_info_ram():
             }
             
             # Coleta informações de cada módulo de memória
-            for modulo in w.Win32_PhysicalMemory():
+            for modulo in wql.consultar(w, "ram", "Win32_PhysicalMemory"):
                 if modulo.Capacity:
                     # Capacidade
                     capacidade_gb = int(modulo.Capacity) / (1024**3)
@@ -362,6 +352,24 @@ def obter_info_ram():
         print(f"Erro ao obter informações da RAM: {e}")
         return "Erro ao obter informações da RAM"
 
+def interpretar_monitores_powershell(texto):
+    """Lê os blocos MONITOR_n ... ---FIM_MONITOR--- gravados por coletar_monitores.ps1.
+
+    Retorna uma lista de dicionários com modelo, fabricante e tamanho.
+    """
+    monitores = []
+    for bloco in blocos.blocos(texto, inicio=INICIO_MONITOR_POWERSHELL):
+        campos = bloco["campos"]
+        # Verificar se temos informações suficientes para este monitor
+        if not any(campos.get(chave) for chave in ("FABRICANTE", "MODELO", "TAMANHO")):
+            continue
+        monitores.append({
+            "modelo": campos.get("MODELO") or "Desconhecido",
+            "fabricante": campos.get("FABRICANTE") or "Desconhecido",
+            "tamanho": campos.get("TAMANHO") or "Tamanho desconhecido"
+        })
+    return monitores
+
 def obter_info_monitores():
     """Obtém informações detalhadas dos monitores conectados usando um script PowerShell externo.
 
@@ -419,44 +427,11 @@ def obter_info_monitores():
         if "NENHUM_MONITOR_DETECTADO" in stdout_text:
             monitores_formatados.append("Nenhum monitor detectado.")
         else:
-            # Verificar se temos informação sobre a quantidade de monitores
-            quantidade_linha = None
-            for linha in stdout_text.split('\n'):
-                if linha.startswith("QUANTIDADE_MONITORES:"):
-                    quantidade_linha = linha.replace("QUANTIDADE_MONITORES:", "").strip()
-                    break
-            
-            # Dividir a saída por monitores usando o separador
-            monitores_texto = stdout_text.split("---FIM_MONITOR---")
-            
-            for monitor_texto in monitores_texto:
-                if not monitor_texto.strip():
-                    continue
-                    
-                linhas = monitor_texto.strip().split('\n')
-                monitor_info = {}
-                
-                for linha in linhas:
-                    linha = linha.strip()
-                    if linha.startswith("MONITOR_"):
-                        continue
-                    elif linha.startswith("QUANTIDADE_MONITORES:"):
-                        continue
-                    elif linha.startswith("FABRICANTE: "):
-                        monitor_info["fabricante"] = linha.replace("FABRICANTE: ", "")
-                    elif linha.startswith("MODELO: "):
-                        monitor_info["modelo"] = linha.replace("MODELO: ", "")
-                    elif linha.startswith("TAMANHO: "):
-                        monitor_info["tamanho"] = linha.replace("TAMANHO: ", "")
-                
-                # Verificar se temos informações suficientes para este monitor
-                if not monitor_info:
-                    continue
-                
+            for monitor_info in interpretar_monitores_powershell(stdout_text):
                 # Formatar a informação do monitor
-                info = f"Monitor: {monitor_info.get('modelo', 'Desconhecido')}\n"
-                info += f"Fabricante: {monitor_info.get('fabricante', 'Desconhecido')}\n"
-                info += f"Tamanho: {monitor_info.get('tamanho', 'Tamanho desconhecido')}"
+                info = f"Monitor: {monitor_info['modelo']}\n"
+                info += f"Fabricante: {monitor_info['fabricante']}\n"
+                info += f"Tamanho: {monitor_info['tamanho']}"
                 
                 monitores_formatados.append(info)
 
@@ -477,16 +452,69 @@ def obter_info_monitores():
     
     return resultado
 
-def coletar_dados_hardware():
-    """Coleta todos os dados de hardware."""
-    return {
-        "usuarioLogado": obter_usuario_logado(),
-        "nomeDispositivo": obter_nome_dispositivo(),
-        "processador": obter_info_processador(),
-        "disco": obter_info_disco(),
-        "ram": obter_info_ram(),
-        "monitores": obter_info_monitores()
+def obter_saude_discos():
+    """Obtém a saúde (SMART/NVMe) de cada disco físico, com leituras em cache (ver saude_discos.py)."""
+    try:
+        return saude_discos.coletar()
+    except Exception as e:
+        print(f"Erro ao obter a saúde dos discos: {e}")
+        return []
+
+def obter_programas():
+    """Obtém a lista de programas instalados, relendo só o que mudou (ver programas.py)."""
+    try:
+        return programas.coletar()
+    except Exception as e:
+        print(f"Erro ao obter os programas instalados: {e}")
+        return None
+
+# Registro das sondas de hardware (ver sondas.py)
+REGISTRO_SONDAS = sondas.criar_registro([
+    sondas.criar_sonda("conexao_wmi", obter_conexao_wmi, plataforma="Windows",
+                       tipo=sondas.ESTATICA, custo=sondas.CARA),
+    sondas.criar_sonda("processador", obter_info_processador, chave="processador",
+                       apelidos=["cpu"]),
+    sondas.criar_sonda("disco", obter_info_disco, chave="disco",
+                       custo=sondas.CARA, dependencias=["conexao_wmi"], apelidos=["discos"]),
+    sondas.criar_sonda("ram", obter_info_ram, chave="ram",
+                       custo=sondas.CARA, dependencias=["conexao_wmi"], apelidos=["memoria"]),
+    sondas.criar_sonda("monitores", obter_info_monitores, chave="monitores", plataforma="Windows",
+                       tipo=sondas.ESTATICA, custo=sondas.CARA, apelidos=["monitor"]),
+    sondas.criar_sonda("saude_discos", obter_saude_discos, chave="saudeDiscos", plataforma="Windows",
+                       custo=sondas.CARA, apelidos=["smart"]),
+    sondas.criar_sonda("programas", obter_programas, chave="programas", plataforma="Windows",
+                       apelidos=["software", "softwares"]),
+])
+
+def coletar_dados_hardware(apenas=None, ignorar=None):
+    """Coleta os dados de hardware.
+
+    Args:
+        apenas: Sondas a executar (None = todas). Ex.: ['cpu', 'ram'].
+        ignorar: Sondas a pular. Ex.: ['monitores'].
+    """
+    perfil_ativo = perfil.ativo()
+    with perfil_ativo.medir_sonda("usuario_logado") if perfil_ativo else nullcontext():
+        usuario = obter_usuario_logado()
+    dados = {
+        "usuarioLogado": usuario,
+        "nomeDispositivo": obter_nome_dispositivo()
     }
+    dados.update(sondas.executar_sondas(REGISTRO_SONDAS, apenas, ignorar, perfil=perfil_ativo))
+    return dados
+
+def exportar_json(destino, apenas=None, ignorar=None):
+    """Coleta sem interface e grava o payload em JSON (usado pelo orquestrador remoto).
+
+    Com destino "-" o JSON vai para a saída padrão, em uma única linha
+    (a última), depois de qualquer mensagem das sondas.
+    """
+    texto = json.dumps(coletar_dados_hardware(apenas, ignorar), ensure_ascii=False)
+    if destino == "-":
+        print(texto)
+    else:
+        with open(destino, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
 
 def exibir_formulario():
     """Exibe o formulário para coleta de informações do usuário usando tkinter."""
@@ -610,7 +638,7 @@ def verificar_cadastro_existente(nome_dispositivo, matricula):
     """Verifica se a máquina ou matrícula já está registrada no servidor."""
     try:
         url = f"{VERIFICAR_URL}{nome_dispositivo}/{matricula}"
-        resposta = requests.get(url, timeout=10)
+        resposta = rede.requisitar_com_backoff("GET", url, timeout=10)
         
         if resposta.status_code == 200:
             dados = resposta.json()
@@ -630,6 +658,20 @@ def verificar_cadastro_existente(nome_dispositivo, matricula):
         print(f"Erro ao verificar cadastro: {e}")
         return {'jaExiste': False, 'maquinaExiste': False, 'matriculaExiste': False}
 
+def registrar_historico(dados):
+    """Envia a coleta de uma máquina já cadastrada para o histórico de hardware.
+
+    Retorna True se o servidor detectou alguma alteração de hardware.
+    """
+    try:
+        resposta = rede.requisitar_com_backoff("POST", HISTORICO_URL, json=dados, timeout=10)
+        if resposta.status_code in (200, 201):
+            return resposta.json().get('alterado', False)
+        print(f"Erro ao registrar histórico. Código: {resposta.status_code}")
+    except Exception as e:
+        print(f"Erro ao registrar histórico: {e}")
+    return False
+
 def enviar_dados(dados):
     """Envia os dados coletados para o servidor."""
     try:
@@ -645,13 +687,26 @@ def enviar_dados(dados):
             elif resultado['matriculaExiste']:
                 mensagem = "Esta matrícula já está registrada no sistema."
             
+            # Máquina já cadastrada: a coleta ainda alimenta o histórico de hardware
+            if resultado['maquinaExiste'] and registrar_historico(dados):
+                mensagem += " Alteração de hardware registrada no histórico."
+            
             return False, f"{mensagem} Não é possível cadastrar novamente."
         
+        # Coleta parcial (--only/--skip) só atualiza máquinas já cadastradas
+        ausentes = sondas.chaves_ausentes(dados)
+        if ausentes:
+            return False, ("Máquina ainda não cadastrada: o primeiro envio exige a coleta completa "
+                           f"(faltam {', '.join(ausentes)}). Execute o coletor sem --only/--skip.")
+        
         # Se não existe, enviar os dados
-        resposta = requests.post(SERVER_URL, json=dados, timeout=10)
+        resposta = rede.requisitar_com_backoff("POST", SERVER_URL, json=dados, timeout=10)
         
-        if resposta.status_code == 201:
+        # 202: servidor com diário de ingestão, gravação no banco em seguida
+        if resposta.status_code in (201, 202):
             return True, "Dados enviados com sucesso!"
+        elif resposta.status_code in rede.STATUS_REPETIR:
+            return False, "Servidor ocupado no momento. Tente novamente em alguns minutos."
         else:
             return False, f"Erro ao enviar dados. Código: {resposta.status_code}, Resposta: {resposta.text}"
     except requests.exceptions.ConnectionError:
@@ -659,10 +714,13 @@ def enviar_dados(dados):
     except Exception as e:
         return False, f"Erro ao enviar dados: {e}"
 
-def main():
-    """Função principal do coletor."""
+def main(apenas=None, ignorar=None, arquivo_offline=None):
+    """Função principal do coletor.
+
+    Com `arquivo_offline` os dados são gravados nesse arquivo NDJSON em vez de enviados ao servidor.
+    """
     # Coletar dados de hardware
-    dados_hardware = coletar_dados_hardware()
+    dados_hardware = coletar_dados_hardware(apenas, ignorar)
     
     # Exibir informações em uma janela
     info_window = tk.Tk()
@@ -682,10 +740,12 @@ def main():
     info_text = f"""
 Usuário Logado: {dados_hardware['usuarioLogado']}
 Nome do Dispositivo: {dados_hardware['nomeDispositivo']}
-Processador: {dados_hardware['processador']}
-Disco: {dados_hardware['disco']}
-RAM: {dados_hardware['ram']}
-Monitores: {len(dados_hardware['monitores'])} detectado(s)
+Processador: {dados_hardware.get('processador', 'Não coletado')}
+Disco: {dados_hardware.get('disco', 'Não coletado')}
+RAM: {dados_hardware.get('ram', 'Não coletado')}
+Monitores: {len(dados_hardware.get('monitores', []))} detectado(s)
+Saúde dos discos: {saude_discos.resumo(dados_hardware.get('saudeDiscos'))}
+Programas instalados: {programas.resumo(dados_hardware.get('programas'))}
     """
     
     # Área de texto para exibir informações
@@ -717,8 +777,9 @@ Monitores: {len(dados_hardware['monitores'])} detectado(s)
     # Combinar dados
     dados_completos = {**dados_hardware, **dados_usuario}
     
-    # Enviar dados
-    sucesso, mensagem = enviar_dados(dados_completos)
+    # Enviar dados (ou gravar no arquivo offline)
+    sucesso, mensagem = (offline.salvar(arquivo_offline, dados_completos) if arquivo_offline
+                         else enviar_dados(dados_completos))
     
     # Exibir resultado
     result_window = tk.Tk()
@@ -750,8 +811,49 @@ Monitores: {len(dados_hardware['monitores'])} detectado(s)
     result_window.mainloop()
 
 if __name__ == "__main__":
+    parser = sondas.adicionar_argumentos(argparse.ArgumentParser(description="Coletor de inventário de hardware"))
+    agente.adicionar_argumentos(parser)
+    atualizacao.adicionar_argumentos(parser)
+    parser.add_argument("--json", metavar="ARQUIVO",
+                        help="Coleta sem interface e grava o resultado em JSON (\"-\" = saída padrão)")
+    parser.add_argument("--offline", metavar="ARQUIVO",
+                        help="Grava a coleta num arquivo NDJSON (.gz comprime) em vez de enviar ao servidor")
+    perfil.adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    if args.listar_sondas:
+        print(sondas.listar_sondas(REGISTRO_SONDAS))
+        sys.exit(0)
+
+    try:
+        sondas.resolver_sondas(REGISTRO_SONDAS, args.apenas, args.ignorar)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.json:
+        exportar_json(args.json, args.apenas, args.ignorar)
+        sys.exit(0)
+
+    if args.profile is not None:
+        caminho = perfil.executar(lambda: coletar_dados_hardware(args.apenas, args.ignorar), args.profile,
+                                  {"Argumentos": " ".join(sys.argv[1:])})
+        print(f"Relatório de desempenho gravado em {os.path.abspath(caminho)}")
+        sys.exit(0)
+
+    if args.atualizar:
+        atualizacao.verificar(SERVER_BASE_URL)
+        sys.exit(0)
+
+    if args.agente:
+        if agente.executar(UTILIZACAO_URL, obter_nome_dispositivo(),
+                           intervalo_amostra=args.intervalo_amostra,
+                           intervalo_envio=args.intervalo_envio,
+                           atualizar=lambda: atualizacao.verificar(SERVER_BASE_URL)):
+            atualizacao.reiniciar()
+        sys.exit(0)
+
     try:
-        main()
+        main(args.apenas, args.ignorar, args.offline)
     except KeyboardInterrupt:
         print("\n\nOperação cancelada pelo usuário.")
     except Exception as e:
@@ -2,10 +2,12 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
 import sys
 import json
 import socket
 import platform
+import argparse
 import subprocess
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -13,11 +15,34 @@ import requests
 import psutil
 import tempfile
 from datetime import datetime
+from contextlib import nullcontext
 
-# Configuração
-SERVER_BASE_URL = "http://localhost:3000"
+import agente
+import atualizacao
+import blocos
+import offline
+import perfil
+import processador
+import rede
+import saude_discos
+import programas
+import sondas
+
+# Configuração (INVENTARIO_SERVIDOR aponta para outro servidor ou para o retransmissor da unidade)
+SERVER_BASE_URL = os.environ.get("INVENTARIO_SERVIDOR", "http://localhost:3000")
 SERVER_URL = f"{SERVER_BASE_URL}/api/hardware-data"
 VERIFICAR_URL = f"{SERVER_BASE_URL}/api/verificar-cadastro/"
+HISTORICO_URL = f"{SERVER_BASE_URL}/api/hardware-data/snapshot"
+UTILIZACAO_URL = f"{SERVER_BASE_URL}/api/utilizacao"
+
+# Chaves lidas da saída das ferramentas (ver blocos.py)
+CHAVES_LSCPU = ('Vendor ID', 'Model name', 'CPU(s)', 'Core(s) per socket', 'Socket(s)')
+SLOTS_VAZIOS_DMIDECODE = ('No Module Installed', 'Not Installed', 'Unknown')
+CHAVES_VELOCIDADE_DMIDECODE = ('Speed', 'Configured Memory Speed', 'Configured Clock Speed')
+SAIDA_XRANDR_CONECTADA = re.compile(
+    r"(?P<nome>\S+) connected(?: primary)?(?: (?P<resolucao>\d+x\d+)\+\d+\+\d+)?"
+    r".*?(?:(?P<largura>\d+)mm x (?P<altura>\d+)mm)?$"
+)
 
 def obter_usuario_logado():
     """Obtém o nome do usuário atualmente logado na máquina."""
@@ -33,41 +58,55 @@ def obter_nome_dispositivo():
     """Obtém o nome do dispositivo."""
     return socket.gethostname()
 
+def interpretar_lscpu(saida):
+    """Extrai (fabricante, modelo, núcleos, threads) da saída do lscpu."""
+    campos = blocos.chaves_valores(saida, CHAVES_LSCPU)
+    fabricante = campos.get('Vendor ID') or "Desconhecido"
+    modelo = campos.get('Model name') or "Desconhecido"
+    threads = campos.get('CPU(s)') or "Desconhecido"
+    try:
+        # Núcleos físicos: núcleos por soquete x soquetes (CPU(s) conta as threads)
+        nucleos = str(int(campos['Core(s) per socket']) * int(campos.get('Socket(s)', '1')))
+    except (KeyError, ValueError):
+        nucleos = "Desconhecido"
+    return fabricante, modelo, nucleos, threads
+
+def formatar_processador(cpu):
+    """Resumo em uma linha a partir de processador.ler() (/proc/cpuinfo e /sys)."""
+    identificacao, topologia = cpu["identificacao"], cpu["topologia"]
+    nucleos = f"{topologia.nucleos} núcleos"
+    if topologia.nucleos_p is not None and topologia.nucleos_e:
+        nucleos += f" ({topologia.nucleos_p}P + {topologia.nucleos_e}E)"
+    freq = f"{cpu['mhz']/1000:.2f} GHz" if cpu["mhz"] else "Desconhecido"
+    partes = [f"{cpu['fabricante_cpuid'] or identificacao.fabricante or 'Desconhecido'} {cpu['marca']}",
+              nucleos, f"{topologia.threads} threads", freq]
+    partes += [parte for parte in (identificacao.familia, processador.descrever_geracao(identificacao),
+                                   identificacao.microarquitetura) if parte]
+    return ", ".join(partes)
+
 def obter_info_processador():
     """Obtém informações detalhadas do processador."""
     try:
-        # Usar o comando lscpu para obter informações do processador
-        info_cpu = subprocess.check_output(['lscpu'], text=True)
-        
-        # Extrair informações relevantes
-        modelo = "Desconhecido"
-        fabricante = "Desconhecido"
-        cores = "Desconhecido"
-        threads = "Desconhecido"
-        
-        for linha in info_cpu.split('\n'):
-            if 'Model name' in linha:
-                modelo = linha.split(':')[1].strip()
-            elif 'Vendor ID' in linha:
-                fabricante = linha.split(':')[1].strip()
-            elif 'CPU(s)' in linha and cores == "Desconhecido":
-                cores = linha.split(':')[1].strip()
-            elif 'Thread(s) per core' in linha:
-                threads_por_core = linha.split(':')[1].strip()
-                threads = str(int(cores) * int(threads_por_core))
+        # /proc/cpuinfo e /sys bastam na maioria das máquinas (ver processador.py)
+        cpu = processador.ler()
+        if cpu["marca"]:
+            return formatar_processador(cpu)
+    except Exception as e:
+        print(f"Erro ao ler /proc/cpuinfo e /sys: {e}")
+
+    try:
+        # Sem a marca em /proc/cpuinfo (ARM, por exemplo): lscpu, sem tradução das chaves
+        info_cpu = subprocess.check_output(['lscpu'], text=True, env={**os.environ, 'LC_ALL': 'C'})
+        fabricante, modelo, cores, threads = interpretar_lscpu(info_cpu)
         
         # Informações adicionais usando /proc/cpuinfo
         try:
             with open('/proc/cpuinfo', 'r') as f:
                 cpuinfo = f.read()
                 
-            # Extrair frequência
-            freq = "Desconhecido"
-            for linha in cpuinfo.split('\n'):
-                if 'cpu MHz' in linha:
-                    freq_mhz = float(linha.split(':')[1].strip())
-                    freq = f"{freq_mhz/1000:.2f} GHz"
-                    break
+            # Extrair frequência (primeiro processador)
+            freq_mhz = float(blocos.chaves_valores(cpuinfo, ('cpu MHz',))['cpu MHz'])
+            freq = f"{freq_mhz/1000:.2f} GHz"
         except:
             freq = "Desconhecido"
         
@@ -76,44 +115,47 @@ def obter_info_processador():
         print(f"Erro ao obter informações do processador: {e}")
         return "Informações do processador não disponíveis"
 
+def interpretar_lsblk(saida):
+    """Monta a descrição de cada disco a partir de `lsblk -d -P -o NAME,SIZE,MODEL,ROTA,TYPE`."""
+    discos = []
+    for disco in blocos.pares(saida):
+        if disco.get('TYPE') != 'disk' or disco.get('NAME', '').startswith('zram'):
+            continue  # loop, rom e zram não são discos físicos
+        modelo = disco.get('MODEL', '').strip() or "Desconhecido"
+        tipo = "HDD" if disco.get('ROTA') == '1' else "SSD"
+        discos.append(f"{disco.get('NAME')}: {modelo} ({disco.get('SIZE')}, {tipo})")
+    return discos
+
 def obter_info_disco():
     """Obtém informações detalhadas dos discos."""
     try:
-        # Usar o comando lsblk para listar discos
-        info_discos = subprocess.check_output(['lsblk', '-d', '-o', 'NAME,SIZE,MODEL,SERIAL'], text=True)
-        
-        # Processar a saída
-        linhas = info_discos.strip().split('\n')
-        discos = []
-        
-        # Pular o cabeçalho
-        for linha in linhas[1:]:
-            partes = linha.split()
-            if len(partes) >= 2:
-                nome = partes[0]
-                tamanho = partes[1]
-                modelo = ' '.join(partes[2:-1]) if len(partes) > 3 else "Desconhecido"
-                discos.append(f"{nome}: {modelo} ({tamanho})")
-        
-        # Verificar se há discos SSD usando o comando smartctl
-        try:
-            for disco in discos:
-                nome_disco = disco.split(':')[0]
-                # Verificar se é SSD ou HDD usando smartctl
-                tipo_cmd = subprocess.run(['smartctl', '-i', f'/dev/{nome_disco}'], 
-                                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                if 'Solid State Device' in tipo_cmd.stdout:
-                    disco = disco.replace(')', ', SSD)')
-                else:
-                    disco = disco.replace(')', ', HDD)')
-        except:
-            pass  # Ignorar erros do smartctl
-            
+        # lsblk em pares NOME="valor": modelos com espaços ou sem número de série não desalinham as colunas.
+        # ROTA (disco rotacional) distingue HDD de SSD sem precisar de root para o smartctl.
+        info_discos = subprocess.check_output(['lsblk', '-d', '-P', '-o', 'NAME,SIZE,MODEL,ROTA,TYPE'], text=True)
+        discos = interpretar_lsblk(info_discos)
         return ", ".join(discos) if discos else "Informações de disco não disponíveis"
     except Exception as e:
         print(f"Erro ao obter informações do disco: {e}")
         return "Informações de disco não disponíveis"
 
+def interpretar_dmidecode_memoria(saida):
+    """Descreve cada módulo instalado na saída de `dmidecode -t 17` ("8 GB DDR4 2667 MT/s")."""
+    modulos = []
+    for bloco in blocos.blocos(saida):
+        if 'Memory Device' not in bloco['titulos']:
+            continue
+        campos = bloco['campos']
+        tamanho = campos.get('Size', '')
+        if not tamanho or tamanho in SLOTS_VAZIOS_DMIDECODE:
+            continue
+        # Velocidade ausente ou desconhecida não descarta o módulo
+        velocidade = next((campos[chave] for chave in CHAVES_VELOCIDADE_DMIDECODE
+                           if campos.get(chave, 'Unknown') != 'Unknown'), None)
+        tipo = campos.get('Type')
+        modulos.append(" ".join(parte for parte in (tamanho, tipo, velocidade)
+                                if parte and parte != 'Unknown'))
+    return modulos
+
 def obter_info_ram():
     """Obtém informações detalhadas da memória RAM."""
     try:
@@ -123,40 +165,15 @@ def obter_info_ram():
         
         # Tentar obter informações mais detalhadas usando dmidecode (requer sudo)
         try:
-            # Verificar se o usuário tem permissão para executar dmidecode
-            dmidecode_test = subprocess.run(['sudo', '-n', 'dmidecode', '-t', '17'], 
-                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
-                                           text=True)
+            # Executa o dmidecode sem pedir senha; sem permissão o código de retorno é diferente de zero
+            dmidecode = subprocess.run(['sudo', '-n', 'dmidecode', '-t', '17'], 
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
+                                       text=True)
             
-            if dmidecode_test.returncode == 0:
-                # Usuário tem permissão para executar dmidecode sem senha
-                ram_info = subprocess.check_output(['sudo', 'dmidecode', '-t', '17'], text=True)
-                
-                # Processar informações
-                modulos = []
-                modulo_atual = {}
-                
-                for linha in ram_info.split('\n'):
-                    linha = linha.strip()
-                    if 'Memory Device' in linha and not modulo_atual:
-                        modulo_atual = {}
-                    elif 'Size:' in linha and 'No Module Installed' not in linha:
-                        modulo_atual['tamanho'] = linha.split(':')[1].strip()
-                    elif 'Type:' in linha and 'Unknown' not in linha:
-                        modulo_atual['tipo'] = linha.split(':')[1].strip()
-                    elif 'Speed:' in linha and 'Unknown' not in linha:
-                        modulo_atual['velocidade'] = linha.split(':')[1].strip()
-                        if modulo_atual:
-                            modulos.append(modulo_atual)
-                            modulo_atual = {}
-                
+            if dmidecode.returncode == 0:
+                modulos = interpretar_dmidecode_memoria(dmidecode.stdout)
                 if modulos:
-                    detalhes = []
-                    for m in modulos:
-                        if 'tamanho' in m and 'tipo' in m and 'velocidade' in m:
-                            detalhes.append(f"{m['tamanho']} {m['tipo']} {m['velocidade']}")
-                    
-                    return ", ".join(detalhes)
+                    return ", ".join(modulos)
             
             # Se não conseguiu detalhes ou não tem permissão, retorna informação básica
             return f"Total: {total_gb:.2f} GB"
@@ -169,6 +186,53 @@ def obter_info_ram():
         print(f"Erro ao obter informações da RAM: {e}")
         return "Informações de RAM não disponíveis"
 
+def decodificar_edid(edid_hex):
+    """Retorna (fabricante, modelo) do EDID em hexadecimal, ou (None, None) se for inválido."""
+    try:
+        edid = bytes.fromhex("".join(edid_hex.split()))
+    except ValueError:
+        return None, None
+    if len(edid) < 128 or edid[:8] != b"\x00\xff\xff\xff\xff\xff\xff\x00":
+        return None, None
+
+    # Código do fabricante: três letras de 5 bits (1 = 'A') nos bytes 8 e 9
+    codigo = (edid[8] << 8) | edid[9]
+    fabricante = "".join(chr(((codigo >> deslocamento) & 0x1f) + 64) for deslocamento in (10, 5, 0))
+
+    # Nome do modelo: descritor 0xFC em um dos quatro blocos de 18 bytes
+    modelo = None
+    for inicio in (54, 72, 90, 108):
+        descritor = edid[inicio:inicio + 18]
+        if descritor[:3] == b"\x00\x00\x00" and descritor[3] == 0xFC:
+            modelo = descritor[5:].split(b"\n")[0].decode("ascii", errors="replace").strip() or None
+            break
+    return fabricante, modelo
+
+def interpretar_xrandr(saida):
+    """Lista os monitores conectados na saída de `xrandr --verbose`."""
+    monitores = []
+    for secao in blocos.blocos(saida, inicio=SAIDA_XRANDR_CONECTADA, recuado=True):
+        cabecalho = secao['cabecalho']
+        monitor = {
+            'nome': cabecalho.group('nome'),
+            'resolucao': cabecalho.group('resolucao') or "Desconhecido",
+            'fabricante': "Desconhecido",
+            'modelo': "Desconhecido",
+            'tamanho': "Desconhecido"
+        }
+
+        # Tamanho físico em mm no próprio cabeçalho ("... 527mm x 296mm")
+        largura_mm, altura_mm = int(cabecalho.group('largura') or 0), int(cabecalho.group('altura') or 0)
+        if largura_mm > 0 and altura_mm > 0:
+            diagonal_inch = ((largura_mm**2 + altura_mm**2)**0.5) / 25.4
+            monitor['tamanho'] = f"{diagonal_inch:.1f}\""
+
+        fabricante, modelo = decodificar_edid(secao['campos'].get('EDID', ''))
+        monitor['fabricante'] = fabricante or monitor['fabricante']
+        monitor['modelo'] = modelo or monitor['modelo']
+        monitores.append(monitor)
+    return monitores
+
 def obter_info_monitores():
     """Obtém informações detalhadas dos monitores conectados."""
     try:
@@ -176,68 +240,7 @@ def obter_info_monitores():
         if subprocess.run(['which', 'xrandr'], stdout=subprocess.PIPE, stderr=subprocess.PIPE).returncode == 0:
             # Usar xrandr para obter informações dos monitores
             saida = subprocess.check_output(['xrandr', '--verbose'], text=True)
-            
-            # Processar a saída para extrair informações dos monitores
-            monitores = []
-            monitor_atual = None
-            edid = ""
-            
-            for linha in saida.split('\n'):
-                if ' connected ' in linha:
-                    # Novo monitor encontrado
-                    if monitor_atual:
-                        # Processar EDID do monitor anterior
-                        monitor_atual['edid'] = edid
-                        monitores.append(monitor_atual)
-                        edid = ""
-                    
-                    nome = linha.split(' ')[0]
-                    resolucao = linha.split('primary ')[1].split(' ')[0] if 'primary' in linha else "Desconhecido"
-                    monitor_atual = {
-                        'nome': nome,
-                        'resolucao': resolucao,
-                        'fabricante': "Desconhecido",
-                        'modelo': "Desconhecido",
-                        'tamanho': "Desconhecido"
-                    }
-                
-                elif 'EDID:' in linha and monitor_atual:
-                    # Início do bloco EDID
-                    edid = ""
-                
-                elif '\t\t' in linha and monitor_atual and 'EDID:' in saida:
-                    # Linha de EDID
-                    edid += linha.strip()
-                
-                elif 'width' in linha and 'height' in linha and monitor_atual:
-                    # Tamanho físico do monitor em mm
-                    try:
-                        partes = linha.strip().split()
-                        width_idx = partes.index('width')
-                        height_idx = partes.index('height')
-                        if width_idx + 1 < len(partes) and height_idx + 1 < len(partes):
-                            width_mm = int(partes[width_idx + 1])
-                            height_mm = int(partes[height_idx + 1])
-                            diagonal_inch = ((width_mm**2 + height_mm**2)**0.5) / 25.4
-                            monitor_atual['tamanho'] = f"{diagonal_inch:.1f}\""
-                    except:
-                        pass
-            
-            # Adicionar o último monitor
-            if monitor_atual:
-                monitor_atual['edid'] = edid
-                monitores.append(monitor_atual)
-            
-            # Tentar extrair informações do fabricante e modelo do EDID
-            for monitor in monitores:
-                if monitor['edid']:
-                    try:
-                        # Aqui seria necessário um parser de EDID mais complexo
-                        # Por simplicidade, apenas indicamos que temos o monitor
-                        monitor['fabricante'] = "Detectado"
-                        monitor['modelo'] = "Detectado"
-                    except:
-                        pass
+            monitores = interpretar_xrandr(saida)
             
             # Formatar a saída
             resultado = []
@@ -255,17 +258,73 @@ def obter_info_monitores():
         print(f"Erro ao obter informações dos monitores: {e}")
         return ["Erro ao obter informações dos monitores"]
 
-def coletar_dados_hardware():
-    """Coleta todos os dados de hardware."""
-    return {
-        "usuarioLogado": obter_usuario_logado(),
-        "nomeDispositivo": obter_nome_dispositivo(),
-        "processador": obter_info_processador(),
-        "disco": obter_info_disco(),
-        "ram": obter_info_ram(),
-        "monitores": obter_info_monitores(),
-        "sistemaOperacional": f"Linux {platform.release()}"
+def obter_sistema_operacional():
+    """Obtém a versão do kernel Linux."""
+    return f"Linux {platform.release()}"
+
+def obter_saude_discos():
+    """Obtém a saúde (SMART/NVMe) de cada disco físico, com leituras em cache (ver saude_discos.py)."""
+    try:
+        return saude_discos.coletar()
+    except Exception as e:
+        print(f"Erro ao obter a saúde dos discos: {e}")
+        return []
+
+def obter_programas():
+    """Obtém a lista de programas instalados, relendo só o que mudou (ver programas.py)."""
+    try:
+        return programas.coletar()
+    except Exception as e:
+        print(f"Erro ao obter os programas instalados: {e}")
+        return None
+
+# Registro das sondas de hardware (ver sondas.py)
+REGISTRO_SONDAS = sondas.criar_registro([
+    sondas.criar_sonda("processador", obter_info_processador, chave="processador", plataforma="Linux",
+                       tipo=sondas.ESTATICA, apelidos=["cpu"]),
+    sondas.criar_sonda("disco", obter_info_disco, chave="disco", plataforma="Linux",
+                       tipo=sondas.ESTATICA, custo=sondas.CARA, apelidos=["discos"]),
+    sondas.criar_sonda("ram", obter_info_ram, chave="ram", plataforma="Linux",
+                       custo=sondas.CARA, apelidos=["memoria"]),
+    sondas.criar_sonda("monitores", obter_info_monitores, chave="monitores", plataforma="Linux",
+                       tipo=sondas.ESTATICA, custo=sondas.CARA, apelidos=["monitor"]),
+    sondas.criar_sonda("sistema", obter_sistema_operacional, chave="sistemaOperacional",
+                       plataforma="Linux", tipo=sondas.ESTATICA, apelidos=["so"]),
+    sondas.criar_sonda("saude_discos", obter_saude_discos, chave="saudeDiscos", plataforma="Linux",
+                       custo=sondas.CARA, apelidos=["smart"]),
+    sondas.criar_sonda("programas", obter_programas, chave="programas", plataforma="Linux",
+                       apelidos=["software", "softwares"]),
+])
+
+def coletar_dados_hardware(apenas=None, ignorar=None):
+    """Coleta os dados de hardware.
+
+    Args:
+        apenas: Sondas a executar (None = todas). Ex.: ['cpu', 'ram'].
+        ignorar: Sondas a pular. Ex.: ['monitores'].
+    """
+    perfil_ativo = perfil.ativo()
+    with perfil_ativo.medir_sonda("usuario_logado") if perfil_ativo else nullcontext():
+        usuario = obter_usuario_logado()
+    dados = {
+        "usuarioLogado": usuario,
+        "nomeDispositivo": obter_nome_dispositivo()
     }
+    dados.update(sondas.executar_sondas(REGISTRO_SONDAS, apenas, ignorar, perfil=perfil_ativo))
+    return dados
+
+def exportar_json(destino, apenas=None, ignorar=None):
+    """Coleta sem interface e grava o payload em JSON (usado pelo orquestrador remoto).
+
+    Com destino "-" o JSON vai para a saída padrão, em uma única linha
+    (a última), depois de qualquer mensagem das sondas.
+    """
+    texto = json.dumps(coletar_dados_hardware(apenas, ignorar), ensure_ascii=False)
+    if destino == "-":
+        print(texto)
+    else:
+        with open(destino, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
 
 def exibir_formulario(dados_hardware):
     """Exibe o formulário para coleta de informações do usuário."""
@@ -358,7 +417,7 @@ def verificar_cadastro_existente(nome_dispositivo, matricula):
     """Verifica se a máquina ou matrícula já está registrada no servidor."""
     try:
         url = f"{VERIFICAR_URL}{nome_dispositivo}/{matricula}"
-        resposta = requests.get(url, timeout=10)
+        resposta = rede.requisitar_com_backoff("GET", url, timeout=10)
         
         if resposta.status_code == 200:
             dados = resposta.json()
@@ -378,6 +437,20 @@ def verificar_cadastro_existente(nome_dispositivo, matricula):
         print(f"Erro ao verificar cadastro: {e}")
         return {'jaExiste': False, 'maquinaExiste': False, 'matriculaExiste': False}
 
+def registrar_historico(dados):
+    """Envia a coleta de uma máquina já cadastrada para o histórico de hardware.
+
+    Retorna True se o servidor detectou alguma alteração de hardware.
+    """
+    try:
+        resposta = rede.requisitar_com_backoff("POST", HISTORICO_URL, json=dados, timeout=10)
+        if resposta.status_code in (200, 201):
+            return resposta.json().get('alterado', False)
+        print(f"Erro ao registrar histórico. Código: {resposta.status_code}")
+    except Exception as e:
+        print(f"Erro ao registrar histórico: {e}")
+    return False
+
 def enviar_dados(dados):
     """Envia os dados coletados para o servidor."""
     try:
@@ -393,13 +466,26 @@ def enviar_dados(dados):
             elif resultado['matriculaExiste']:
                 mensagem = "Esta matrícula já está registrada no sistema."
             
+            # Máquina já cadastrada: a coleta ainda alimenta o histórico de hardware
+            if resultado['maquinaExiste'] and registrar_historico(dados):
+                mensagem += " Alteração de hardware registrada no histórico."
+            
             return False, f"{mensagem} Não é possível cadastrar novamente."
         
+        # Coleta parcial (--only/--skip) só atualiza máquinas já cadastradas
+        ausentes = sondas.chaves_ausentes(dados)
+        if ausentes:
+            return False, ("Máquina ainda não cadastrada: o primeiro envio exige a coleta completa "
+                           f"(faltam {', '.join(ausentes)}). Execute o coletor sem --only/--skip.")
+        
         # Se não existe, enviar os dados
-        resposta = requests.post(SERVER_URL, json=dados, timeout=10)
+        resposta = rede.requisitar_com_backoff("POST", SERVER_URL, json=dados, timeout=10)
         
-        if resposta.status_code == 201:
+        # 202: servidor com diário de ingestão, gravação no banco em seguida
+        if resposta.status_code in (201, 202):
             return True, "Dados enviados com sucesso!"
+        elif resposta.status_code in rede.STATUS_REPETIR:
+            return False, "Servidor ocupado no momento. Tente novamente em alguns minutos."
         else:
             return False, f"Erro ao enviar dados. Código: {resposta.status_code}, Resposta: {resposta.text}"
     except requests.exceptions.ConnectionError:
@@ -407,10 +493,13 @@ def enviar_dados(dados):
     except Exception as e:
         return False, f"Erro ao enviar dados: {e}"
 
-def main():
-    """Função principal do coletor."""
+def main(apenas=None, ignorar=None, arquivo_offline=None):
+    """Função principal do coletor.
+
+    Com `arquivo_offline` os dados são gravados nesse arquivo NDJSON em vez de enviados ao servidor.
+    """
     # Coletar dados de hardware
-    dados_hardware = coletar_dados_hardware()
+    dados_hardware = coletar_dados_hardware(apenas, ignorar)
     
     # Exibir informações em uma janela
     info_window = tk.Tk()
@@ -430,11 +519,13 @@ def main():
     info_text = f"""
 Usuário Logado: {dados_hardware['usuarioLogado']}
 Nome do Dispositivo: {dados_hardware['nomeDispositivo']}
-Sistema Operacional: {dados_hardware['sistemaOperacional']}
-Processador: {dados_hardware['processador']}
-Disco: {dados_hardware['disco']}
-RAM: {dados_hardware['ram']}
-Monitores: {len(dados_hardware['monitores'])} detectado(s)
+Sistema Operacional: {dados_hardware.get('sistemaOperacional', 'Não coletado')}
+Processador: {dados_hardware.get('processador', 'Não coletado')}
+Disco: {dados_hardware.get('disco', 'Não coletado')}
+RAM: {dados_hardware.get('ram', 'Não coletado')}
+Monitores: {len(dados_hardware.get('monitores', []))} detectado(s)
+Saúde dos discos: {saude_discos.resumo(dados_hardware.get('saudeDiscos'))}
+Programas instalados: {programas.resumo(dados_hardware.get('programas'))}
     """
     
     # Área de texto para exibir informações
@@ -452,8 +543,9 @@ Monitores: {len(dados_hardware['monitores'])} detectado(s)
         
         # Verificar se o formulário foi preenchido
         if "secretaria" in dados_completos:
-            # Enviar dados para o servidor
-            sucesso, mensagem = enviar_dados(dados_completos)
+            # Enviar dados para o servidor (ou gravar no arquivo offline)
+            sucesso, mensagem = (offline.salvar(arquivo_offline, dados_completos) if arquivo_offline
+                                 else enviar_dados(dados_completos))
             
             # Exibir resultado
             if sucesso:
@@ -476,8 +568,49 @@ Monitores: {len(dados_hardware['monitores'])} detectado(s)
     info_window.mainloop()
 
 if __name__ == "__main__":
+    parser = sondas.adicionar_argumentos(argparse.ArgumentParser(description="Coletor de inventário de hardware (Linux)"))
+    agente.adicionar_argumentos(parser)
+    atualizacao.adicionar_argumentos(parser)
+    parser.add_argument("--json", metavar="ARQUIVO",
+                        help="Coleta sem interface e grava o resultado em JSON (\"-\" = saída padrão)")
+    parser.add_argument("--offline", metavar="ARQUIVO",
+                        help="Grava a coleta num arquivo NDJSON (.gz comprime) em vez de enviar ao servidor")
+    perfil.adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    if args.listar_sondas:
+        print(sondas.listar_sondas(REGISTRO_SONDAS))
+        sys.exit(0)
+
+    try:
+        sondas.resolver_sondas(REGISTRO_SONDAS, args.apenas, args.ignorar)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.json:
+        exportar_json(args.json, args.apenas, args.ignorar)
+        sys.exit(0)
+
+    if args.profile is not None:
+        caminho = perfil.executar(lambda: coletar_dados_hardware(args.apenas, args.ignorar), args.profile,
+                                  {"Argumentos": " ".join(sys.argv[1:])})
+        print(f"Relatório de desempenho gravado em {os.path.abspath(caminho)}")
+        sys.exit(0)
+
+    if args.atualizar:
+        atualizacao.verificar(SERVER_BASE_URL)
+        sys.exit(0)
+
+    if args.agente:
+        if agente.executar(UTILIZACAO_URL, obter_nome_dispositivo(),
+                           intervalo_amostra=args.intervalo_amostra,
+                           intervalo_envio=args.intervalo_envio,
+                           atualizar=lambda: atualizacao.verificar(SERVER_BASE_URL)):
+            atualizacao.reiniciar()
+        sys.exit(0)
+
     try:
-        main()
+        main(args.apenas, args.ignorar, args.offline)
     except KeyboardInterrupt:
         print("\nOperação cancelada pelo usuário.")
     except Exception as e:
@@ -0,0 +1,581 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compara o coletor Python (coletor_linux.py) com o coletor Go (coletor-golang) no Linux.
+
+As duas implementações rodam sem interface (--json / -json) contra as mesmas
+capturas: lscpu, lsblk, dmidecode, xrandr e smartctl são substituídos no PATH
+por scripts que devolvem a saída gravada, e o processador do coletor Python
+(lido direto de /proc e /sys, ver processador.py) vem de uma cópia desses
+arquivos via INVENTARIO_RAIZ_SISTEMA, de modo que a diferença medida é a do
+coletor e não a da máquina. Para cada implementação são medidos:
+
+- inicialização: tempo de `--help` (interpretador/runtime e imports)
+- coleta: tempo total de uma coleta, CPU (usuário + sistema) e pico de RSS
+  do processo do coletor (sem os subprocessos)
+- tamanho do que é distribuído (executável Go; executável do PyInstaller se
+  informado, senão apenas os fontes .py, sem o interpretador)
+
+e a saída é comparada campo a campo entre as implementações e, nas capturas
+sintéticas, com os valores esperados de cada campo (precisão).
+
+    python comparar_coletores.py                        # capturas sintéticas
+    python comparar_coletores.py --gravar maquina.json  # grava as capturas desta máquina
+    python comparar_coletores.py --capturas maquina.json --repeticoes 10 --relatorio resultado.json
+    python comparar_coletores.py --go-bin ../builds/TesteSegurancaParaNovoAntivirus_TI_GO_Linux
+
+Sem --go-bin o coletor Go é compilado com `go build` (precisa do Go e dos módulos).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shlex
+import shutil
+import difflib
+import fcntl
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+from datetime import datetime
+
+import medir_analisadores
+import processador
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+DIRETORIO_GO = os.path.join(os.path.dirname(DIRETORIO), "coletor-golang")
+# Fora da árvore de código, junto dos executáveis gerados por empacotar.py
+RELATORIO_PADRAO = os.path.join(os.path.dirname(DIRETORIO), "builds", "comparacao_coletores.json")
+
+# Ferramentas substituídas pelas capturas; chamadas sem captura falham com código 127
+FERRAMENTAS = ("lscpu", "lsblk", "sudo", "smartctl", "xrandr", "dmidecode")
+
+# Campos fora da comparação: saudeDiscos depende do momento da coleta e programas só existe
+# nos coletores Python. Os percentuais de utilização são removidos antes da comparação normalizada
+CAMPOS_IGNORADOS = ("saudeDiscos", "programas")
+VOLATIL = re.compile(r"\(?\d+(?:[.,]\d+)?% (?:utilização|usado)\)?")
+
+INTERVALO_AMOSTRA_RSS = 0.002   # segundos
+
+
+# ---------------------------------------------------------------------------
+# Capturas
+# ---------------------------------------------------------------------------
+
+def _chamada(ferramenta, argumentos, saida, codigo=0):
+    return {"ferramenta": ferramenta, "argumentos": argumentos, "saida": saida, "codigo": codigo}
+
+
+def _smartctl_json(modelo, rotacao):
+    return json.dumps({
+        "smartctl": {"exit_status": 0},
+        "device": {"protocol": "ATA"},
+        "model_name": modelo,
+        "serial_number": "S000TESTE",
+        "rotation_rate": rotacao,
+        "smart_status": {"passed": True},
+        "power_on_time": {"hours": 12000},
+        "temperature": {"current": 35},
+        "ata_smart_attributes": {"table": [
+            {"id": 5, "raw": {"value": 0}}, {"id": 197, "raw": {"value": 0}}, {"id": 198, "raw": {"value": 0}},
+        ]},
+    })
+
+
+def _arquivos_processador(nucleos_por_soquete, threads_por_nucleo, soquetes, cpuinfo):
+    """Arquivos de /proc e /sys lidos por processador.py para a topologia informada."""
+    threads = nucleos_por_soquete * threads_por_nucleo * soquetes
+    arquivos = {"proc/cpuinfo": cpuinfo, "sys/devices/system/cpu/online": f"0-{threads - 1}\n"}
+    for cpu in range(threads):
+        nucleo, _ = divmod(cpu, threads_por_nucleo)
+        soquete, nucleo = divmod(nucleo, nucleos_por_soquete)
+        topologia = f"sys/devices/system/cpu/cpu{cpu}/topology"
+        arquivos[f"{topologia}/physical_package_id"] = f"{soquete}\n"
+        arquivos[f"{topologia}/core_id"] = f"{nucleo}\n"
+    return arquivos
+
+
+def capturas_sinteticas():
+    """Capturas de uma estação típica, com o que cada campo deve conter."""
+    discos = (("sda", "Samsung SSD 870 EVO 500GB", "465.8G", "0", "S5Y1NX0R123456", "Solid State Device"),
+              ("sdb", "ST1000DM010-2EP102", "931.5G", "1", "ZN1ABCDE", "7200 rpm"))
+    lsblk_pares = "".join(f'NAME="{nome}" SIZE="{tamanho}" MODEL="{modelo}" ROTA="{rota}" TYPE="disk"\n'
+                          for nome, modelo, tamanho, rota, _, _ in discos)
+    lsblk_tipos = "".join(f'NAME="{nome}" TYPE="disk"\n' for nome, *_ in discos)
+    lsblk_colunas = "NAME   SIZE MODEL                      SERIAL\n" + "".join(
+        f"{nome:<6} {tamanho:>6} {modelo:<26} {serie}\n" for nome, modelo, tamanho, _, serie, _ in discos)
+
+    chamadas = [
+        _chamada("lscpu", [], medir_analisadores.gerar_lscpu(1)),
+        _chamada("lsblk", ["-d", "-P", "-o", "NAME,SIZE,MODEL,ROTA,TYPE"], lsblk_pares),
+        _chamada("lsblk", ["-d", "-P", "-o", "NAME,TYPE"], lsblk_tipos),
+        _chamada("lsblk", ["-d", "-o", "NAME,SIZE,MODEL,SERIAL"], lsblk_colunas),
+        _chamada("sudo", ["-n", "dmidecode", "-t", "17"], medir_analisadores.gerar_dmidecode(4)),
+        _chamada("xrandr", ["--verbose"], medir_analisadores.gerar_xrandr(2)),
+    ]
+    for nome, modelo, _, rota, serie, rotacao in discos:
+        chamadas.append(_chamada("sudo", ["-n", "smartctl", "-j", "-a", "-n", "standby", f"/dev/{nome}"],
+                                 _smartctl_json(modelo, 0 if rota == "0" else 7200)))
+        chamadas.append(_chamada("smartctl", ["-i", f"/dev/{nome}"],
+                                 f"Device Model:     {modelo}\nSerial Number:    {serie}\n"
+                                 f"Rotation Rate:    {rotacao}\n"))
+
+    # O mesmo processador de gerar_lscpu(1): 2 soquetes x 2 núcleos x 2 threads
+    arquivos = _arquivos_processador(2, 2, 2, (
+        "processor\t: 0\nvendor_id\t: GenuineIntel\ncpu family\t: 6\nmodel\t\t: 85\n"
+        "model name\t: Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz\nstepping\t: 7\ncpu MHz\t\t: 2100.000\n\n"))
+
+    # Trechos que cada campo precisa conter para estar correto
+    esperado = {
+        "processador": ["GenuineIntel", "Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz", "4 núcleos", "8 threads"],
+        "disco": ["sda", "Samsung SSD 870 EVO 500GB", "465.8G", "SSD",
+                  "sdb", "ST1000DM010-2EP102", "931.5G", "HDD"],
+        "ram": ["32 GB DDR4 2933 MT/s"],
+        "monitores": ["DEL", "DELL P2400H", "DELL P2401H", "23.8\"", "1920x1080"],
+    }
+    return {"descricao": "sintéticas (estação com 2 discos, 2 módulos de RAM e 2 monitores)",
+            "chamadas": chamadas, "arquivos": arquivos, "esperado": esperado}
+
+
+def carregar_capturas(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def _chave(argumentos):
+    return " ".join(argumentos)
+
+
+def preparar_substitutos(capturas, destino):
+    """Cria em `destino` um script por ferramenta que devolve a saída gravada para cada chamada.
+
+    Os scripts são de shell (só `cat`), para que o custo de cada chamada seja
+    pequeno e igual para os dois coletores. Chamadas sem captura ficam em
+    destino/sem_captura.log. Os arquivos de /proc e /sys gravados vão para
+    destino/raiz (ver _ambiente).
+    """
+    for relativo, conteudo in capturas.get("arquivos", {}).items():
+        arquivo = os.path.join(destino, "raiz", relativo)
+        os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+        with open(arquivo, "w", encoding="utf-8") as saida:
+            saida.write(conteudo)
+
+    saidas = os.path.join(destino, "saidas")
+    os.makedirs(saidas, exist_ok=True)
+    registro = os.path.join(destino, "sem_captura.log")
+    casos = {ferramenta: [] for ferramenta in FERRAMENTAS}
+    for indice, chamada in enumerate(capturas["chamadas"]):
+        arquivo = os.path.join(saidas, str(indice))
+        with open(arquivo, "w", encoding="utf-8") as saida:
+            saida.write(chamada.get("saida", ""))
+        casos.setdefault(chamada["ferramenta"], []).append(
+            f"  {shlex.quote(_chave(chamada['argumentos']))}) cat {shlex.quote(arquivo)}; "
+            f"exit {int(chamada.get('codigo', 0))};;"
+        )
+
+    for ferramenta, linhas in casos.items():
+        caminho = os.path.join(destino, ferramenta)
+        with open(caminho, "w", encoding="utf-8") as script:
+            script.write("#!/bin/sh\ncase \"$*\" in\n" + "\n".join(linhas) + "\n"
+                         f"  *) echo {shlex.quote(ferramenta)} \"$*\" >> {shlex.quote(registro)}; "
+                         f"echo \"{ferramenta}: sem captura para: $*\" >&2; exit 127;;\nesac\n")
+        os.chmod(caminho, 0o755)
+    return registro
+
+
+def repassar_chamada(ferramenta, registro, caminho_original):
+    """Usado na gravação: executa a ferramenta real, anota a chamada e repassa a saída."""
+    argumentos = sys.argv[1:]
+    executavel = shutil.which(ferramenta, path=caminho_original)
+    if executavel is None:
+        processo = subprocess.CompletedProcess(argumentos, 127, b"", f"{ferramenta}: não encontrado\n".encode())
+    else:
+        processo = subprocess.run([executavel, *argumentos], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    linha = json.dumps(_chamada(ferramenta, argumentos, processo.stdout.decode("utf-8", errors="replace"),
+                                processo.returncode), ensure_ascii=False)
+    # smartctl roda em paralelo no coletor Python: uma linha por escrita, sob trava
+    with open(registro, "a", encoding="utf-8") as arquivo:
+        fcntl.flock(arquivo, fcntl.LOCK_EX)
+        arquivo.write(linha + "\n")
+    sys.stdout.buffer.write(processo.stdout)
+    sys.stderr.buffer.write(processo.stderr)
+    return processo.returncode
+
+
+def copiar_arquivos_sistema():
+    """Os arquivos de /proc e /sys que processador.py lê nesta máquina."""
+    raiz_cpu = "/sys/devices/system/cpu"
+    relativos = ["proc/cpuinfo", "sys/devices/system/cpu/online"]
+    for tipo in ("cpu_core", "cpu_atom"):
+        relativos.append(f"sys/devices/{tipo}/cpus")
+    for nome in os.listdir(raiz_cpu):
+        if re.fullmatch(r"cpu\d+", nome):
+            for campo in ("physical_package_id", "core_id"):
+                relativos.append(f"sys/devices/system/cpu/{nome}/topology/{campo}")
+
+    arquivos = {}
+    for relativo in relativos:
+        try:
+            with open("/" + relativo, encoding="utf-8", errors="replace") as arquivo:
+                # Só o início de /proc/cpuinfo é lido pelo coletor
+                arquivos[relativo] = arquivo.read(processador.TAMANHO_LEITURA_CPUINFO)
+        except OSError:
+            continue
+    return arquivos
+
+
+def preparar_gravadores(destino, registro):
+    caminho_original = os.environ.get("PATH", "")
+    for ferramenta in FERRAMENTAS:
+        caminho = os.path.join(destino, ferramenta)
+        with open(caminho, "w", encoding="utf-8") as script:
+            script.write(f"#!{sys.executable}\nimport sys\nsys.path.insert(0, {DIRETORIO!r})\n"
+                         "import comparar_coletores\n"
+                         f"sys.exit(comparar_coletores.repassar_chamada({ferramenta!r}, {registro!r}, "
+                         f"{caminho_original!r}))\n")
+        os.chmod(caminho, 0o755)
+
+
+def gravar_capturas(implementacoes, caminho):
+    """Roda cada coletor uma vez contra as ferramentas reais e grava as chamadas feitas."""
+    with tempfile.TemporaryDirectory(prefix="capturas_") as temporario:
+        registro = os.path.join(temporario, "chamadas.jsonl")
+        preparar_gravadores(temporario, registro)
+        cache = os.path.join(temporario, "cache")
+        for implementacao in implementacoes:
+            executar(implementacao["coleta"], _ambiente(temporario, cache))
+
+        chamadas, vistas = [], set()
+        if os.path.exists(registro):
+            with open(registro, encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    chamada = json.loads(linha)
+                    chave = (chamada["ferramenta"], _chave(chamada["argumentos"]))
+                    if chave not in vistas:
+                        vistas.add(chave)
+                        chamadas.append(chamada)
+
+    capturas = {"descricao": f"gravadas em {platform.node()} em {datetime.now():%Y-%m-%d %H:%M}",
+                "chamadas": chamadas, "arquivos": copiar_arquivos_sistema()}
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(capturas, arquivo, ensure_ascii=False, indent=2)
+    return capturas
+
+
+# ---------------------------------------------------------------------------
+# Implementações
+# ---------------------------------------------------------------------------
+
+def implementacao_python(executavel=None):
+    if executavel:
+        comando, tamanho = [executavel], os.path.getsize(executavel)
+        descricao = f"executável {os.path.basename(executavel)}"
+    else:
+        comando = [sys.executable, os.path.join(DIRETORIO, "coletor_linux.py")]
+        tamanho = sum(os.path.getsize(os.path.join(DIRETORIO, nome))
+                      for nome in os.listdir(DIRETORIO) if nome.endswith(".py"))
+        descricao = f"fontes .py (sem o interpretador Python {platform.python_version()})"
+    return {"nome": "python", "inicializacao": comando + ["--help"], "coleta": comando + ["--json", "-"],
+            "tamanho": tamanho, "tamanho_descricao": descricao}
+
+
+def compilar_go(destino):
+    """Compila o coletor Go como em build_linux.sh. Retorna (caminho, erro)."""
+    if shutil.which("go") is None:
+        return None, "go não encontrado no PATH (use --go-bin)"
+    caminho = os.path.join(destino, "coletor_go")
+    processo = subprocess.run(["go", "build", "-o", caminho, "./src"], cwd=DIRETORIO_GO,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                              env={**os.environ, "GOOS": "linux", "GOARCH": "amd64"})
+    if processo.returncode != 0:
+        ultima = processo.stdout.strip().splitlines()[-1:] or [""]
+        return None, f"go build falhou: {ultima[0]}"
+    return caminho, None
+
+
+def implementacao_go(executavel):
+    return {"nome": "go", "inicializacao": [executavel, "-h"], "coleta": [executavel, "-json"],
+            "tamanho": os.path.getsize(executavel), "tamanho_descricao": f"executável {os.path.basename(executavel)}"}
+
+
+# ---------------------------------------------------------------------------
+# Medição
+# ---------------------------------------------------------------------------
+
+def _ambiente(diretorio_substitutos, cache=None):
+    ambiente = {**os.environ, "PATH": diretorio_substitutos + os.pathsep + os.environ.get("PATH", "")}
+    raiz = os.path.join(diretorio_substitutos, "raiz")
+    if os.path.isdir(raiz):
+        ambiente["INVENTARIO_RAIZ_SISTEMA"] = raiz
+    if cache:
+        # Cache da saúde dos discos vazio a cada execução: mede a coleta a frio
+        ambiente["XDG_CACHE_HOME"] = cache
+    return ambiente
+
+
+def _pico_rss(pid):
+    """VmHWM (pico de RSS) do processo em KiB, ou 0 se ele já terminou."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status:
+            for linha in status:
+                if linha.startswith("VmHWM:"):
+                    return int(linha.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def executar(comando, ambiente):
+    """Executa o comando e devolve tempo, CPU, pico de RSS, código e saídas.
+
+    O pico de RSS vem do VmHWM amostrado durante a execução: o ru_maxrss do
+    wait4 herda a memória deste processo no fork e não serve para coletores leves.
+    """
+    with tempfile.TemporaryFile() as saida, tempfile.TemporaryFile() as erros:
+        inicio = time.perf_counter()
+        processo = subprocess.Popen(comando, stdout=saida, stderr=erros, stdin=subprocess.DEVNULL,
+                                    env=ambiente, cwd=DIRETORIO)
+        pico = [0]
+        terminou = threading.Event()
+
+        def amostrar():
+            while not terminou.is_set():
+                pico[0] = max(pico[0], _pico_rss(processo.pid))
+                terminou.wait(INTERVALO_AMOSTRA_RSS)
+
+        amostrador = threading.Thread(target=amostrar, daemon=True)
+        amostrador.start()
+        _, status, uso = os.wait4(processo.pid, 0)
+        duracao = time.perf_counter() - inicio
+        terminou.set()
+        amostrador.join()
+        processo.returncode = os.waitstatus_to_exitcode(status)
+        saida.seek(0)
+        erros.seek(0)
+        return {
+            "duracao": duracao,
+            "cpu": uso.ru_utime + uso.ru_stime,
+            "rss_kib": pico[0] or None,
+            "codigo": processo.returncode,
+            "saida": saida.read().decode("utf-8", errors="replace"),
+            "erros": erros.read().decode("utf-8", errors="replace"),
+        }
+
+
+def _estatisticas(valores):
+    valores = [v for v in valores if v is not None]
+    if not valores:
+        return None
+    return {"min": min(valores), "mediana": statistics.median(valores), "max": max(valores)}
+
+
+def medir_implementacao(implementacao, substitutos, repeticoes):
+    resultado = {"nome": implementacao["nome"], "tamanho_bytes": implementacao["tamanho"],
+                 "tamanho_descricao": implementacao["tamanho_descricao"], "erros": []}
+
+    inicializacoes = []
+    for _ in range(repeticoes):
+        execucao = executar(implementacao["inicializacao"], _ambiente(substitutos))
+        if execucao["codigo"] != 0:
+            resultado["erros"].append(f"inicialização terminou com código {execucao['codigo']}: "
+                                      f"{execucao['erros'].strip()[-300:]}")
+            break
+        inicializacoes.append(execucao["duracao"])
+
+    coletas, dados = [], None
+    for _ in range(repeticoes):
+        with tempfile.TemporaryDirectory(prefix="cache_") as cache:
+            execucao = executar(implementacao["coleta"], _ambiente(substitutos, cache))
+        if execucao["codigo"] != 0:
+            resultado["erros"].append(f"coleta terminou com código {execucao['codigo']}: "
+                                      f"{execucao['erros'].strip()[-300:]}")
+            break
+        coletas.append(execucao)
+        linhas = [linha for linha in execucao["saida"].splitlines() if linha.strip()]
+        try:
+            dados = json.loads(linhas[-1])
+        except (IndexError, ValueError):
+            resultado["erros"].append("a coleta não terminou com uma linha JSON")
+            break
+
+    resultado["inicializacao_s"] = _estatisticas(inicializacoes)
+    resultado["coleta_s"] = _estatisticas([c["duracao"] for c in coletas])
+    resultado["cpu_s"] = _estatisticas([c["cpu"] for c in coletas])
+    resultado["pico_rss_kib"] = max((c["rss_kib"] for c in coletas if c["rss_kib"]), default=None)
+    resultado["dados"] = dados
+    return resultado
+
+
+# ---------------------------------------------------------------------------
+# Comparação da saída
+# ---------------------------------------------------------------------------
+
+def _texto(valor):
+    if isinstance(valor, list):
+        return "; ".join(_texto(item) for item in valor)
+    if isinstance(valor, dict):
+        return json.dumps(valor, ensure_ascii=False, sort_keys=True)
+    return "" if valor is None else str(valor)
+
+
+def _normalizar(texto):
+    """Minúsculas, espaços simples e sem percentuais de utilização (mudam a cada coleta)."""
+    texto = VOLATIL.sub(" ", texto.lower())
+    return " ".join(texto.replace(",", " ").split())
+
+
+def comparar_campos(dados, esperado=None):
+    """Compara campo a campo as saídas {implementação: dados}; implementações sem saída ficam de fora."""
+    dados = {nome: valores for nome, valores in dados.items() if valores is not None}
+    esperado = esperado or {}
+    campos = {}
+    for campo in sorted(set().union(*dados.values()) if dados else ()):
+        textos = {nome: _texto(valores.get(campo)) for nome, valores in dados.items()}
+        comparacao = {nome: valores.get(campo) for nome, valores in dados.items()}
+        comparacao["presente"] = {nome: campo in valores for nome, valores in dados.items()}
+        if len(dados) == 2 and campo not in CAMPOS_IGNORADOS and all(comparacao["presente"].values()):
+            primeiro, segundo = textos.values()
+            comparacao["igual"] = primeiro == segundo
+            comparacao["igual_normalizado"] = _normalizar(primeiro) == _normalizar(segundo)
+            comparacao["similaridade"] = round(difflib.SequenceMatcher(None, primeiro, segundo).ratio(), 3)
+        if campo in esperado:
+            comparacao["precisao"] = {}
+            for nome, texto in textos.items():
+                faltando = [trecho for trecho in esperado[campo] if trecho not in texto]
+                comparacao["precisao"][nome] = {
+                    "acertos": len(esperado[campo]) - len(faltando),
+                    "esperados": len(esperado[campo]),
+                    "faltando": faltando,
+                }
+        campos[campo] = comparacao
+    return campos
+
+
+# ---------------------------------------------------------------------------
+# Relatório
+# ---------------------------------------------------------------------------
+
+def _ms(estatistica):
+    return f"{estatistica['mediana'] * 1000:9.1f}" if estatistica else f"{'-':>9}"
+
+
+def resumir(relatorio):
+    linhas = [f"Capturas: {relatorio['capturas']}", f"Repetições: {relatorio['repeticoes']}", "",
+              f"{'coletor':<8} {'início (ms)':>12} {'coleta (ms)':>12} {'CPU (ms)':>9} {'pico RSS':>10} "
+              f"{'tamanho':>10}  distribuído"]
+    for medida in relatorio["implementacoes"]:
+        rss = f"{medida['pico_rss_kib'] / 1024:.1f} MiB" if medida.get("pico_rss_kib") else "-"
+        tamanho = f"{medida['tamanho_bytes'] / 1024 / 1024:.1f} MiB" if medida.get("tamanho_bytes") else "-"
+        linhas.append(f"{medida['nome']:<8} {_ms(medida.get('inicializacao_s')):>12} "
+                      f"{_ms(medida.get('coleta_s')):>12} {_ms(medida.get('cpu_s')):>9} {rss:>10} {tamanho:>10}  "
+                      f"{medida.get('tamanho_descricao', '')}")
+        for erro in medida.get("erros", []):
+            linhas.append(f"         erro: {erro}")
+
+    linhas += ["", "Campos (= igual, ~ igual sem utilização/espaços, ≠ diferente):"]
+    for campo, comparacao in relatorio["campos"].items():
+        if "igual" in comparacao:
+            marca = "=" if comparacao["igual"] else "~" if comparacao["igual_normalizado"] else "≠"
+            situacao = f"{marca} similaridade {comparacao['similaridade']:.2f}"
+        else:
+            presentes = [nome for nome, presente in comparacao["presente"].items() if presente]
+            if len(presentes) == len(comparacao["presente"]):
+                situacao = "não comparado"
+            else:
+                situacao = f"só em {', '.join(presentes)}"
+        precisao = comparacao.get("precisao")
+        if precisao:
+            situacao += "; precisão " + ", ".join(f"{nome} {p['acertos']}/{p['esperados']}"
+                                                  for nome, p in precisao.items())
+        linhas.append(f"  {campo:<20} {situacao}")
+        if precisao:
+            for nome, p in precisao.items():
+                if p["faltando"]:
+                    linhas.append(f"  {'':<20}   {nome} não trouxe: {', '.join(p['faltando'])}")
+
+    if relatorio.get("sem_captura"):
+        linhas += ["", "Chamadas sem captura (falharam com 127):"] + [f"  {c}" for c in relatorio["sem_captura"]]
+    return "\n".join(linhas)
+
+
+def main():
+    if platform.system() != "Linux":
+        print("A comparação roda no Linux (o coletor Go para Windows depende do WMI).")
+        return 1
+
+    parser = argparse.ArgumentParser(description="Compara os coletores Python e Go com as mesmas capturas")
+    parser.add_argument("--capturas", metavar="ARQUIVO", help="Capturas gravadas com --gravar (padrão: sintéticas)")
+    parser.add_argument("--gravar", metavar="ARQUIVO",
+                        help="Grava as chamadas dos dois coletores às ferramentas desta máquina e sai")
+    parser.add_argument("--go-bin", metavar="EXECUTAVEL", help="Coletor Go já compilado (padrão: go build)")
+    parser.add_argument("--python-exe", metavar="EXECUTAVEL",
+                        help="Coletor Python empacotado pelo PyInstaller (padrão: coletor_linux.py)")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções de cada medição")
+    parser.add_argument("--relatorio", metavar="ARQUIVO", default=RELATORIO_PADRAO,
+                        help="Relatório em JSON (\"-\" = saída padrão, no lugar do resumo; "
+                             "padrão: builds/comparacao_coletores.json)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="comparar_coletores_") as temporario:
+        implementacoes = [implementacao_python(args.python_exe)]
+        erro_go = None
+        executavel_go = args.go_bin
+        if not executavel_go:
+            executavel_go, erro_go = compilar_go(temporario)
+        if executavel_go:
+            implementacoes.append(implementacao_go(os.path.abspath(executavel_go)))
+
+        if args.gravar:
+            capturas = gravar_capturas(implementacoes, args.gravar)
+            print(f"{len(capturas['chamadas'])} chamadas gravadas em {os.path.abspath(args.gravar)}")
+            if erro_go:
+                print(f"Coletor Go não incluído: {erro_go}")
+            return 0
+
+        capturas = carregar_capturas(args.capturas) if args.capturas else capturas_sinteticas()
+        substitutos = os.path.join(temporario, "substitutos")
+        os.makedirs(substitutos)
+        registro = preparar_substitutos(capturas, substitutos)
+
+        medidas = [medir_implementacao(implementacao, substitutos, args.repeticoes)
+                   for implementacao in implementacoes]
+        if erro_go:
+            medidas.append({"nome": "go", "erros": [erro_go], "dados": None})
+
+        sem_captura = []
+        if os.path.exists(registro):
+            with open(registro, encoding="utf-8") as arquivo:
+                sem_captura = sorted({linha.strip() for linha in arquivo if linha.strip()})
+
+    dados = {medida["nome"]: medida.pop("dados") for medida in medidas}
+    relatorio = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "maquina": {"sistema": platform.platform(), "processadores": os.cpu_count(),
+                    "python": platform.python_version()},
+        "capturas": capturas.get("descricao", args.capturas),
+        "repeticoes": args.repeticoes,
+        "implementacoes": medidas,
+        "campos": comparar_campos(dados, capturas.get("esperado")),
+        "sem_captura": sem_captura,
+    }
+
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.relatorio == "-":
+        print(texto)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(args.relatorio)), exist_ok=True)
+        with open(args.relatorio, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+        print(resumir(relatorio))
+        print(f"\nRelatório completo: {os.path.abspath(args.relatorio)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
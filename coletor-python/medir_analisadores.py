@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compara a leitura da saída das ferramentas por blocos.py com os laços antigos.
+
+Gera capturas sintéticas grandes no formato real de lscpu (servidor com
+muitos nós NUMA), dmidecode -t 17 (muitos slots, parte vazia), xrandr
+--verbose (muitas saídas com EDID) e do script PowerShell de monitores, mede
+o tempo das duas implementações e mostra o que cada uma extraiu. Os laços
+antigos estão copiados aqui como referência.
+
+    python medir_analisadores.py
+    python medir_analisadores.py --escala 20 --repeticoes 50
+"""
+
+import sys
+import time
+import argparse
+
+import coletor
+import coletor_linux
+
+
+# ---------------------------------------------------------------------------
+# Capturas sintéticas
+# ---------------------------------------------------------------------------
+
+def gerar_lscpu(nos_numa):
+    linhas = [
+        "Architecture:                    x86_64",
+        "CPU op-mode(s):                  32-bit, 64-bit",
+        "Address sizes:                   46 bits physical, 48 bits virtual",
+        "Byte Order:                      Little Endian",
+        f"CPU(s):                          {nos_numa * 8}",
+        f"On-line CPU(s) list:             0-{nos_numa * 8 - 1}",
+        "Vendor ID:                       GenuineIntel",
+        "BIOS Vendor ID:                  Intel(R) Corporation",
+        "Model name:                      Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz",
+        "BIOS Model name:                 Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz  CPU @ 2.1GHz",
+        "CPU family:                      6",
+        "Thread(s) per core:              2",
+        f"Core(s) per socket:              {nos_numa * 2}",
+        "Socket(s):                       2",
+        "Flags:                           fpu vme de pse tsc msr pae mce cx8 apic sep mtrr pge mca cmov",
+        f"NUMA node(s):                    {nos_numa}",
+    ]
+    linhas += [f"NUMA node{i} CPU(s):               {i * 4}-{i * 4 + 3},{i * 4 + 64}-{i * 4 + 67}"
+               for i in range(nos_numa)]
+    linhas += [f"Vulnerability Teste {i}:          Mitigation; Clear CPU buffers; SMT vulnerable"
+               for i in range(nos_numa)]
+    return "\n".join(linhas) + "\n"
+
+
+def gerar_dmidecode(slots):
+    blocos = ["# dmidecode 3.5\nGetting SMBIOS data from sysfs.\nSMBIOS 3.2.0 present.\n"]
+    for i in range(slots):
+        instalado = i % 2 == 0
+        velocidade = "Unknown" if i % 6 == 4 else "2933 MT/s"
+        blocos.append(
+            f"Handle 0x{0x1100 + i:04X}, DMI type 17, 84 bytes\n"
+            "Memory Device\n"
+            "\tArray Handle: 0x1000\n"
+            "\tError Information Handle: Not Provided\n"
+            "\tTotal Width: 72 bits\n"
+            "\tData Width: 64 bits\n"
+            f"\tSize: {'32 GB' if instalado else 'No Module Installed'}\n"
+            "\tForm Factor: DIMM\n"
+            "\tSet: None\n"
+            f"\tLocator: CPU{i % 2 + 1}_DIMM_{i // 2}\n"
+            "\tBank Locator: Not Specified\n"
+            f"\tType: {'DDR4' if instalado else 'Unknown'}\n"
+            "\tType Detail: Synchronous Registered (Buffered)\n"
+            f"\tSpeed: {velocidade if instalado else 'Unknown'}\n"
+            f"\tManufacturer: {'Samsung' if instalado else 'Not Specified'}\n"
+            f"\tSerial Number: {'%08X' % (0x40000000 + i) if instalado else 'Not Specified'}\n"
+            f"\tPart Number: {'M393A4K40CB2-CVF' if instalado else 'Not Specified'}\n"
+            "\tRank: 2\n"
+            f"\tConfigured Memory Speed: {velocidade if instalado else 'Unknown'}\n"
+            "\tMinimum Voltage: 1.2 V\n"
+            "\tMemory Technology: DRAM\n"
+            "\tNon-Volatile Size: None\n"
+            f"\tVolatile Size: {'32 GB' if instalado else 'None'}\n"
+            "\tCache Size: None\n"
+            "\tLogical Size: None\n"
+        )
+    return "\n".join(blocos)
+
+
+def gerar_edid(fabricante, modelo):
+    codigo = sum((ord(letra) - 64) << deslocamento for letra, deslocamento in zip(fabricante, (10, 5, 0)))
+    edid = bytearray(128)
+    edid[:8] = b"\x00\xff\xff\xff\xff\xff\xff\x00"
+    edid[8], edid[9] = codigo >> 8, codigo & 0xff
+    edid[72:77] = b"\x00\x00\x00\xfc\x00"
+    edid[77:90] = (modelo.encode("ascii") + b"\n").ljust(13, b" ")
+    hexa = edid.hex()
+    return "".join(f"\t\t{hexa[i:i + 32]}\n" for i in range(0, len(hexa), 32))
+
+
+def gerar_xrandr(saidas):
+    linhas = ["Screen 0: minimum 320 x 200, current 3840 x 1080, maximum 16384 x 16384\n"]
+    for i in range(saidas):
+        if i % 3 == 2:
+            linhas.append(f"DP-{i} disconnected (normal left inverted right x axis y axis)\n"
+                          "\tIdentifier: 0x%x\n\tTimestamp:  1234\n\tSubpixel:   unknown\n" % (0x40 + i))
+            continue
+        principal = "primary " if i == 0 else ""
+        linhas.append(
+            f"HDMI-{i} connected {principal}1920x1080+{i * 1920}+0 (0x48) normal "
+            "(normal left inverted right x axis y axis) 527mm x 296mm\n"
+            f"\tIdentifier: 0x{0x40 + i:x}\n"
+            "\tTimestamp:  1234\n"
+            "\tSubpixel:   unknown\n"
+            "\tGamma:      1.0:1.0:1.0\n"
+            "\tBrightness: 1.0\n"
+            "\tClones:    \n"
+            "\tCRTC:       0\n"
+            "\tCRTCs:      0 1 2\n"
+            "\tTransform:  1.000000 0.000000 0.000000\n"
+            "\t            0.000000 1.000000 0.000000\n"
+            "\t            0.000000 0.000000 1.000000\n"
+            "\t           filter: \n"
+            "\tEDID: \n"
+            + gerar_edid("DEL", f"DELL P24{i % 100:02d}H") +
+            "\tBroadcast RGB: Automatic \n"
+            "\t\tsupported: Automatic, Full, Limited 16:235\n"
+            "\tlink-status: Good \n"
+            "\t\tsupported: Good, Bad\n"
+            "  1920x1080 (0x48) 148.500MHz +HSync +VSync *current +preferred\n"
+            "        h: width  1920 start 2008 end 2052 total 2200 skew    0 clock  67.50KHz\n"
+            "        v: height 1080 start 1084 end 1089 total 1125           clock  60.00Hz\n"
+            "  1280x720 (0x49) 74.250MHz +HSync +VSync\n"
+            "        h: width  1280 start 1390 end 1430 total 1650 skew    0 clock  45.00KHz\n"
+            "        v: height  720 start  725 end  730 total  750           clock  60.00Hz\n"
+        )
+    return "".join(linhas)
+
+
+def gerar_powershell(monitores):
+    linhas = [f"QUANTIDADE_MONITORES: {monitores}"]
+    for i in range(monitores):
+        linhas += [f"MONITOR_{i + 1}", "FABRICANTE: DEL", f"MODELO: DELL P24{i % 100:02d}H",
+                   "TAMANHO: 23.8 polegadas (53 cm x 30 cm)", "---FIM_MONITOR---"]
+    return "\n".join(linhas) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Laços antigos (coletor_linux.py e coletor.py antes de blocos.py)
+# ---------------------------------------------------------------------------
+
+def lscpu_antigo(info_cpu):
+    modelo = "Desconhecido"
+    fabricante = "Desconhecido"
+    cores = "Desconhecido"
+    threads = "Desconhecido"
+    for linha in info_cpu.split('\n'):
+        if 'Model name' in linha:
+            modelo = linha.split(':')[1].strip()
+        elif 'Vendor ID' in linha:
+            fabricante = linha.split(':')[1].strip()
+        elif 'CPU(s)' in linha and cores == "Desconhecido":
+            cores = linha.split(':')[1].strip()
+        elif 'Thread(s) per core' in linha:
+            threads_por_core = linha.split(':')[1].strip()
+            threads = str(int(cores) * int(threads_por_core))
+    return fabricante, modelo, cores, threads
+
+
+def dmidecode_antigo(ram_info):
+    modulos = []
+    modulo_atual = {}
+    for linha in ram_info.split('\n'):
+        linha = linha.strip()
+        if 'Memory Device' in linha and not modulo_atual:
+            modulo_atual = {}
+        elif 'Size:' in linha and 'No Module Installed' not in linha:
+            modulo_atual['tamanho'] = linha.split(':')[1].strip()
+        elif 'Type:' in linha and 'Unknown' not in linha:
+            modulo_atual['tipo'] = linha.split(':')[1].strip()
+        elif 'Speed:' in linha and 'Unknown' not in linha:
+            modulo_atual['velocidade'] = linha.split(':')[1].strip()
+            if modulo_atual:
+                modulos.append(modulo_atual)
+                modulo_atual = {}
+    return [f"{m['tamanho']} {m['tipo']} {m['velocidade']}" for m in modulos
+            if 'tamanho' in m and 'tipo' in m and 'velocidade' in m]
+
+
+def xrandr_antigo(saida):
+    monitores = []
+    monitor_atual = None
+    edid = ""
+    for linha in saida.split('\n'):
+        if ' connected ' in linha:
+            if monitor_atual:
+                monitor_atual['edid'] = edid
+                monitores.append(monitor_atual)
+                edid = ""
+            nome = linha.split(' ')[0]
+            resolucao = linha.split('primary ')[1].split(' ')[0] if 'primary' in linha else "Desconhecido"
+            monitor_atual = {'nome': nome, 'resolucao': resolucao, 'fabricante': "Desconhecido",
+                             'modelo': "Desconhecido", 'tamanho': "Desconhecido"}
+        elif 'EDID:' in linha and monitor_atual:
+            edid = ""
+        elif '\t\t' in linha and monitor_atual and 'EDID:' in saida:
+            edid += linha.strip()
+        elif 'width' in linha and 'height' in linha and monitor_atual:
+            try:
+                partes = linha.strip().split()
+                width_mm = int(partes[partes.index('width') + 1])
+                height_mm = int(partes[partes.index('height') + 1])
+                monitor_atual['tamanho'] = f"{((width_mm**2 + height_mm**2)**0.5) / 25.4:.1f}\""
+            except (ValueError, IndexError):
+                pass
+    if monitor_atual:
+        monitor_atual['edid'] = edid
+        monitores.append(monitor_atual)
+    for monitor in monitores:
+        if monitor['edid']:
+            monitor['fabricante'] = "Detectado"
+            monitor['modelo'] = "Detectado"
+    return monitores
+
+
+def powershell_antigo(stdout_text):
+    monitores = []
+    for monitor_texto in stdout_text.split("---FIM_MONITOR---"):
+        if not monitor_texto.strip():
+            continue
+        monitor_info = {}
+        for linha in monitor_texto.strip().split('\n'):
+            linha = linha.strip()
+            if linha.startswith("MONITOR_"):
+                continue
+            elif linha.startswith("QUANTIDADE_MONITORES:"):
+                continue
+            elif linha.startswith("FABRICANTE: "):
+                monitor_info["fabricante"] = linha.replace("FABRICANTE: ", "")
+            elif linha.startswith("MODELO: "):
+                monitor_info["modelo"] = linha.replace("MODELO: ", "")
+            elif linha.startswith("TAMANHO: "):
+                monitor_info["tamanho"] = linha.replace("TAMANHO: ", "")
+        if monitor_info:
+            monitores.append(monitor_info)
+    return monitores
+
+
+# ---------------------------------------------------------------------------
+# Medição
+# ---------------------------------------------------------------------------
+
+def medir(funcao, texto, repeticoes):
+    """Menor tempo de uma chamada, em milissegundos."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(texto)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def resumo_monitores(monitores):
+    if not monitores:
+        return "nenhum monitor"
+    primeiro = monitores[0]
+    return (f"{len(monitores)} monitores; 1º: {primeiro['fabricante']} {primeiro['modelo']}, "
+            f"{primeiro['tamanho']}, {primeiro.get('resolucao', '-')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara blocos.py com os laços antigos de leitura")
+    parser.add_argument("--escala", type=int, default=10, help="Multiplica o tamanho das capturas")
+    parser.add_argument("--repeticoes", type=int, default=20, help="Execuções de cada medição")
+    args = parser.parse_args()
+
+    casos = [
+        ("lscpu", gerar_lscpu(8 * args.escala), lscpu_antigo, coletor_linux.interpretar_lscpu,
+         lambda r: f"fabricante={r[0]}, modelo={r[1]}, núcleos={r[2]}, threads={r[3]}"),
+        ("dmidecode -t 17", gerar_dmidecode(48 * args.escala), dmidecode_antigo,
+         coletor_linux.interpretar_dmidecode_memoria,
+         lambda r: f"{len(r)} módulos; 1º: {r[0] if r else '-'}"),
+        ("xrandr --verbose", gerar_xrandr(6 * args.escala), xrandr_antigo, coletor_linux.interpretar_xrandr,
+         resumo_monitores),
+        ("PowerShell monitores", gerar_powershell(40 * args.escala), powershell_antigo,
+         coletor.interpretar_monitores_powershell, resumo_monitores),
+    ]
+
+    for nome, texto, antigo, novo, resumir in casos:
+        tempo_antigo = medir(antigo, texto, args.repeticoes)
+        tempo_novo = medir(novo, texto, args.repeticoes)
+        print(f"{nome} ({len(texto) / 1024:.0f} KiB, {texto.count(chr(10))} linhas)")
+        print(f"  antigo: {tempo_antigo:8.3f} ms  {resumir(antigo(texto))}")
+        print(f"  blocos: {tempo_novo:8.3f} ms  {resumir(novo(texto))}")
+        print(f"  razão antigo/blocos: {tempo_antigo / tempo_novo:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Coleta offline: registros gravados em arquivo NDJSON para importação posterior.
+
+Para unidades sem nenhum caminho de rede até o servidor, o coletor anexa o
+payload (uma linha JSON por máquina) a um arquivo, por exemplo num pendrive
+levado pela equipe de campo. Arquivos terminados em .gz são comprimidos;
+cada execução acrescenta um novo membro gzip, o que preserva os registros anteriores
+mesmo que a gravação seja interrompida no meio: o registro incompleto do fim
+é descartado na leitura, com um aviso. O servidor importa o arquivo
+com `node scripts/importar_ndjson.js`.
+"""
+
+import os
+import gzip
+import json
+import zlib
+from datetime import datetime, timezone
+
+
+def abrir(caminho, modo):
+    """Abre o arquivo em modo texto, com gzip quando a extensão é .gz."""
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, modo + "t", encoding="utf-8")
+    return open(caminho, modo, encoding="utf-8")
+
+
+def anexar_registro(caminho, dados):
+    """Acrescenta um registro ao arquivo e força a gravação no dispositivo."""
+    registro = {chave: valor for chave, valor in dados.items() if valor is not None}
+    registro["coletadoEm"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    linha = (json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    with open(caminho, "ab") as bruto:
+        if caminho.endswith(".gz"):
+            # Um membro gzip por registro, fechado antes do fsync
+            with gzip.GzipFile(fileobj=bruto, mode="ab") as comprimido:
+                comprimido.write(linha)
+        else:
+            bruto.write(linha)
+        # Pendrives costumam ser removidos logo após a coleta. O fsync usa o mesmo
+        # handle de escrita: no Windows (FlushFileBuffers) ele exige acesso de gravação
+        bruto.flush()
+        os.fsync(bruto.fileno())
+
+
+def _linhas_gzip(caminho, tamanho_bloco=64 * 1024):
+    """Linhas (bytes) de um arquivo .gz com vários membros, em blocos (memória constante).
+
+    Se o último membro terminar antes do trailer gzip (gravação interrompida com o
+    pendrive removido), a leitura para no último registro completo com um aviso.
+    """
+    descompressor = zlib.decompressobj(31)
+    em_membro = False
+    resto = b""
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b""):
+            while bloco:
+                em_membro = True
+                resto += descompressor.decompress(bloco)
+                if descompressor.eof:
+                    # Fim de um membro: o que sobrou do bloco pertence ao próximo
+                    bloco = descompressor.unused_data
+                    descompressor = zlib.decompressobj(31)
+                    em_membro = False
+                else:
+                    bloco = b""
+                *linhas, resto = resto.split(b"\n")
+                yield from linhas
+
+    if em_membro:
+        descartada = ", linha final descartada" if resto.strip() else ""
+        print(f"{caminho}: último registro gzip incompleto (gravação interrompida); "
+              f"lido até o último registro completo{descartada}.")
+    elif resto:
+        yield resto
+
+
+def ler_registros(caminho):
+    """Percorre os registros do arquivo um a um (memória constante)."""
+    if caminho.endswith(".gz"):
+        linhas = (linha.decode("utf-8") for linha in _linhas_gzip(caminho))
+    else:
+        linhas = open(caminho, "r", encoding="utf-8")
+    try:
+        for linha in linhas:
+            linha = linha.strip()
+            if linha:
+                yield json.loads(linha)
+    finally:
+        linhas.close()
+
+
+def salvar(caminho, dados):
+    """Grava a coleta no arquivo offline. Retorna (sucesso, mensagem) como enviar_dados."""
+    try:
+        anexar_registro(caminho, dados)
+        return True, f"Dados salvos em {caminho} para importação posterior."
+    except OSError as e:
+        return False, f"Erro ao salvar dados em {caminho}: {e}"
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Coleta de inventário de uma frota inteira, sem passar de máquina em máquina.
+
+Recebe uma lista de hosts e executa o coletor em cada um pelo transporte
+indicado (PowerShell Remoting para Windows, SSH para Linux ou o substituto
+local), com um número limitado de coletas simultâneas e tempo máximo por
+host. Os resultados são enviados ao servidor em lotes à medida que chegam
+(`POST /api/hardware-data/lote`) e podem ser gravados em NDJSON.
+
+Lista de hosts: um host por linha, ou CSV com cabeçalho contendo `host` e,
+opcionalmente, transporte, usuario, porta, secretaria, setor, matricula e
+nomeCompleto (campos do formulário, necessários para máquinas novas).
+
+Exemplos:
+    python orquestrador.py --hosts hosts.csv --transporte psrp --usuario PREFEITURA\\ti
+    python orquestrador.py --hosts-sinteticos 200 --transporte local --sem-envio
+"""
+
+import os
+import csv
+import sys
+import json
+import math
+import time
+import getpass
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import rede
+import transportes
+
+SERVER_BASE_URL = "http://localhost:3000"
+LOTE_URL = f"{SERVER_BASE_URL}/api/hardware-data/lote"
+
+CONCORRENCIA = 32
+TIMEOUT_HOST = 300   # segundos
+TAMANHO_LOTE = 50
+
+CAMPOS_FORMULARIO = ("secretaria", "setor", "matricula", "nomeCompleto")
+
+
+def ler_hosts(caminho, transporte_padrao):
+    """Lê a lista de hosts (texto simples ou CSV com cabeçalho `host`)."""
+    with open(caminho, encoding="utf-8-sig") as arquivo:
+        linhas = [linha for linha in arquivo if linha.strip() and not linha.lstrip().startswith("#")]
+
+    if linhas and "host" in [campo.strip() for campo in linhas[0].split(",")]:
+        hosts = [{chave.strip(): (valor or "").strip() for chave, valor in linha.items() if chave}
+                 for linha in csv.DictReader(linhas)]
+    else:
+        hosts = [{"host": linha.strip()} for linha in linhas]
+
+    for host in hosts:
+        host["transporte"] = host.get("transporte") or transporte_padrao
+    return [host for host in hosts if host.get("host")]
+
+
+def hosts_sinteticos(quantidade, transporte):
+    """Hosts fictícios para medir o motor de distribuição com o transporte local."""
+    return [{"host": f"SINTETICO-{i:05d}", "transporte": transporte} for i in range(quantidade)]
+
+
+def coletar_host(host, transporte, timeout):
+    """Executa a coleta em um host. Nunca lança: falhas viram resultado com `erro`."""
+    inicio = time.monotonic()
+    resultado = {"host": host["host"], "transporte": host["transporte"], "dados": None, "erro": None}
+    try:
+        dados = transporte.coletar(host, timeout)
+        # Campos do formulário vêm da lista de hosts
+        for campo in CAMPOS_FORMULARIO:
+            if host.get(campo):
+                dados[campo] = host[campo]
+        resultado["dados"] = dados
+    except transportes.ErroTransporte as e:
+        resultado["erro"] = str(e)
+    except Exception as e:
+        resultado["erro"] = f"{type(e).__name__}: {e}"
+    resultado["duracao"] = time.monotonic() - inicio
+    return resultado
+
+
+def executar_frota(hosts, instancias, concorrencia=CONCORRENCIA, timeout=TIMEOUT_HOST):
+    """Gera os resultados (na ordem em que terminam) com no máximo `concorrencia` coletas simultâneas."""
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        futuros = [executor.submit(coletar_host, host, instancias[host["transporte"]], timeout)
+                   for host in hosts]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+class EnvioEmLote:
+    """Acumula os payloads coletados e os envia ao servidor em lotes."""
+
+    def __init__(self, url, tamanho=TAMANHO_LOTE):
+        self.url = url
+        self.tamanho = tamanho
+        self.pendentes = []
+        self.situacoes = {}
+
+    def adicionar(self, dados):
+        self.pendentes.append(dados)
+        if len(self.pendentes) >= self.tamanho:
+            self.enviar()
+
+    def enviar(self):
+        if not self.pendentes:
+            return
+        lote, self.pendentes = self.pendentes, []
+        try:
+            resposta = rede.requisitar_com_backoff("POST", self.url, json={"registros": lote}, timeout=60)
+            if resposta.status_code == 200:
+                for item in resposta.json().get("resultados", []):
+                    self.situacoes[item["situacao"]] = self.situacoes.get(item["situacao"], 0) + 1
+                return
+            print(f"Erro ao enviar lote. Código: {resposta.status_code}")
+        except Exception as e:
+            print(f"Erro ao enviar lote: {e}")
+        self.situacoes["falha_envio"] = self.situacoes.get("falha_envio", 0) + len(lote)
+
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0.0
+    return valores_ordenados[max(1, math.ceil(p / 100 * len(valores_ordenados))) - 1]
+
+
+def criar_instancias(nomes, args):
+    """Instancia apenas os transportes usados na lista de hosts."""
+    instancias = {}
+    for nome in nomes:
+        if nome not in transportes.TRANSPORTES:
+            raise ValueError(f"Transporte desconhecido: {nome} (disponíveis: {', '.join(transportes.TRANSPORTES)})")
+        if nome == "local":
+            instancias[nome] = transportes.TransporteLocal(args.comando_local)
+        elif nome == "ssh":
+            instancias[nome] = transportes.TransporteSSH(args.executavel_linux, args.usuario)
+        elif nome == "psrp":
+            senha = os.environ.get("INVENTARIO_SENHA") or getpass.getpass(f"Senha de {args.usuario}: ")
+            instancias[nome] = transportes.TransportePSRP(args.executavel_windows, args.usuario, senha, args.ssl)
+        else:
+            instancias[nome] = transportes.TRANSPORTES[nome]()
+    return instancias
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coleta de inventário remota em toda a frota")
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument("--hosts", metavar="ARQUIVO", help="Lista de hosts (texto ou CSV)")
+    origem.add_argument("--hosts-sinteticos", type=int, metavar="N",
+                        help="Gera N hosts fictícios (benchmark com --transporte local)")
+    parser.add_argument("--transporte", default="psrp", help="Transporte padrão: psrp, ssh ou local")
+    parser.add_argument("--usuario", help="Usuário para psrp/ssh (ex.: DOMINIO\\usuario)")
+    parser.add_argument("--ssl", action="store_true", help="WinRM por HTTPS (porta 5986)")
+    parser.add_argument("--executavel-windows", default=transportes.EXECUTAVEL_WINDOWS)
+    parser.add_argument("--executavel-linux", default=transportes.EXECUTAVEL_LINUX)
+    parser.add_argument("--comando-local", help="Comando do transporte local (padrão: coletor desta máquina com --json -)")
+    parser.add_argument("--concorrencia", type=int, default=CONCORRENCIA, help="Coletas simultâneas")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT_HOST, help="Tempo máximo por host (s)")
+    parser.add_argument("--url", default=LOTE_URL, help="Endpoint de envio em lote")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="Registros por envio")
+    parser.add_argument("--sem-envio", action="store_true", help="Não envia ao servidor")
+    parser.add_argument("--saida", metavar="ARQUIVO", help="Grava cada resultado em NDJSON")
+    args = parser.parse_args()
+
+    if args.hosts:
+        hosts = ler_hosts(args.hosts, args.transporte)
+    else:
+        hosts = hosts_sinteticos(args.hosts_sinteticos, args.transporte)
+    if not hosts:
+        parser.error("A lista de hosts está vazia")
+
+    try:
+        instancias = criar_instancias(sorted({host["transporte"] for host in hosts}), args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    envio = None if args.sem_envio else EnvioEmLote(args.url, args.lote)
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else None
+    duracoes, falhas = [], {}
+    inicio = time.monotonic()
+
+    print(f"Coletando {len(hosts)} hosts com até {args.concorrencia} simultâneos...")
+    try:
+        for concluidos, resultado in enumerate(executar_frota(hosts, instancias, args.concorrencia, args.timeout), 1):
+            duracoes.append(resultado["duracao"])
+            if resultado["erro"]:
+                falhas[resultado["host"]] = resultado["erro"]
+                print(f"[{concluidos}/{len(hosts)}] {resultado['host']}: ERRO {resultado['erro']}")
+            else:
+                print(f"[{concluidos}/{len(hosts)}] {resultado['host']}: ok ({resultado['duracao']:.1f} s)")
+                if envio:
+                    envio.adicionar(resultado["dados"])
+            if saida:
+                saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                saida.flush()
+        if envio:
+            envio.enviar()
+    except KeyboardInterrupt:
+        print("\nColeta interrompida pelo usuário.")
+    finally:
+        if saida:
+            saida.close()
+
+    total = time.monotonic() - inicio
+    duracoes.sort()
+    print("\nResumo da coleta")
+    print(f"  Hosts: {len(duracoes)} de {len(hosts)} ({len(duracoes) - len(falhas)} ok, {len(falhas)} falhas)")
+    print(f"  Tempo total: {total:.1f} s ({len(duracoes) / total if total > 0 else 0:.1f} hosts/s)")
+    print(f"  Por host: p50 {percentil(duracoes, 50):.2f} s, p95 {percentil(duracoes, 95):.2f} s, "
+          f"máx {duracoes[-1] if duracoes else 0:.2f} s")
+    if envio:
+        print(f"  Servidor: {', '.join(f'{k}: {v}' for k, v in sorted(envio.situacoes.items())) or 'nada enviado'}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
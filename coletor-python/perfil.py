@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Modo de diagnóstico (--profile): descobre o que deixa a coleta lenta na máquina do usuário.
+
+Durante a coleta, cada sonda roda sob o cProfile e toda chamada externa
+(subprocess e consultas WMI) é registrada com os argumentos, o início, a
+duração e o resultado. Ao final é gravado um relatório em texto, sem
+dependências, que o usuário pode anexar ao chamado. Ele traz:
+
+- tempo de cada sonda (relógio e CPU)
+- as chamadas externas mais lentas, com a sonda que as fez
+- a linha do tempo completa das chamadas externas
+- as funções mais caras de cada sonda segundo o cProfile
+
+Os dados coletados (usuário, nome completo, matrícula) não entram no relatório.
+"""
+
+import os
+import io
+import sys
+import time
+import pstats
+import socket
+import cProfile
+import platform
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime
+
+FUNCOES_POR_SONDA = 15        # linhas do cProfile por sonda
+CHAMADAS_MAIS_LENTAS = 10
+TAMANHO_DESCRICAO = 200       # caracteres do comando/consulta exibidos
+
+_ativo = None
+
+
+def ativo():
+    """Perfil em andamento, ou None fora do modo --profile."""
+    return _ativo
+
+
+def registrar_wmi(consulta, inicio, situacao):
+    """Registra uma consulta WMI feita por wql.consultar (nada fora do modo --profile)."""
+    if _ativo:
+        _ativo.registrar_chamada("wmi", _descrever_comando(consulta), inicio, situacao)
+
+
+def _descrever_comando(comando):
+    if isinstance(comando, (list, tuple)):
+        texto = " ".join(str(parte) for parte in comando)
+    else:
+        texto = str(comando)
+    return texto if len(texto) <= TAMANHO_DESCRICAO else texto[:TAMANHO_DESCRICAO - 3] + "..."
+
+
+class Perfil:
+    """Mede sondas e chamadas externas de uma coleta e gera o relatório."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.data = datetime.now()
+        self.sondas = []
+        self.chamadas = []
+        self.fim = None
+        self.sonda_atual = None
+        self._originais = {}
+
+    # -- instalação ---------------------------------------------------------
+
+    def instalar(self):
+        """Passa a registrar subprocess.run/call (check_output usa run) e ativa o perfil."""
+        global _ativo
+        for nome in ("run", "call"):
+            self._originais[nome] = getattr(subprocess, nome)
+            setattr(subprocess, nome, self._instrumentar_subprocess(nome, self._originais[nome]))
+        _ativo = self
+        return self
+
+    def remover(self):
+        global _ativo
+        for nome, original in self._originais.items():
+            setattr(subprocess, nome, original)
+        self._originais = {}
+        self.fim = time.perf_counter()
+        _ativo = None
+
+    def _instrumentar_subprocess(self, nome, original):
+        def instrumentada(*args, **kwargs):
+            comando = args[0] if args else kwargs.get("args")
+            inicio = time.perf_counter()
+            situacao = "erro"
+            try:
+                retorno = original(*args, **kwargs)
+                situacao = f"código {getattr(retorno, 'returncode', retorno)}"
+                return retorno
+            except subprocess.CalledProcessError as e:
+                situacao = f"código {e.returncode}"
+                raise
+            except subprocess.TimeoutExpired:
+                situacao = "tempo esgotado"
+                raise
+            except Exception as e:
+                situacao = type(e).__name__
+                raise
+            finally:
+                self.registrar_chamada("subprocess", _descrever_comando(comando), inicio, situacao)
+
+        instrumentada.__name__ = nome
+        return instrumentada
+
+    # -- medição ------------------------------------------------------------
+
+    def registrar_chamada(self, tipo, descricao, inicio, situacao):
+        self.chamadas.append({
+            "sonda": self.sonda_atual or "-",
+            "tipo": tipo,
+            "descricao": descricao,
+            "inicio": inicio - self.inicio,
+            "duracao": time.perf_counter() - inicio,
+            "situacao": situacao,
+        })
+
+    @contextmanager
+    def medir_sonda(self, nome):
+        """Executa o bloco sob o cProfile, atribuindo à sonda as chamadas externas feitas nele."""
+        registro = {"nome": nome, "erro": None}
+        perfilador = cProfile.Profile()
+        anterior, self.sonda_atual = self.sonda_atual, nome
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        perfilador.enable()
+        try:
+            yield
+        except Exception as e:
+            registro["erro"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            perfilador.disable()
+            registro["duracao"] = time.perf_counter() - inicio
+            registro["cpu"] = time.process_time() - inicio_cpu
+            self.sonda_atual = anterior
+
+            saida = io.StringIO()
+            estatisticas = pstats.Stats(perfilador, stream=saida)
+            estatisticas.strip_dirs().sort_stats("cumulative").print_stats(FUNCOES_POR_SONDA)
+            registro["cprofile"] = saida.getvalue().strip()
+            self.sondas.append(registro)
+
+    # -- relatório ----------------------------------------------------------
+
+    def relatorio(self, contexto=None):
+        total = (self.fim or time.perf_counter()) - self.inicio
+        linhas = [
+            "RELATÓRIO DE DESEMPENHO DO COLETOR DE INVENTÁRIO",
+            "=" * 60,
+            f"Data: {self.data:%Y-%m-%d %H:%M:%S}",
+            f"Máquina: {socket.gethostname()}",
+            f"Sistema: {platform.platform()}",
+            f"Python: {sys.version.split()[0]} ({'executável empacotado' if getattr(sys, 'frozen', False) else 'script'})",
+            f"Processadores lógicos: {os.cpu_count()}",
+        ]
+        for chave, valor in (contexto or {}).items():
+            linhas.append(f"{chave}: {valor}")
+        linhas.append(f"Tempo total da coleta: {total:.2f} s")
+
+        linhas += ["", "SONDAS (mais lentas primeiro)", "-" * 60,
+                   f"{'sonda':<20} {'relógio (s)':>12} {'CPU (s)':>10} {'chamadas':>9}  situação"]
+        for sonda in sorted(self.sondas, key=lambda s: s["duracao"], reverse=True):
+            chamadas = sum(1 for c in self.chamadas if c["sonda"] == sonda["nome"])
+            linhas.append(f"{sonda['nome']:<20} {sonda['duracao']:>12.3f} {sonda['cpu']:>10.3f} {chamadas:>9}  "
+                          f"{sonda['erro'] or 'ok'}")
+
+        linhas += ["", f"CHAMADAS EXTERNAS MAIS LENTAS (de {len(self.chamadas)})", "-" * 60]
+        for chamada in sorted(self.chamadas, key=lambda c: c["duracao"], reverse=True)[:CHAMADAS_MAIS_LENTAS]:
+            linhas.append(self._formatar_chamada(chamada))
+        if not self.chamadas:
+            linhas.append("(nenhuma)")
+
+        linhas += ["", "LINHA DO TEMPO DAS CHAMADAS EXTERNAS", "-" * 60]
+        linhas += [self._formatar_chamada(chamada) for chamada in self.chamadas] or ["(nenhuma)"]
+
+        linhas += ["", "FUNÇÕES MAIS CARAS POR SONDA (cProfile, tempo acumulado)", "-" * 60]
+        for sonda in self.sondas:
+            linhas += [f"[{sonda['nome']}] {sonda['duracao']:.3f} s", sonda["cprofile"], ""]
+        return "\n".join(linhas) + "\n"
+
+    @staticmethod
+    def _formatar_chamada(chamada):
+        return (f"+{chamada['inicio']:8.3f} s  {chamada['duracao']:8.3f} s  {chamada['sonda']:<16} "
+                f"{chamada['tipo']:<10} {chamada['descricao']}  [{chamada['situacao']}]")
+
+    def salvar(self, caminho, contexto=None):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(self.relatorio(contexto))
+        return caminho
+
+
+def caminho_padrao():
+    """Nome do relatório quando --profile é usado sem arquivo."""
+    return f"perfil_coletor_{socket.gethostname()}_{datetime.now():%Y%m%d_%H%M%S}.txt"
+
+
+def adicionar_argumentos(parser):
+    """Adiciona a opção --profile a um argparse.ArgumentParser."""
+    parser.add_argument("--profile", nargs="?", const="", metavar="ARQUIVO",
+                        help="Coleta sem interface medindo cada sonda e grava um relatório de desempenho "
+                             "(padrão: perfil_coletor_<máquina>_<data>.txt)")
+    return parser
+
+
+def executar(coletar, caminho=None, contexto=None):
+    """Executa `coletar()` com o perfil ativo e grava o relatório. Retorna o caminho do arquivo."""
+    perfil = Perfil().instalar()
+    try:
+        coletar()
+    finally:
+        perfil.remover()
+    return perfil.salvar(caminho or caminho_padrao(), contexto)
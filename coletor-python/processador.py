@@ -0,0 +1,402 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Identificação do processador sem WMI nem lscpu, comum aos coletores Windows e Linux.
+
+A marca ("Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz"), o fabricante e a
+família/modelo CPUID vêm de fontes baratas: o registro
+(HKLM\\HARDWARE\\DESCRIPTION\\System\\CentralProcessor\\0) no Windows e
+/proc/cpuinfo no Linux. Núcleos, threads e soquetes vêm de
+GetLogicalProcessorInformationEx e de /sys/devices/system/cpu. A leitura
+inteira leva poucos milissegundos, contra ~1 s de uma consulta Win32_Processor.
+
+`identificar` decodifica fabricante, família comercial, geração e
+microarquitetura a partir de uma tabela de modelos compilada na importação
+(expressões sobre a marca e o mapa família/modelo CPUID -> microarquitetura),
+com o resultado memorizado por combinação de entradas.
+"""
+
+import os
+import re
+import sys
+import time
+import platform
+from collections import namedtuple
+from functools import lru_cache
+
+import psutil
+
+import blocos
+
+Identificacao = namedtuple("Identificacao", "fabricante familia geracao serie microarquitetura")
+Topologia = namedtuple("Topologia", "nucleos threads soquetes nucleos_p nucleos_e")
+
+FABRICANTES = {
+    "GenuineIntel": "Intel",
+    "AuthenticAMD": "AMD",
+    "HygonGenuine": "Hygon",
+    "CentaurHauls": "VIA",
+    "  Shanghai  ": "Zhaoxin",
+    "Shanghai": "Zhaoxin",      # /proc/cpuinfo remove os espaços
+}
+
+CHAVES_CPUINFO = ("vendor_id", "model name", "cpu family", "model", "cpu MHz")
+
+# Raiz de /proc e /sys no Linux (comparar_coletores.py aponta para capturas gravadas)
+RAIZ_SISTEMA = os.environ.get("INVENTARIO_RAIZ_SISTEMA", "/")
+
+# O primeiro bloco de /proc/cpuinfo basta; em máquinas com centenas de CPUs o arquivo passa de 1 MB
+TAMANHO_LEITURA_CPUINFO = 16384
+
+# Janela mínima da utilização medida entre a importação e a coleta
+JANELA_UTILIZACAO = 0.1
+
+
+# ---------------------------------------------------------------------------
+# Tabela de modelos
+# ---------------------------------------------------------------------------
+
+# Microarquitetura por (fabricante, família CPUID): {modelo: nome}, ou faixas (início, fim, nome) de modelos
+_MICROARQUITETURAS = {
+    ("Intel", 6): {
+        0x1A: "Nehalem", 0x1E: "Nehalem", 0x2E: "Nehalem", 0x25: "Westmere", 0x2C: "Westmere", 0x2F: "Westmere",
+        0x2A: "Sandy Bridge", 0x2D: "Sandy Bridge", 0x3A: "Ivy Bridge", 0x3E: "Ivy Bridge",
+        0x3C: "Haswell", 0x3F: "Haswell", 0x45: "Haswell", 0x46: "Haswell",
+        0x3D: "Broadwell", 0x47: "Broadwell", 0x4F: "Broadwell", 0x56: "Broadwell",
+        0x4E: "Skylake", 0x5E: "Skylake", 0x55: "Skylake/Cascade Lake",
+        0x8E: "Kaby Lake/Coffee Lake", 0x9E: "Kaby Lake/Coffee Lake", 0x66: "Cannon Lake",
+        0xA5: "Comet Lake", 0xA6: "Comet Lake", 0x7D: "Ice Lake", 0x7E: "Ice Lake",
+        0x6A: "Ice Lake", 0x6C: "Ice Lake", 0x8C: "Tiger Lake", 0x8D: "Tiger Lake", 0xA7: "Rocket Lake",
+        0x97: "Alder Lake", 0x9A: "Alder Lake", 0xBE: "Alder Lake-N",
+        0xB7: "Raptor Lake", 0xBA: "Raptor Lake", 0xBF: "Raptor Lake",
+        0xAA: "Meteor Lake", 0xAC: "Meteor Lake", 0xBD: "Lunar Lake", 0xC5: "Arrow Lake", 0xC6: "Arrow Lake",
+        0x8F: "Sapphire Rapids", 0xCF: "Emerald Rapids", 0xAD: "Granite Rapids", 0xAF: "Sierra Forest",
+        0x1C: "Bonnell", 0x26: "Bonnell", 0x37: "Silvermont", 0x4C: "Airmont", 0x5C: "Goldmont",
+        0x7A: "Goldmont Plus", 0x86: "Tremont", 0x96: "Tremont", 0x9C: "Tremont",
+    },
+    ("AMD", 0x15): [(0x00, 0x0F, "Bulldozer/Piledriver"), (0x10, 0x1F, "Piledriver"),
+                    (0x30, 0x3F, "Steamroller"), (0x60, 0x7F, "Excavator")],
+    ("AMD", 0x16): [(0x00, 0x0F, "Jaguar"), (0x30, 0x3F, "Puma")],
+    ("AMD", 0x17): [(0x00, 0x07, "Zen"), (0x08, 0x0F, "Zen+"), (0x10, 0x17, "Zen"), (0x18, 0x1F, "Zen+"),
+                    (0x20, 0x2F, "Zen"), (0x30, 0xFF, "Zen 2")],
+    ("AMD", 0x19): [(0x00, 0x0F, "Zen 3"), (0x10, 0x1F, "Zen 4"), (0x20, 0x2F, "Zen 3"), (0x40, 0x4F, "Zen 3+"),
+                    (0x50, 0x5F, "Zen 3"), (0x60, 0x7F, "Zen 4"), (0xA0, 0xAF, "Zen 4c")],
+    ("AMD", 0x1A): [(0x00, 0xFF, "Zen 5")],
+    ("Hygon", 0x18): [(0x00, 0xFF, "Dhyana (Zen)")],
+}
+
+
+def _compilar_microarquiteturas():
+    """Expande as faixas em dicionários: a consulta vira uma única busca por chave."""
+    tabela = {}
+    for chave, modelos in _MICROARQUITETURAS.items():
+        if isinstance(modelos, dict):
+            tabela[chave] = dict(modelos)
+        else:
+            tabela[chave] = {modelo: nome for inicio, fim, nome in modelos for modelo in range(inicio, fim + 1)}
+    return tabela
+
+
+MICROARQUITETURAS = _compilar_microarquiteturas()
+
+
+def _geracao_core(numero):
+    """Geração de um Core i3/i5/i7/i9 pelo número do modelo (i5-8250U -> 8, i7-12700 -> 12, i7-1165G7 -> 11)."""
+    digitos = re.match(r"\d+", numero).group()
+    if len(digitos) == 3:
+        return 1                                    # i7-920, i5-750
+    if len(digitos) == 5 or (len(digitos) == 4 and digitos[0] == "1"):
+        return int(digitos[:2])                     # 12700, 1165G7
+    return int(digitos[0])                          # 8250U, 2600
+
+
+def _serie_ryzen(numero):
+    return f"Ryzen {numero[0]}000"
+
+
+# Modelos comerciais: (fabricante, expressão sobre a marca, decodificador). A primeira que casar vale.
+# O decodificador recebe o match e devolve (família, geração, série).
+_MODELOS = [
+    ("Intel", r"Core\(TM\) Ultra (?P<classe>[3579])\s+(?:Processor\s+)?(?P<numero>\d)\d\d",
+     lambda m: (f"Core Ultra {m['classe']}", None, f"Série {m['numero']}")),
+    ("Intel", r"(?P<geracao>\d{1,2})th Gen Intel\(R\) Core\(TM\) (?P<classe>i[3579])",
+     lambda m: (f"Core {m['classe']}", int(m["geracao"]), None)),
+    # Alder Lake-N (i3-N305, i3-N300): só núcleos E, sem número de geração no nome comercial
+    ("Intel", r"Core\(TM\) (?P<classe>i[3579])-N\d{3}\b",
+     lambda m: (f"Core {m['classe']}", None, "Série N")),
+    ("Intel", r"Core\(TM\) (?P<classe>i[3579])-(?P<numero>\d{3,5}[A-Z0-9]*)",
+     lambda m: (f"Core {m['classe']}", _geracao_core(m["numero"]), None)),
+    ("Intel", r"Core\(TM\) (?P<classe>i[3579]) CPU\s+[A-Z]?\s*\d{3}",
+     lambda m: (f"Core {m['classe']}", 1, None)),
+    ("Intel", r"Core\(TM\) (?P<classe>m[357])-(?P<numero>\d)",
+     lambda m: (f"Core {m['classe']}", int(m["numero"]), None)),
+    ("Intel", r"Core\(TM\) (?P<classe>[3579]) (?:Processor )?(?P<numero>\d)\d\d",
+     lambda m: (f"Core {m['classe']}", None, f"Série {m['numero']}")),
+    ("Intel", r"Core\(TM\)\s?2 (?P<classe>Duo|Quad|Extreme|Solo)",
+     lambda m: (f"Core 2 {m['classe']}", None, None)),
+    ("Intel", r"Xeon\(R\) (?P<classe>Platinum|Gold|Silver|Bronze) (?P<numero>\d{4})",
+     lambda m: (f"Xeon {m['classe']}", int(m["numero"][1]), "Xeon Scalable")),
+    ("Intel", r"Xeon\(R\) (?:CPU )?(?P<classe>E[357])-\d{4}[A-Z]?(?: v(?P<versao>\d))?",
+     lambda m: (f"Xeon {m['classe']}", None, f"v{m['versao']}" if m["versao"] else "v1")),
+    ("Intel", r"Xeon\(R\) (?:CPU )?(?P<classe>E|W|w[3579])-?\d{4}",
+     lambda m: (f"Xeon {m['classe'].upper()[0]}", None, None)),
+    ("Intel", r"Xeon", lambda m: ("Xeon", None, None)),
+    ("Intel", r"(?P<classe>Pentium|Celeron|Atom)", lambda m: (m["classe"], None, None)),
+    ("Intel", r"Intel\(R\) (?:Processor )?(?P<classe>N)\d{2,3}\b", lambda m: ("Processor N", None, None)),
+    ("AMD", r"Ryzen AI (?P<classe>[3579])(?: PRO)?(?: HX)? (?P<numero>\d)\d\d",
+     lambda m: (f"Ryzen AI {m['classe']}", None, f"Ryzen AI {m['numero']}00")),
+    ("AMD", r"Ryzen Threadripper (?:PRO )?(?P<numero>\d)\d{3}",
+     lambda m: ("Ryzen Threadripper", None, _serie_ryzen(m["numero"]))),
+    ("AMD", r"Ryzen (?P<classe>[3579])(?: PRO)? (?P<numero>\d)\d{3}",
+     lambda m: (f"Ryzen {m['classe']}", None, _serie_ryzen(m["numero"]))),
+    ("AMD", r"EPYC (?:Embedded )?\d{3}(?P<geracao>\d)",
+     lambda m: ("EPYC", int(m["geracao"]), "EPYC")),
+    ("AMD", r"(?P<classe>Athlon|Phenom|Opteron|Sempron|Turion)", lambda m: (m["classe"], None, None)),
+    ("AMD", r"\bFX\b|FX\(tm\)", lambda m: ("FX", None, None)),
+    ("AMD", r"\b(?P<classe>A(?:4|6|8|9|10|12))-\d{4}", lambda m: (f"Série {m['classe']}", None, None)),
+]
+MODELOS = [(fabricante, re.compile(expressao, re.IGNORECASE), decodificar)
+           for fabricante, expressao, decodificar in _MODELOS]
+
+
+@lru_cache(maxsize=None)
+def identificar(marca, fabricante_cpuid=None, familia_cpuid=None, modelo_cpuid=None):
+    """Decodifica fabricante, família comercial, geração, série e microarquitetura.
+
+    `marca` é o nome completo do processador; `fabricante_cpuid` a identificação
+    ("GenuineIntel", "AuthenticAMD"); família e modelo são os números CPUID.
+    """
+    marca = " ".join((marca or "").split())
+    fabricante = FABRICANTES.get(fabricante_cpuid or "")
+    if fabricante is None:
+        fabricante = "Intel" if "intel" in marca.lower() else "AMD" if "amd" in marca.lower() else None
+
+    familia = geracao = serie = None
+    for fabricante_modelo, expressao, decodificar in MODELOS:
+        if fabricante and fabricante_modelo != fabricante:
+            continue
+        encontrado = expressao.search(marca)
+        if encontrado:
+            familia, geracao, serie = decodificar(encontrado)
+            fabricante = fabricante or fabricante_modelo
+            break
+
+    microarquitetura = None
+    if familia_cpuid is not None and modelo_cpuid is not None:
+        microarquitetura = MICROARQUITETURAS.get((fabricante, familia_cpuid), {}).get(modelo_cpuid)
+    return Identificacao(fabricante, familia, geracao, serie, microarquitetura)
+
+
+def descrever_geracao(identificacao):
+    """Texto da geração: "12ª Geração" (Core), "2ª Geração Xeon Scalable", "Série 2", "Ryzen 5000"...
+
+    Só os Core i3/i5/i7/i9/m saem como "Nª Geração" puro, o formato que o
+    servidor usa nas estatísticas da frota.
+    """
+    partes = []
+    if identificacao.geracao:
+        partes.append(f"{identificacao.geracao}ª Geração")
+    if identificacao.serie:
+        partes.append(identificacao.serie)
+    return " ".join(partes) or None
+
+
+# ---------------------------------------------------------------------------
+# Leitura no Linux
+# ---------------------------------------------------------------------------
+
+def _inteiro(valor):
+    try:
+        return int(valor, 0) if isinstance(valor, str) else None
+    except ValueError:
+        return None
+
+
+def _ler(caminho):
+    with open(caminho, encoding="ascii") as arquivo:
+        return arquivo.read().strip()
+
+
+def _lista_cpus(texto):
+    """Expande uma lista do kernel ("0-3,8-11") em números de CPU."""
+    cpus = []
+    for parte in texto.split(","):
+        if "-" in parte:
+            inicio, fim = parte.split("-")
+            cpus.extend(range(int(inicio), int(fim) + 1))
+        elif parte:
+            cpus.append(int(parte))
+    return cpus
+
+
+def ler_cpuinfo(caminho=None):
+    """Campos do primeiro processador de /proc/cpuinfo (marca, fabricante, família, modelo e MHz)."""
+    caminho = caminho or os.path.join(RAIZ_SISTEMA, "proc", "cpuinfo")
+    with open(caminho, encoding="utf-8", errors="replace") as arquivo:
+        texto = arquivo.read(TAMANHO_LEITURA_CPUINFO)
+    return blocos.chaves_valores(texto, CHAVES_CPUINFO)
+
+
+def topologia_linux(raiz=None):
+    """Núcleos, threads e soquetes a partir do sysfs; núcleos P/E em processadores híbridos da Intel."""
+    raiz = raiz or os.path.join(RAIZ_SISTEMA, "sys", "devices", "system", "cpu")
+    cpus = _lista_cpus(_ler(os.path.join(raiz, "online")))
+    nucleos, soquetes = {}, set()
+    for cpu in cpus:
+        topologia = os.path.join(raiz, f"cpu{cpu}", "topology")
+        soquete = _ler(os.path.join(topologia, "physical_package_id"))
+        nucleos[cpu] = (soquete, _ler(os.path.join(topologia, "core_id")))
+        soquetes.add(soquete)
+
+    # Híbridos (Alder Lake em diante) expõem os tipos de núcleo como PMUs separadas
+    nucleos_p = nucleos_e = None
+    tipos = os.path.dirname(os.path.dirname(raiz))
+    if os.path.exists(os.path.join(tipos, "cpu_atom", "cpus")):
+        def contar(tipo):
+            caminho = os.path.join(tipos, tipo, "cpus")
+            if not os.path.exists(caminho):
+                return 0
+            return len({nucleos[cpu] for cpu in _lista_cpus(_ler(caminho)) if cpu in nucleos})
+        nucleos_p, nucleos_e = contar("cpu_core"), contar("cpu_atom")
+
+    return Topologia(len(set(nucleos.values())), len(cpus), len(soquetes), nucleos_p, nucleos_e)
+
+
+def ler_linux():
+    """(marca, fabricante CPUID, família, modelo, MHz atual, topologia) no Linux."""
+    campos = ler_cpuinfo()
+    mhz = campos.get("cpu MHz")
+    return (campos.get("model name"), campos.get("vendor_id"), _inteiro(campos.get("cpu family")),
+            _inteiro(campos.get("model")), float(mhz) if mhz else None, topologia_linux())
+
+
+# ---------------------------------------------------------------------------
+# Leitura no Windows
+# ---------------------------------------------------------------------------
+
+def ler_registro_windows():
+    """(marca, fabricante CPUID, família, modelo, MHz nominal) do registro."""
+    import winreg
+    chave = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\CentralProcessor\0")
+    try:
+        def valor(nome):
+            try:
+                return winreg.QueryValueEx(chave, nome)[0]
+            except OSError:
+                return None
+        marca, fabricante, identificador, mhz = (valor("ProcessorNameString"), valor("VendorIdentifier"),
+                                                 valor("Identifier") or "", valor("~MHz"))
+    finally:
+        winreg.CloseKey(chave)
+    # Identifier: "Intel64 Family 6 Model 142 Stepping 10"
+    cpuid = re.search(r"Family (\d+) Model (\d+)", identificador)
+    familia, modelo = (int(cpuid.group(1)), int(cpuid.group(2))) if cpuid else (None, None)
+    return marca, fabricante, familia, modelo, mhz
+
+
+def topologia_windows():
+    """Núcleos, threads e soquetes por GetLogicalProcessorInformationEx (todos os grupos de processadores)."""
+    import ctypes
+    from ctypes import wintypes
+
+    RELACAO_NUCLEO, RELACAO_SOQUETE, RELACAO_TODAS = 0, 3, 0xFFFF
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    tamanho = wintypes.DWORD(0)
+    kernel32.GetLogicalProcessorInformationEx(RELACAO_TODAS, None, ctypes.byref(tamanho))
+    buffer = ctypes.create_string_buffer(tamanho.value)
+    if not kernel32.GetLogicalProcessorInformationEx(RELACAO_TODAS, buffer, ctypes.byref(tamanho)):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    # SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX: Relationship (DWORD), Size (DWORD) e, para núcleo/soquete,
+    # PROCESSOR_RELATIONSHIP: Flags, EfficiencyClass, Reserved[20], GroupCount (WORD), GROUP_AFFINITY[GroupCount]
+    # GROUP_AFFINITY: Mask (KAFFINITY = ponteiro), Group (WORD), Reserved[3] (WORD)
+    dados = buffer.raw[:tamanho.value]
+    tamanho_mascara = ctypes.sizeof(ctypes.c_void_p)
+    tamanho_afinidade = tamanho_mascara + 8
+    inicio_afinidades = 8 + 24
+    nucleos, threads, soquetes, classes = 0, 0, 0, []
+    posicao = 0
+    while posicao < len(dados):
+        relacao = int.from_bytes(dados[posicao:posicao + 4], "little")
+        tamanho_registro = int.from_bytes(dados[posicao + 4:posicao + 8], "little")
+        if relacao == RELACAO_NUCLEO:
+            nucleos += 1
+            classes.append(dados[posicao + 9])
+            grupos = int.from_bytes(dados[posicao + 30:posicao + 32], "little")
+            for grupo in range(grupos):
+                afinidade = posicao + inicio_afinidades + grupo * tamanho_afinidade
+                threads += bin(int.from_bytes(dados[afinidade:afinidade + tamanho_mascara], "little")).count("1")
+        elif relacao == RELACAO_SOQUETE:
+            soquetes += 1
+        if tamanho_registro <= 0:
+            break
+        posicao += tamanho_registro
+
+    # Híbridos: EfficiencyClass maior = núcleo de desempenho (P)
+    nucleos_p = nucleos_e = None
+    if len(set(classes)) > 1:
+        nucleos_p = classes.count(max(classes))
+        nucleos_e = nucleos - nucleos_p
+    return Topologia(nucleos, threads or os.cpu_count(), soquetes or 1, nucleos_p, nucleos_e)
+
+
+# ---------------------------------------------------------------------------
+# Coleta
+# ---------------------------------------------------------------------------
+
+def ler():
+    """Dicionário com marca, identificação, topologia e frequência do processador desta máquina."""
+    if sys.platform == "win32":
+        marca, fabricante_cpuid, familia, modelo, mhz = ler_registro_windows()
+        topologia = topologia_windows()
+    else:
+        marca, fabricante_cpuid, familia, modelo, mhz, topologia = ler_linux()
+    identificacao = identificar(marca, fabricante_cpuid, familia, modelo)
+    return {
+        "marca": " ".join((marca or "").split()) or None,
+        "fabricante_cpuid": fabricante_cpuid,
+        "identificacao": identificacao,
+        "topologia": topologia,
+        "mhz": mhz,
+    }
+
+
+def descrever_nucleos(topologia):
+    """"14 (6P + 8E)" em processadores híbridos; senão só o número."""
+    if topologia.nucleos_p is not None and topologia.nucleos_e:
+        return f"{topologia.nucleos} ({topologia.nucleos_p}P + {topologia.nucleos_e}E)"
+    return str(topologia.nucleos)
+
+
+def _tempos_cpu():
+    tempos = psutil.cpu_times()
+    ocioso = tempos.idle + getattr(tempos, "iowait", 0)
+    return sum(tempos), ocioso
+
+
+# A utilização é medida desde a importação do módulo: a coleta não precisa parar 1 s para amostrar.
+# Os tempos são guardados aqui em vez de usar psutil.cpu_percent(None), cujo estado é global.
+_inicio_utilizacao = time.monotonic()
+_tempos_iniciais = _tempos_cpu()
+
+
+def utilizacao():
+    """Utilização da CPU (%) desde a importação do módulo (no mínimo JANELA_UTILIZACAO segundos)."""
+    decorrido = time.monotonic() - _inicio_utilizacao
+    if decorrido < JANELA_UTILIZACAO:
+        time.sleep(JANELA_UTILIZACAO - decorrido)
+    total, ocioso = _tempos_cpu()
+    intervalo = total - _tempos_iniciais[0]
+    if intervalo <= 0:
+        return 0.0
+    return round(max(0.0, min(100.0, 100 * (1 - (ocioso - _tempos_iniciais[1]) / intervalo))), 1)
+
+
+def arquitetura():
+    maquina = platform.machine().lower()
+    if maquina in ("amd64", "x86_64", "arm64", "aarch64"):
+        return "64-bit"
+    if maquina in ("x86", "i386", "i686", "armv7l"):
+        return "32-bit"
+    return "N/A"
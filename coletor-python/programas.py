@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Inventário de programas instalados com leitura incremental.
+
+- Windows: chaves Uninstall do registro (HKLM nas visões de 64 e 32 bits e
+  HKCU). Cada subchave tem a data da última escrita: só as subchaves novas ou
+  alteradas desde a coleta anterior têm os valores lidos de novo.
+- Linux: arquivo de status do dpkg e banco do rpm. O dpkg só é interpretado de
+  novo quando o arquivo muda (mtime, tamanho, inode); o `rpm -qa` só roda
+  quando algum arquivo do banco muda.
+
+O resultado anterior fica num cache em arquivo (mesmo diretório do cache de
+saúde dos discos), então uma coleta sem instalações novas custa poucos
+milissegundos.
+
+A lista enviada ao servidor é compacta e sem repetições: cada programa é
+[nome, versão, índice do fabricante], os fabricantes aparecem uma única vez em
+`fabricantes` e `hash` identifica o conteúdo, para que o servidor ignore uma
+lista igual à que já tem.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import subprocess
+
+import saude_discos
+
+RAIZ_SISTEMA = os.environ.get("INVENTARIO_RAIZ_SISTEMA", "/")
+VERSAO_CACHE = 1
+TIMEOUT_RPM = 120   # segundos
+
+# Chave Uninstall (o mesmo caminho em HKLM e HKCU)
+CAMINHO_UNINSTALL = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+
+# Tipos de entrada do Uninstall que não são programas (atualizações do Windows e do Office)
+TIPOS_ATUALIZACAO = ("Update", "Hotfix", "Security Update", "Service Pack")
+
+
+def caminho_cache():
+    """Cache ao lado do cache de saúde dos discos."""
+    return os.path.join(os.path.dirname(saude_discos.caminho_cache()), "programas.json")
+
+
+def carregar_cache(caminho):
+    cache = saude_discos.carregar_cache(caminho)
+    return cache if cache.get("versao") == VERSAO_CACHE else {"versao": VERSAO_CACHE}
+
+
+def compactar(itens, fonte):
+    """Converte [(nome, versao, fabricante)] na estrutura enviada ao servidor."""
+    unicos = sorted({(nome.strip(), (versao or "").strip(), (fabricante or "").strip())
+                     for nome, versao, fabricante in itens if nome and nome.strip()})
+    fabricantes = sorted({fabricante for _, _, fabricante in unicos if fabricante})
+    indices = {fabricante: i for i, fabricante in enumerate(fabricantes)}
+    lista = [[nome, versao or None, indices.get(fabricante)] for nome, versao, fabricante in unicos]
+    conteudo = json.dumps([fabricantes, lista], ensure_ascii=False, separators=(",", ":"))
+    return {
+        "fonte": fonte,
+        "hash": hashlib.sha256(conteudo.encode("utf-8")).hexdigest(),
+        "fabricantes": fabricantes,
+        "itens": lista,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Windows (registro)
+# ---------------------------------------------------------------------------
+
+def _chaves_uninstall():
+    import winreg
+    return [
+        (winreg.HKEY_LOCAL_MACHINE, winreg.KEY_WOW64_64KEY, "HKLM64"),
+        (winreg.HKEY_LOCAL_MACHINE, winreg.KEY_WOW64_32KEY, "HKLM32"),
+        (winreg.HKEY_CURRENT_USER, 0, "HKCU"),
+    ]
+
+
+def _valor(chave, nome):
+    import winreg
+    try:
+        valor, _ = winreg.QueryValueEx(chave, nome)
+        return valor
+    except OSError:
+        return None
+
+
+def ler_entrada_uninstall(chave):
+    """(nome, versao, fabricante) de uma subchave Uninstall, ou None se não for um programa."""
+    nome = _valor(chave, "DisplayName")
+    if not isinstance(nome, str) or not nome.strip():
+        return None
+    # Componentes de sistema e atualizações de outro programa não aparecem em "Programas e Recursos"
+    if _valor(chave, "SystemComponent") == 1 or _valor(chave, "ParentKeyName"):
+        return None
+    if _valor(chave, "ReleaseType") in TIPOS_ATUALIZACAO:
+        return None
+    versao = _valor(chave, "DisplayVersion")
+    fabricante = _valor(chave, "Publisher")
+    return [nome, versao if isinstance(versao, str) else None,
+            fabricante if isinstance(fabricante, str) else None]
+
+
+def coletar_windows(cache):
+    """Lê as chaves Uninstall reaproveitando as subchaves sem escrita desde a coleta anterior."""
+    import winreg
+    anterior = cache.get("windows", {})
+    atual = {}
+    itens = []
+
+    for raiz, visao, rotulo in _chaves_uninstall():
+        subchaves_anteriores = anterior.get(rotulo, {})
+        subchaves = {}
+        try:
+            uninstall = winreg.OpenKey(raiz, CAMINHO_UNINSTALL, 0, winreg.KEY_READ | visao)
+        except OSError:
+            continue
+        with uninstall:
+            quantidade = winreg.QueryInfoKey(uninstall)[0]
+            for i in range(quantidade):
+                try:
+                    nome_subchave = winreg.EnumKey(uninstall, i)
+                    with winreg.OpenKey(uninstall, nome_subchave, 0, winreg.KEY_READ | visao) as subchave:
+                        # Última escrita em unidades de 100 ns desde 1601
+                        escrita = winreg.QueryInfoKey(subchave)[2]
+                        guardada = subchaves_anteriores.get(nome_subchave)
+                        if guardada and guardada[0] == escrita:
+                            entrada = guardada[1]
+                        else:
+                            entrada = ler_entrada_uninstall(subchave)
+                except OSError:
+                    continue   # subchave removida durante a leitura
+                subchaves[nome_subchave] = [escrita, entrada]
+                if entrada:
+                    itens.append(entrada)
+        atual[rotulo] = subchaves
+
+    cache["windows"] = atual
+    return itens
+
+
+# ---------------------------------------------------------------------------
+# Linux (dpkg / rpm)
+# ---------------------------------------------------------------------------
+
+def _assinatura(caminho):
+    """Identifica a versão de um arquivo sem lê-lo (None se não existir)."""
+    try:
+        estado = os.stat(caminho)
+    except OSError:
+        return None
+    return [estado.st_mtime_ns, estado.st_size, estado.st_ino]
+
+
+def interpretar_dpkg_status(linhas):
+    """Pacotes instalados de /var/lib/dpkg/status como [(nome, versao, mantenedor)]."""
+    itens = []
+    pacote = {}
+    for linha in list(linhas) + [""]:
+        linha = linha.rstrip("\n")
+        if not linha:
+            if pacote.get("Status", "").endswith(" installed") and pacote.get("Package"):
+                # "Ubuntu Developers <ubuntu-devel-discuss@...>" -> "Ubuntu Developers"
+                mantenedor = pacote.get("Maintainer", "").split("<")[0].strip() or None
+                itens.append([pacote["Package"], pacote.get("Version"), mantenedor])
+            pacote = {}
+        elif not linha[0].isspace() and ":" in linha:
+            campo, valor = linha.split(":", 1)
+            if campo in ("Package", "Status", "Version", "Maintainer"):
+                pacote[campo] = valor.strip()
+    return itens
+
+
+def coletar_dpkg(cache):
+    caminho = os.path.join(RAIZ_SISTEMA, "var", "lib", "dpkg", "status")
+    assinatura = _assinatura(caminho)
+    if assinatura is None:
+        cache.pop("dpkg", None)
+        return None
+
+    guardado = cache.get("dpkg")
+    if guardado and guardado.get("assinatura") == assinatura:
+        return guardado["itens"]
+
+    with open(caminho, encoding="utf-8", errors="replace") as arquivo:
+        itens = interpretar_dpkg_status(arquivo)
+    cache["dpkg"] = {"assinatura": assinatura, "itens": itens}
+    return itens
+
+
+def _assinatura_rpm():
+    """Assinatura de todos os arquivos do banco do rpm (rpmdb.sqlite, Packages, Packages.db...)."""
+    assinatura = []
+    for diretorio in (os.path.join(RAIZ_SISTEMA, "var", "lib", "rpm"),
+                      os.path.join(RAIZ_SISTEMA, "usr", "lib", "sysimage", "rpm")):
+        try:
+            entradas = sorted(os.scandir(diretorio), key=lambda entrada: entrada.name)
+        except OSError:
+            continue
+        for entrada in entradas:
+            if entrada.is_file(follow_symlinks=False):
+                estado = entrada.stat(follow_symlinks=False)
+                assinatura.append([entrada.path, estado.st_mtime_ns, estado.st_size])
+    return assinatura or None
+
+
+def coletar_rpm(cache):
+    assinatura = _assinatura_rpm()
+    if assinatura is None:
+        cache.pop("rpm", None)
+        return None
+
+    guardado = cache.get("rpm")
+    if guardado and guardado.get("assinatura") == assinatura:
+        return guardado["itens"]
+
+    try:
+        saida = subprocess.run(["rpm", "-qa", "--qf", "%{NAME}\t%{VERSION}-%{RELEASE}\t%{VENDOR}\n"],
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True, timeout=TIMEOUT_RPM, check=True).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Erro ao consultar o banco do rpm: {e}")
+        return None
+
+    itens = []
+    for linha in saida.splitlines():
+        partes = linha.split("\t")
+        if len(partes) == 3 and partes[0] != "gpg-pubkey":
+            itens.append([partes[0], partes[1], None if partes[2] == "(none)" else partes[2]])
+    cache["rpm"] = {"assinatura": assinatura, "itens": itens}
+    return itens
+
+
+def coletar_linux(cache):
+    """Pacotes do dpkg e do rpm. Retorna (itens, fonte)."""
+    itens = []
+    fontes = []
+    for fonte, coletar_fonte in (("dpkg", coletar_dpkg), ("rpm", coletar_rpm)):
+        encontrados = coletar_fonte(cache)
+        if encontrados:
+            itens.extend(encontrados)
+            fontes.append(fonte)
+    return itens, "+".join(fontes) or None
+
+
+def coletar(caminho=None):
+    """Lista compacta dos programas instalados nesta máquina (ver docstring do módulo)."""
+    caminho = caminho or caminho_cache()
+    cache = carregar_cache(caminho)
+    anterior = json.dumps(cache, sort_keys=True)
+
+    if sys.platform == "win32":
+        itens, fonte = coletar_windows(cache), "registro"
+    else:
+        itens, fonte = coletar_linux(cache)
+
+    # Sem mudança nas fontes o cache não é regravado
+    if json.dumps(cache, sort_keys=True) != anterior:
+        saude_discos.gravar_cache(caminho, cache, "programas instalados")
+    return compactar(itens, fonte)
+
+
+def resumo(programas):
+    """Texto curto para a janela do coletor ("1234 programas")."""
+    if not isinstance(programas, dict) or not programas.get("itens"):
+        return "Não disponível"
+    return f"{len(programas['itens'])} programas"
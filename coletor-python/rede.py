@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Requisições HTTP dos coletores com nova tentativa e backoff exponencial.
+
+Quando o servidor está saturado ele responde 429 (ou 503) com Retry-After.
+Os coletores esperam o tempo indicado, acrescido de uma variação aleatória
+(jitter), para que as máquinas de uma mesma secretaria não voltem todas no
+mesmo segundo.
+"""
+
+import time
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import requests
+
+STATUS_REPETIR = (429, 503)
+TENTATIVAS = 6
+ESPERA_BASE = 1.0       # segundos
+ESPERA_MAXIMA = 60.0    # segundos
+TEMPO_TOTAL_MAXIMO = 300.0
+
+
+def interpretar_retry_after(valor):
+    """Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos."""
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+        return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def calcular_espera(tentativa, retry_after=None, base=ESPERA_BASE, maximo=ESPERA_MAXIMA):
+    """Tempo de espera antes da próxima tentativa.
+
+    Sem Retry-After usa backoff exponencial com jitter completo
+    (uniforme entre 0 e base * 2^tentativa). Com Retry-After espera ao
+    menos o tempo pedido, mais até metade dele (ou da base) de jitter.
+    """
+    if retry_after is not None:
+        return min(maximo, retry_after + random.uniform(0, max(base, retry_after / 2)))
+    return random.uniform(0, min(maximo, base * (2 ** tentativa)))
+
+
+def requisitar_com_backoff(metodo, url, tentativas=TENTATIVAS, repetir_falha_conexao=True,
+                           tempo_total=TEMPO_TOTAL_MAXIMO, **kwargs):
+    """Executa `requests.request` repetindo em 429/503 e falhas de conexão.
+
+    Args:
+        metodo: 'GET', 'POST', ...
+        url: Endereço da requisição.
+        tentativas: Número máximo de tentativas.
+        repetir_falha_conexao: Repetir também em erros de conexão/timeout.
+            Para envios (POST) só são repetidos erros de conexão, nunca
+            timeouts de leitura, já que o servidor pode ter gravado os dados.
+        tempo_total: Limite (s) para a soma das esperas.
+        **kwargs: Repassados para requests.request (json, timeout, ...).
+
+    Retorna a última resposta recebida; se nenhuma resposta chegou,
+    relança a última exceção.
+    """
+    kwargs.setdefault("timeout", 10)
+    inicio = time.monotonic()
+    ultima_excecao = None
+
+    for tentativa in range(tentativas):
+        retry_after = None
+        try:
+            resposta = requests.request(metodo, url, **kwargs)
+            if resposta.status_code not in STATUS_REPETIR:
+                return resposta
+            retry_after = interpretar_retry_after(resposta.headers.get("Retry-After"))
+            ultima_excecao = None
+        except requests.exceptions.ReadTimeout as e:
+            if metodo.upper() != "GET" or not repetir_falha_conexao:
+                raise
+            ultima_excecao, resposta = e, None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if not repetir_falha_conexao:
+                raise
+            ultima_excecao, resposta = e, None
+
+        if tentativa == tentativas - 1:
+            break
+
+        espera = calcular_espera(tentativa, retry_after)
+        if time.monotonic() - inicio + espera > tempo_total:
+            break
+
+        motivo = f"código {resposta.status_code}" if resposta is not None else type(ultima_excecao).__name__
+        print(f"Servidor indisponível ({motivo}). Nova tentativa em {espera:.1f} s...")
+        time.sleep(espera)
+
+    if ultima_excecao is not None:
+        raise ultima_excecao
+    return resposta
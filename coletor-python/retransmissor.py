@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Retransmissor de unidade: recebe os coletores da rede local e envia ao servidor central em lotes.
+
+Unidades remotas (escolas, postos de saúde) falam com o servidor central por
+links lentos. O retransmissor atende os coletores com a mesma API do servidor:
+
+- GET  /api/verificar-cadastro/<nome>/<matricula>: respondido pelo cache local
+  de cadastros, sincronizado de forma incremental com `GET /api/cadastros`
+- POST /api/hardware-data e /api/hardware-data/snapshot: gravados numa fila
+  local (SQLite) e respondidos na hora
+- POST /api/utilizacao (modo agente) e GET /download/... (manifesto e
+  executáveis da atualização automática): encaminhados ao servidor central
+  na hora, com a resposta dele
+
+Uma thread envia a fila ao servidor central em lotes comprimidos (gzip) para
+`POST /api/hardware-data/lote` sempre que o link estiver disponível. Com isso
+as idas e voltas pela WAN deixam de ser duas por máquina e passam a ser
+algumas por unidade. Cada lote é limitado em registros e em bytes; um lote
+recusado pelo servidor (4xx) é dividido ao meio até isolar o registro
+responsável, que sai da fila para a tabela `recusados` sem travar os demais.
+
+Uso (nos coletores da unidade, INVENTARIO_SERVIDOR=http://<retransmissor>:3000):
+    python retransmissor.py --upstream http://servidor-central:3000
+"""
+
+import sys
+import gzip
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from urllib.parse import unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+import rede
+
+PORTA = 3000
+INTERVALO_ENVIO = 60            # segundos entre envios da fila
+INTERVALO_SINCRONIZACAO = 900   # segundos entre sincronizações de cadastros
+TAMANHO_LOTE = 200
+LIMITE_BYTES_LOTE = 4 * 1024 * 1024   # JSON antes do gzip; o servidor aceita até LIMITE_JSON (10 MB)
+MAXIMO_TENTATIVAS = 5           # registros com erro no servidor vão para `recusados` depois disso
+TIMEOUT_ENCAMINHAMENTO = 60     # segundos
+TAMANHO_BLOCO = 64 * 1024
+CAMPOS_OBRIGATORIOS = ("secretaria", "setor", "matricula", "usuarioLogado", "nomeCompleto", "nomeDispositivo")
+
+# Cabeçalhos repassados nas rotas encaminhadas ao servidor central
+CABECALHOS_PEDIDO = ("Content-Type", "Content-Encoding", "Accept-Encoding", "Range", "If-Range", "If-None-Match")
+CABECALHOS_RESPOSTA = ("Content-Type", "Content-Length", "Content-Encoding", "Content-Range", "Accept-Ranges",
+                       "ETag", "Cache-Control", "Vary", "Last-Modified", "Retry-After", "X-Coletor-Sha256")
+
+
+class Armazenamento:
+    """Fila de envio e cache de cadastros em SQLite (uma conexão compartilhada com trava)."""
+
+    def __init__(self, caminho):
+        self.trava = threading.Lock()
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS fila (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recebidoEm REAL NOT NULL,
+                payload TEXT NOT NULL,
+                tentativas INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS cadastros (
+                nomeDispositivo TEXT NOT NULL,
+                matricula TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_cadastros_nome ON cadastros (nomeDispositivo);
+            CREATE INDEX IF NOT EXISTS idx_cadastros_matricula ON cadastros (matricula);
+            CREATE TABLE IF NOT EXISTS estado (chave TEXT PRIMARY KEY, valor TEXT);
+            CREATE TABLE IF NOT EXISTS recusados (
+                id INTEGER PRIMARY KEY,
+                recebidoEm REAL NOT NULL,
+                recusadoEm REAL NOT NULL,
+                status INTEGER NOT NULL,
+                motivo TEXT,
+                payload TEXT NOT NULL
+            );
+        """)
+        self.conexao.commit()
+
+    def enfileirar(self, payload):
+        with self.trava:
+            self.conexao.execute("INSERT INTO fila (recebidoEm, payload) VALUES (?, ?)",
+                                 (time.time(), json.dumps(payload, ensure_ascii=False)))
+            self.conexao.commit()
+
+    def proximos(self, limite, limite_bytes=LIMITE_BYTES_LOTE):
+        """Registros mais antigos da fila, até `limite` registros ou `limite_bytes` (ao menos um)."""
+        with self.trava:
+            linhas = self.conexao.execute(
+                "SELECT id, payload, tentativas FROM fila ORDER BY id LIMIT ?", (limite,)).fetchall()
+        selecionadas, total = [], 0
+        for linha in linhas:
+            total += len(linha[1].encode("utf-8"))
+            if selecionadas and total > limite_bytes:
+                break
+            selecionadas.append(linha)
+        return selecionadas
+
+    def pendentes(self):
+        with self.trava:
+            return self.conexao.execute("SELECT COUNT(*) FROM fila").fetchone()[0]
+
+    def recusar(self, id_fila, status, motivo):
+        """Tira da fila um registro que o servidor central não aceita, guardando-o para análise."""
+        with self.trava:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO recusados (id, recebidoEm, recusadoEm, status, motivo, payload) "
+                "SELECT id, recebidoEm, ?, ?, ?, payload FROM fila WHERE id = ?",
+                (time.time(), status, motivo, id_fila))
+            self.conexao.execute("DELETE FROM fila WHERE id = ?", (id_fila,))
+            self.conexao.commit()
+
+    def recusados(self):
+        with self.trava:
+            return self.conexao.execute("SELECT COUNT(*) FROM recusados").fetchone()[0]
+
+    def concluir(self, ids_removidos, ids_com_erro):
+        with self.trava:
+            self.conexao.executemany("DELETE FROM fila WHERE id = ?", [(i,) for i in ids_removidos])
+            self.conexao.executemany("UPDATE fila SET tentativas = tentativas + 1 WHERE id = ?",
+                                     [(i,) for i in ids_com_erro])
+            self.conexao.commit()
+
+    def adicionar_cadastros(self, cadastros):
+        with self.trava:
+            self.conexao.executemany("INSERT INTO cadastros (nomeDispositivo, matricula) VALUES (?, ?)",
+                                     [(c["nomeDispositivo"], c.get("matricula")) for c in cadastros])
+            self.conexao.commit()
+
+    def verificar(self, nome_dispositivo, matricula):
+        with self.trava:
+            maquina = self.conexao.execute(
+                "SELECT 1 FROM cadastros WHERE nomeDispositivo = ? LIMIT 1", (nome_dispositivo,)).fetchone()
+            mat = self.conexao.execute(
+                "SELECT 1 FROM cadastros WHERE matricula = ? LIMIT 1", (matricula,)).fetchone()
+        return maquina is not None, mat is not None
+
+    def obter_estado(self, chave, padrao=None):
+        with self.trava:
+            linha = self.conexao.execute("SELECT valor FROM estado WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha else padrao
+
+    def gravar_estado(self, chave, valor):
+        with self.trava:
+            self.conexao.execute("INSERT OR REPLACE INTO estado (chave, valor) VALUES (?, ?)", (chave, str(valor)))
+            self.conexao.commit()
+
+
+def sincronizar_cadastros(armazenamento, upstream):
+    """Baixa do servidor central os cadastros novos desde a última sincronização."""
+    desde = int(armazenamento.obter_estado("ultimoCadastro", 0))
+    total = 0
+    while True:
+        resposta = rede.requisitar_com_backoff(
+            "GET", f"{upstream}/api/cadastros", params={"desde": desde}, timeout=60, tempo_total=60)
+        if resposta.status_code != 200:
+            print(f"Erro ao sincronizar cadastros. Código: {resposta.status_code}")
+            return total
+        dados = resposta.json().get("data", [])
+        if not dados:
+            return total
+        armazenamento.adicionar_cadastros(dados)
+        desde = dados[-1]["id"]
+        armazenamento.gravar_estado("ultimoCadastro", desde)
+        total += len(dados)
+
+
+def _motivo(resposta):
+    try:
+        return str(resposta.json().get("message"))[:500]
+    except ValueError:
+        return resposta.text[:500]
+
+
+def enviar_linhas(armazenamento, upstream, linhas):
+    """Envia as linhas num lote. Retorna quantos registros saíram da fila.
+
+    Um lote recusado com 4xx (ex.: 413 por tamanho, 400) é dividido ao meio e
+    reenviado; um registro recusado sozinho vai para `recusados`. Com 5xx ou
+    429 o lote fica na fila para o próximo ciclo.
+    """
+    corpo = gzip.compress(json.dumps({"registros": [json.loads(l[1]) for l in linhas]}).encode("utf-8"))
+    resposta = rede.requisitar_com_backoff(
+        "POST", f"{upstream}/api/hardware-data/lote", data=corpo, timeout=120, tempo_total=60,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+
+    if 400 <= resposta.status_code < 500 and resposta.status_code not in rede.STATUS_REPETIR:
+        if len(linhas) > 1:
+            meio = len(linhas) // 2
+            return (enviar_linhas(armazenamento, upstream, linhas[:meio]) +
+                    enviar_linhas(armazenamento, upstream, linhas[meio:]))
+        motivo = _motivo(resposta)
+        print(f"Registro {linhas[0][0]} recusado pelo servidor central ({resposta.status_code}: {motivo}).")
+        armazenamento.recusar(linhas[0][0], resposta.status_code, motivo)
+        return 1
+
+    if resposta.status_code != 200:
+        print(f"Erro ao enviar lote ao servidor central. Código: {resposta.status_code}")
+        return 0
+
+    removidos, com_erro, recusados = [], [], []
+    for (id_fila, _, tentativas), item in zip(linhas, resposta.json().get("resultados", [])):
+        situacao = item.get("situacao")
+        if situacao == "pendente":
+            # Cadastro ainda no diário de ingestão do servidor: fica na fila, sem contar tentativa
+            continue
+        if situacao == "erro" and tentativas + 1 < MAXIMO_TENTATIVAS:
+            com_erro.append(id_fila)
+        elif situacao == "erro":
+            recusados.append((id_fila, f"erro no servidor central após {MAXIMO_TENTATIVAS} tentativas"))
+        elif situacao == "incompleto":
+            recusados.append((id_fila, "incompleto"))
+        else:
+            removidos.append(id_fila)
+    armazenamento.concluir(removidos, com_erro)
+    for id_fila, motivo in recusados:
+        armazenamento.recusar(id_fila, resposta.status_code, motivo)
+    if recusados:
+        print(f"{len(recusados)} registro(s) do lote recusados pelo servidor central (tabela recusados).")
+    return len(removidos) + len(recusados)
+
+
+def enviar_fila(armazenamento, upstream, tamanho_lote=TAMANHO_LOTE, limite_bytes=LIMITE_BYTES_LOTE):
+    """Envia um lote da fila ao servidor central. Retorna quantos registros saíram da fila."""
+    linhas = armazenamento.proximos(tamanho_lote, limite_bytes)
+    if not linhas:
+        return 0
+    return enviar_linhas(armazenamento, upstream, linhas)
+
+
+def laco_envio(armazenamento, upstream, intervalo_envio, intervalo_sincronizacao, parar):
+    """Thread de fundo: sincroniza cadastros e esvazia a fila quando o link permite."""
+    proxima_sincronizacao = 0
+    while not parar.is_set():
+        try:
+            if time.monotonic() >= proxima_sincronizacao:
+                novos = sincronizar_cadastros(armazenamento, upstream)
+                if novos:
+                    print(f"{novos} cadastros sincronizados com o servidor central.")
+                proxima_sincronizacao = time.monotonic() + intervalo_sincronizacao
+
+            while enviar_fila(armazenamento, upstream):
+                print(f"Lote enviado. Pendentes: {armazenamento.pendentes()}")
+        except requests.exceptions.RequestException as e:
+            print(f"Servidor central indisponível ({type(e).__name__}). Nova tentativa em {intervalo_envio} s.")
+        except Exception as e:
+            print(f"Erro no envio ao servidor central: {e}")
+        parar.wait(intervalo_envio)
+
+
+def criar_manipulador(armazenamento, upstream):
+    class Manipulador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def encaminhar(self, metodo, corpo=None):
+            """Repassa a requisição ao servidor central e devolve a resposta dele em fluxo, sem descomprimir."""
+            cabecalhos = {nome: self.headers[nome] for nome in CABECALHOS_PEDIDO if self.headers.get(nome)}
+            # Sem Accept-Encoding explícito o requests pediria gzip por conta própria
+            cabecalhos.setdefault("Accept-Encoding", "identity")
+            try:
+                resposta = requests.request(metodo, f"{upstream}{self.path}", data=corpo, headers=cabecalhos,
+                                            stream=True, timeout=TIMEOUT_ENCAMINHAMENTO)
+            except requests.exceptions.RequestException as e:
+                print(f"Servidor central indisponível para {self.path} ({type(e).__name__}).")
+                self.responder(503, {"success": False, "message": "Servidor central indisponível."},
+                               {"Retry-After": "60"})
+                return
+
+            with resposta:
+                self.send_response(resposta.status_code)
+                for nome in CABECALHOS_RESPOSTA:
+                    if nome in resposta.headers:
+                        self.send_header(nome, resposta.headers[nome])
+                # Sem tamanho conhecido, o fim da resposta é o fim da conexão
+                if "Content-Length" not in resposta.headers:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.end_headers()
+                for bloco in resposta.raw.stream(TAMANHO_BLOCO, decode_content=False):
+                    self.wfile.write(bloco)
+
+        def responder(self, status, dados, cabecalhos=None):
+            corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            for nome, valor in (cabecalhos or {}).items():
+                self.send_header(nome, valor)
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def ler_json(self):
+            tamanho = int(self.headers.get("Content-Length") or 0)
+            corpo = self.rfile.read(tamanho) if tamanho else b""
+            if self.headers.get("Content-Encoding") == "gzip":
+                corpo = gzip.decompress(corpo)
+            return json.loads(corpo or b"{}")
+
+        def do_GET(self):
+            partes = self.path.split("?")[0].strip("/").split("/")
+            if len(partes) == 4 and partes[:2] == ["api", "verificar-cadastro"]:
+                maquina, matricula = armazenamento.verificar(unquote(partes[2]), unquote(partes[3]))
+                return self.responder(200, {
+                    "maquinaExiste": maquina,
+                    "matriculaExiste": matricula,
+                    "jaExiste": maquina or matricula
+                })
+            if partes == ["saude"]:
+                return self.responder(200, {
+                    "success": True,
+                    "pendentes": armazenamento.pendentes(),
+                    "recusados": armazenamento.recusados()
+                })
+            if partes[0] == "download":
+                return self.encaminhar("GET")
+            self.responder(404, {"success": False, "message": "Rota não disponível no retransmissor."})
+
+        def do_POST(self):
+            caminho = self.path.split("?")[0].rstrip("/")
+            if caminho == "/api/utilizacao":
+                tamanho = int(self.headers.get("Content-Length") or 0)
+                return self.encaminhar("POST", self.rfile.read(tamanho) if tamanho else b"")
+            try:
+                dados = self.ler_json()
+            except (ValueError, OSError):
+                return self.responder(400, {"success": False, "message": "JSON inválido."})
+            if not isinstance(dados, dict):
+                return self.responder(400, {"success": False, "message": "JSON inválido."})
+
+            if caminho == "/api/hardware-data":
+                if not all(dados.get(campo) for campo in CAMPOS_OBRIGATORIOS):
+                    return self.responder(400, {
+                        "success": False,
+                        "message": "Dados incompletos. Todos os campos são obrigatórios."
+                    })
+                armazenamento.enfileirar(dados)
+                armazenamento.adicionar_cadastros([dados])
+                return self.responder(201, {
+                    "success": True,
+                    "message": "Dados de hardware registrados com sucesso!",
+                    "enfileirado": True
+                })
+
+            if caminho == "/api/hardware-data/snapshot":
+                if not dados.get("nomeDispositivo"):
+                    return self.responder(400, {"success": False, "message": "nomeDispositivo é obrigatório."})
+                armazenamento.enfileirar(dados)
+                return self.responder(200, {
+                    "success": True,
+                    "alterado": False,
+                    "enfileirado": True,
+                    "message": "Coleta enfileirada para envio ao servidor central."
+                })
+
+            self.responder(404, {"success": False, "message": "Rota não disponível no retransmissor."})
+
+        def log_message(self, formato, *args):
+            pass
+
+    return Manipulador
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retransmissor de unidade para o inventário de hardware")
+    parser.add_argument("--upstream", required=True, help="URL do servidor central (ex.: http://servidor:3000)")
+    parser.add_argument("--porta", type=int, default=PORTA, help=f"Porta local (padrão: {PORTA})")
+    parser.add_argument("--banco", default="retransmissor.db", help="Arquivo SQLite da fila e do cache")
+    parser.add_argument("--intervalo-envio", type=float, default=INTERVALO_ENVIO, metavar="SEGUNDOS")
+    parser.add_argument("--intervalo-sincronizacao", type=float, default=INTERVALO_SINCRONIZACAO, metavar="SEGUNDOS")
+    args = parser.parse_args()
+
+    upstream = args.upstream.rstrip("/")
+    armazenamento = Armazenamento(args.banco)
+    parar = threading.Event()
+    envio = threading.Thread(target=laco_envio, daemon=True,
+                             args=(armazenamento, upstream, args.intervalo_envio,
+                                   args.intervalo_sincronizacao, parar))
+    envio.start()
+
+    servidor = ThreadingHTTPServer(("0.0.0.0", args.porta), criar_manipulador(armazenamento, upstream))
+    print(f"Retransmissor na porta {args.porta}, encaminhando para {upstream}")
+    print(f"Registros pendentes na fila: {armazenamento.pendentes()}")
+    recusados = armazenamento.recusados()
+    if recusados:
+        print(f"Registros recusados pelo servidor central (tabela recusados): {recusados}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando o retransmissor...")
+    finally:
+        parar.set()
+        servidor.server_close()
+        envio.join(timeout=5)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
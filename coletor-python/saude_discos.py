@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Saúde dos discos (SMART / NVMe) para prever falhas na frota.
+
+Para cada disco físico são lidos o resultado do autoteste SMART, as horas
+ligado, a temperatura, os setores realocados e pendentes, os erros
+incorrigíveis e, em NVMe, o desgaste e o aviso crítico do log de saúde.
+
+- Linux: `smartctl -j -a -n standby` (smartmontools 7+, via `sudo -n`), um
+  subprocesso por disco, todos ao mesmo tempo. Com `-n standby` um HDD em
+  repouso não é acordado: vale a última leitura guardada.
+- Windows: MSFT_StorageReliabilityCounter e MSFT_PhysicalDisk (Storage
+  Management) mais MSStorageDriver_FailurePredictStatus (root\\wmi). Cada
+  consulta WMI devolve todos os discos de uma vez.
+
+As leituras ficam num cache em arquivo com validade (INVENTARIO_TTL_SAUDE_DISCOS,
+em segundos, padrão 6 h): coletas repetidas dentro do prazo não consultam os
+discos de novo.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import blocos
+
+TTL_PADRAO = int(os.environ.get("INVENTARIO_TTL_SAUDE_DISCOS", 6 * 3600))
+TIMEOUT_SMARTCTL = 60   # segundos por disco
+MAXIMO_SIMULTANEOS = 16
+
+# Atributos SMART de ATA usados na previsão de falha (id -> campo do payload)
+ATRIBUTOS_ATA = {
+    5: "setoresRealocados",      # Reallocated_Sector_Ct
+    187: "errosIncorrigiveis",   # Reported_Uncorrect
+    197: "setoresPendentes",     # Current_Pending_Sector
+    198: "setoresIncorrigiveis", # Offline_Uncorrectable
+}
+
+# Bit 1 do código de saída do smartctl: dispositivo não aberto ou, com -n, em modo de economia
+SMARTCTL_NAO_ABERTO = 0x02
+
+
+def caminho_cache():
+    """Arquivo de cache do usuário (LOCALAPPDATA no Windows, XDG_CACHE_HOME no Linux)."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "inventario", "saude_discos.json")
+
+
+def carregar_cache(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            cache = json.load(arquivo)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def gravar_cache(caminho, cache, descricao="saúde dos discos"):
+    """Grava o cache de forma atômica; falhas (disco somente leitura, permissão) são ignoradas."""
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(cache, arquivo, ensure_ascii=False)
+        os.replace(temporario, caminho)
+    except OSError as e:
+        print(f"Não foi possível gravar o cache de {descricao}: {e}")
+
+
+def _valido(entrada, agora, ttl):
+    return isinstance(entrada, dict) and agora - entrada.get("lidoEm", 0) < ttl
+
+
+def avaliar(disco):
+    """Classifica o disco em "falha", "atencao" ou "ok" e devolve (situacao, motivos)."""
+    motivos = []
+    if disco.get("aprovado") is False:
+        return "falha", ["autoteste SMART reprovado"]
+    if disco.get("avisoCritico"):
+        motivos.append(f"aviso crítico NVMe {disco['avisoCritico']}")
+    for campo, descricao in (("setoresRealocados", "setores realocados"),
+                             ("setoresPendentes", "setores pendentes"),
+                             ("setoresIncorrigiveis", "setores incorrigíveis"),
+                             ("errosIncorrigiveis", "erros incorrigíveis"),
+                             ("errosMidia", "erros de mídia")):
+        if (disco.get(campo) or 0) > 0:
+            motivos.append(f"{disco[campo]} {descricao}")
+    if (disco.get("desgastePct") or 0) >= 90:
+        motivos.append(f"desgaste de {disco['desgastePct']}%")
+    return ("atencao" if motivos else "ok"), motivos
+
+
+def resumo(discos):
+    """Texto curto para a janela do coletor ("2 ok, 1 atenção")."""
+    if not discos:
+        return "Não disponível"
+    contagem = {}
+    for disco in discos:
+        contagem[disco.get("situacao", "ok")] = contagem.get(disco.get("situacao", "ok"), 0) + 1
+    nomes = {"ok": "ok", "atencao": "atenção", "falha": "falha", "desconhecida": "sem leitura"}
+    return ", ".join(f"{quantidade} {nomes.get(situacao, situacao)}" for situacao, quantidade in sorted(contagem.items()))
+
+
+# ---------------------------------------------------------------------------
+# Linux (smartctl)
+# ---------------------------------------------------------------------------
+
+def listar_discos_linux():
+    """Nomes dos discos físicos (sda, nvme0n1), sem loop, rom e zram."""
+    saida = subprocess.check_output(["lsblk", "-d", "-P", "-o", "NAME,TYPE"], text=True)
+    return [disco["NAME"] for disco in blocos.pares(saida)
+            if disco.get("TYPE") == "disk" and not disco.get("NAME", "").startswith("zram")]
+
+
+def interpretar_smartctl(relatorio):
+    """Converte o JSON do `smartctl -j -a` nos campos enviados ao servidor."""
+    dispositivo = relatorio.get("device", {})
+    disco = {
+        "modelo": relatorio.get("model_name") or relatorio.get("model_family"),
+        "serie": relatorio.get("serial_number"),
+        "protocolo": dispositivo.get("protocol"),
+        "tipo": None,
+        "aprovado": relatorio.get("smart_status", {}).get("passed"),
+        "horasLigado": relatorio.get("power_on_time", {}).get("hours"),
+        "temperatura": relatorio.get("temperature", {}).get("current"),
+    }
+
+    rotacao = relatorio.get("rotation_rate")
+    if dispositivo.get("protocol") == "NVMe":
+        disco["tipo"] = "NVMe"
+    elif rotacao is not None:
+        disco["tipo"] = "HDD" if rotacao > 0 else "SSD"
+
+    for atributo in relatorio.get("ata_smart_attributes", {}).get("table", []):
+        campo = ATRIBUTOS_ATA.get(atributo.get("id"))
+        if campo:
+            disco[campo] = atributo.get("raw", {}).get("value")
+
+    saude_nvme = relatorio.get("nvme_smart_health_information_log")
+    if saude_nvme:
+        disco["desgastePct"] = saude_nvme.get("percentage_used")
+        disco["errosMidia"] = saude_nvme.get("media_errors")
+        disco["avisoCritico"] = saude_nvme.get("critical_warning")
+        disco["reservaDisponivelPct"] = saude_nvme.get("available_spare")
+        if disco["horasLigado"] is None:
+            disco["horasLigado"] = saude_nvme.get("power_on_hours")
+    return disco
+
+
+def consultar_smartctl(nome):
+    """Lê um disco. Devolve (dados, em_repouso); dados é None quando não há leitura."""
+    comando = ["sudo", "-n", "smartctl", "-j", "-a", "-n", "standby", f"/dev/{nome}"]
+    try:
+        processo = subprocess.run(comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                  text=True, timeout=TIMEOUT_SMARTCTL)
+        relatorio = json.loads(processo.stdout or "{}")
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        print(f"Erro ao consultar SMART de /dev/{nome}: {e}")
+        return None, False
+
+    if "smartctl" not in relatorio:
+        return None, False   # sem sudo sem senha ou smartmontools anterior à 7.0 (sem -j)
+
+    mensagens = " ".join(m.get("string", "") for m in relatorio["smartctl"].get("messages", []))
+    if processo.returncode & SMARTCTL_NAO_ABERTO:
+        return None, "STANDBY" in mensagens.upper() or "SLEEP" in mensagens.upper()
+    return interpretar_smartctl(relatorio), False
+
+
+def coletar_linux(ttl=TTL_PADRAO, caminho=None):
+    caminho = caminho or caminho_cache()
+    cache = carregar_cache(caminho)
+    agora = time.time()
+
+    nomes = listar_discos_linux()
+    pendentes = [nome for nome in nomes if not _valido(cache.get(nome), agora, ttl)]
+    if pendentes:
+        with ThreadPoolExecutor(max_workers=min(len(pendentes), MAXIMO_SIMULTANEOS)) as executor:
+            leituras = dict(zip(pendentes, executor.map(consultar_smartctl, pendentes)))
+        for nome, (dados, em_repouso) in leituras.items():
+            if dados is not None:
+                cache[nome] = {"lidoEm": agora, "dados": dados}
+            elif em_repouso:
+                # Mantém a última leitura, se houver; a validade não é renovada
+                cache.setdefault(nome, {"lidoEm": 0, "dados": None})["emRepouso"] = True
+        gravar_cache(caminho, cache)
+
+    return [_montar(nome, cache.get(nome)) for nome in nomes]
+
+
+# ---------------------------------------------------------------------------
+# Windows (WMI)
+# ---------------------------------------------------------------------------
+
+def _consultar_wmi(namespace, classe):
+    import wmi
+    import wql
+    return wql.consultar(wmi.WMI(namespace=namespace), "saude_discos", classe)
+
+
+def coletar_windows(ttl=TTL_PADRAO, caminho=None):
+    caminho = caminho or caminho_cache()
+    cache = carregar_cache(caminho)
+    agora = time.time()
+
+    if cache and all(_valido(entrada, agora, ttl) for entrada in cache.values()):
+        return [_montar(nome, entrada) for nome, entrada in sorted(cache.items())]
+
+    discos = {}
+    for disco in _consultar_wmi(r"root\Microsoft\Windows\Storage", "MSFT_PhysicalDisk"):
+        tipo = {3: "HDD", 4: "SSD"}.get(disco.MediaType)
+        if disco.BusType == 17:   # NVMe
+            tipo = "NVMe"
+        discos[str(disco.DeviceId)] = {
+            "modelo": (disco.FriendlyName or "").strip() or None,
+            "serie": (disco.SerialNumber or "").strip() or None,
+            "protocolo": {17: "NVMe", 11: "ATA", 8: "RAID", 7: "USB"}.get(disco.BusType),
+            "tipo": tipo,
+            "aprovado": None if disco.HealthStatus is None else disco.HealthStatus != 2,  # 2 = Unhealthy
+        }
+
+    try:
+        for contador in _consultar_wmi(r"root\Microsoft\Windows\Storage", "MSFT_StorageReliabilityCounter"):
+            disco = discos.get(str(contador.DeviceId))
+            if disco is None:
+                continue
+            disco["horasLigado"] = contador.PowerOnHours
+            disco["temperatura"] = contador.Temperature
+            disco["desgastePct"] = contador.Wear
+            disco["errosIncorrigiveis"] = contador.ReadErrorsUncorrected
+    except Exception as e:
+        # Contadores de confiabilidade exigem administrador
+        print(f"Contadores de confiabilidade dos discos indisponíveis: {e}")
+
+    try:
+        # Previsão de falha do próprio firmware (somente discos ATA com SMART). A instância traz o
+        # modelo no identificador do dispositivo ("...&Prod_ST1000DM010-2EP1\...", com "_" no lugar de espaço).
+        for status in _consultar_wmi(r"root\wmi", "MSStorageDriver_FailurePredictStatus"):
+            if not status.PredictFailure:
+                continue
+            instancia = (status.InstanceName or "").upper()
+            for disco in discos.values():
+                modelo = (disco["modelo"] or "").upper().replace(" ", "_")[:16]
+                if modelo and modelo in instancia:
+                    disco["aprovado"] = False
+    except Exception as e:
+        print(f"Previsão de falha SMART indisponível: {e}")
+
+    cache = {f"disco{id_disco}": {"lidoEm": agora, "dados": dados} for id_disco, dados in discos.items()}
+    gravar_cache(caminho, cache)
+    return [_montar(nome, entrada) for nome, entrada in sorted(cache.items())]
+
+
+def _montar(nome, entrada):
+    """Item do payload: dados da leitura (ou só o nome), idade da leitura e situação."""
+    if not entrada or not entrada.get("dados"):
+        if entrada and entrada.get("emRepouso"):
+            return {"dispositivo": nome, "emRepouso": True, "situacao": "desconhecida",
+                    "motivos": ["em repouso, sem leitura anterior"]}
+        return {"dispositivo": nome, "situacao": "desconhecida", "motivos": ["sem leitura SMART"]}
+    disco = {"dispositivo": nome, **entrada["dados"]}
+    disco["idadeLeitura"] = int(time.time() - entrada.get("lidoEm", 0))
+    if entrada.get("emRepouso"):
+        disco["emRepouso"] = True
+    disco["situacao"], disco["motivos"] = avaliar(disco)
+    return disco
+
+
+def coletar(ttl=TTL_PADRAO):
+    """Lista a saúde de cada disco físico desta máquina."""
+    if sys.platform == "win32":
+        return coletar_windows(ttl)
+    return coletar_linux(ttl)
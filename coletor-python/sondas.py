@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Registro de sondas de hardware compartilhado pelos coletores.
+
+Cada sonda declara o nome, a chave que preenche no payload enviado ao
+servidor, a plataforma em que roda, a classe de custo e as dependências.
+A partir do registro é possível executar apenas o subconjunto pedido
+(`--only cpu,ram`, `--skip monitores`) junto com as dependências mínimas.
+"""
+
+import platform
+from contextlib import nullcontext
+
+# Plataformas aceitas (mesmos valores de platform.system())
+TODAS_PLATAFORMAS = "Todas"
+
+# Classes de custo
+ESTATICA = "estatica"    # muda raramente (modelo, capacidade)
+DINAMICA = "dinamica"    # muda a cada execução (utilização, espaço livre)
+BARATA = "barata"        # resolvida em milissegundos
+CARA = "cara"            # envolve WMI, PowerShell ou subprocessos lentos
+
+# Chaves do payload exigidas para cadastrar uma máquina nova no servidor
+CHAVES_CADASTRO = ("processador", "disco", "ram")
+
+
+def criar_sonda(nome, funcao, chave=None, plataforma=TODAS_PLATAFORMAS,
+                tipo=DINAMICA, custo=BARATA, dependencias=(), apelidos=()):
+    """Cria a descrição de uma sonda.
+
+    Sondas sem `chave` são internas: não aparecem no payload e só rodam
+    quando alguma sonda selecionada depende delas. O resultado de cada
+    dependência é passado à função da sonda como argumento nomeado.
+    """
+    return {
+        "nome": nome,
+        "funcao": funcao,
+        "chave": chave,
+        "plataforma": plataforma,
+        "tipo": tipo,
+        "custo": custo,
+        "dependencias": tuple(dependencias),
+        "apelidos": tuple(apelidos),
+    }
+
+
+def criar_registro(sondas):
+    """Monta o registro (dicionário nome -> sonda) validando as dependências."""
+    registro = {}
+    for sonda in sondas:
+        if sonda["nome"] in registro:
+            raise ValueError(f"Sonda duplicada: {sonda['nome']}")
+        registro[sonda["nome"]] = sonda
+
+    for sonda in registro.values():
+        for dependencia in sonda["dependencias"]:
+            if dependencia not in registro:
+                raise ValueError(f"Sonda '{sonda['nome']}' depende de sonda inexistente: {dependencia}")
+
+    return registro
+
+
+def interpretar_lista(valor):
+    """Converte 'cpu, ram' em ['cpu', 'ram']."""
+    if not valor:
+        return []
+    return [item.strip() for item in valor.split(",") if item.strip()]
+
+
+def _suportada(sonda, sistema):
+    return sonda["plataforma"] in (TODAS_PLATAFORMAS, sistema)
+
+
+def _resolver_nome(registro, nome):
+    """Aceita o nome da sonda, a chave do payload ou um apelido."""
+    nome_normalizado = nome.strip().lower()
+    for sonda in registro.values():
+        nomes = {sonda["nome"].lower()} | {apelido.lower() for apelido in sonda["apelidos"]}
+        if sonda["chave"]:
+            nomes.add(sonda["chave"].lower())
+        if nome_normalizado in nomes:
+            return sonda["nome"]
+
+    disponiveis = ", ".join(sorted(s["nome"] for s in registro.values() if s["chave"]))
+    raise ValueError(f"Sonda desconhecida: '{nome}'. Disponíveis: {disponiveis}")
+
+
+def resolver_sondas(registro, apenas=None, ignorar=None, sistema=None):
+    """Retorna, em ordem de execução, o grafo mínimo de sondas a executar.
+
+    Args:
+        registro: Registro criado por `criar_registro`.
+        apenas: Nomes/apelidos a executar (None ou vazio = todas).
+        ignorar: Nomes/apelidos a pular.
+        sistema: Plataforma alvo (padrão: platform.system()).
+    """
+    sistema = sistema or platform.system()
+
+    if apenas:
+        selecionadas = [_resolver_nome(registro, nome) for nome in apenas]
+    else:
+        selecionadas = [s["nome"] for s in registro.values() if s["chave"]]
+
+    ignoradas = {_resolver_nome(registro, nome) for nome in (ignorar or [])}
+    selecionadas = [nome for nome in selecionadas
+                    if nome not in ignoradas and _suportada(registro[nome], sistema)]
+
+    # Ordenação topológica (dependências antes de quem depende delas)
+    ordem = []
+    visitando = set()
+
+    def visitar(nome):
+        # Dependências de outra plataforma ficam de fora; a sonda recebe None
+        if nome in ordem or not _suportada(registro[nome], sistema):
+            return
+        if nome in visitando:
+            raise ValueError(f"Dependência circular envolvendo a sonda '{nome}'")
+        visitando.add(nome)
+        for dependencia in registro[nome]["dependencias"]:
+            visitar(dependencia)
+        visitando.discard(nome)
+        ordem.append(nome)
+
+    for nome in selecionadas:
+        visitar(nome)
+
+    return ordem
+
+
+def executar_sondas(registro, apenas=None, ignorar=None, sistema=None, perfil=None):
+    """Executa o grafo mínimo de sondas e retorna o payload com as chaves coletadas.
+
+    Com `perfil` (ver perfil.py), cada sonda é medida individualmente.
+    """
+    resultados = {}
+    dados = {}
+
+    for nome in resolver_sondas(registro, apenas, ignorar, sistema):
+        sonda = registro[nome]
+        argumentos = {dependencia: resultados.get(dependencia) for dependencia in sonda["dependencias"]}
+        medicao = perfil.medir_sonda(nome) if perfil else nullcontext()
+        try:
+            with medicao:
+                resultados[nome] = sonda["funcao"](**argumentos)
+        except Exception as e:
+            print(f"Erro ao executar a sonda '{nome}': {e}")
+            resultados[nome] = f"Erro ao executar a sonda {nome}" if sonda["chave"] else None
+
+        if sonda["chave"]:
+            dados[sonda["chave"]] = resultados[nome]
+
+    return dados
+
+
+def chaves_ausentes(dados):
+    """Chaves de CHAVES_CADASTRO que uma coleta parcial (--only/--skip) não preencheu."""
+    return [chave for chave in CHAVES_CADASTRO if not isinstance(dados.get(chave), str)]
+
+
+def listar_sondas(registro, sistema=None):
+    """Texto com as sondas disponíveis, plataforma, custo e dependências."""
+    sistema = sistema or platform.system()
+    linhas = []
+    for sonda in registro.values():
+        if not sonda["chave"]:
+            continue
+        marcador = "" if _suportada(sonda, sistema) else " (indisponível nesta plataforma)"
+        apelidos = f" [{', '.join(sonda['apelidos'])}]" if sonda["apelidos"] else ""
+        dependencias = ", ".join(sonda["dependencias"]) or "-"
+        linhas.append(
+            f"{sonda['nome']}{apelidos}: {sonda['tipo']}/{sonda['custo']}, "
+            f"plataforma {sonda['plataforma']}, dependências: {dependencias}{marcador}"
+        )
+    return "\n".join(linhas)
+
+
+def adicionar_argumentos(parser):
+    """Adiciona as opções de seleção de sondas a um argparse.ArgumentParser."""
+    parser.add_argument("--only", dest="apenas", type=interpretar_lista, default=[],
+                        metavar="SONDAS", help="Executa apenas as sondas indicadas (ex.: cpu,ram)")
+    parser.add_argument("--skip", dest="ignorar", type=interpretar_lista, default=[],
+                        metavar="SONDAS", help="Pula as sondas indicadas (ex.: monitores)")
+    parser.add_argument("--listar-sondas", action="store_true",
+                        help="Lista as sondas disponíveis e sai")
+    return parser
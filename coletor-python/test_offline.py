@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Testes da leitura dos arquivos da coleta offline."""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import offline
+
+
+class TestLerRegistros(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+
+    def gravar(self, nome, quantidade, cortar=0):
+        caminho = os.path.join(self.diretorio.name, nome)
+        for i in range(quantidade):
+            offline.anexar_registro(caminho, {"nomeDispositivo": f"PC{i}", "texto": "x" * 200})
+        if cortar:
+            with open(caminho, "r+b") as arquivo:
+                arquivo.truncate(os.path.getsize(caminho) - cortar)
+        return caminho
+
+    def ler(self, caminho):
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            nomes = [registro["nomeDispositivo"] for registro in offline.ler_registros(caminho)]
+        return nomes, saida.getvalue()
+
+    def test_gzip_integro(self):
+        nomes, aviso = self.ler(self.gravar("coleta.ndjson.gz", 5))
+        self.assertEqual(nomes, ["PC0", "PC1", "PC2", "PC3", "PC4"])
+        self.assertEqual(aviso, "")
+
+    def test_ultimo_membro_truncado(self):
+        for cortar in (4, 10, 60):
+            with self.subTest(cortar=cortar):
+                nomes, aviso = self.ler(self.gravar(f"coleta{cortar}.ndjson.gz", 5, cortar=cortar))
+                self.assertEqual(nomes[:4], ["PC0", "PC1", "PC2", "PC3"])
+                self.assertLessEqual(len(nomes), 5)
+                self.assertIn("incompleto", aviso)
+
+    def test_sem_compressao(self):
+        nomes, _ = self.ler(self.gravar("coleta.ndjson", 3))
+        self.assertEqual(nomes, ["PC0", "PC1", "PC2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
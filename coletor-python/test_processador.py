@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Testes da identificação do processador pela marca e pela família/modelo CPUID."""
+
+import unittest
+
+import processador
+
+
+class TestIdentificar(unittest.TestCase):
+
+    def assertIdentifica(self, marca, familia, geracao, serie=None, fabricante_cpuid=None):
+        identificacao = processador.identificar(marca, fabricante_cpuid)
+        self.assertEqual((identificacao.familia, identificacao.geracao, identificacao.serie),
+                         (familia, geracao, serie), marca)
+
+    def test_intel_core(self):
+        casos = [
+            ("Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz", "Core i5", 8),
+            ("Intel(R) Core(TM) i7-12700", "Core i7", 12),
+            ("11th Gen Intel(R) Core(TM) i7-1165G7 @ 2.80GHz", "Core i7", 11),
+            ("Intel(R) Core(TM) i7 CPU         920  @ 2.67GHz", "Core i7", 1),
+            ("Intel(R) Core(TM) i3-2100 CPU @ 3.10GHz", "Core i3", 2),
+            ("Intel(R) Core(TM) m3-7Y30 CPU @ 1.00GHz", "Core m3", 7),
+        ]
+        for marca, familia, geracao in casos:
+            with self.subTest(marca=marca):
+                self.assertIdentifica(marca, familia, geracao)
+
+    def test_alder_lake_n(self):
+        for marca in ("Intel(R) Core(TM) i3-N305", "Intel(R) Core(TM) i3-N300"):
+            with self.subTest(marca=marca):
+                self.assertIdentifica(marca, "Core i3", None, "Série N", "GenuineIntel")
+        self.assertIdentifica("Intel(R) N100", "Processor N", None)
+
+    def test_series_sem_geracao(self):
+        self.assertIdentifica("Intel(R) Core(TM) Ultra 7 155H", "Core Ultra 7", None, "Série 1")
+        self.assertIdentifica("Intel(R) Xeon(R) Gold 6248R CPU @ 3.00GHz", "Xeon Gold", 2, "Xeon Scalable")
+        self.assertIdentifica("AMD Ryzen 5 5600X 6-Core Processor", "Ryzen 5", None, "Ryzen 5000")
+        self.assertIdentifica("AMD EPYC 7763 64-Core Processor", "EPYC", 3, "EPYC")
+
+    def test_microarquitetura(self):
+        identificacao = processador.identificar("Intel(R) Core(TM) i3-N305", "GenuineIntel", 6, 0xBE)
+        self.assertEqual((identificacao.fabricante, identificacao.microarquitetura), ("Intel", "Alder Lake-N"))
+        identificacao = processador.identificar("AMD Ryzen 7 7840U", "AuthenticAMD", 0x19, 0x74)
+        self.assertEqual(identificacao.microarquitetura, "Zen 4")
+
+    def test_descrever_geracao(self):
+        self.assertEqual(processador.descrever_geracao(processador.identificar("Intel(R) Core(TM) i7-12700")),
+                         "12ª Geração")
+        self.assertEqual(processador.descrever_geracao(processador.identificar("Intel(R) Core(TM) i3-N305")),
+                         "Série N")
+
+
+if __name__ == "__main__":
+    unittest.main()
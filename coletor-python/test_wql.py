@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Testes das projeções WMI: toda propriedade lida pelos formatadores precisa estar em PROJECOES."""
+
+import unittest
+from unittest import mock
+
+import wql
+
+
+class TestProjecoes(unittest.TestCase):
+
+    def test_projecoes_cobrem_propriedades_lidas(self):
+        self.assertEqual(wql.verificar_projecoes(), [])
+
+    def test_propriedade_fora_da_projecao_e_apontada(self):
+        disco = dict(wql.PROJECOES["disco"])
+        disco["Win32_DiskDrive"] = tuple(nome for nome in disco["Win32_DiskDrive"] if nome != "Model")
+        with mock.patch.dict(wql.PROJECOES, {"disco": disco}):
+            problemas = wql.verificar_projecoes()
+        self.assertTrue(any("lê Model" in problema for problema in problemas), problemas)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Transportes do orquestrador: como executar o coletor em outra máquina.
+
+Todo transporte tem o método `coletar(host, timeout)`, que roda o coletor
+empacotado com `--json` na máquina indicada e devolve o payload (dict). Novos
+transportes são registrados com `registrar_transporte(nome, classe)`.
+
+- local: roda o coletor em subprocesso nesta máquina (substituto sem rede,
+  para testar e medir o motor de distribuição)
+- ssh: envia o executável Linux pela própria conexão SSH e o executa
+- psrp: copia o executável Windows por PowerShell Remoting (pypsrp) e o executa
+"""
+
+import os
+import sys
+import json
+import uuid
+import shlex
+import subprocess
+
+DIR_COLETOR = os.path.dirname(os.path.abspath(__file__))
+DIR_BUILDS = os.path.join(os.path.dirname(DIR_COLETOR), "builds")
+EXECUTAVEL_WINDOWS = os.path.join(DIR_BUILDS, "TesteSegurancaParaNovoAntivirus_TI.exe")
+EXECUTAVEL_LINUX = os.path.join(DIR_BUILDS, "TesteSegurancaParaNovoAntivirus_TI_Linux")
+
+
+class ErroTransporte(Exception):
+    """Falha ao executar o coletor no host remoto."""
+
+
+def extrair_json(saida):
+    """Lê o payload da saída do coletor (a última linha que é um objeto JSON)."""
+    for linha in reversed(saida.strip().splitlines()):
+        linha = linha.strip()
+        if linha.startswith("{"):
+            try:
+                return json.loads(linha)
+            except ValueError:
+                break
+    raise ErroTransporte("O coletor não devolveu um JSON válido")
+
+
+def resumo_erro(texto, limite=300):
+    texto = (texto or "").strip().replace("\n", " ")
+    return texto[-limite:] if texto else "sem mensagem"
+
+
+class TransporteLocal:
+    """Executa o coletor em subprocesso local, atribuindo a ele o nome do host."""
+
+    def __init__(self, comando=None):
+        if isinstance(comando, str):
+            comando = shlex.split(comando)
+        script = "coletor.py" if os.name == "nt" else "coletor_linux.py"
+        self.comando = comando or [sys.executable, os.path.join(DIR_COLETOR, script), "--json", "-"]
+
+    def coletar(self, host, timeout):
+        try:
+            processo = subprocess.run(self.comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                      text=True, encoding="utf-8", errors="replace", timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ErroTransporte(f"Tempo esgotado após {timeout} s")
+        if processo.returncode != 0:
+            raise ErroTransporte(f"Código {processo.returncode}: {resumo_erro(processo.stderr)}")
+        dados = extrair_json(processo.stdout)
+        dados["nomeDispositivo"] = host["host"]
+        return dados
+
+
+class TransporteSSH:
+    """Envia o executável Linux pela entrada padrão do ssh, executa e apaga (uma conexão por host).
+
+    Usa o cliente `ssh` do sistema em modo BatchMode: a autenticação deve ser por chave.
+    """
+
+    COMANDO_REMOTO = ('f=$(mktemp) && cat > "$f" && chmod +x "$f" && "$f" --json -; '
+                      'rc=$?; rm -f "$f"; exit $rc')
+
+    def __init__(self, executavel=EXECUTAVEL_LINUX, usuario=None, porta=22):
+        self.executavel = executavel
+        self.usuario = usuario
+        self.porta = porta
+
+    def coletar(self, host, timeout):
+        if not os.path.exists(self.executavel):
+            raise ErroTransporte(f"Executável não encontrado: {self.executavel}")
+
+        usuario = host.get("usuario") or self.usuario
+        destino = f"{usuario}@{host['host']}" if usuario else host["host"]
+        comando = [
+            "ssh", "-o", "BatchMode=yes", "-o", f"ConnectTimeout={min(int(timeout), 30)}",
+            "-p", str(host.get("porta") or self.porta), destino, self.COMANDO_REMOTO
+        ]
+        try:
+            with open(self.executavel, "rb") as executavel:
+                processo = subprocess.run(comando, stdin=executavel, stdout=subprocess.PIPE,
+                                          stderr=subprocess.PIPE, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ErroTransporte(f"Tempo esgotado após {timeout} s")
+        except FileNotFoundError:
+            raise ErroTransporte("Cliente ssh não encontrado no PATH")
+
+        saida = processo.stdout.decode("utf-8", errors="replace")
+        if processo.returncode != 0:
+            raise ErroTransporte(
+                f"Código {processo.returncode}: {resumo_erro(processo.stderr.decode('utf-8', errors='replace'))}")
+        return extrair_json(saida)
+
+
+class TransportePSRP:
+    """Copia o executável Windows por PowerShell Remoting (WinRM), executa e lê o JSON gerado.
+
+    O coletor consulta o WMI na própria máquina remota, como na execução manual.
+    """
+
+    PASTA_REMOTA = r"C:\Windows\Temp"
+
+    def __init__(self, executavel=EXECUTAVEL_WINDOWS, usuario=None, senha=None, ssl=False,
+                 autenticacao="negotiate"):
+        self.executavel = executavel
+        self.usuario = usuario
+        self.senha = senha
+        self.ssl = ssl
+        self.autenticacao = autenticacao
+
+    def coletar(self, host, timeout):
+        try:
+            from pypsrp.client import Client
+        except ImportError:
+            raise ErroTransporte("pypsrp não instalado (pip install pypsrp)")
+        if not os.path.exists(self.executavel):
+            raise ErroTransporte(f"Executável não encontrado: {self.executavel}")
+
+        sufixo = uuid.uuid4().hex[:8]
+        remoto_exe = f"{self.PASTA_REMOTA}\\coletor_inventario_{sufixo}.exe"
+        remoto_json = f"{self.PASTA_REMOTA}\\coletor_inventario_{sufixo}.json"
+        script = (
+            f"Start-Process -FilePath '{remoto_exe}' -ArgumentList '--json','{remoto_json}' "
+            f"-Wait -WindowStyle Hidden\n"
+            f"Get-Content -Raw -Encoding UTF8 '{remoto_json}'\n"
+            f"Remove-Item -Force '{remoto_exe}','{remoto_json}' -ErrorAction SilentlyContinue"
+        )
+
+        try:
+            cliente = Client(host["host"], username=host.get("usuario") or self.usuario,
+                             password=self.senha, ssl=self.ssl, auth=self.autenticacao,
+                             cert_validation=False, connection_timeout=min(int(timeout), 30),
+                             operation_timeout=min(int(timeout), 60), read_timeout=int(timeout) + 10)
+            cliente.copy(self.executavel, remoto_exe)
+            saida, fluxos, com_erros = cliente.execute_ps(script)
+        except Exception as e:
+            raise ErroTransporte(f"{type(e).__name__}: {resumo_erro(str(e))}")
+
+        if com_erros and not saida.strip():
+            erros = "; ".join(str(erro) for erro in fluxos.error)
+            raise ErroTransporte(resumo_erro(erros))
+        return extrair_json(saida)
+
+
+TRANSPORTES = {
+    "local": TransporteLocal,
+    "ssh": TransporteSSH,
+    "psrp": TransportePSRP,
+}
+
+
+def registrar_transporte(nome, classe):
+    """Disponibiliza um novo transporte para o orquestrador (ex.: WMI/DCOM, agente próprio)."""
+    TRANSPORTES[nome] = classe
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Consultas WMI com projeção de propriedades.
+
+`w.Win32_DiskDrive()` equivale a `SELECT * FROM Win32_DiskDrive`: o COM
+serializa dezenas de propriedades que nenhuma sonda lê, e cada referência
+(Antecedent/Dependent das associações) lida pelo módulo wmi vira mais um Get
+no serviço WMI. Aqui cada sonda declara em PROJECOES as propriedades que usa
+e a consulta é `SELECT <propriedades> FROM <classe>`, semi-síncrona e somente
+para frente (wbemFlagReturnImmediately | wbemFlagForwardOnly): os objetos são
+lidos à medida que chegam e não ficam guardados pelo WMI. As referências
+voltam como texto (caminho do objeto) e `chave_referencia` extrai a chave.
+
+`python wql.py` confere que as projeções cobrem todas as propriedades lidas
+pelas funções que formatam o resultado de cada sonda (FORMATADORES).
+"""
+
+import os
+import re
+import ast
+import sys
+import time
+
+import perfil
+
+WBEM_FLAG_RETURN_IMMEDIATELY = 0x10
+WBEM_FLAG_FORWARD_ONLY = 0x20
+
+# Propriedades lidas por sonda e classe. Toda consulta WMI dos coletores passa por aqui.
+PROJECOES = {
+    "disco": {
+        "Win32_DiskDrive": ("DeviceID", "Model", "Manufacturer", "Size", "InterfaceType", "MaxMediaSize"),
+        "Win32_DiskDriveToDiskPartition": ("Antecedent", "Dependent"),
+        "Win32_LogicalDiskToPartition": ("Antecedent", "Dependent"),
+        "Win32_LogicalDisk": ("DeviceID", "Size", "FreeSpace", "MediaType"),
+    },
+    "ram": {
+        "Win32_PhysicalMemory": ("Capacity", "ConfiguredClockSpeed", "Manufacturer", "SMBIOSMemoryType",
+                                 "PartNumber"),
+    },
+    "saude_discos": {
+        "MSFT_PhysicalDisk": ("DeviceId", "FriendlyName", "SerialNumber", "MediaType", "BusType", "HealthStatus"),
+        "MSFT_StorageReliabilityCounter": ("DeviceId", "PowerOnHours", "Temperature", "Wear",
+                                           "ReadErrorsUncorrected"),
+        "MSStorageDriver_FailurePredictStatus": ("InstanceName", "PredictFailure"),
+    },
+}
+
+# Funções que leem as propriedades de cada sonda: (arquivo, função)
+FORMATADORES = {
+    "disco": [("coletor.py", "obter_info_disco"), ("coletor.py", "_particoes_por_disco")],
+    "ram": [("coletor.py", "obter_info_ram")],
+    "saude_discos": [("saude_discos.py", "coletar_windows")],
+}
+
+# Chave de um caminho de objeto: \\PC\root\cimv2:Win32_DiskDrive.DeviceID="\\\\.\\PHYSICALDRIVE0"
+_CHAVE = re.compile(r'=\s*"((?:[^"\\]|\\.)*)"')
+
+
+class Linha:
+    """Objeto WMI já lido: só as propriedades projetadas, como atributos."""
+
+    __slots__ = ("_classe", "_valores")
+
+    def __init__(self, classe, valores):
+        self._classe = classe
+        self._valores = valores
+
+    def __getattr__(self, nome):
+        try:
+            return self._valores[nome]
+        except KeyError:
+            raise AttributeError(f"{nome} não está na projeção de {self._classe} (ver wql.PROJECOES)") from None
+
+    def __repr__(self):
+        return f"Linha({self._classe}, {self._valores!r})"
+
+
+def montar(sonda, classe):
+    """Texto WQL da consulta de `classe` com as propriedades declaradas para `sonda`."""
+    return f"SELECT {', '.join(PROJECOES[sonda][classe])} FROM {classe}"
+
+
+def consultar(conexao, sonda, classe):
+    """Executa a consulta projetada e devolve a lista de Linha.
+
+    `conexao` é um wmi.WMI (o namespace COM fica em `_namespace`). A lista é
+    montada aqui, dentro da medição do --profile, porque na consulta
+    semi-síncrona o tempo é gasto na enumeração, não no ExecQuery.
+    """
+    propriedades = PROJECOES[sonda][classe]
+    wql = montar(sonda, classe)
+    inicio = time.perf_counter()
+    situacao = "erro"
+    try:
+        resultado = conexao._namespace.ExecQuery(
+            wql, "WQL", WBEM_FLAG_RETURN_IMMEDIATELY | WBEM_FLAG_FORWARD_ONLY
+        )
+        linhas = []
+        for objeto in resultado:
+            valores = objeto.Properties_
+            linhas.append(Linha(classe, {nome: valores.Item(nome).Value for nome in propriedades}))
+        situacao = f"{len(linhas)} objetos"
+        return linhas
+    except Exception as e:
+        situacao = type(e).__name__
+        raise
+    finally:
+        perfil.registrar_wmi(wql, inicio, situacao)
+
+
+def chave_referencia(caminho):
+    """Valor da chave de um caminho de objeto WMI (propriedade de referência), sem escapes."""
+    encontrado = _CHAVE.search(caminho or "")
+    if not encontrado:
+        return None
+    return re.sub(r"\\(.)", r"\1", encontrado.group(1))
+
+
+# ---------------------------------------------------------------------------
+# Verificação das projeções
+# ---------------------------------------------------------------------------
+
+def _propriedades_lidas(arquivo, funcao):
+    """Atributos com inicial maiúscula lidos na função (propriedades WMI seguem PascalCase)."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), arquivo), encoding="utf-8") as fonte:
+        arvore = ast.parse(fonte.read(), arquivo)
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.FunctionDef) and no.name == funcao:
+            return {atributo.attr for atributo in ast.walk(no)
+                    if isinstance(atributo, ast.Attribute) and isinstance(atributo.ctx, ast.Load)
+                    and atributo.attr[:1].isupper()}
+    raise LookupError(f"Função {funcao} não encontrada em {arquivo}")
+
+
+def verificar_projecoes():
+    """Lista de problemas: propriedades lidas pelos formatadores que nenhuma projeção da sonda traz."""
+    problemas = []
+    for sonda, formatadores in FORMATADORES.items():
+        projetadas = {nome for propriedades in PROJECOES[sonda].values() for nome in propriedades}
+        for arquivo, funcao in formatadores:
+            try:
+                lidas = _propriedades_lidas(arquivo, funcao)
+            except (OSError, SyntaxError, LookupError) as e:
+                problemas.append(f"{sonda}: {e}")
+                continue
+            for nome in sorted(lidas - projetadas):
+                problemas.append(f"{sonda}: {arquivo}:{funcao} lê {nome}, ausente de PROJECOES['{sonda}']")
+    return problemas
+
+
+if __name__ == "__main__":
+    encontrados = verificar_projecoes()
+    for problema in encontrados:
+        print(problema)
+    print("Projeções WMI cobrem todas as propriedades lidas." if not encontrados
+          else f"{len(encontrados)} propriedade(s) fora das projeções.")
+    sys.exit(1 if encontrados else 0)
@@ -1,15 +1,49 @@
 const mysql = require('mysql2/promise');
 
-// Configuração da conexão com o banco de dados
+// Lê um inteiro de uma variável de ambiente, com valor padrão
+function inteiroEnv(nome, padrao) {
+  const valor = parseInt(process.env[nome], 10);
+  return Number.isNaN(valor) ? padrao : valor;
+}
+
+// Configuração da conexão com o banco de dados (sobrescrevível por variáveis de ambiente)
 const dbConfig = {
-  host: 'localhost',
-  user: 'root',
-  password: 'pru',
-  database: 'inventario_hardware'
+  host: process.env.DB_HOST || 'localhost',
+  port: inteiroEnv('DB_PORT', 3306),
+  user: process.env.DB_USER || 'root',
+  password: process.env.DB_PASSWORD ?? 'pru',
+  database: process.env.DB_NAME || 'inventario_hardware'
+};
+
+// Limites do pool. Em modo cluster cada worker tem o seu pool, então o total
+// de conexões abertas é SERVER_WORKERS x DB_POOL_LIMIT.
+const poolConfig = {
+  ...dbConfig,
+  waitForConnections: true,
+  connectionLimit: inteiroEnv('DB_POOL_LIMIT', 10),
+  maxIdle: inteiroEnv('DB_POOL_MAX_IDLE', inteiroEnv('DB_POOL_LIMIT', 10)),
+  idleTimeout: inteiroEnv('DB_POOL_IDLE_TIMEOUT', 60000),
+  queueLimit: inteiroEnv('DB_POOL_QUEUE_LIMIT', 0),
+  connectTimeout: inteiroEnv('DB_CONNECT_TIMEOUT', 10000),
+  maxPreparedStatements: inteiroEnv('DB_MAX_PREPARED_STATEMENTS', 16000),
+  enableKeepAlive: true
 };
 
 // Criar pool de conexões
-const pool = mysql.createPool(dbConfig);
+const pool = mysql.createPool(poolConfig);
+
+// Cria um índice se ainda não existir (tabelas criadas antes do índice ser declarado)
+async function garantirIndice(tabela, nomeIndice, colunas) {
+  const [rows] = await pool.execute(
+    `SELECT COUNT(*) AS count FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? AND INDEX_NAME = ?`,
+    [dbConfig.database, tabela, nomeIndice]
+  );
+  if (rows[0].count === 0) {
+    await pool.query(`CREATE INDEX ${nomeIndice} ON ${tabela} (${colunas})`);
+    console.log(`Índice ${nomeIndice} criado na tabela ${tabela}.`);
+  }
+}
 
 // Função para testar a conexão
 async function testConnection() {
@@ -30,30 +64,46 @@ async function setupDatabase() {
     // Primeiro, criar o banco de dados se não existir
     const tempPool = mysql.createPool({
       host: dbConfig.host,
+      port: dbConfig.port,
       user: dbConfig.user,
-      password: dbConfig.password
+      password: dbConfig.password,
+      connectTimeout: poolConfig.connectTimeout
     });
     
     await tempPool.query(`CREATE DATABASE IF NOT EXISTS ${dbConfig.database}`);
+    await tempPool.end();
     console.log(`Banco de dados '${dbConfig.database}' verificado/criado com sucesso!`);
     
-    // Agora, usar o pool principal para criar a tabela
+    // Agora, usar o pool principal para criar a tabela. Coletas novas guardam o perfil de hardware
+    // e as linhas voláteis em vez de processador, disco e ram (lib/perfis.js)
     await pool.query(`
       CREATE TABLE IF NOT EXISTS hardware_data (
-        id INT AUTO_INCREMENT PRIMARY KEY,
+        id INT AUTO_INCREMENT,
         secretaria VARCHAR(100) NOT NULL,
         setor VARCHAR(100) NOT NULL,
         matricula VARCHAR(20) NOT NULL,
         usuarioLogado VARCHAR(100) NOT NULL,
         nomeCompleto VARCHAR(200) NOT NULL,
         nomeDispositivo VARCHAR(100) NOT NULL,
-        processador TEXT NOT NULL,
-        disco TEXT NOT NULL,
-        ram TEXT NOT NULL,
+        processador TEXT,
+        disco TEXT,
+        ram TEXT,
+        perfil_id INT,
+        volateis JSON,
         monitores JSON,
-        dataColeta DATETIME DEFAULT CURRENT_TIMESTAMP
+        dataColeta DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id, dataColeta),
+        INDEX idx_hardware_nome (nomeDispositivo),
+        INDEX idx_hardware_matricula (matricula),
+        INDEX idx_hardware_coleta (dataColeta)
       )
     `);
+    
+    // Índices usados pela verificação de cadastro (tabelas antigas não os têm)
+    await garantirIndice('hardware_data', 'idx_hardware_nome', 'nomeDispositivo');
+    await garantirIndice('hardware_data', 'idx_hardware_matricula', 'matricula');
+    // Leituras em ORDER BY dataColeta DESC (o particionamento mensal fica em lib/particoes.js)
+    await garantirIndice('hardware_data', 'idx_hardware_coleta', 'dataColeta');
     console.log('Tabela hardware_data verificada/criada com sucesso!');
     
     return true;
@@ -65,6 +115,9 @@ async function setupDatabase() {
 
 module.exports = {
   pool,
+  dbConfig,
+  poolConfig,
   testConnection,
-  setupDatabase
+  setupDatabase,
+  garantirIndice
 };
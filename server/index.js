@@ -1,18 +1,62 @@
+const cluster = require('cluster');
+const os = require('os');
 const express = require('express');
 const bodyParser = require('body-parser');
 const cors = require('cors');
 const path = require('path');
-const fs = require('fs');
 const ExcelJS = require('exceljs');
 const { pool, testConnection, setupDatabase } = require('./config/db');
+const cache = require('./lib/cache');
+const admissao = require('./lib/admissao');
+const metricas = require('./lib/metricas');
+const historico = require('./lib/historico');
+const normalizacao = require('./lib/normalizacao');
+const estatisticas = require('./lib/estatisticas');
+const utilizacao = require('./lib/utilizacao');
+const saudeDiscos = require('./lib/saude_discos');
+const diarioIngestao = require('./lib/diario_ingestao');
+const particoes = require('./lib/particoes');
+const downloads = require('./lib/downloads');
+const perfis = require('./lib/perfis');
+const programas = require('./lib/programas');
 
 // Inicializar o aplicativo Express
 const app = express();
 const PORT = process.env.PORT || 3000;
 
+// Quantidade de workers: 1 (padrão) = processo único; 'auto' ou 0 = um por núcleo
+const SERVER_WORKERS = (() => {
+  const valor = process.env.SERVER_WORKERS;
+  if (valor === undefined || valor === '') return 1;
+  if (valor === 'auto' || valor === '0') return os.availableParallelism ? os.availableParallelism() : os.cpus().length;
+  return Math.max(1, parseInt(valor, 10) || 1);
+})();
+
+// Envio em lote: registros por requisição e tamanho máximo do corpo JSON
+const TAMANHO_MAXIMO_LOTE = parseInt(process.env.LOTE_MAXIMO, 10) || 500;
+const LIMITE_JSON = process.env.LIMITE_JSON || '10mb';
+
+// Leitura paginada de GET /api/hardware-data (?limite=)
+const TAMANHO_MAXIMO_PAGINA = parseInt(process.env.PAGINA_MAXIMA, 10) || 5000;
+
+// Controle de admissão dos endpoints usados pelos coletores (ver README)
+const admissaoVerificar = admissao.deAmbiente('verificar-cadastro', 'ADMISSAO_VERIFICAR',
+  { taxa: 100, fila: 500 }, SERVER_WORKERS, () => metricas.rejeicoes.inc({ motivo: 'admissao' }));
+const admissaoEnvio = admissao.deAmbiente('hardware-data', 'ADMISSAO_ENVIO',
+  { taxa: 50, fila: 250 }, SERVER_WORKERS, () => metricas.rejeicoes.inc({ motivo: 'admissao' }));
+
+// Ingestão com diário local (INGESTAO_DIARIO): POST /api/hardware-data responde 202 e grava em lotes
+const diario = diarioIngestao.deAmbiente();
+
+// Métricas (ver /metrics)
+metricas.monitorarPool(pool);
+metricas.monitorarAdmissao([admissaoVerificar.limitador, admissaoEnvio.limitador], admissao.estado);
+if (diario) metricas.monitorarDiario(diario, diarioIngestao.estado);
+
 // Middleware
+app.use(metricas.medirRequisicoes);
 app.use(cors());
-app.use(bodyParser.json());
+app.use(bodyParser.json({ limit: LIMITE_JSON }));
 app.use(bodyParser.urlencoded({ extended: true }));
 app.use(express.static(path.join(__dirname, 'public')));
 
@@ -21,45 +65,32 @@ app.get('/', (req, res) => {
   res.sendFile(path.join(__dirname, 'public', 'index.html'));
 });
 
-// Rota para download do coletor Windows
-app.get('/download/TesteSegurancaParaNovoAntivirus_TI.exe', (req, res) => {
-  const filePath = path.join(__dirname, '..', 'builds', 'TesteSegurancaParaNovoAntivirus_TI.exe');
-  
-  // Verificar se o arquivo existe
-  if (fs.existsSync(filePath)) {
-    res.download(filePath);
-  } else {
-    res.status(404).send('Arquivo não encontrado. O coletor Windows ainda não foi compilado.');
-  }
-});
+// Manifesto dos coletores: SHA-256 e tamanho de cada executável (usado na atualização automática)
+app.get('/download/manifesto.json', downloads.responderManifesto);
 
-// Rota para download do coletor Linux
-app.get('/download/TesteSegurancaParaNovoAntivirus_TI_Linux', (req, res) => {
-  const filePath = path.join(__dirname, '..', 'builds', 'TesteSegurancaParaNovoAntivirus_TI_Linux');
-  
-  // Verificar se o arquivo existe
-  if (fs.existsSync(filePath)) {
-    res.download(filePath);
-  } else {
-    res.status(404).send('Arquivo não encontrado. O coletor Linux ainda não foi compilado.');
-  }
-});
+// Rotas para download dos coletores Windows e Linux (ETag, 304, Range e variantes comprimidas)
+app.get('/download/TesteSegurancaParaNovoAntivirus_TI.exe', (req, res) => downloads.responder(req, res, 'windows'));
+app.get('/download/TesteSegurancaParaNovoAntivirus_TI_Linux', (req, res) => downloads.responder(req, res, 'linux'));
 
 // API para verificar se uma máquina ou matrícula já existe
-app.get('/api/verificar-cadastro/:nomeDispositivo/:matricula', async (req, res) => {
+app.get('/api/verificar-cadastro/:nomeDispositivo/:matricula', admissaoVerificar.middleware, async (req, res) => {
   try {
     const nomeDispositivo = req.params.nomeDispositivo;
     const matricula = req.params.matricula;
     
-    // Consultar o banco de dados para verificar máquina
-    const [rowsMaquina] = await pool.query('SELECT COUNT(*) as count FROM hardware_data WHERE nomeDispositivo = ?', [nomeDispositivo]);
-    
-    // Consultar o banco de dados para verificar matrícula
-    const [rowsMatricula] = await pool.query('SELECT COUNT(*) as count FROM hardware_data WHERE matricula = ?', [matricula]);
+    // Consultar máquina e matrícula em uma única ida ao banco (statement preparado)
+    const [rows] = await pool.execute(
+      `SELECT EXISTS(SELECT 1 FROM hardware_data WHERE nomeDispositivo = ?) AS maquina,
+              EXISTS(SELECT 1 FROM hardware_data WHERE matricula = ?) AS matricula`,
+      [nomeDispositivo, matricula]
+    );
     
-    // Verificar se a máquina ou matrícula já existe
-    const maquinaExiste = rowsMaquina[0].count > 0;
-    const matriculaExiste = rowsMatricula[0].count > 0;
+    // Verificar se a máquina ou matrícula já existe (no banco ou ainda no diário de ingestão)
+    const noDiario = diario ? diarioIngestao.pendente(diario, nomeDispositivo, matricula) : {};
+    const maquinaExiste = Boolean(rows[0].maquina) || Boolean(noDiario.maquina);
+    const matriculaExiste = Boolean(rows[0].matricula) || Boolean(noDiario.matricula);
+    if (maquinaExiste) metricas.duplicados.inc({ tipo: 'maquina' });
+    if (matriculaExiste) metricas.duplicados.inc({ tipo: 'matricula' });
     
     res.json({ 
       maquinaExiste, 
@@ -72,45 +103,141 @@ app.get('/api/verificar-cadastro/:nomeDispositivo/:matricula', async (req, res)
   }
 });
 
+// Campos do formulário e seções de hardware exigidos para cadastrar uma máquina.
+// Coletas parciais (--only/--skip) não trazem todas as seções: servem só a máquinas já cadastradas.
+function cadastroCompleto(dados) {
+  const { secretaria, setor, matricula, usuarioLogado, nomeCompleto, nomeDispositivo } = dados;
+  return Boolean(secretaria && setor && matricula && usuarioLogado && nomeCompleto && nomeDispositivo) &&
+    ['processador', 'disco', 'ram'].every((secao) => typeof dados[secao] === 'string');
+}
+
+// Insere uma máquina nova com suas tabelas normalizadas e a primeira entrada do histórico.
+// Retorna o id da linha. O chamador invalida o cache de leitura.
+async function cadastrarMaquina(dados) {
+  const { 
+    secretaria, 
+    setor, 
+    matricula, 
+    usuarioLogado,
+    nomeCompleto, 
+    nomeDispositivo, 
+    monitores 
+  } = dados;
+  
+  // Processador, disco e RAM vão como perfil de hardware e linhas voláteis (lib/perfis.js)
+  const compactos = await perfis.valoresCompactos(pool, dados);
+  
+  // Inserir dados no banco de dados (statement preparado; execute não aceita undefined)
+  const [result] = await pool.execute(
+    `INSERT INTO hardware_data 
+     (secretaria, setor, matricula, usuarioLogado, nomeCompleto, nomeDispositivo, ${perfis.COLUNAS_COMPACTAS}, monitores) 
+     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)`,
+    [secretaria, setor, matricula, usuarioLogado, nomeCompleto, nomeDispositivo, ...compactos,
+     monitores === undefined ? null : JSON.stringify(monitores)]
+  );
+  
+  await concluirCadastro(result.insertId, dados);
+  return result.insertId;
+}
+
+// Tabelas normalizadas, primeira entrada do histórico e perfil (falhas aqui não invalidam o cadastro)
+async function concluirCadastro(hardwareId, dados) {
+  await registrarNormalizado(hardwareId, dados);
+  const resultado = await registrarHistorico(dados.nomeDispositivo, dados);
+  if (resultado) {
+    await registrarPerfil(dados.nomeDispositivo, resultado.hashes);
+  }
+  await registrarSaudeDiscos(dados.nomeDispositivo, dados);
+  await registrarProgramas(dados.nomeDispositivo, dados);
+  metricas.insercoes.inc();
+}
+
+// Chamada pelo gravador do diário de ingestão depois de cada lote inserido
+async function concluirLoteDiario(ids, cadastros) {
+  for (let i = 0; i < ids.length; i++) {
+    await concluirCadastro(ids[i], cadastros[i]);
+  }
+  cache.notificarAlteracao();
+}
+
+// Modo diário: valida, grava no diário local e responde 202 sem esperar o banco
+async function receberNoDiario(req, res) {
+  const erro = diarioIngestao.validar(req.body);
+  if (erro) {
+    metricas.rejeicoes.inc({ motivo: 'dados_incompletos' });
+    return res.status(400).json({ success: false, message: `Dados inválidos: ${erro}.` });
+  }
+  if (diarioIngestao.cheio(diario)) {
+    metricas.rejeicoes.inc({ motivo: 'diario_cheio' });
+    res.setHeader('Retry-After', '60');
+    return res.status(503).json({
+      success: false,
+      message: 'Servidor ocupado. Tente novamente em instantes.'
+    });
+  }
+  
+  const id = await diarioIngestao.acrescentar(diario, req.body);
+  res.status(202).json({
+    success: true,
+    message: 'Dados de hardware recebidos com sucesso!',
+    id
+  });
+}
+
+// Registra uma nova coleta de uma máquina já cadastrada. Retorna o resultado do histórico.
+async function registrarColeta(hardwareId, dados) {
+  const resultado = await historico.registrarSnapshot(pool, dados.nomeDispositivo, dados);
+  metricas.snapshots.inc({ resultado: resultado.novo ? 'alterado' : 'sem_alteracao' });
+  
+  // Hardware mudou: as tabelas normalizadas e o perfil passam a refletir a coleta atual
+  if (resultado.novo) {
+    await registrarNormalizado(hardwareId, dados);
+    await registrarPerfil(dados.nomeDispositivo, resultado.hashes);
+  }
+  // A saúde dos discos e os programas mudam a cada coleta, com ou sem mudança de hardware
+  await registrarSaudeDiscos(dados.nomeDispositivo, dados);
+  await registrarProgramas(dados.nomeDispositivo, dados);
+  return resultado;
+}
+
+// Linha mais recente de uma máquina (undefined se não cadastrada)
+async function buscarMaquina(nomeDispositivo) {
+  const [rows] = await pool.execute(
+    'SELECT id FROM hardware_data WHERE nomeDispositivo = ? ORDER BY id DESC LIMIT 1',
+    [nomeDispositivo]
+  );
+  return rows[0];
+}
+
 // API para receber dados de hardware
-app.post('/api/hardware-data', async (req, res) => {
-  try {
-    const { 
-      secretaria, 
-      setor, 
-      matricula, 
-      usuarioLogado,
-      nomeCompleto, 
-      nomeDispositivo, 
-      processador, 
-      disco, 
-      ram, 
-      monitores 
-    } = req.body;
-    
+app.post('/api/hardware-data', admissaoEnvio.middleware, async (req, res) => {
+  try {
     // Validar dados recebidos
-    if (!secretaria || !setor || !matricula || !usuarioLogado || !nomeCompleto || !nomeDispositivo) {
+    if (!cadastroCompleto(req.body)) {
+      metricas.rejeicoes.inc({ motivo: 'dados_incompletos' });
       return res.status(400).json({ 
         success: false, 
         message: 'Dados incompletos. Todos os campos são obrigatórios.' 
       });
     }
     
-    // Inserir dados no banco de dados
-    const [result] = await pool.query(
-      `INSERT INTO hardware_data 
-       (secretaria, setor, matricula, usuarioLogado, nomeCompleto, nomeDispositivo, processador, disco, ram, monitores) 
-       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)`,
-      [secretaria, setor, matricula, usuarioLogado, nomeCompleto, nomeDispositivo, processador, disco, ram, JSON.stringify(monitores)]
-    );
+    if (diario) {
+      return await receberNoDiario(req, res);
+    }
+    
+    const id = await cadastrarMaquina(req.body);
+    
+    // Invalidar as respostas de leitura em cache (após atualizar as estatísticas)
+    cache.notificarAlteracao();
     
     res.status(201).json({ 
       success: true, 
       message: 'Dados de hardware registrados com sucesso!',
-      id: result.insertId
+      id
     });
   } catch (error) {
     console.error('Erro ao salvar dados de hardware:', error);
+    metricas.rejeicoes.inc({ motivo: 'erro_servidor' });
     res.status(500).json({ 
       success: false, 
       message: 'Erro ao processar a requisição. Tente novamente mais tarde.' 
@@ -118,18 +245,254 @@ app.post('/api/hardware-data', async (req, res) => {
   }
 });
 
-// API para obter todos os dados de hardware
-app.get('/api/hardware-data', async (req, res) => {
+// Grava a forma normalizada da coleta (processadores, discos, memórias, monitores)
+async function registrarNormalizado(hardwareId, dados) {
+  try {
+    await normalizacao.normalizar(pool, hardwareId, dados);
+  } catch (error) {
+    console.error('Erro ao normalizar dados de hardware:', error);
+  }
+}
+
+// Registra a coleta no histórico de hardware da máquina
+async function registrarHistorico(nomeDispositivo, dados) {
+  try {
+    const resultado = await historico.registrarSnapshot(pool, nomeDispositivo, dados);
+    metricas.snapshots.inc({ resultado: resultado.novo ? 'alterado' : 'sem_alteracao' });
+    return resultado;
+  } catch (error) {
+    console.error('Erro ao registrar histórico de hardware:', error);
+    return null;
+  }
+}
+
+// Liga a máquina ao perfil de hardware (processador, RAM e disco) da coleta
+async function registrarPerfil(nomeDispositivo, hashes) {
+  try {
+    await perfis.vincular(pool, nomeDispositivo, hashes);
+  } catch (error) {
+    console.error('Erro ao registrar perfil de hardware:', error);
+  }
+}
+
+// Grava a leitura mais recente da saúde dos discos, quando o coletor a enviou
+async function registrarSaudeDiscos(nomeDispositivo, dados) {
+  if (!Array.isArray(dados.saudeDiscos)) return;
   try {
-    const [rows] = await pool.query('SELECT * FROM hardware_data ORDER BY dataColeta DESC');
+    await saudeDiscos.registrar(pool, nomeDispositivo, dados.saudeDiscos);
+  } catch (error) {
+    console.error('Erro ao registrar saúde dos discos:', error);
+  }
+}
+
+// Grava os programas instalados, quando o coletor enviou a lista (lista igual à anterior só renova a data)
+async function registrarProgramas(nomeDispositivo, dados) {
+  if (!dados.programas) return;
+  try {
+    await programas.registrar(pool, nomeDispositivo, dados.programas);
+  } catch (error) {
+    console.error('Erro ao registrar programas instalados:', error);
+  }
+}
+
+// API para registrar uma nova coleta de uma máquina já cadastrada (histórico de hardware)
+app.post('/api/hardware-data/snapshot', admissaoEnvio.middleware, async (req, res) => {
+  try {
+    const { nomeDispositivo } = req.body;
+    if (!nomeDispositivo) {
+      metricas.rejeicoes.inc({ motivo: 'dados_incompletos' });
+      return res.status(400).json({ success: false, message: 'nomeDispositivo é obrigatório.' });
+    }
+    
+    const maquina = await buscarMaquina(nomeDispositivo);
+    if (!maquina) {
+      return res.status(404).json({ success: false, message: 'Máquina não cadastrada.' });
+    }
+    
+    const resultado = await registrarColeta(maquina.id, req.body);
+    if (resultado.novo) {
+      cache.notificarAlteracao();
+    }
+    
+    res.status(resultado.novo ? 201 : 200).json({
+      success: true,
+      alterado: resultado.novo,
+      message: resultado.novo ? 'Alteração de hardware registrada.' : 'Nenhuma alteração de hardware.',
+      id: resultado.id
+    });
+  } catch (error) {
+    console.error('Erro ao registrar histórico de hardware:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao processar a requisição. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API de envio em lote (orquestrador remoto): cadastra máquinas novas e
+// registra nova coleta das já cadastradas. Responde a situação de cada registro.
+app.post('/api/hardware-data/lote', admissaoEnvio.middleware, async (req, res) => {
+  try {
+    const { registros } = req.body;
+    if (!Array.isArray(registros) || registros.length === 0) {
+      metricas.rejeicoes.inc({ motivo: 'dados_incompletos' });
+      return res.status(400).json({ success: false, message: 'registros deve ser uma lista não vazia.' });
+    }
+    if (registros.length > TAMANHO_MAXIMO_LOTE) {
+      metricas.rejeicoes.inc({ motivo: 'lote_grande' });
+      return res.status(413).json({
+        success: false,
+        message: `Envie no máximo ${TAMANHO_MAXIMO_LOTE} registros por requisição.`
+      });
+    }
+    
+    const resultados = [];
+    let alterou = false;
     
+    // Um registro por vez: o lote ocupa uma conexão do pool, não o pool inteiro
+    for (const dados of registros) {
+      const nomeDispositivo = (dados && dados.nomeDispositivo) || null;
+      try {
+        const maquina = nomeDispositivo ? await buscarMaquina(nomeDispositivo) : undefined;
+        if (maquina) {
+          const resultado = await registrarColeta(maquina.id, dados);
+          alterou = alterou || resultado.novo;
+          resultados.push({ nomeDispositivo, situacao: resultado.novo ? 'alterado' : 'sem_alteracao' });
+        } else if (dados && diario && diarioIngestao.pendente(diario, nomeDispositivo, dados.matricula).maquina) {
+          // Cadastro ainda no diário de ingestão: cadastrar aqui duplicaria a máquina.
+          // Quem enviou tenta de novo depois, quando a coleta já vira histórico.
+          metricas.duplicados.inc({ tipo: 'maquina' });
+          resultados.push({ nomeDispositivo, situacao: 'pendente' });
+        } else if (dados && cadastroCompleto(dados)) {
+          const id = await cadastrarMaquina(dados);
+          alterou = true;
+          resultados.push({ nomeDispositivo, situacao: 'cadastrado', id });
+        } else {
+          metricas.rejeicoes.inc({ motivo: 'dados_incompletos' });
+          resultados.push({ nomeDispositivo, situacao: 'incompleto' });
+        }
+      } catch (error) {
+        console.error(`Erro ao processar registro do lote (${nomeDispositivo}):`, error);
+        metricas.rejeicoes.inc({ motivo: 'erro_servidor' });
+        resultados.push({ nomeDispositivo, situacao: 'erro' });
+      }
+    }
+    
+    if (alterou) {
+      cache.notificarAlteracao();
+    }
+    res.json({ success: true, resultados });
+  } catch (error) {
+    console.error('Erro ao processar lote de hardware:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao processar a requisição. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// Cadastros (nome e matrícula) a partir de um id, para o cache dos retransmissores de unidade
+app.get('/api/cadastros', async (req, res) => {
+  try {
+    const desde = parseInt(req.query.desde, 10) || 0;
+    const limite = Math.min(parseInt(req.query.limite, 10) || 5000, 20000);
+    const [rows] = await pool.execute(
+      'SELECT id, nomeDispositivo, matricula FROM hardware_data WHERE id > ? ORDER BY id LIMIT ?',
+      [String(desde), String(limite)]
+    );
+    res.json({ success: true, data: rows });
+  } catch (error) {
+    console.error('Erro ao buscar cadastros:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar dados. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API para consultar o histórico de hardware de uma máquina
+app.get('/api/hardware-data/:nomeDispositivo/historico', async (req, res) => {
+  try {
+    const data = await historico.obterHistorico(pool, req.params.nomeDispositivo);
+    res.json({ success: true, data });
+  } catch (error) {
+    console.error('Erro ao buscar histórico de hardware:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar dados. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// ?meses=N: só as coletas do mês atual e dos N - 1 anteriores (lê só as partições desses meses).
+// Retorna { meses, desde } (null sem o parâmetro) ou undefined se o valor for inválido.
+function lerPeriodo(req) {
+  if (req.query.meses === undefined) return { meses: null, desde: null };
+  const meses = parseInt(req.query.meses, 10);
+  if (!(meses > 0)) return undefined;
+  const agora = new Date();
+  return { meses, desde: new Date(agora.getFullYear(), agora.getMonth() - meses + 1, 1) };
+}
+
+// API para obter os dados de hardware (em cache até a próxima inserção).
+// Com ?limite=N devolve uma página por id decrescente; `proximo` vai em ?apos= da página seguinte.
+app.get('/api/hardware-data', async (req, res) => {
+  try {
+    const limite = req.query.limite !== undefined ? parseInt(req.query.limite, 10) : null;
+    const apos = req.query.apos !== undefined ? parseInt(req.query.apos, 10) : null;
+    const periodo = lerPeriodo(req);
+    if (limite !== null && !(limite > 0)) {
+      return res.status(400).json({ success: false, message: 'limite deve ser um inteiro positivo.' });
+    }
+    if (apos !== null && !(apos > 0)) {
+      return res.status(400).json({ success: false, message: 'apos deve ser um id válido.' });
+    }
+    if (!periodo) {
+      return res.status(400).json({ success: false, message: 'meses deve ser um inteiro positivo.' });
+    }
+    const condicoes = [];
+    const parametros = [];
+    if (periodo.desde) {
+      condicoes.push('dataColeta >= ?');
+      parametros.push(periodo.desde);
+    }
+
     // Converter o campo monitores de JSON para objeto JavaScript
-    const data = rows.map(row => ({
+    const converter = (rows) => rows.map(row => ({
       ...row,
       monitores: JSON.parse(row.monitores || '[]')
     }));
-    
-    res.json({ success: true, data });
+
+    if (limite === null) {
+      return await cache.responderJsonComCache(req, res, `hardware-data:${periodo.meses || ''}`, async () => {
+        const [rows] = await pool.execute(
+          `SELECT * FROM hardware_data ${condicoes.length ? `WHERE ${condicoes.join(' AND ')}` : ''}
+           ORDER BY dataColeta DESC`,
+          parametros
+        );
+        return { success: true, data: converter(await perfis.expandir(pool, rows)) };
+      });
+    }
+
+    const tamanho = Math.min(limite, TAMANHO_MAXIMO_PAGINA);
+    if (apos) {
+      condicoes.push('id < ?');
+      parametros.push(apos);
+    }
+    const chave = `hardware-data:${periodo.meses || ''}:${apos || ''}:${tamanho}`;
+    await cache.responderJsonComCache(req, res, chave, async () => {
+      // Paginação por chave (id): cada página é uma busca no índice primário, sem OFFSET
+      const [rows] = await pool.query(
+        `SELECT * FROM hardware_data ${condicoes.length ? `WHERE ${condicoes.join(' AND ')}` : ''}
+         ORDER BY id DESC LIMIT ?`,
+        [...parametros, tamanho]
+      );
+      return {
+        success: true,
+        data: converter(await perfis.expandir(pool, rows)),
+        proximo: rows.length === tamanho ? rows[rows.length - 1].id : null
+      };
+    });
   } catch (error) {
     console.error('Erro ao buscar dados de hardware:', error);
     res.status(500).json({ 
@@ -139,86 +502,355 @@ app.get('/api/hardware-data', async (req, res) => {
   }
 });
 
+// API para receber a utilização agregada por hora (coletor em modo agente)
+app.post('/api/utilizacao', admissaoEnvio.middleware, async (req, res) => {
+  try {
+    const { nomeDispositivo, agregados } = req.body;
+    if (!nomeDispositivo || !Array.isArray(agregados) || agregados.length === 0) {
+      metricas.rejeicoes.inc({ motivo: 'dados_incompletos' });
+      return res.status(400).json({ success: false, message: 'nomeDispositivo e agregados são obrigatórios.' });
+    }
+    if (agregados.length > utilizacao.MAXIMO_AGREGADOS) {
+      metricas.rejeicoes.inc({ motivo: 'lote_grande' });
+      return res.status(413).json({
+        success: false,
+        message: `Envie no máximo ${utilizacao.MAXIMO_AGREGADOS} agregados por requisição.`
+      });
+    }
+    
+    const aceitos = await utilizacao.registrar(pool, nomeDispositivo, agregados, req.body.execucao);
+    res.status(201).json({ success: true, aceitos });
+  } catch (error) {
+    console.error('Erro ao registrar utilização:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao processar a requisição. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API para consultar a utilização de uma máquina (?horas=168)
+app.get('/api/hardware-data/:nomeDispositivo/utilizacao', async (req, res) => {
+  try {
+    const horas = Math.min(Math.max(parseInt(req.query.horas, 10) || 168, 1), 24 * 366);
+    const data = await utilizacao.obter(pool, req.params.nomeDispositivo, horas);
+    res.json({ success: true, data });
+  } catch (error) {
+    console.error('Erro ao buscar utilização:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar utilização. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API de saúde dos discos da frota (?situacao=falha,atencao&secretaria=...)
+app.get('/api/saude-discos', async (req, res) => {
+  try {
+    const situacoes = (req.query.situacao || '').split(',').map((s) => s.trim()).filter(Boolean);
+    const invalidas = situacoes.filter((s) => !saudeDiscos.SITUACOES.includes(s));
+    if (invalidas.length > 0) {
+      return res.status(400).json({
+        success: false,
+        message: `Situação inválida: ${invalidas.join(', ')}. Use ${saudeDiscos.SITUACOES.join(', ')}.`
+      });
+    }
+    const data = await saudeDiscos.listar(pool, { situacoes, secretaria: req.query.secretaria || null });
+    res.json({ success: true, data });
+  } catch (error) {
+    console.error('Erro ao buscar saúde dos discos:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar saúde dos discos. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API de estatísticas agregadas da frota (?secretaria=...&setor=...)
+app.get('/api/estatisticas', async (req, res) => {
+  try {
+    // Textos maiores que as colunas (100 caracteres) não correspondem a nenhuma máquina
+    const secretaria = String(req.query.secretaria || '').trim().slice(0, 100) || null;
+    const setor = String(req.query.setor || '').trim().slice(0, 100) || null;
+    const chave = `estatisticas:${secretaria || ''}\0${setor || ''}`;
+    await cache.responderJsonComCache(req, res, chave, async () => ({
+      success: true,
+      data: await estatisticas.obter(pool, { secretaria, setor })
+    }));
+  } catch (error) {
+    console.error('Erro ao buscar estatísticas:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar estatísticas. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API dos perfis de hardware da frota, dos mais comuns para os mais raros (?limite=50)
+app.get('/api/perfis', async (req, res) => {
+  try {
+    const limite = Math.min(Math.max(parseInt(req.query.limite, 10) || 50, 1), 1000);
+    await cache.responderJsonComCache(req, res, `perfis:${limite}`, async () => ({
+      success: true,
+      data: await perfis.listar(pool, { limite })
+    }));
+  } catch (error) {
+    console.error('Erro ao buscar perfis de hardware:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar perfis. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API de um perfil de hardware com as máquinas que o compartilham
+app.get('/api/perfis/:id', async (req, res) => {
+  try {
+    const id = parseInt(req.params.id, 10);
+    const data = Number.isNaN(id) ? null : await perfis.obter(pool, id);
+    if (!data) {
+      return res.status(404).json({ success: false, message: 'Perfil não encontrado.' });
+    }
+    res.json({ success: true, data });
+  } catch (error) {
+    console.error('Erro ao buscar perfil de hardware:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar perfil. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API dos programas instalados de uma máquina
+app.get('/api/hardware-data/:nomeDispositivo/programas', async (req, res) => {
+  try {
+    const data = await programas.listarDaMaquina(pool, req.params.nomeDispositivo);
+    res.json({ success: true, data });
+  } catch (error) {
+    console.error('Erro ao buscar programas instalados:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar programas. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API das máquinas com um programa (?nome=...&prefixo=1&versao=...)
+app.get('/api/programas', async (req, res) => {
+  try {
+    const nome = typeof req.query.nome === 'string' ? req.query.nome.trim() : '';
+    if (!nome) {
+      return res.status(400).json({ success: false, message: 'Informe o nome do programa.' });
+    }
+    const data = await programas.buscar(pool, {
+      nome,
+      prefixo: req.query.prefixo === '1',
+      versao: typeof req.query.versao === 'string' && req.query.versao ? req.query.versao : null
+    });
+    res.json({ success: true, data });
+  } catch (error) {
+    console.error('Erro ao buscar programas instalados:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar programas. Tente novamente mais tarde.' 
+    });
+  }
+});
+
+// API do perfil de uma máquina com as demais máquinas de mesmo hardware
+app.get('/api/hardware-data/:nomeDispositivo/perfil', async (req, res) => {
+  try {
+    const id = await perfis.perfilDaMaquina(pool, req.params.nomeDispositivo);
+    const data = id === null ? null : await perfis.obter(pool, id);
+    if (!data) {
+      return res.status(404).json({ success: false, message: 'Máquina sem perfil de hardware.' });
+    }
+    res.json({ success: true, data });
+  } catch (error) {
+    console.error('Erro ao buscar perfil de hardware:', error);
+    res.status(500).json({ 
+      success: false, 
+      message: 'Erro ao buscar perfil. Tente novamente mais tarde.' 
+    });
+  }
+});
+
 // Rota para visualização de dados
 app.get('/dados', (req, res) => {
   res.sendFile(path.join(__dirname, 'public', 'dados.html'));
 });
 
-// Rota para exportar dados para Excel
+// Gera a planilha do inventário completo (ou só das coletas desde `desde`)
+async function gerarPlanilhaExcel(desde = null) {
+  // Buscar dados do banco
+  const [rows] = await pool.execute(
+    `SELECT * FROM hardware_data ${desde ? 'WHERE dataColeta >= ?' : ''} ORDER BY dataColeta DESC`,
+    desde ? [desde] : []
+  );
+  await perfis.expandir(pool, rows);
+  
+  // Criar um novo workbook
+  const workbook = new ExcelJS.Workbook();
+  const worksheet = workbook.addWorksheet('Inventário de Hardware');
+  
+  // Definir cabeçalhos
+  worksheet.columns = [
+    { header: 'ID', key: 'id', width: 10 },
+    { header: 'Secretaria', key: 'secretaria', width: 20 },
+    { header: 'Setor', key: 'setor', width: 20 },
+    { header: 'Matrícula', key: 'matricula', width: 15 },
+    { header: 'Nome Completo', key: 'nomeCompleto', width: 30 },
+    { header: 'Nome do Dispositivo', key: 'nomeDispositivo', width: 25 },
+    { header: 'Processador', key: 'processador', width: 30 },
+    { header: 'Disco', key: 'disco', width: 15 },
+    { header: 'RAM', key: 'ram', width: 15 },
+    { header: 'Monitores', key: 'monitores', width: 40 },
+    { header: 'Data da Coleta', key: 'dataColeta', width: 20 }
+  ];
+  
+  // Estilizar cabeçalhos
+  worksheet.getRow(1).font = { bold: true };
+  worksheet.getRow(1).fill = {
+    type: 'pattern',
+    pattern: 'solid',
+    fgColor: { argb: 'FFD3D3D3' }
+  };
+  
+  // Adicionar dados
+  rows.forEach(row => {
+    // Formatar os monitores como string
+    const monitoresStr = JSON.parse(row.monitores || '[]')
+      .map(m => `${m.marca || 'N/A'} ${m.modelo || 'N/A'} ${m.tamanho || 'N/A'}`)
+      .join(', ');
+    
+    // Formatar a data
+    const data = new Date(row.dataColeta);
+    const dataFormatada = data.toLocaleString('pt-BR');
+    
+    worksheet.addRow({
+      ...row,
+      monitores: monitoresStr,
+      dataColeta: dataFormatada
+    });
+  });
+  
+  return workbook.xlsx.writeBuffer();
+}
+
+// Rota para exportar dados para Excel (planilha em cache até a próxima inserção; ?meses=N como na API)
 app.get('/exportar-excel', async (req, res) => {
   try {
-    // Buscar dados do banco
-    const [rows] = await pool.query('SELECT * FROM hardware_data ORDER BY dataColeta DESC');
-    
-    // Criar um novo workbook
-    const workbook = new ExcelJS.Workbook();
-    const worksheet = workbook.addWorksheet('Inventário de Hardware');
-    
-    // Definir cabeçalhos
-    worksheet.columns = [
-      { header: 'ID', key: 'id', width: 10 },
-      { header: 'Secretaria', key: 'secretaria', width: 20 },
-      { header: 'Setor', key: 'setor', width: 20 },
-      { header: 'Matrícula', key: 'matricula', width: 15 },
-      { header: 'Nome Completo', key: 'nomeCompleto', width: 30 },
-      { header: 'Nome do Dispositivo', key: 'nomeDispositivo', width: 25 },
-      { header: 'Processador', key: 'processador', width: 30 },
-      { header: 'Disco', key: 'disco', width: 15 },
-      { header: 'RAM', key: 'ram', width: 15 },
-      { header: 'Monitores', key: 'monitores', width: 40 },
-      { header: 'Data da Coleta', key: 'dataColeta', width: 20 }
-    ];
-    
-    // Estilizar cabeçalhos
-    worksheet.getRow(1).font = { bold: true };
-    worksheet.getRow(1).fill = {
-      type: 'pattern',
-      pattern: 'solid',
-      fgColor: { argb: 'FFD3D3D3' }
-    };
-    
-    // Adicionar dados
-    rows.forEach(row => {
-      // Formatar os monitores como string
-      const monitoresStr = JSON.parse(row.monitores || '[]')
-        .map(m => `${m.marca || 'N/A'} ${m.modelo || 'N/A'} ${m.tamanho || 'N/A'}`)
-        .join(', ');
-      
-      // Formatar a data
-      const data = new Date(row.dataColeta);
-      const dataFormatada = data.toLocaleString('pt-BR');
-      
-      worksheet.addRow({
-        ...row,
-        monitores: monitoresStr,
-        dataColeta: dataFormatada
-      });
+    const periodo = lerPeriodo(req);
+    if (!periodo) {
+      return res.status(400).send('meses deve ser um inteiro positivo.');
+    }
+    await cache.responderComCache(req, res, `exportar-excel:${periodo.meses || ''}`, async () => {
+      const inicio = process.hrtime.bigint();
+      const corpo = Buffer.from(await gerarPlanilhaExcel(periodo.desde));
+      metricas.duracaoExportacao.observar({ formato: 'xlsx' }, Number(process.hrtime.bigint() - inicio) / 1e9);
+      return {
+        corpo,
+        tipo: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        cabecalhos: { 'Content-Disposition': 'attachment; filename=inventario_hardware.xlsx' },
+        comprimivel: false
+      };
     });
-    
-    // Configurar resposta
-    res.setHeader('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet');
-    res.setHeader('Content-Disposition', 'attachment; filename=inventario_hardware.xlsx');
-    
-    // Escrever para o response
-    await workbook.xlsx.write(res);
-    res.end();
   } catch (error) {
     console.error('Erro ao exportar para Excel:', error);
     res.status(500).send('Erro ao gerar o arquivo Excel. Tente novamente mais tarde.');
   }
 });
 
-// Inicializar o servidor
+// Invalidação do cache de leitura por ferramentas locais que gravam direto no banco (importador NDJSON)
+app.post('/api/cache/invalidar', (req, res) => {
+  const local = ['127.0.0.1', '::1', '::ffff:127.0.0.1'].includes(req.socket.remoteAddress);
+  if (!local) {
+    return res.status(403).json({ success: false, message: 'Permitido apenas a partir do próprio servidor.' });
+  }
+  cache.notificarAlteracao();
+  res.status(204).end();
+});
+
+// Métricas no formato Prometheus
+app.get('/metrics', async (req, res) => {
+  try {
+    res.setHeader('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+    res.send(await metricas.exportar());
+  } catch (error) {
+    console.error('Erro ao gerar métricas:', error);
+    res.status(500).send('Erro ao gerar métricas');
+  }
+});
+
+// Inicializar o servidor (processo único ou worker do cluster)
+function iniciarHttp() {
+  if (diario) {
+    diarioIngestao.iniciarGravador(diario, pool, concluirLoteDiario);
+  }
+  app.listen(PORT, () => {
+    if (cluster.isWorker) {
+      console.log(`Worker ${process.pid} atendendo na porta ${PORT}`);
+    } else {
+      console.log(`Servidor rodando na porta ${PORT}`);
+      console.log(`Acesse: http://localhost:${PORT}`);
+    }
+  });
+}
+
+// Processo principal do cluster: prepara o banco uma única vez e cria um worker por núcleo
+async function iniciarCluster() {
+  console.log(`Iniciando ${SERVER_WORKERS} workers (processo principal ${process.pid})`);
+  
+  // Repassar invalidações de cache, cadastros pendentes no diário e métricas entre os workers
+  cache.configurarPrimario();
+  metricas.configurarPrimario();
+  if (diario) diarioIngestao.configurarPrimario();
+  
+  for (let i = 0; i < SERVER_WORKERS; i++) {
+    cluster.fork();
+  }
+  
+  // Recriar workers que terminarem inesperadamente
+  cluster.on('exit', (worker, code, signal) => {
+    if (code !== 0 && !worker.exitedAfterDisconnect) {
+      console.error(`Worker ${worker.process.pid} terminou (${signal || code}). Iniciando outro...`);
+      cluster.fork();
+    }
+  });
+  
+  console.log(`Servidor rodando na porta ${PORT}`);
+  console.log(`Acesse: http://localhost:${PORT}`);
+}
+
 async function iniciarServidor() {
   try {
+    if (cluster.isWorker) {
+      iniciarHttp();
+      return;
+    }
+    
     // Configurar o banco de dados
     await setupDatabase();
+    await historico.criarTabelas(pool);
+    await normalizacao.criarTabelas(pool);
+    await estatisticas.criarTabelas(pool);
+    await utilizacao.criarTabelas(pool);
+    await saudeDiscos.criarTabelas(pool);
+    await perfis.criarTabelas(pool);
+    await programas.criarTabelas(pool);
+    await particoes.criarTabelas(pool);
+    await particoes.garantir(pool);
+    if (diario) {
+      await diarioIngestao.criarTabelas(pool);
+    }
     
-    // Iniciar o servidor
-    app.listen(PORT, () => {
-      console.log(`Servidor rodando na porta ${PORT}`);
-      console.log(`Acesse: http://localhost:${PORT}`);
-    });
+    if (SERVER_WORKERS > 1) {
+      // O pool do processo principal não atende requisições
+      await pool.end();
+      await iniciarCluster();
+    } else {
+      iniciarHttp();
+    }
   } catch (error) {
     console.error('Erro ao iniciar o servidor:', error);
     process.exit(1);
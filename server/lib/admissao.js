@@ -0,0 +1,124 @@
+// Controle de admissão por endpoint (token bucket com fila limitada).
+//
+// Cada limitador libera `taxa` requisições por segundo, com rajadas de até
+// `rajada`. Quem chega sem ficha disponível espera na fila; com a fila cheia a
+// resposta é 429 com Retry-After, para que os coletores tentem de novo mais tarde
+// em vez de esgotar o pool do banco todos ao mesmo tempo.
+
+function criarLimitador(nome, { taxa, rajada, fila, aoRejeitar = null }) {
+  const limitador = {
+    nome,
+    taxa,
+    rajada: Math.max(1, rajada || Math.ceil(taxa)),
+    tamanhoFila: fila,
+    fichas: Math.max(1, rajada || Math.ceil(taxa)),
+    ultimoAbastecimento: Date.now(),
+    espera: [],
+    timer: null,
+    rejeitadas: 0,
+    aoRejeitar
+  };
+  return limitador;
+}
+
+function abastecer(limitador) {
+  const agora = Date.now();
+  const decorrido = (agora - limitador.ultimoAbastecimento) / 1000;
+  limitador.fichas = Math.min(limitador.rajada, limitador.fichas + decorrido * limitador.taxa);
+  limitador.ultimoAbastecimento = agora;
+}
+
+// Libera as requisições da fila conforme as fichas vão sendo repostas
+function processarFila(limitador) {
+  limitador.timer = null;
+  abastecer(limitador);
+
+  while (limitador.espera.length > 0 && limitador.fichas >= 1) {
+    const proxima = limitador.espera.shift();
+    if (proxima.cancelada) continue;
+    limitador.fichas -= 1;
+    proxima.liberar();
+  }
+
+  if (limitador.espera.length > 0) {
+    const atraso = Math.ceil(((1 - limitador.fichas) / limitador.taxa) * 1000);
+    limitador.timer = setTimeout(() => processarFila(limitador), Math.max(1, atraso));
+  }
+}
+
+// Segundos até a fila atual (mais esta requisição) ser atendida
+function estimarRetryAfter(limitador) {
+  return Math.max(1, Math.ceil((limitador.espera.length + 1) / limitador.taxa));
+}
+
+function middleware(limitador) {
+  return (req, res, next) => {
+    abastecer(limitador);
+
+    if (limitador.espera.length === 0 && limitador.fichas >= 1) {
+      limitador.fichas -= 1;
+      return next();
+    }
+
+    if (limitador.espera.length >= limitador.tamanhoFila) {
+      limitador.rejeitadas++;
+      if (limitador.aoRejeitar) limitador.aoRejeitar();
+      res.setHeader('Retry-After', String(estimarRetryAfter(limitador)));
+      return res.status(429).json({
+        success: false,
+        message: 'Servidor ocupado. Tente novamente em instantes.'
+      });
+    }
+
+    const item = { cancelada: false, liberar: next };
+    limitador.espera.push(item);
+
+    // Cliente desistiu enquanto aguardava: libera a vaga na fila. O 'close' da
+    // requisição não serve: ele dispara assim que o corpo termina de ser lido
+    // (body-parser), com o cliente ainda esperando a resposta.
+    res.on('close', () => {
+      if (!res.writableFinished) item.cancelada = true;
+    });
+
+    if (!limitador.timer) {
+      processarFila(limitador);
+    }
+  };
+}
+
+function estado(limitador) {
+  return {
+    nome: limitador.nome,
+    fila: limitador.espera.length,
+    rejeitadas: limitador.rejeitadas
+  };
+}
+
+// Cria o middleware a partir das variáveis de ambiente <PREFIXO>_TAXA/_RAJADA/_FILA.
+// Taxa 0 desativa o controle. Em modo cluster a taxa é dividida entre os workers.
+function deAmbiente(nome, prefixo, padrao, workers = 1, aoRejeitar = null) {
+  const ler = (sufixo, valorPadrao) => {
+    const valor = parseFloat(process.env[`${prefixo}_${sufixo}`]);
+    return Number.isNaN(valor) ? valorPadrao : valor;
+  };
+
+  const taxa = ler('TAXA', padrao.taxa);
+  if (taxa <= 0) {
+    return { limitador: null, middleware: (req, res, next) => next() };
+  }
+
+  const limitador = criarLimitador(nome, {
+    taxa: taxa / workers,
+    rajada: Math.ceil(ler('RAJADA', padrao.rajada || taxa) / workers),
+    fila: Math.ceil(ler('FILA', padrao.fila) / workers),
+    aoRejeitar
+  });
+  return { limitador, middleware: middleware(limitador) };
+}
+
+module.exports = {
+  criarLimitador,
+  middleware,
+  estado,
+  deAmbiente
+};
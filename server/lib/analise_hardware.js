@@ -0,0 +1,252 @@
+// Interpretação dos textos enviados pelos coletores.
+//
+// Os coletores mandam processador, disco, RAM e monitores como texto livre, em
+// formatos diferentes no Windows (linhas "Chave: valor") e no Linux (resumo em
+// uma linha). Estas funções convertem os dois formatos em objetos estruturados
+// usados pelas tabelas normalizadas e pelas estatísticas da frota.
+
+const UNIDADES_GB = { K: 1 / (1024 * 1024), M: 1 / 1024, G: 1, T: 1024, P: 1024 * 1024 };
+
+function numero(valor) {
+  if (valor === undefined || valor === null) return null;
+  const n = parseFloat(String(valor).replace(',', '.'));
+  return Number.isNaN(n) ? null : n;
+}
+
+function inteiro(valor) {
+  const n = parseInt(valor, 10);
+  return Number.isNaN(n) ? null : n;
+}
+
+function texto(valor) {
+  if (valor === undefined || valor === null) return null;
+  const limpo = String(valor).trim();
+  return limpo && !/^(N\/A|Não disponível|Desconhecido|Não identificado)$/i.test(limpo) ? limpo : null;
+}
+
+// "Chave: valor" por linha -> objeto (primeira ocorrência de cada chave)
+function chavesValores(bloco) {
+  const resultado = {};
+  for (const linha of bloco.split('\n')) {
+    const indice = linha.indexOf(':');
+    if (indice <= 0) continue;
+    const chave = linha.slice(0, indice).trim();
+    if (!(chave in resultado)) resultado[chave] = linha.slice(indice + 1).trim();
+  }
+  return resultado;
+}
+
+function tipoDisco(valor) {
+  const t = (valor || '').toUpperCase();
+  if (t.includes('SSD') || t.includes('NVME')) return 'SSD';
+  if (t.includes('HDD')) return 'HDD';
+  return null;
+}
+
+// Só "12ª Geração" (Intel Core) entra nas estatísticas; "2ª Geração Xeon Scalable" ou
+// "3ª Geração EPYC" numeram outra linha de produtos e não são comparáveis
+function geracaoCore(valor) {
+  const geracao = /^(\d+)ª Geração$/.exec((valor || '').trim());
+  return geracao ? inteiro(geracao[1]) : null;
+}
+
+function analisarProcessador(valor) {
+  if (!valor || typeof valor !== 'string') return null;
+
+  if (valor.includes('Modelo:')) {
+    const campos = chavesValores(valor);
+    return {
+      fabricante: texto(campos['Fabricante']),
+      modelo: texto(campos['Modelo']),
+      geracao: geracaoCore(campos['Geração']),
+      arquitetura: texto(campos['Arquitetura']),
+      nucleos: inteiro(campos['Núcleos']),
+      threads: inteiro(campos['Threads']),
+      frequenciaMaxMHz: numero(campos['Frequência máxima'])
+    };
+  }
+
+  // Linux: "GenuineIntel Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz, 4 núcleos, 8 threads, 1.80 GHz"
+  // seguido, quando identificados, de família, geração e microarquitetura (", Core i5, 8ª Geração, Kaby Lake R")
+  const linux = valor.match(
+    /^(\S+)\s+(.*?),\s*(\d+|Desconhecido) núcleos(?: \(\d+P \+ \d+E\))?,\s*(\d+|Desconhecido) threads/
+  );
+  if (linux) {
+    const fabricante = /intel/i.test(linux[1]) ? 'Intel' : /amd/i.test(linux[1]) ? 'AMD' : texto(linux[1]);
+    return {
+      fabricante,
+      modelo: texto(linux[2]),
+      geracao: geracaoCore((valor.match(/,\s*(\d+ª Geração)(?=,|$)/) || [])[1]),
+      arquitetura: null,
+      nucleos: inteiro(linux[3]),
+      threads: inteiro(linux[4]),
+      frequenciaMaxMHz: null
+    };
+  }
+
+  // Fallback sem WMI: "<descrição> (Utilização: x%, Frequência: y MHz)"
+  return {
+    fabricante: /intel/i.test(valor) ? 'Intel' : /amd/i.test(valor) ? 'AMD' : null,
+    modelo: texto(valor.replace(/\s*\(Utilização:.*$/, '')),
+    geracao: null,
+    arquitetura: null,
+    nucleos: null,
+    threads: null,
+    frequenciaMaxMHz: null
+  };
+}
+
+function analisarDiscos(valor) {
+  if (!valor || typeof valor !== 'string') return [];
+  const discos = [];
+
+  if (valor.includes('Disco:')) {
+    let atual = null;
+    for (const linha of valor.split('\n')) {
+      const conteudo = linha.trim();
+      if (conteudo.startsWith('Disco:')) {
+        atual = {
+          modelo: texto(conteudo.slice(6)),
+          fabricante: null,
+          tipo: null,
+          interface: null,
+          capacidadeGB: null,
+          particoes: []
+        };
+        discos.push(atual);
+      } else if (!atual) {
+        continue;
+      } else if (conteudo.startsWith('Fabricante:')) {
+        atual.fabricante = texto(conteudo.slice(11));
+      } else if (conteudo.startsWith('Tipo:')) {
+        atual.tipo = tipoDisco(conteudo.slice(5));
+      } else if (conteudo.startsWith('Interface:')) {
+        atual.interface = texto(conteudo.slice(10));
+      } else if (conteudo.startsWith('Capacidade:')) {
+        atual.capacidadeGB = numero(conteudo.slice(11));
+      } else {
+        const particao = conteudo.match(/^-\s*Unidade (\S+?):? ([\d.]+) GB livre de ([\d.]+) GB/);
+        if (particao) {
+          atual.particoes.push({
+            unidade: particao[1],
+            livreGB: numero(particao[2]),
+            tamanhoGB: numero(particao[3])
+          });
+        }
+      }
+    }
+    return discos;
+  }
+
+  // Linux: "sda: Modelo (238.5G, SSD), nvme0n1: Modelo (476.9G)"
+  const padrao = /(\S+): (.*?) \(([\d.,]+)([KMGTP])?(?:, (SSD|HDD))?\)/g;
+  let encontrado;
+  while ((encontrado = padrao.exec(valor)) !== null) {
+    const unidade = UNIDADES_GB[encontrado[4] || 'G'];
+    discos.push({
+      modelo: texto(encontrado[2]),
+      fabricante: null,
+      tipo: tipoDisco(encontrado[5]) || (encontrado[1].startsWith('nvme') ? 'SSD' : null),
+      interface: encontrado[1].startsWith('nvme') ? 'NVMe' : null,
+      capacidadeGB: numero(encontrado[3]) * unidade,
+      particoes: []
+    });
+  }
+  return discos;
+}
+
+function analisarMemoria(valor) {
+  const resultado = { totalGB: null, modulos: [] };
+  if (!valor || typeof valor !== 'string') return resultado;
+
+  const uso = valor.match(/([\d.]+) GB \/ ([\d.]+) GB/);
+  const total = valor.match(/^Total: ([\d.]+) GB/);
+  if (uso) resultado.totalGB = numero(uso[2]);
+  else if (total) resultado.totalGB = numero(total[1]);
+
+  if (valor.includes('Módulo:')) {
+    for (const bloco of valor.split(/\n\s*\n/)) {
+      if (!bloco.includes('Módulo:')) continue;
+      const campos = chavesValores(bloco);
+      resultado.modulos.push({
+        capacidadeGB: numero(campos['Módulo']),
+        frequenciaMHz: inteiro(campos['Frequência']),
+        fabricante: texto(campos['Fabricante']),
+        tipo: texto(campos['Tipo']),
+        partNumber: texto(campos['Part Number'])
+      });
+    }
+  } else {
+    // Linux (dmidecode): "8 GB DDR4 2667 MT/s, 8192 MB DDR4 2667 MT/s"
+    const padrao = /([\d.]+) (MB|GB) (\S+) (\d+)/g;
+    let encontrado;
+    while ((encontrado = padrao.exec(valor)) !== null) {
+      const capacidade = numero(encontrado[1]);
+      resultado.modulos.push({
+        capacidadeGB: encontrado[2] === 'MB' ? capacidade / 1024 : capacidade,
+        frequenciaMHz: inteiro(encontrado[4]),
+        fabricante: null,
+        tipo: texto(encontrado[3]),
+        partNumber: null
+      });
+    }
+  }
+
+  if (resultado.totalGB === null && resultado.modulos.length > 0) {
+    resultado.totalGB = resultado.modulos.reduce((soma, m) => soma + (m.capacidadeGB || 0), 0);
+  }
+  return resultado;
+}
+
+function analisarMonitores(valor) {
+  if (valor === undefined || valor === null) return [];
+
+  let dados = valor;
+  if (typeof dados === 'string') {
+    try {
+      dados = JSON.parse(dados);
+    } catch (e) {
+      // Texto simples (coletor Windows)
+    }
+  }
+
+  // Linux/Go: ["Monitor 1: Fabricante Modelo, 21.5\", 1920x1080", ...]
+  if (Array.isArray(dados)) {
+    return dados
+      .map((item) => String(item).match(/^Monitor \d+: (.*?),\s*(?:([\d.]+)"|[^,]*)/))
+      .filter(Boolean)
+      .map((m) => ({ fabricante: null, modelo: texto(m[1]), tamanhoPolegadas: numero(m[2]) }));
+  }
+
+  if (typeof dados !== 'string') return [];
+
+  // Windows: blocos "Monitor: ...\nFabricante: ...\nTamanho: 21.5 polegadas (...)"
+  return dados.split(/\n\s*\n/)
+    .filter((bloco) => bloco.trim().startsWith('Monitor:'))
+    .map((bloco) => {
+      const campos = chavesValores(bloco);
+      return {
+        fabricante: texto(campos['Fabricante']),
+        modelo: texto(campos['Monitor']),
+        tamanhoPolegadas: numero((campos['Tamanho'] || '').split(' ')[0])
+      };
+    });
+}
+
+// Estrutura completa de uma coleta
+function analisarColeta(dados) {
+  return {
+    processador: analisarProcessador(dados.processador),
+    discos: analisarDiscos(dados.disco),
+    memoria: analisarMemoria(dados.ram),
+    monitores: analisarMonitores(dados.monitores)
+  };
+}
+
+module.exports = {
+  analisarProcessador,
+  analisarDiscos,
+  analisarMemoria,
+  analisarMonitores,
+  analisarColeta
+};
@@ -0,0 +1,213 @@
+const crypto = require('crypto');
+const zlib = require('zlib');
+const cluster = require('cluster');
+
+// Cache em memória das respostas de leitura.
+//
+// Cada entrada guarda o corpo já serializado, o ETag (hash do conteúdo) e as
+// versões comprimidas, geradas uma única vez. Toda inserção incrementa a versão
+// e descarta as entradas; em modo cluster o worker que inseriu avisa os demais
+// através do processo principal.
+//
+// As chaves vêm dos parâmetros da consulta (período, página, filtros), então o
+// cache é limitado por bytes (corpo + versões comprimidas) e por quantidade de
+// entradas: quando passa de um dos limites, as menos usadas recentemente saem.
+
+const TAMANHO_MINIMO_COMPRESSAO = 1024;
+const MAXIMO_BYTES = (parseFloat(process.env.CACHE_MAXIMO_MB) || 64) * 1024 * 1024;
+const MAXIMO_ENTRADAS = parseInt(process.env.CACHE_MAXIMO_ENTRADAS, 10) || 200;
+
+let versao = 0;
+// Map em ordem de uso: a primeira entrada é a menos usada recentemente
+const entradas = new Map();
+const emAndamento = new Map();
+let bytesEmUso = 0;
+
+function versaoAtual() {
+  return versao;
+}
+
+function invalidar() {
+  versao++;
+  entradas.clear();
+  emAndamento.clear();
+  bytesEmUso = 0;
+}
+
+function tamanhoEntrada(entrada) {
+  return entrada.chave.length + entrada.corpo.length +
+    Object.values(entrada.comprimidos).reduce((total, corpo) => total + corpo.length, 0);
+}
+
+// Descarta as entradas menos usadas até respeitar os limites
+function aplicarLimites() {
+  for (const [chave, entrada] of entradas) {
+    if (bytesEmUso <= MAXIMO_BYTES && entradas.size <= MAXIMO_ENTRADAS) break;
+    entradas.delete(chave);
+    bytesEmUso -= tamanhoEntrada(entrada);
+  }
+}
+
+function guardar(chave, entrada) {
+  // Resposta maior que o cache inteiro: é servida, mas não guardada
+  if (entrada.corpo.length > MAXIMO_BYTES) return;
+  entrada.chave = chave;
+  entradas.set(chave, entrada);
+  bytesEmUso += tamanhoEntrada(entrada);
+  aplicarLimites();
+}
+
+// Chamada após qualquer escrita em hardware_data
+function notificarAlteracao() {
+  invalidar();
+  if (cluster.isWorker && process.send) {
+    process.send({ tipo: 'cache:invalidar' });
+  }
+}
+
+// Workers recebem as invalidações feitas pelos outros workers
+if (cluster.isWorker) {
+  process.on('message', (mensagem) => {
+    if (mensagem && mensagem.tipo === 'cache:invalidar') {
+      invalidar();
+    }
+  });
+}
+
+// No processo principal, repassa a invalidação para os demais workers
+function configurarPrimario() {
+  cluster.on('message', (origem, mensagem) => {
+    if (!mensagem || mensagem.tipo !== 'cache:invalidar') return;
+    for (const worker of Object.values(cluster.workers)) {
+      if (worker && worker.id !== origem.id) {
+        worker.send(mensagem);
+      }
+    }
+  });
+}
+
+function criarEntrada({ corpo, tipo, cabecalhos, comprimivel }) {
+  const buffer = Buffer.isBuffer(corpo) ? corpo : Buffer.from(corpo);
+  return {
+    hash: crypto.createHash('sha1').update(buffer).digest('hex'),
+    corpo: buffer,
+    tipo,
+    cabecalhos: cabecalhos || {},
+    // Formatos já comprimidos (ex.: xlsx) não ganham nada com gzip/brotli
+    comprimivel: comprimivel !== false,
+    comprimidos: {}
+  };
+}
+
+// Obtém a entrada do cache ou a produz; requisições simultâneas compartilham a mesma consulta
+async function obter(chave, produzir) {
+  const existente = entradas.get(chave);
+  if (existente) {
+    // Reinsere para marcar como usada recentemente
+    entradas.delete(chave);
+    entradas.set(chave, existente);
+    return existente;
+  }
+
+  if (emAndamento.has(chave)) return emAndamento.get(chave);
+
+  const versaoInicial = versao;
+  const promessa = (async () => {
+    try {
+      const entrada = criarEntrada(await produzir());
+      // Só guarda se nada foi inserido enquanto a consulta rodava
+      if (versao === versaoInicial) {
+        guardar(chave, entrada);
+      }
+      return entrada;
+    } finally {
+      if (emAndamento.get(chave) === promessa) {
+        emAndamento.delete(chave);
+      }
+    }
+  })();
+
+  emAndamento.set(chave, promessa);
+  return promessa;
+}
+
+function escolherCodificacao(req, entrada) {
+  if (!entrada.comprimivel || entrada.corpo.length < TAMANHO_MINIMO_COMPRESSAO) return null;
+  const aceitas = (req.headers['accept-encoding'] || '').toLowerCase();
+  if (/\bbr\b/.test(aceitas)) return 'br';
+  if (/\bgzip\b/.test(aceitas)) return 'gzip';
+  return null;
+}
+
+function comprimir(entrada, codificacao) {
+  if (!entrada.comprimidos[codificacao]) {
+    entrada.comprimidos[codificacao] = codificacao === 'br'
+      ? zlib.brotliCompressSync(entrada.corpo, {
+          params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 5 }
+        })
+      : zlib.gzipSync(entrada.corpo, { level: 6 });
+    // A versão comprimida conta no limite enquanto a entrada estiver no cache
+    if (entradas.get(entrada.chave) === entrada) {
+      bytesEmUso += entrada.comprimidos[codificacao].length;
+      aplicarLimites();
+    }
+  }
+  return entrada.comprimidos[codificacao];
+}
+
+// ETag forte por representação: mesmo hash, sufixo da codificação
+function etagPara(entrada, codificacao) {
+  return `"${entrada.hash}${codificacao ? '-' + codificacao : ''}"`;
+}
+
+function correspondeIfNoneMatch(req, entrada) {
+  const cabecalho = req.headers['if-none-match'];
+  if (!cabecalho) return false;
+  if (cabecalho.trim() === '*') return true;
+  return cabecalho.split(',').some((etag) => {
+    const valor = etag.trim().replace(/^W\//, '').replace(/"/g, '');
+    return valor.split('-')[0] === entrada.hash;
+  });
+}
+
+// Responde a partir do cache com ETag, 304 e compressão
+async function responderComCache(req, res, chave, produzir) {
+  const entrada = await obter(chave, produzir);
+  const codificacao = escolherCodificacao(req, entrada);
+
+  res.setHeader('ETag', etagPara(entrada, codificacao));
+  res.setHeader('Cache-Control', 'no-cache');
+  res.setHeader('Vary', 'Accept-Encoding');
+  for (const [nome, valor] of Object.entries(entrada.cabecalhos)) {
+    res.setHeader(nome, valor);
+  }
+
+  if (correspondeIfNoneMatch(req, entrada)) {
+    return res.status(304).end();
+  }
+
+  const corpo = codificacao ? comprimir(entrada, codificacao) : entrada.corpo;
+  res.setHeader('Content-Type', entrada.tipo);
+  res.setHeader('Content-Length', corpo.length);
+  if (codificacao) {
+    res.setHeader('Content-Encoding', codificacao);
+  }
+  res.status(200).end(corpo);
+}
+
+// Atalho para respostas JSON
+function responderJsonComCache(req, res, chave, produzirDados) {
+  return responderComCache(req, res, chave, async () => ({
+    corpo: JSON.stringify(await produzirDados()),
+    tipo: 'application/json; charset=utf-8'
+  }));
+}
+
+module.exports = {
+  versaoAtual,
+  invalidar,
+  notificarAlteracao,
+  configurarPrimario,
+  responderComCache,
+  responderJsonComCache
+};
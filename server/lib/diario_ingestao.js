@@ -0,0 +1,470 @@
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+const cluster = require('cluster');
+const perfis = require('./perfis');
+
+// Diário de ingestão (write-behind) de POST /api/hardware-data.
+//
+// Com INGESTAO_DIARIO definido, o servidor valida o cadastro, acrescenta-o a um
+// arquivo local (uma linha JSON por registro, com fdatasync antes de responder)
+// e responde 202 com o id do registro. Um gravador em segundo plano aplica o
+// diário em hardware_data com INSERTs de várias linhas e tenta de novo, com
+// espera crescente, enquanto o MySQL estiver lento ou fora do ar.
+//
+// Cada processo (worker do cluster) escreve nos seus próprios segmentos
+// (<início>-<pid>-<n>.ndjson). Gravações simultâneas dividem o mesmo fdatasync.
+// O gravador fecha o segmento aberto a cada ciclo e aplica os fechados em
+// ordem; o avanço em cada segmento fica em diario_ingestao, na mesma transação
+// do INSERT, então um lote nunca é inserido duas vezes, mesmo que o processo
+// caia no meio. Segmentos de processos que terminaram são adotados pelo
+// gravador seguinte. Registros que o banco recusa (dados inválidos) vão para
+// rejeitados.ndjson em vez de travar o diário.
+//
+// Os cadastros pendentes (nome e matrícula) de cada worker são repassados aos
+// demais através do processo principal, como as invalidações do cache: a
+// verificação de cadastro e o /lote de qualquer worker enxergam o diário
+// inteiro. Um worker novo pede o estado dos outros ao iniciar, e o de um worker
+// encerrado é descartado (os segmentos dele são adotados e anunciados de novo).
+
+const TAMANHOS = {
+  secretaria: 100, setor: 100, matricula: 20, usuarioLogado: 100, nomeCompleto: 200, nomeDispositivo: 100
+};
+const CAMPOS_TEXTO = ['processador', 'disco', 'ram'];
+const MAXIMO_BYTES_TEXTO = 65535;
+const ESPERA_MAXIMA = 30000;
+const PADRAO_SEGMENTO = /^(\d+)-(\d+)-(\d+)\.ndjson$/;
+
+async function criarTabelas(pool) {
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS diario_ingestao (
+      segmento CHAR(36) PRIMARY KEY,
+      aplicadas INT NOT NULL,
+      atualizadoEm DATETIME NOT NULL
+    )
+  `);
+  console.log('Tabela do diário de ingestão verificada/criada com sucesso!');
+}
+
+// Retorna a mensagem de erro do cadastro, ou null se o banco vai aceitá-lo
+function validar(dados) {
+  for (const [campo, tamanho] of Object.entries(TAMANHOS)) {
+    if (typeof dados[campo] !== 'string') return `campo ${campo} deve ser texto`;
+    if (dados[campo].length > tamanho) return `campo ${campo} maior que ${tamanho} caracteres`;
+  }
+  for (const campo of CAMPOS_TEXTO) {
+    if (typeof dados[campo] !== 'string') return `campo ${campo} ausente`;
+    if (Buffer.byteLength(dados[campo]) > MAXIMO_BYTES_TEXTO) return `campo ${campo} maior que 64 KB`;
+  }
+  return null;
+}
+
+function criarDiario(diretorio, { lote = 200, intervalo = 1000, maximoPendentes = 100000 } = {}) {
+  fs.mkdirSync(diretorio, { recursive: true });
+  const diario = {
+    diretorio,
+    lote,
+    intervalo,
+    maximoPendentes,
+    aberto: null,
+    sequencia: 0,
+    fechados: [],
+    // Registros de cada segmento já descontados de `pendentes` (segmentos retomados após falha)
+    descontados: new Map(),
+    aEscrever: [],
+    agendado: false,
+    cadeia: Promise.resolve(),
+    pendentes: 0,
+    // Cadastros no diário ainda não aplicados, para a verificação de cadastro
+    nomes: new Map(),
+    matriculas: new Map(),
+    // Os mesmos contadores dos demais workers do cluster, por pid
+    outros: new Map(),
+    falhasSeguidas: 0,
+    ultimoErro: null,
+    rejeitados: 0,
+    timer: null
+  };
+  if (cluster.isWorker && process.send) {
+    process.on('message', (mensagem) => receber(diario, mensagem));
+    process.send({ tipo: 'diario:sincronizar', pid: process.pid });
+  }
+  return diario;
+}
+
+// Operações no segmento aberto (gravação e fechamento) rodam uma de cada vez
+function encadear(diario, operacao) {
+  const resultado = diario.cadeia.then(operacao);
+  diario.cadeia = resultado.catch(() => {});
+  return resultado;
+}
+
+function contar(mapa, chave, delta) {
+  const total = (mapa.get(chave) || 0) + delta;
+  if (total > 0) mapa.set(chave, total);
+  else mapa.delete(chave);
+}
+
+function marcarPendentes(diario, registros, delta) {
+  diario.pendentes += delta * registros.length;
+  for (const { dados } of registros) {
+    contar(diario.nomes, dados.nomeDispositivo, delta);
+    contar(diario.matriculas, dados.matricula, delta);
+  }
+  if (cluster.isWorker && process.send && registros.length > 0) {
+    process.send({
+      tipo: 'diario:pendentes',
+      pid: process.pid,
+      delta,
+      nomes: registros.map(({ dados }) => dados.nomeDispositivo),
+      matriculas: registros.map(({ dados }) => dados.matricula)
+    });
+  }
+}
+
+// Mensagens dos outros workers, repassadas pelo processo principal
+function receber(diario, mensagem) {
+  if (!mensagem || typeof mensagem.tipo !== 'string' || !mensagem.tipo.startsWith('diario:')) return;
+  if (mensagem.pid === process.pid) return;
+
+  if (mensagem.tipo === 'diario:pendentes') {
+    if (!diario.outros.has(mensagem.pid)) {
+      diario.outros.set(mensagem.pid, { nomes: new Map(), matriculas: new Map() });
+    }
+    const outro = diario.outros.get(mensagem.pid);
+    for (const nome of mensagem.nomes) contar(outro.nomes, nome, mensagem.delta);
+    for (const matricula of mensagem.matriculas) contar(outro.matriculas, matricula, mensagem.delta);
+  } else if (mensagem.tipo === 'diario:estado') {
+    // Estado completo substitui os avisos anteriores do mesmo worker
+    diario.outros.set(mensagem.pid, { nomes: new Map(mensagem.nomes), matriculas: new Map(mensagem.matriculas) });
+  } else if (mensagem.tipo === 'diario:encerrado') {
+    diario.outros.delete(mensagem.pid);
+  } else if (mensagem.tipo === 'diario:sincronizar' && process.send) {
+    process.send({
+      tipo: 'diario:estado',
+      pid: process.pid,
+      para: mensagem.pid,
+      nomes: [...diario.nomes],
+      matriculas: [...diario.matriculas]
+    });
+  }
+}
+
+// No processo principal, repassa os pendentes entre os workers e descarta os de quem terminou
+function configurarPrimario() {
+  cluster.on('message', (origem, mensagem) => {
+    if (!mensagem || typeof mensagem.tipo !== 'string' || !mensagem.tipo.startsWith('diario:')) return;
+    for (const worker of Object.values(cluster.workers)) {
+      if (!worker || worker.id === origem.id) continue;
+      if (mensagem.para !== undefined && worker.process.pid !== mensagem.para) continue;
+      worker.send(mensagem);
+    }
+  });
+  cluster.on('exit', (worker) => {
+    for (const outro of Object.values(cluster.workers)) {
+      if (outro && outro.isConnected()) outro.send({ tipo: 'diario:encerrado', pid: worker.process.pid });
+    }
+  });
+}
+
+async function abrirSegmento(diario) {
+  if (!diario.aberto) {
+    const nome = `${Date.now()}-${process.pid}-${diario.sequencia++}.ndjson`;
+    const caminho = path.join(diario.diretorio, nome);
+    diario.aberto = { caminho, handle: await fs.promises.open(caminho, 'a'), linhas: 0 };
+  }
+  return diario.aberto;
+}
+
+async function fecharAberto(diario) {
+  const aberto = diario.aberto;
+  if (!aberto) return;
+  diario.aberto = null;
+  await aberto.handle.close().catch(() => {});
+  if (aberto.linhas > 0) diario.fechados.push(aberto.caminho);
+  else await fs.promises.unlink(aberto.caminho).catch(() => {});
+}
+
+async function gravarGrupo(diario, grupo) {
+  try {
+    const aberto = await abrirSegmento(diario);
+    await aberto.handle.appendFile(grupo.map((item) => item.linha).join(''));
+    await aberto.handle.datasync();
+    aberto.linhas += grupo.length;
+    marcarPendentes(diario, grupo.map((item) => item.registro), 1);
+    for (const item of grupo) item.resolve(item.registro.id);
+  } catch (error) {
+    // A linha pode ter ficado pela metade: as próximas vão para um segmento novo
+    await fecharAberto(diario);
+    for (const item of grupo) item.reject(error);
+  }
+}
+
+// Acrescenta o cadastro ao diário. Resolve com o id do registro depois do fdatasync.
+function acrescentar(diario, dados) {
+  const registro = { id: crypto.randomUUID(), recebidoEm: new Date().toISOString(), dados };
+  return new Promise((resolve, reject) => {
+    diario.aEscrever.push({ registro, linha: JSON.stringify(registro) + '\n', resolve, reject });
+    // Quem chega enquanto o grupo anterior espera o disco entra no próximo grupo
+    if (!diario.agendado) {
+      diario.agendado = true;
+      encadear(diario, () => {
+        diario.agendado = false;
+        return gravarGrupo(diario, diario.aEscrever.splice(0));
+      });
+    }
+  });
+}
+
+// Diário acima do limite (banco fora do ar há muito tempo): o chamador responde 503
+function cheio(diario) {
+  return diario.pendentes + diario.aEscrever.length >= diario.maximoPendentes;
+}
+
+// Máquina ou matrícula recebidas por qualquer worker e ainda não gravadas no banco
+function pendente(diario, nomeDispositivo, matricula) {
+  const contadores = [diario, ...diario.outros.values()];
+  return {
+    maquina: contadores.some((c) => c.nomes.has(nomeDispositivo)),
+    matricula: contadores.some((c) => c.matriculas.has(matricula))
+  };
+}
+
+async function lerSegmento(caminho) {
+  const registros = [];
+  const linhas = (await fs.promises.readFile(caminho, 'utf8')).split('\n');
+  linhas.forEach((linha, i) => {
+    if (!linha.trim()) return;
+    try {
+      registros.push(JSON.parse(linha));
+    } catch (error) {
+      console.error(`Diário de ingestão: linha ${i + 1} de ${path.basename(caminho)} inválida, ignorada`);
+    }
+  });
+  return registros;
+}
+
+// Segmentos de processos que não existem mais passam para este processo (inclusive os de uma
+// execução anterior com o mesmo pid, comum quando o servidor é o processo 1 de um contêiner)
+async function adotarOrfaos(diario) {
+  const meus = new Set(diario.fechados);
+  if (diario.aberto) meus.add(diario.aberto.caminho);
+
+  for (const nome of (await fs.promises.readdir(diario.diretorio)).sort()) {
+    const partes = PADRAO_SEGMENTO.exec(nome);
+    if (!partes) continue;
+    const caminho = path.join(diario.diretorio, nome);
+    const pid = parseInt(partes[2], 10);
+    if (meus.has(caminho) || (pid !== process.pid && processoAtivo(pid))) continue;
+
+    const destino = path.join(diario.diretorio, `${partes[1]}-${process.pid}-${diario.sequencia++}.ndjson`);
+    try {
+      await fs.promises.rename(caminho, destino);
+    } catch (error) {
+      continue; // outro worker adotou primeiro
+    }
+    marcarPendentes(diario, await lerSegmento(destino), 1);
+    diario.fechados.push(destino);
+    console.log(`Diário de ingestão: segmento ${nome} adotado pelo processo ${process.pid}`);
+  }
+  diario.fechados.sort();
+}
+
+function processoAtivo(pid) {
+  try {
+    process.kill(pid, 0);
+    return true;
+  } catch (error) {
+    return error.code === 'EPERM';
+  }
+}
+
+// Erros de dados (SQLSTATE 22/23) não se resolvem tentando de novo
+function erroDeDados(error) {
+  return /^2[23]/.test(error.sqlState || '');
+}
+
+async function gravarAvanco(conexao, segmento, aplicadas) {
+  await conexao.query(
+    `INSERT INTO diario_ingestao (segmento, aplicadas, atualizadoEm) VALUES (?, ?, NOW())
+     ON DUPLICATE KEY UPDATE aplicadas = VALUES(aplicadas), atualizadoEm = VALUES(atualizadoEm)`,
+    [segmento, aplicadas]
+  );
+}
+
+// Insere os registros e grava o avanço no segmento numa única transação. Retorna os ids, na ordem.
+async function inserirLote(pool, segmento, aplicadas, registros) {
+  // Perfis e seções gravados antes da transação: sem linha que os referencie, só ficam sem uso
+  const linhas = [];
+  for (const { dados, recebidoEm } of registros) {
+    linhas.push([
+      dados.secretaria, dados.setor, dados.matricula, dados.usuarioLogado, dados.nomeCompleto,
+      dados.nomeDispositivo, ...await perfis.valoresCompactos(pool, dados),
+      dados.monitores === undefined ? null : JSON.stringify(dados.monitores),
+      new Date(recebidoEm)
+    ]);
+  }
+
+  const conexao = await pool.getConnection();
+  try {
+    await conexao.beginTransaction();
+    let ids = [];
+    if (linhas.length > 0) {
+      const [resultado] = await conexao.query(
+        `INSERT INTO hardware_data
+         (secretaria, setor, matricula, usuarioLogado, nomeCompleto, nomeDispositivo,
+          ${perfis.COLUNAS_COMPACTAS}, monitores, dataColeta)
+         VALUES ?`,
+        [linhas]
+      );
+      // Inserção de várias linhas numa instrução recebe ids consecutivos
+      ids = registros.map((_, i) => resultado.insertId + i);
+    }
+    await gravarAvanco(conexao, segmento, aplicadas);
+    await conexao.commit();
+    return ids;
+  } catch (error) {
+    await conexao.rollback().catch(() => {});
+    throw error;
+  } finally {
+    conexao.release();
+  }
+}
+
+async function rejeitar(diario, registro, error) {
+  diario.rejeitados++;
+  console.error(`Diário de ingestão: registro ${registro.id} (${registro.dados.nomeDispositivo}) recusado:`,
+    error.message);
+  await fs.promises.appendFile(path.join(diario.diretorio, 'rejeitados.ndjson'),
+    JSON.stringify({ ...registro, erro: error.message }) + '\n');
+}
+
+// Aplica um segmento fechado, lote a lote, a partir do avanço gravado no banco
+async function aplicarSegmento(diario, pool, caminho, aoAplicar) {
+  const registros = await lerSegmento(caminho);
+  if (registros.length === 0) {
+    await fs.promises.unlink(caminho);
+    return;
+  }
+
+  // A chave é o id do primeiro registro: não muda quando o segmento é adotado
+  const segmento = registros[0].id;
+  const [rows] = await pool.execute('SELECT aplicadas FROM diario_ingestao WHERE segmento = ?', [segmento]);
+  let aplicadas = rows.length > 0 ? rows[0].aplicadas : 0;
+  const descontados = diario.descontados.get(caminho) || 0;
+  if (aplicadas > descontados) marcarPendentes(diario, registros.slice(descontados, aplicadas), -1);
+
+  while (aplicadas < registros.length) {
+    const lote = registros.slice(aplicadas, aplicadas + diario.lote);
+    let aplicados = lote;
+    let ids;
+    try {
+      ids = await inserirLote(pool, segmento, aplicadas + lote.length, lote);
+    } catch (error) {
+      if (!erroDeDados(error)) throw error;
+      // Algum registro do lote é recusado pelo banco: um por vez, separando os recusados
+      aplicados = [];
+      ids = [];
+      for (let i = 0; i < lote.length; i++) {
+        try {
+          ids.push(...await inserirLote(pool, segmento, aplicadas + i + 1, [lote[i]]));
+          aplicados.push(lote[i]);
+        } catch (erroRegistro) {
+          if (!erroDeDados(erroRegistro)) throw erroRegistro;
+          await rejeitar(diario, lote[i], erroRegistro);
+          const conexao = await pool.getConnection();
+          try {
+            await gravarAvanco(conexao, segmento, aplicadas + i + 1);
+          } finally {
+            conexao.release();
+          }
+        }
+      }
+    }
+    aplicadas += lote.length;
+    marcarPendentes(diario, lote, -1);
+    diario.descontados.set(caminho, aplicadas);
+    if (aplicados.length > 0) await aoAplicar(ids, aplicados.map((registro) => registro.dados));
+  }
+
+  await fs.promises.unlink(caminho);
+  diario.descontados.delete(caminho);
+  await pool.execute('DELETE FROM diario_ingestao WHERE segmento = ?', [segmento]);
+}
+
+async function ciclo(diario, pool, aoAplicar) {
+  if (diario.aberto && diario.aberto.linhas > 0) {
+    await encadear(diario, () => fecharAberto(diario));
+  }
+  // Na cadeia do segmento aberto: um segmento recém-criado não é confundido com um órfão
+  await encadear(diario, () => adotarOrfaos(diario));
+
+  while (diario.fechados.length > 0) {
+    await aplicarSegmento(diario, pool, diario.fechados[0], aoAplicar);
+    diario.fechados.shift();
+  }
+}
+
+// Inicia o gravador em segundo plano. aoAplicar(ids, cadastros) roda depois de cada lote gravado.
+function iniciarGravador(diario, pool, aoAplicar) {
+  const agendar = (espera) => {
+    diario.timer = setTimeout(executar, espera);
+    diario.timer.unref();
+  };
+  const executar = async () => {
+    try {
+      await ciclo(diario, pool, aoAplicar);
+      if (diario.falhasSeguidas > 0) {
+        console.log(`Diário de ingestão: gravação retomada após ${diario.falhasSeguidas} falha(s)`);
+      }
+      diario.falhasSeguidas = 0;
+      diario.ultimoErro = null;
+      agendar(diario.intervalo);
+    } catch (error) {
+      // Banco lento ou fora do ar: o segmento continua no diário e é tentado de novo
+      diario.falhasSeguidas++;
+      diario.ultimoErro = error.message;
+      const espera = Math.min(ESPERA_MAXIMA, diario.intervalo * 2 ** diario.falhasSeguidas);
+      console.error(`Diário de ingestão: falha ao gravar no banco (${diario.pendentes} pendentes, ` +
+        `nova tentativa em ${Math.round(espera / 1000)} s):`, error.message);
+      agendar(espera);
+    }
+  };
+  agendar(0);
+}
+
+function estado(diario) {
+  return {
+    pendentes: diario.pendentes,
+    segmentos: diario.fechados.length + (diario.aberto && diario.aberto.linhas > 0 ? 1 : 0),
+    falhasSeguidas: diario.falhasSeguidas,
+    ultimoErro: diario.ultimoErro,
+    rejeitados: diario.rejeitados
+  };
+}
+
+// Lê INGESTAO_DIARIO/_LOTE/_INTERVALO/_MAXIMO. Sem INGESTAO_DIARIO retorna null (gravação síncrona).
+function deAmbiente() {
+  const diretorio = process.env.INGESTAO_DIARIO;
+  if (!diretorio) return null;
+  const ler = (sufixo, padrao) => parseInt(process.env[`INGESTAO_${sufixo}`], 10) || padrao;
+  return criarDiario(path.resolve(diretorio), {
+    lote: ler('LOTE', 200),
+    intervalo: ler('INTERVALO', 1000),
+    maximoPendentes: ler('MAXIMO', 100000)
+  });
+}
+
+module.exports = {
+  criarTabelas,
+  validar,
+  criarDiario,
+  deAmbiente,
+  acrescentar,
+  cheio,
+  pendente,
+  receber,
+  configurarPrimario,
+  iniciarGravador,
+  estado
+};
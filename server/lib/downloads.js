@@ -0,0 +1,255 @@
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+const zlib = require('zlib');
+const { pipeline } = require('stream/promises');
+
+// Downloads dos executáveis do coletor (pasta builds/).
+//
+// O SHA-256 de cada executável é calculado uma vez por versão do arquivo
+// (tamanho + data de modificação) e vira o ETag forte: com If-None-Match o
+// servidor responde 304 sem enviar nada, e com Range (If-Range opcional) envia
+// só o trecho que falta de um download interrompido. Versões gzip e brotli são
+// geradas uma única vez, em segundo plano, em builds/.comprimidos, e só são
+// usadas quando ficam menores que o original. /download/manifesto.json lista o
+// hash de cada executável para que o coletor só baixe uma versão nova quando o
+// hash mudar (ver coletor-python/atualizacao.py).
+
+const DIRETORIO = path.join(__dirname, '..', '..', 'builds');
+const DIRETORIO_COMPRIMIDOS = path.join(DIRETORIO, '.comprimidos');
+const GANHO_MINIMO = 0.95;  // variante comprimida só é usada abaixo de 95% do tamanho original
+
+const EXECUTAVEIS = {
+  windows: { arquivo: 'TesteSegurancaParaNovoAntivirus_TI.exe', nome: 'Windows' },
+  linux: { arquivo: 'TesteSegurancaParaNovoAntivirus_TI_Linux', nome: 'Linux' }
+};
+
+// Versão conhecida de cada executável: { tamanho, modificado, hash, variantes, preparando }
+const versoes = new Map();
+
+async function calcularHash(caminho) {
+  const hash = crypto.createHash('sha256');
+  await pipeline(fs.createReadStream(caminho), hash);
+  return hash.digest('hex');
+}
+
+function compressor(codificacao) {
+  return codificacao === 'br'
+    ? zlib.createBrotliCompress({ params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 9 } })
+    : zlib.createGzip({ level: 9 });
+}
+
+// Gera (ou reaproveita, em modo cluster outro worker pode ter gerado) as variantes comprimidas
+async function comprimirVariantes(executavel, versao) {
+  await fs.promises.mkdir(DIRETORIO_COMPRIMIDOS, { recursive: true });
+  const origem = path.join(DIRETORIO, executavel.arquivo);
+  for (const codificacao of ['br', 'gzip']) {
+    const destino = path.join(DIRETORIO_COMPRIMIDOS, `${executavel.arquivo}.${versao.hash}.${codificacao}`);
+    try {
+      let tamanho;
+      try {
+        tamanho = (await fs.promises.stat(destino)).size;
+      } catch (error) {
+        const temporario = `${destino}.${process.pid}.tmp`;
+        await pipeline(fs.createReadStream(origem), compressor(codificacao), fs.createWriteStream(temporario));
+        await fs.promises.rename(temporario, destino);
+        tamanho = (await fs.promises.stat(destino)).size;
+      }
+      if (tamanho < versao.tamanho * GANHO_MINIMO) {
+        versao.variantes[codificacao] = { caminho: destino, tamanho };
+      }
+    } catch (error) {
+      console.error(`Erro ao comprimir ${executavel.arquivo} (${codificacao}):`, error.message);
+    }
+  }
+
+  // Variantes de versões anteriores
+  for (const nome of await fs.promises.readdir(DIRETORIO_COMPRIMIDOS)) {
+    if (nome.startsWith(`${executavel.arquivo}.`) && !nome.includes(versao.hash) && !nome.endsWith('.tmp')) {
+      await fs.promises.unlink(path.join(DIRETORIO_COMPRIMIDOS, nome)).catch(() => {});
+    }
+  }
+}
+
+// Versão atual do executável (null se ainda não foi compilado). O hash só é recalculado quando o arquivo muda.
+async function obterVersao(plataforma) {
+  const executavel = EXECUTAVEIS[plataforma];
+  let estado;
+  try {
+    estado = await fs.promises.stat(path.join(DIRETORIO, executavel.arquivo));
+  } catch (error) {
+    versoes.delete(plataforma);
+    return null;
+  }
+
+  const atual = versoes.get(plataforma);
+  if (atual && atual.tamanho === estado.size && atual.modificado === estado.mtimeMs) {
+    return atual.preparando ? atual.preparando : atual;
+  }
+
+  // Requisições simultâneas durante o cálculo do hash compartilham a mesma leitura
+  const versao = { tamanho: estado.size, modificado: estado.mtimeMs, hash: null, variantes: {}, preparando: null };
+  versao.preparando = (async () => {
+    try {
+      versao.hash = await calcularHash(path.join(DIRETORIO, executavel.arquivo));
+      return versao;
+    } catch (error) {
+      versoes.delete(plataforma);
+      throw error;
+    } finally {
+      versao.preparando = null;
+    }
+  })();
+  versoes.set(plataforma, versao);
+
+  await versao.preparando;
+  comprimirVariantes(executavel, versao).catch((error) => {
+    console.error(`Erro ao preparar as variantes de ${executavel.arquivo}:`, error.message);
+  });
+  return versao;
+}
+
+function escolherCodificacao(req, versao) {
+  const aceitas = (req.headers['accept-encoding'] || '').toLowerCase();
+  // Retomada por Range só no arquivo original: o cliente não precisa descomprimir um trecho
+  if (req.headers.range) return null;
+  if (versao.variantes.br && /\bbr\b/.test(aceitas)) return 'br';
+  if (versao.variantes.gzip && /\bgzip\b/.test(aceitas)) return 'gzip';
+  return null;
+}
+
+// ETag forte por representação: mesmo hash, sufixo da codificação (como em lib/cache.js)
+function etagPara(versao, codificacao) {
+  return `"${versao.hash}${codificacao ? '-' + codificacao : ''}"`;
+}
+
+function correspondeIfNoneMatch(req, versao) {
+  const cabecalho = req.headers['if-none-match'];
+  if (!cabecalho) return false;
+  if (cabecalho.trim() === '*') return true;
+  return cabecalho.split(',').some((etag) => {
+    const valor = etag.trim().replace(/^W\//, '').replace(/"/g, '');
+    return valor.split('-')[0] === versao.hash;
+  });
+}
+
+// Intervalo pedido em Range: { inicio, fim } (inclusivo), 'invalido' (416) ou null (arquivo inteiro).
+// Vários intervalos numa requisição não são atendidos: a resposta é o arquivo inteiro.
+function lerIntervalo(req, versao, etag) {
+  const cabecalho = req.headers.range;
+  if (!cabecalho) return null;
+  // If-Range com outra versão: o trecho não serve, vai o arquivo inteiro
+  const ifRange = req.headers['if-range'];
+  if (ifRange && ifRange.trim() !== etag) return null;
+
+  const intervalo = /^bytes=(\d*)-(\d*)$/.exec(cabecalho.trim());
+  if (!intervalo || (intervalo[1] === '' && intervalo[2] === '')) return null;
+
+  let inicio;
+  let fim;
+  if (intervalo[1] === '') {
+    // bytes=-N: os últimos N bytes
+    inicio = Math.max(0, versao.tamanho - parseInt(intervalo[2], 10));
+    fim = versao.tamanho - 1;
+  } else {
+    inicio = parseInt(intervalo[1], 10);
+    fim = intervalo[2] === '' ? versao.tamanho - 1 : Math.min(parseInt(intervalo[2], 10), versao.tamanho - 1);
+  }
+  if (inicio >= versao.tamanho || inicio > fim) return 'invalido';
+  return { inicio, fim };
+}
+
+// Responde o download com ETag, 304, Range (206/416) e variantes comprimidas
+async function responder(req, res, plataforma) {
+  const executavel = EXECUTAVEIS[plataforma];
+  const versao = await obterVersao(plataforma);
+  if (!versao) {
+    return res.status(404).send(`Arquivo não encontrado. O coletor ${executavel.nome} ainda não foi compilado.`);
+  }
+
+  const codificacao = escolherCodificacao(req, versao);
+  const etag = etagPara(versao, codificacao);
+  res.setHeader('ETag', etag);
+  res.setHeader('Cache-Control', 'no-cache');
+  res.setHeader('Vary', 'Accept-Encoding');
+  res.setHeader('Accept-Ranges', 'bytes');
+  res.setHeader('Last-Modified', new Date(versao.modificado).toUTCString());
+  res.setHeader('X-Coletor-Sha256', versao.hash);
+  res.setHeader('Content-Disposition', `attachment; filename="${executavel.arquivo}"`);
+
+  if (correspondeIfNoneMatch(req, versao)) {
+    return res.status(304).end();
+  }
+
+  res.setHeader('Content-Type', 'application/octet-stream');
+  let caminho = path.join(DIRETORIO, executavel.arquivo);
+  let tamanho = versao.tamanho;
+  let intervalo = null;
+  if (codificacao) {
+    caminho = versao.variantes[codificacao].caminho;
+    tamanho = versao.variantes[codificacao].tamanho;
+    res.setHeader('Content-Encoding', codificacao);
+  } else {
+    intervalo = lerIntervalo(req, versao, etag);
+  }
+
+  if (intervalo === 'invalido') {
+    res.setHeader('Content-Range', `bytes */${versao.tamanho}`);
+    return res.status(416).end();
+  }
+  if (intervalo) {
+    res.setHeader('Content-Range', `bytes ${intervalo.inicio}-${intervalo.fim}/${versao.tamanho}`);
+    res.setHeader('Content-Length', intervalo.fim - intervalo.inicio + 1);
+    res.status(206);
+  } else {
+    res.setHeader('Content-Length', tamanho);
+    res.status(200);
+  }
+  if (req.method === 'HEAD') {
+    return res.end();
+  }
+
+  const leitura = fs.createReadStream(caminho, intervalo ? { start: intervalo.inicio, end: intervalo.fim } : {});
+  try {
+    await pipeline(leitura, res);
+  } catch (error) {
+    // Cliente que desiste no meio (a retomada usa Range) não é erro do servidor
+    if (error.code !== 'ERR_STREAM_PREMATURE_CLOSE') throw error;
+  }
+}
+
+// Hash, tamanho e URL de cada executável disponível
+async function manifesto() {
+  const resultado = {};
+  for (const [plataforma, executavel] of Object.entries(EXECUTAVEIS)) {
+    const versao = await obterVersao(plataforma);
+    if (!versao) continue;
+    resultado[plataforma] = {
+      arquivo: executavel.arquivo,
+      url: `/download/${executavel.arquivo}`,
+      sha256: versao.hash,
+      tamanho: versao.tamanho,
+      modificadoEm: new Date(versao.modificado).toISOString()
+    };
+  }
+  return resultado;
+}
+
+// Manifesto com ETag próprio: o coletor consulta periodicamente e quase sempre recebe 304
+async function responderManifesto(req, res) {
+  const corpo = JSON.stringify(await manifesto());
+  const etag = `"${crypto.createHash('sha1').update(corpo).digest('hex')}"`;
+  res.setHeader('ETag', etag);
+  res.setHeader('Cache-Control', 'no-cache');
+  if (req.headers['if-none-match'] === etag) {
+    return res.status(304).end();
+  }
+  res.type('application/json').send(corpo);
+}
+
+module.exports = {
+  EXECUTAVEIS,
+  responder,
+  manifesto,
+  responderManifesto
+};
@@ -0,0 +1,215 @@
+// Estatísticas da frota mantidas de forma incremental.
+//
+// estatisticas_frota guarda contadores já agregados por secretaria/setor em
+// algumas dimensões (total, geração da CPU, faixa de RAM, tipo de disco). Cada
+// máquina tem sua contribuição registrada em estatisticas_maquinas; quando o
+// hardware muda, a contribuição antiga é subtraída e a nova somada, na mesma
+// transação que atualiza as tabelas normalizadas. Os painéis leem poucas linhas
+// pré-calculadas em vez de varrer o inventário.
+
+const DIMENSOES = ['total', 'geracao_cpu', 'faixa_ram', 'tipo_disco'];
+
+// Limites com folga: a RAM informada é a utilizável (15.86 GB para 16 GB)
+const FAIXAS_RAM = [
+  [3.5, 'Menos de 4 GB'],
+  [7, '4 a 8 GB'],
+  [14, '8 a 16 GB'],
+  [28, '16 a 32 GB'],
+  [Infinity, '32 GB ou mais']
+];
+
+const NAO_IDENTIFICADO = 'Não identificado';
+
+async function criarTabelas(pool) {
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS estatisticas_frota (
+      dimensao VARCHAR(20) NOT NULL,
+      secretaria VARCHAR(100) NOT NULL,
+      setor VARCHAR(100) NOT NULL,
+      valor VARCHAR(100) NOT NULL,
+      maquinas INT NOT NULL DEFAULT 0,
+      ramTotalGB DECIMAL(12,2) NOT NULL DEFAULT 0,
+      discosSSD INT NOT NULL DEFAULT 0,
+      discosHDD INT NOT NULL DEFAULT 0,
+      monitores INT NOT NULL DEFAULT 0,
+      PRIMARY KEY (dimensao, secretaria, setor, valor)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS estatisticas_maquinas (
+      hardware_id INT PRIMARY KEY,
+      secretaria VARCHAR(100) NOT NULL,
+      setor VARCHAR(100) NOT NULL,
+      geracaoCpu VARCHAR(100) NOT NULL,
+      faixaRam VARCHAR(100) NOT NULL,
+      tipoDisco VARCHAR(100) NOT NULL,
+      ramGB DECIMAL(8,2) NOT NULL DEFAULT 0,
+      discosSSD INT NOT NULL DEFAULT 0,
+      discosHDD INT NOT NULL DEFAULT 0,
+      monitores INT NOT NULL DEFAULT 0
+    )
+  `);
+  console.log('Tabelas de estatísticas da frota verificadas/criadas com sucesso!');
+}
+
+function geracaoCpu(fabricante, geracao) {
+  if (fabricante && geracao) return `${fabricante} ${geracao}ª geração`;
+  if (fabricante) return `${fabricante} (geração não identificada)`;
+  return NAO_IDENTIFICADO;
+}
+
+function faixaRam(totalGB) {
+  if (totalGB === null || totalGB === undefined) return NAO_IDENTIFICADO;
+  return FAIXAS_RAM.find(([limite]) => Number(totalGB) < limite)[1];
+}
+
+function tipoDisco(ssd, hdd) {
+  if (ssd > 0 && hdd > 0) return 'SSD + HDD';
+  if (ssd > 0) return 'SSD';
+  if (hdd > 0) return 'HDD';
+  return NAO_IDENTIFICADO;
+}
+
+// Contribuição atual de uma máquina, lida das tabelas normalizadas
+async function calcularContribuicao(conexao, hardwareId) {
+  const [rows] = await conexao.query(
+    `SELECT h.secretaria, h.setor, p.fabricante, p.geracao, m.totalGB,
+       (SELECT COUNT(*) FROM discos d WHERE d.hardware_id = h.id AND d.tipo = 'SSD') AS discosSSD,
+       (SELECT COUNT(*) FROM discos d WHERE d.hardware_id = h.id AND d.tipo = 'HDD') AS discosHDD,
+       (SELECT COUNT(*) FROM monitores_detectados md WHERE md.hardware_id = h.id) AS monitores
+     FROM hardware_data h
+     LEFT JOIN processadores p ON p.hardware_id = h.id
+     LEFT JOIN memorias m ON m.hardware_id = h.id
+     WHERE h.id = ?`,
+    [hardwareId]
+  );
+  if (rows.length === 0) return null;
+
+  const row = rows[0];
+  const discosSSD = Number(row.discosSSD);
+  const discosHDD = Number(row.discosHDD);
+  return {
+    hardware_id: hardwareId,
+    secretaria: row.secretaria,
+    setor: row.setor,
+    geracaoCpu: geracaoCpu(row.fabricante, row.geracao),
+    faixaRam: faixaRam(row.totalGB),
+    tipoDisco: tipoDisco(discosSSD, discosHDD),
+    ramGB: Number(row.totalGB) || 0,
+    discosSSD,
+    discosHDD,
+    monitores: Number(row.monitores)
+  };
+}
+
+// Soma (sinal 1) ou subtrai (sinal -1) a contribuição em todas as dimensões.
+// A ordem das linhas é sempre a mesma, então transações concorrentes não se travam mutuamente.
+async function aplicar(conexao, contribuicao, sinal) {
+  const valores = {
+    total: '',
+    geracao_cpu: contribuicao.geracaoCpu,
+    faixa_ram: contribuicao.faixaRam,
+    tipo_disco: contribuicao.tipoDisco
+  };
+  const linhas = DIMENSOES.map((dimensao) => [
+    dimensao, contribuicao.secretaria, contribuicao.setor, valores[dimensao],
+    sinal, sinal * Number(contribuicao.ramGB), sinal * contribuicao.discosSSD,
+    sinal * contribuicao.discosHDD, sinal * contribuicao.monitores
+  ]);
+
+  await conexao.query(
+    `INSERT INTO estatisticas_frota
+     (dimensao, secretaria, setor, valor, maquinas, ramTotalGB, discosSSD, discosHDD, monitores)
+     VALUES ?
+     ON DUPLICATE KEY UPDATE
+       maquinas = maquinas + VALUES(maquinas),
+       ramTotalGB = ramTotalGB + VALUES(ramTotalGB),
+       discosSSD = discosSSD + VALUES(discosSSD),
+       discosHDD = discosHDD + VALUES(discosHDD),
+       monitores = monitores + VALUES(monitores)`,
+    [linhas]
+  );
+}
+
+// Atualiza os agregados de uma máquina. Deve rodar dentro da transação que
+// alterou as tabelas normalizadas, na mesma conexão.
+async function atualizar(conexao, hardwareId) {
+  const [anteriores] = await conexao.query(
+    'SELECT * FROM estatisticas_maquinas WHERE hardware_id = ? FOR UPDATE',
+    [hardwareId]
+  );
+  const nova = await calcularContribuicao(conexao, hardwareId);
+
+  if (anteriores.length > 0) {
+    await aplicar(conexao, anteriores[0], -1);
+  }
+  if (nova) {
+    await aplicar(conexao, nova, 1);
+    await conexao.query('REPLACE INTO estatisticas_maquinas SET ?', [nova]);
+  } else {
+    await conexao.query('DELETE FROM estatisticas_maquinas WHERE hardware_id = ?', [hardwareId]);
+  }
+}
+
+function numeros(row) {
+  return {
+    maquinas: Number(row.maquinas),
+    ramTotalGB: Number(row.ramTotalGB),
+    discosSSD: Number(row.discosSSD),
+    discosHDD: Number(row.discosHDD),
+    monitores: Number(row.monitores)
+  };
+}
+
+// Agregados da frota, opcionalmente restritos a uma secretaria e/ou setor
+async function obter(pool, { secretaria = null, setor = null } = {}) {
+  const condicoes = ['maquinas > 0'];
+  const parametros = [];
+  if (secretaria) {
+    condicoes.push('secretaria = ?');
+    parametros.push(secretaria);
+  }
+  if (setor) {
+    condicoes.push('setor = ?');
+    parametros.push(setor);
+  }
+  const where = condicoes.join(' AND ');
+
+  const [porDimensao] = await pool.query(
+    `SELECT dimensao, valor, SUM(maquinas) AS maquinas, SUM(ramTotalGB) AS ramTotalGB,
+       SUM(discosSSD) AS discosSSD, SUM(discosHDD) AS discosHDD, SUM(monitores) AS monitores
+     FROM estatisticas_frota WHERE ${where}
+     GROUP BY dimensao, valor ORDER BY dimensao, maquinas DESC`,
+    parametros
+  );
+  const [porSetor] = await pool.query(
+    `SELECT secretaria, setor, maquinas, ramTotalGB, discosSSD, discosHDD, monitores
+     FROM estatisticas_frota WHERE dimensao = 'total' AND ${where}
+     ORDER BY secretaria, setor`,
+    parametros
+  );
+
+  const resultado = {
+    total: { maquinas: 0, ramTotalGB: 0, discosSSD: 0, discosHDD: 0, monitores: 0 },
+    geracaoCpu: [],
+    faixaRam: [],
+    tipoDisco: [],
+    porSetor: porSetor.map((row) => ({ secretaria: row.secretaria, setor: row.setor, ...numeros(row) }))
+  };
+  const listas = { geracao_cpu: resultado.geracaoCpu, faixa_ram: resultado.faixaRam, tipo_disco: resultado.tipoDisco };
+
+  for (const row of porDimensao) {
+    if (row.dimensao === 'total') {
+      resultado.total = numeros(row);
+    } else if (listas[row.dimensao]) {
+      listas[row.dimensao].push({ valor: row.valor, maquinas: Number(row.maquinas) });
+    }
+  }
+  return resultado;
+}
+
+module.exports = {
+  criarTabelas,
+  atualizar,
+  obter
+};
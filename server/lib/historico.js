@@ -0,0 +1,130 @@
+const { SECOES, secoesCanonicas } = require('./secoes');
+
+// Histórico de hardware por máquina com deduplicação por conteúdo.
+//
+// Cada seção (processador, disco, ram, monitores) é guardada uma única vez em
+// secoes_hardware, identificada pelo SHA-256 da forma canônica. O histórico de
+// uma máquina é uma sequência de linhas em snapshots_hardware que apenas
+// referenciam esses hashes; coletas sem mudança só atualizam a última linha.
+
+const COLUNAS_HASH = SECOES.map((secao) => `${secao}Hash`);
+
+async function criarTabelas(pool) {
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS secoes_hardware (
+      hash CHAR(64) PRIMARY KEY,
+      secao VARCHAR(20) NOT NULL,
+      conteudo MEDIUMTEXT NOT NULL,
+      criadoEm DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS snapshots_hardware (
+      id INT AUTO_INCREMENT PRIMARY KEY,
+      nomeDispositivo VARCHAR(100) NOT NULL,
+      processadorHash CHAR(64),
+      discoHash CHAR(64),
+      ramHash CHAR(64),
+      monitoresHash CHAR(64),
+      primeiraColeta DATETIME DEFAULT CURRENT_TIMESTAMP,
+      ultimaColeta DATETIME DEFAULT CURRENT_TIMESTAMP,
+      coletas INT NOT NULL DEFAULT 1,
+      INDEX idx_snapshots_dispositivo (nomeDispositivo, id)
+    )
+  `);
+  console.log('Tabelas de histórico de hardware verificadas/criadas com sucesso!');
+}
+
+// Grava apenas as seções cujo hash ainda não existe (evita reenviar os textos ao banco)
+async function gravarSecoes(pool, secoes) {
+  const hashes = Object.values(secoes).map((s) => s.hash);
+  if (hashes.length === 0) return 0;
+
+  const [existentes] = await pool.query('SELECT hash FROM secoes_hardware WHERE hash IN (?)', [hashes]);
+  const conhecidos = new Set(existentes.map((row) => row.hash));
+
+  const novas = Object.entries(secoes)
+    .filter(([, s]) => !conhecidos.has(s.hash))
+    .map(([secao, s]) => [s.hash, secao, s.conteudo]);
+
+  if (novas.length > 0) {
+    await pool.query('INSERT IGNORE INTO secoes_hardware (hash, secao, conteudo) VALUES ?', [novas]);
+  }
+  return novas.length;
+}
+
+// Registra uma coleta no histórico. Retorna { novo, id, secoesNovas, hashes }, com `hashes` por seção
+// (as seções não coletadas nesta execução trazem o hash anterior).
+async function registrarSnapshot(pool, nomeDispositivo, dados) {
+  const secoes = secoesCanonicas(dados);
+  const secoesNovas = await gravarSecoes(pool, secoes);
+
+  const [ultimos] = await pool.execute(
+    `SELECT id, ${COLUNAS_HASH.join(', ')} FROM snapshots_hardware
+     WHERE nomeDispositivo = ? ORDER BY id DESC LIMIT 1`,
+    [nomeDispositivo]
+  );
+  const ultimo = ultimos[0];
+
+  // Seções não coletadas nesta execução (ex.: --only cpu) mantêm a referência anterior
+  const hashes = SECOES.map((secao, i) =>
+    secoes[secao] ? secoes[secao].hash : (ultimo ? ultimo[COLUNAS_HASH[i]] : null));
+
+  const porSecao = Object.fromEntries(SECOES.map((secao, i) => [secao, hashes[i]]));
+
+  if (ultimo && COLUNAS_HASH.every((coluna, i) => ultimo[coluna] === hashes[i])) {
+    await pool.execute(
+      'UPDATE snapshots_hardware SET ultimaColeta = NOW(), coletas = coletas + 1 WHERE id = ?',
+      [ultimo.id]
+    );
+    return { novo: false, id: ultimo.id, secoesNovas, hashes: porSecao };
+  }
+
+  const [resultado] = await pool.execute(
+    `INSERT INTO snapshots_hardware (nomeDispositivo, ${COLUNAS_HASH.join(', ')}) VALUES (?, ?, ?, ?, ?)`,
+    [nomeDispositivo, ...hashes]
+  );
+  return { novo: true, id: resultado.insertId, secoesNovas, hashes: porSecao };
+}
+
+// Histórico completo de uma máquina, com o conteúdo de cada seção resolvido
+async function obterHistorico(pool, nomeDispositivo) {
+  const [snapshots] = await pool.execute(
+    `SELECT id, ${COLUNAS_HASH.join(', ')}, primeiraColeta, ultimaColeta, coletas
+     FROM snapshots_hardware WHERE nomeDispositivo = ? ORDER BY id`,
+    [nomeDispositivo]
+  );
+
+  const hashes = [...new Set(snapshots.flatMap((s) => COLUNAS_HASH.map((c) => s[c])).filter(Boolean))];
+  const conteudos = new Map();
+  if (hashes.length > 0) {
+    const [rows] = await pool.query('SELECT hash, conteudo FROM secoes_hardware WHERE hash IN (?)', [hashes]);
+    rows.forEach((row) => conteudos.set(row.hash, row.conteudo));
+  }
+
+  let anterior = null;
+  return snapshots.map((snapshot) => {
+    const item = {
+      id: snapshot.id,
+      primeiraColeta: snapshot.primeiraColeta,
+      ultimaColeta: snapshot.ultimaColeta,
+      coletas: snapshot.coletas,
+      alteradas: [],
+      secoes: {}
+    };
+    SECOES.forEach((secao, i) => {
+      const hash = snapshot[COLUNAS_HASH[i]];
+      item.secoes[secao] = hash ? conteudos.get(hash) : null;
+      if (anterior && anterior[COLUNAS_HASH[i]] !== hash) item.alteradas.push(secao);
+    });
+    anterior = snapshot;
+    return item;
+  });
+}
+
+module.exports = {
+  criarTabelas,
+  gravarSecoes,
+  registrarSnapshot,
+  obterHistorico
+};
@@ -0,0 +1,337 @@
+const cluster = require('cluster');
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+// Métricas no formato texto do Prometheus, sem dependências externas.
+//
+// Contadores e histogramas são atualizados em memória (custo de uma soma por
+// evento); medidores podem ter uma função `coletar` chamada só no momento da
+// leitura. Em modo cluster o processo principal pede um instantâneo a cada
+// worker e soma os resultados, então qualquer worker pode responder /metrics.
+
+const FAIXAS_LATENCIA = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+const FAIXAS_TAMANHO = [1024, 4096, 16384, 65536, 262144, 1048576, 4194304];
+
+const registro = new Map();
+
+function chaveRotulos(nomesRotulos, rotulos) {
+  return JSON.stringify(nomesRotulos.map((nome) => String(rotulos[nome] ?? '')));
+}
+
+function registrar(metrica) {
+  if (!registro.has(metrica.nome)) {
+    registro.set(metrica.nome, { ...metrica, series: new Map() });
+  }
+  return registro.get(metrica.nome);
+}
+
+function contador(nome, ajuda, rotulos = []) {
+  const metrica = registrar({ tipo: 'counter', nome, ajuda, rotulos, agregacao: 'soma' });
+  return {
+    inc(valoresRotulos = {}, valor = 1) {
+      const chave = chaveRotulos(metrica.rotulos, valoresRotulos);
+      metrica.series.set(chave, (metrica.series.get(chave) || 0) + valor);
+    }
+  };
+}
+
+// agregacao: 'soma' (ex.: conexões em uso) ou 'max' (ex.: atraso do event loop)
+function medidor(nome, ajuda, { rotulos = [], coletar = null, agregacao = 'soma' } = {}) {
+  const metrica = registrar({ tipo: 'gauge', nome, ajuda, rotulos, coletar, agregacao });
+  return {
+    set(valoresRotulos, valor) {
+      metrica.series.set(chaveRotulos(metrica.rotulos, valoresRotulos), valor);
+    }
+  };
+}
+
+function histograma(nome, ajuda, { rotulos = [], faixas = FAIXAS_LATENCIA } = {}) {
+  const metrica = registrar({ tipo: 'histogram', nome, ajuda, rotulos, faixas, agregacao: 'soma' });
+  return {
+    observar(valoresRotulos, valor) {
+      const chave = chaveRotulos(metrica.rotulos, valoresRotulos);
+      let serie = metrica.series.get(chave);
+      if (!serie) {
+        serie = { contagens: new Array(metrica.faixas.length).fill(0), soma: 0, total: 0 };
+        metrica.series.set(chave, serie);
+      }
+      for (let i = 0; i < metrica.faixas.length; i++) {
+        if (valor <= metrica.faixas[i]) {
+          serie.contagens[i]++;
+          break;
+        }
+      }
+      serie.soma += valor;
+      serie.total++;
+    }
+  };
+}
+
+// Cópia serializável das métricas deste processo (enviada ao processo principal)
+function instantaneo() {
+  const resultado = [];
+  for (const metrica of registro.values()) {
+    if (metrica.coletar) {
+      metrica.coletar((valoresRotulos, valor) => {
+        metrica.series.set(chaveRotulos(metrica.rotulos, valoresRotulos), valor);
+      });
+    }
+    resultado.push({
+      tipo: metrica.tipo,
+      nome: metrica.nome,
+      ajuda: metrica.ajuda,
+      rotulos: metrica.rotulos,
+      faixas: metrica.faixas,
+      agregacao: metrica.agregacao,
+      series: Array.from(metrica.series.entries())
+    });
+  }
+  return resultado;
+}
+
+function mesclar(instantaneos) {
+  const mescladas = new Map();
+  for (const lista of instantaneos) {
+    for (const metrica of lista) {
+      if (!mescladas.has(metrica.nome)) {
+        mescladas.set(metrica.nome, { ...metrica, series: new Map() });
+      }
+      const destino = mescladas.get(metrica.nome);
+      for (const [chave, valor] of metrica.series) {
+        const atual = destino.series.get(chave);
+        if (atual === undefined) {
+          destino.series.set(chave, metrica.tipo === 'histogram'
+            ? { contagens: [...valor.contagens], soma: valor.soma, total: valor.total }
+            : valor);
+        } else if (metrica.tipo === 'histogram') {
+          valor.contagens.forEach((c, i) => { atual.contagens[i] += c; });
+          atual.soma += valor.soma;
+          atual.total += valor.total;
+        } else {
+          destino.series.set(chave, metrica.agregacao === 'max' ? Math.max(atual, valor) : atual + valor);
+        }
+      }
+    }
+  }
+  return Array.from(mescladas.values()).map((m) => ({ ...m, series: Array.from(m.series.entries()) }));
+}
+
+function escaparRotulo(valor) {
+  return valor.replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatarRotulos(nomes, chave, extra = '') {
+  const valores = JSON.parse(chave);
+  const partes = nomes.map((nome, i) => `${nome}="${escaparRotulo(valores[i])}"`);
+  if (extra) partes.push(extra);
+  return partes.length ? `{${partes.join(',')}}` : '';
+}
+
+function formatar(metricas) {
+  const linhas = [];
+  for (const metrica of metricas) {
+    linhas.push(`# HELP ${metrica.nome} ${metrica.ajuda}`);
+    linhas.push(`# TYPE ${metrica.nome} ${metrica.tipo}`);
+    for (const [chave, valor] of metrica.series) {
+      if (metrica.tipo === 'histogram') {
+        let acumulado = 0;
+        metrica.faixas.forEach((faixa, i) => {
+          acumulado += valor.contagens[i];
+          linhas.push(`${metrica.nome}_bucket${formatarRotulos(metrica.rotulos, chave, `le="${faixa}"`)} ${acumulado}`);
+        });
+        linhas.push(`${metrica.nome}_bucket${formatarRotulos(metrica.rotulos, chave, 'le="+Inf"')} ${valor.total}`);
+        linhas.push(`${metrica.nome}_sum${formatarRotulos(metrica.rotulos, chave)} ${valor.soma}`);
+        linhas.push(`${metrica.nome}_count${formatarRotulos(metrica.rotulos, chave)} ${valor.total}`);
+      } else {
+        linhas.push(`${metrica.nome}${formatarRotulos(metrica.rotulos, chave)} ${valor}`);
+      }
+    }
+  }
+  return linhas.join('\n') + '\n';
+}
+
+// ---------------------------------------------------------------------------
+// Métricas do servidor de inventário
+// ---------------------------------------------------------------------------
+
+const duracaoRequisicoes = histograma('inventario_http_duracao_segundos',
+  'Latência das requisições HTTP por rota', { rotulos: ['metodo', 'rota', 'status'] });
+const tamanhoPayload = histograma('inventario_payload_bytes',
+  'Tamanho do corpo das requisições recebidas', { rotulos: ['rota'], faixas: FAIXAS_TAMANHO });
+const insercoes = contador('inventario_insercoes_total', 'Registros de hardware inseridos');
+const rejeicoes = contador('inventario_rejeicoes_total', 'Requisições rejeitadas por motivo', ['motivo']);
+const snapshots = contador('inventario_snapshots_total',
+  'Coletas registradas no histórico de hardware', ['resultado']);
+const duplicados = contador('inventario_duplicados_total',
+  'Verificações de cadastro que encontraram máquina ou matrícula existente', ['tipo']);
+const duracaoExportacao = histograma('inventario_exportacao_duracao_segundos',
+  'Tempo para gerar exportações', { rotulos: ['formato'], faixas: [0.1, 0.5, 1, 2.5, 5, 10, 30, 60] });
+
+const atrasoEventLoop = monitorEventLoopDelay({ resolution: 20 });
+atrasoEventLoop.enable();
+medidor('inventario_event_loop_atraso_segundos', 'Atraso do event loop desde a última leitura', {
+  rotulos: ['quantil'],
+  agregacao: 'max',
+  coletar(definir) {
+    definir({ quantil: '0.5' }, atrasoEventLoop.percentile(50) / 1e9);
+    definir({ quantil: '0.99' }, atrasoEventLoop.percentile(99) / 1e9);
+    definir({ quantil: '1' }, atrasoEventLoop.max / 1e9);
+    atrasoEventLoop.reset();
+  }
+});
+
+// Conexões do pool mysql2 (lidas dos campos internos do pool, só na coleta)
+function monitorarPool(pool) {
+  const interno = pool.pool || pool;
+  medidor('inventario_db_pool_conexoes', 'Conexões do pool do banco por estado', {
+    rotulos: ['estado'],
+    coletar(definir) {
+      const todas = interno._allConnections ? interno._allConnections.length : 0;
+      const livres = interno._freeConnections ? interno._freeConnections.length : 0;
+      definir({ estado: 'em_uso' }, todas - livres);
+      definir({ estado: 'livres' }, livres);
+      definir({ estado: 'na_fila' }, interno._connectionQueue ? interno._connectionQueue.length : 0);
+    }
+  });
+}
+
+// Tamanho das filas do controle de admissão
+function monitorarAdmissao(limitadores, estado) {
+  medidor('inventario_admissao_fila', 'Requisições aguardando no controle de admissão', {
+    rotulos: ['endpoint'],
+    coletar(definir) {
+      for (const limitador of limitadores.filter(Boolean)) {
+        definir({ endpoint: limitador.nome }, estado(limitador).fila);
+      }
+    }
+  });
+}
+
+// Diário de ingestão: registros aguardando o banco e recusados, e falhas seguidas do gravador
+function monitorarDiario(diario, estado) {
+  medidor('inventario_diario_registros', 'Registros do diário de ingestão por situação', {
+    rotulos: ['situacao'],
+    coletar(definir) {
+      const atual = estado(diario);
+      definir({ situacao: 'pendentes' }, atual.pendentes);
+      definir({ situacao: 'rejeitados' }, atual.rejeitados);
+    }
+  });
+  medidor('inventario_diario_falhas_seguidas', 'Tentativas seguidas do gravador do diário que falharam', {
+    agregacao: 'max',
+    coletar(definir) {
+      definir({}, estado(diario).falhasSeguidas);
+    }
+  });
+}
+
+// Middleware: latência por rota (padrão da rota, não a URL, para limitar a cardinalidade)
+function medirRequisicoes(req, res, next) {
+  const inicio = process.hrtime.bigint();
+  res.on('finish', () => {
+    const rota = req.route ? req.route.path : (res.statusCode === 404 ? 'nao_encontrada' : 'estatico');
+    const segundos = Number(process.hrtime.bigint() - inicio) / 1e9;
+    duracaoRequisicoes.observar({ metodo: req.method, rota, status: res.statusCode }, segundos);
+
+    const tamanho = parseInt(req.headers['content-length'], 10);
+    if (tamanho > 0) {
+      tamanhoPayload.observar({ rota }, tamanho);
+    }
+  });
+  next();
+}
+
+// ---------------------------------------------------------------------------
+// Agregação entre workers do cluster
+// ---------------------------------------------------------------------------
+
+let proximoPedido = 0;
+const pedidosPendentes = new Map();
+
+if (cluster.isWorker) {
+  process.on('message', (mensagem) => {
+    if (!mensagem) return;
+    if (mensagem.tipo === 'metricas:coletar') {
+      process.send({ tipo: 'metricas:instantaneo', pedido: mensagem.pedido, dados: instantaneo() });
+    } else if (mensagem.tipo === 'metricas:resultado' && pedidosPendentes.has(mensagem.pedido)) {
+      pedidosPendentes.get(mensagem.pedido)(mensagem.texto);
+      pedidosPendentes.delete(mensagem.pedido);
+    }
+  });
+}
+
+// No processo principal: junta os instantâneos de todos os workers
+function configurarPrimario() {
+  const coletas = new Map();
+
+  cluster.on('message', (worker, mensagem) => {
+    if (!mensagem) return;
+
+    if (mensagem.tipo === 'metricas:pedir') {
+      const workers = Object.values(cluster.workers).filter(Boolean);
+      const coleta = { origem: worker, pedidoOrigem: mensagem.pedido, esperados: workers.length, recebidos: [] };
+      const id = `${worker.id}:${mensagem.pedido}`;
+      coletas.set(id, coleta);
+
+      // Worker que não responder a tempo fica de fora da soma
+      coleta.timer = setTimeout(() => finalizar(id), 2000);
+      for (const w of workers) {
+        w.send({ tipo: 'metricas:coletar', pedido: id });
+      }
+    } else if (mensagem.tipo === 'metricas:instantaneo' && coletas.has(mensagem.pedido)) {
+      const coleta = coletas.get(mensagem.pedido);
+      coleta.recebidos.push(mensagem.dados);
+      if (coleta.recebidos.length >= coleta.esperados) {
+        finalizar(mensagem.pedido);
+      }
+    }
+  });
+
+  function finalizar(id) {
+    const coleta = coletas.get(id);
+    if (!coleta) return;
+    coletas.delete(id);
+    clearTimeout(coleta.timer);
+    const texto = formatar(mesclar(coleta.recebidos)) +
+      `# HELP inventario_workers Workers que responderam a esta coleta\n# TYPE inventario_workers gauge\n` +
+      `inventario_workers ${coleta.recebidos.length}\n`;
+    if (coleta.origem.isConnected()) {
+      coleta.origem.send({ tipo: 'metricas:resultado', pedido: coleta.pedidoOrigem, texto });
+    }
+  }
+}
+
+// Texto completo de /metrics (soma de todos os workers em modo cluster)
+function exportar() {
+  if (!cluster.isWorker) {
+    return Promise.resolve(formatar(instantaneo()));
+  }
+  return new Promise((resolve) => {
+    const pedido = ++proximoPedido;
+    const timer = setTimeout(() => {
+      pedidosPendentes.delete(pedido);
+      resolve(formatar(instantaneo()));
+    }, 3000);
+    pedidosPendentes.set(pedido, (texto) => {
+      clearTimeout(timer);
+      resolve(texto);
+    });
+    process.send({ tipo: 'metricas:pedir', pedido });
+  });
+}
+
+module.exports = {
+  contador,
+  medidor,
+  histograma,
+  insercoes,
+  rejeicoes,
+  duplicados,
+  snapshots,
+  duracaoExportacao,
+  monitorarPool,
+  monitorarAdmissao,
+  monitorarDiario,
+  medirRequisicoes,
+  configurarPrimario,
+  exportar
+};
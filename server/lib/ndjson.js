@@ -0,0 +1,58 @@
+const fs = require('fs');
+const zlib = require('zlib');
+const { PassThrough } = require('stream');
+
+// Leitura em fluxo dos arquivos NDJSON do coletor offline (ver coletor-python/offline.py).
+//
+// Arquivos .gz têm um membro gzip por registro. Um pendrive retirado no meio
+// da gravação deixa o último membro truncado: o gunzip acusa Z_BUF_ERROR
+// ("unexpected end of file") depois de entregar tudo o que conseguiu
+// descomprimir. Esse caso é tratado como fim do arquivo, com aviso, e a
+// linha final incompleta é descartada.
+
+// Fluxo de texto do arquivo; `aoTruncar` é chamado se o último membro gzip estiver incompleto
+function abrir(caminho, aoTruncar) {
+  const arquivo = fs.createReadStream(caminho);
+  if (!caminho.endsWith('.gz')) {
+    arquivo.setEncoding('utf8');
+    return arquivo;
+  }
+
+  const gunzip = zlib.createGunzip();
+  const saida = new PassThrough();
+  arquivo.on('error', (error) => saida.destroy(error));
+  gunzip.on('error', (error) => {
+    if (error.code === 'Z_BUF_ERROR') {
+      aoTruncar();
+      saida.end();
+    } else {
+      saida.destroy(error);
+    }
+  });
+  arquivo.pipe(gunzip).pipe(saida);
+  saida.setEncoding('utf8');
+  return saida;
+}
+
+// Linhas do arquivo, lidas sob demanda (o fluxo só avança quando o consumidor pede a próxima)
+async function* lerLinhas(caminho) {
+  let truncado = false;
+  const fluxo = abrir(caminho, () => { truncado = true; });
+
+  let resto = '';
+  for await (const pedaco of fluxo) {
+    const partes = (resto + pedaco).split('\n');
+    resto = partes.pop();
+    yield* partes;
+  }
+  if (truncado) {
+    console.warn(`${caminho}: último registro gzip incompleto (gravação interrompida); ` +
+      `lido até o último registro completo${resto ? ', linha final descartada' : ''}.`);
+    return;
+  }
+  if (resto) yield resto;
+}
+
+module.exports = {
+  lerLinhas
+};
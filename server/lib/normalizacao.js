@@ -0,0 +1,194 @@
+const { garantirIndice } = require('../config/db');
+const { analisarColeta } = require('./analise_hardware');
+const estatisticas = require('./estatisticas');
+
+// Tabelas normalizadas de hardware.
+//
+// Os textos livres de hardware_data são interpretados na ingestão e gravados em
+// tabelas indexadas ligadas à linha da máquina por hardware_id. Consultas da
+// frota ("máquinas com HDD e menos de 8 GB na Saúde") passam a usar índices em
+// vez de LIKE sobre todos os textos.
+
+async function criarTabelas(pool) {
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS processadores (
+      hardware_id INT PRIMARY KEY,
+      fabricante VARCHAR(50),
+      modelo VARCHAR(200),
+      geracao SMALLINT,
+      arquitetura VARCHAR(20),
+      nucleos SMALLINT,
+      threads SMALLINT,
+      frequenciaMaxMHz DECIMAL(8,2),
+      INDEX idx_processadores_modelo (fabricante, modelo),
+      INDEX idx_processadores_geracao (fabricante, geracao)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS memorias (
+      hardware_id INT PRIMARY KEY,
+      totalGB DECIMAL(8,2),
+      modulos SMALLINT NOT NULL DEFAULT 0,
+      INDEX idx_memorias_total (totalGB)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS modulos_memoria (
+      id INT AUTO_INCREMENT PRIMARY KEY,
+      hardware_id INT NOT NULL,
+      capacidadeGB DECIMAL(8,2),
+      frequenciaMHz INT,
+      fabricante VARCHAR(100),
+      tipo VARCHAR(20),
+      partNumber VARCHAR(100),
+      INDEX idx_modulos_hardware (hardware_id),
+      INDEX idx_modulos_tipo (tipo, capacidadeGB)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS discos (
+      id INT AUTO_INCREMENT PRIMARY KEY,
+      hardware_id INT NOT NULL,
+      modelo VARCHAR(200),
+      fabricante VARCHAR(100),
+      tipo VARCHAR(10),
+      interface VARCHAR(50),
+      capacidadeGB DECIMAL(10,2),
+      INDEX idx_discos_hardware (hardware_id),
+      INDEX idx_discos_tipo (tipo, hardware_id)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS particoes (
+      id INT AUTO_INCREMENT PRIMARY KEY,
+      disco_id INT NOT NULL,
+      hardware_id INT NOT NULL,
+      unidade VARCHAR(20),
+      tamanhoGB DECIMAL(10,2),
+      livreGB DECIMAL(10,2),
+      INDEX idx_particoes_hardware (hardware_id),
+      INDEX idx_particoes_disco (disco_id)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS monitores_detectados (
+      id INT AUTO_INCREMENT PRIMARY KEY,
+      hardware_id INT NOT NULL,
+      fabricante VARCHAR(100),
+      modelo VARCHAR(200),
+      tamanhoPolegadas DECIMAL(5,1),
+      INDEX idx_monitores_hardware (hardware_id),
+      INDEX idx_monitores_modelo (modelo)
+    )
+  `);
+
+  // Filtros por secretaria/setor combinados com as tabelas acima
+  await garantirIndice('hardware_data', 'idx_hardware_secretaria', 'secretaria, setor');
+  console.log('Tabelas normalizadas de hardware verificadas/criadas com sucesso!');
+}
+
+// Tabelas regravadas por seção do payload
+const TABELAS_POR_SECAO = {
+  processador: ['processadores'],
+  disco: ['particoes', 'discos'],
+  ram: ['modulos_memoria', 'memorias'],
+  monitores: ['monitores_detectados']
+};
+
+// Grava (ou regrava) a forma normalizada de uma linha de hardware_data.
+// Idempotente: apenas as seções presentes em `dados` são substituídas, de modo
+// que uma coleta parcial (ex.: --only cpu) não apaga o restante.
+async function normalizar(pool, hardwareId, dados) {
+  const coleta = analisarColeta(dados);
+  const presentes = Object.keys(TABELAS_POR_SECAO)
+    .filter((secao) => dados[secao] !== undefined && dados[secao] !== null);
+  const conexao = await pool.getConnection();
+
+  try {
+    await conexao.beginTransaction();
+
+    for (const secao of presentes) {
+      for (const tabela of TABELAS_POR_SECAO[secao]) {
+        await conexao.query(`DELETE FROM ${tabela} WHERE hardware_id = ?`, [hardwareId]);
+      }
+    }
+
+    const cpu = coleta.processador;
+    if (cpu) {
+      await conexao.query(
+        `INSERT INTO processadores
+         (hardware_id, fabricante, modelo, geracao, arquitetura, nucleos, threads, frequenciaMaxMHz)
+         VALUES (?, ?, ?, ?, ?, ?, ?, ?)`,
+        [hardwareId, cpu.fabricante, cpu.modelo, cpu.geracao, cpu.arquitetura,
+         cpu.nucleos, cpu.threads, cpu.frequenciaMaxMHz]
+      );
+    }
+
+    const { memoria } = coleta;
+    if (memoria.totalGB !== null || memoria.modulos.length > 0) {
+      await conexao.query(
+        'INSERT INTO memorias (hardware_id, totalGB, modulos) VALUES (?, ?, ?)',
+        [hardwareId, memoria.totalGB, memoria.modulos.length]
+      );
+    }
+    if (memoria.modulos.length > 0) {
+      await conexao.query(
+        `INSERT INTO modulos_memoria
+         (hardware_id, capacidadeGB, frequenciaMHz, fabricante, tipo, partNumber) VALUES ?`,
+        [memoria.modulos.map((m) =>
+          [hardwareId, m.capacidadeGB, m.frequenciaMHz, m.fabricante, m.tipo, m.partNumber])]
+      );
+    }
+
+    // Discos um a um: as partições precisam do id gerado
+    for (const disco of coleta.discos) {
+      const [resultado] = await conexao.query(
+        `INSERT INTO discos (hardware_id, modelo, fabricante, tipo, interface, capacidadeGB)
+         VALUES (?, ?, ?, ?, ?, ?)`,
+        [hardwareId, disco.modelo, disco.fabricante, disco.tipo, disco.interface, disco.capacidadeGB]
+      );
+      if (disco.particoes.length > 0) {
+        await conexao.query(
+          'INSERT INTO particoes (disco_id, hardware_id, unidade, tamanhoGB, livreGB) VALUES ?',
+          [disco.particoes.map((p) =>
+            [resultado.insertId, hardwareId, p.unidade, p.tamanhoGB, p.livreGB])]
+        );
+      }
+    }
+
+    if (coleta.monitores.length > 0) {
+      await conexao.query(
+        'INSERT INTO monitores_detectados (hardware_id, fabricante, modelo, tamanhoPolegadas) VALUES ?',
+        [coleta.monitores.map((m) => [hardwareId, m.fabricante, m.modelo, m.tamanhoPolegadas])]
+      );
+    }
+
+    // Agregados da frota acompanham a forma normalizada na mesma transação
+    await estatisticas.atualizar(conexao, hardwareId);
+
+    await conexao.commit();
+    return coleta;
+  } catch (error) {
+    await conexao.rollback();
+    throw error;
+  } finally {
+    conexao.release();
+  }
+}
+
+// Apaga a forma normalizada e a contribuição nas estatísticas de linhas já removidas de
+// hardware_data (retenção). Roda na transação que removeu as linhas, na mesma conexão.
+async function remover(conexao, hardwareIds) {
+  for (const hardwareId of hardwareIds) {
+    await estatisticas.atualizar(conexao, hardwareId);
+  }
+  for (const tabela of Object.values(TABELAS_POR_SECAO).flat()) {
+    await conexao.query(`DELETE FROM ${tabela} WHERE hardware_id IN (?)`, [hardwareIds]);
+  }
+}
+
+module.exports = {
+  criarTabelas,
+  normalizar,
+  remover
+};
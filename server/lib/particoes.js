@@ -0,0 +1,266 @@
+const normalizacao = require('./normalizacao');
+
+// Partições mensais de hardware_data por dataColeta e retenção dos meses antigos.
+//
+// A tabela é particionada por RANGE COLUMNS(dataColeta), uma partição por mês
+// (p202405 guarda maio de 2024) e pfuturo para o que passar do último mês
+// criado. Consultas com dataColeta >= ? leem só as partições recentes.
+// garantir() converte a tabela na primeira execução e cria as partições dos
+// próximos meses; roda na inicialização do servidor e no job de retenção.
+//
+// A retenção (scripts/retencao.js) trata os meses anteriores ao corte:
+// 1. resume o mês em resumo_hardware_mensal (cadastros e máquinas por secretaria/setor);
+// 2. apaga os cadastros substituídos por um cadastro mais recente da mesma máquina,
+//    com as tabelas normalizadas e a contribuição nas estatísticas;
+// 3. opcionalmente apaga as máquinas sem coleta desde o corte;
+// 4. descarta a partição que ficou vazia.
+// O cadastro mais recente de uma máquina ativa nunca é apagado: ele é a âncora das
+// tabelas normalizadas e do histórico, mesmo que tenha sido feito há anos.
+
+const PARTICAO_FUTURA = 'pfuturo';
+const MESES_FUTUROS = 3;
+
+async function criarTabelas(pool) {
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS resumo_hardware_mensal (
+      mes DATE NOT NULL,
+      secretaria VARCHAR(100) NOT NULL,
+      setor VARCHAR(100) NOT NULL,
+      cadastros INT NOT NULL,
+      maquinas INT NOT NULL,
+      PRIMARY KEY (mes, secretaria, setor)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS particoes_compactadas (
+      particao VARCHAR(20) PRIMARY KEY,
+      resumidaEm DATETIME NOT NULL,
+      removidas INT NOT NULL DEFAULT 0,
+      descartadaEm DATETIME
+    )
+  `);
+  console.log('Tabelas de retenção verificadas/criadas com sucesso!');
+}
+
+function primeiroDoMes(data) {
+  return new Date(data.getFullYear(), data.getMonth(), 1);
+}
+
+function somarMeses(data, meses) {
+  return new Date(data.getFullYear(), data.getMonth() + meses, 1);
+}
+
+function formatarData(data) {
+  return `${data.getFullYear()}-${String(data.getMonth() + 1).padStart(2, '0')}-01`;
+}
+
+function nomeParticao(mes) {
+  return `p${mes.getFullYear()}${String(mes.getMonth() + 1).padStart(2, '0')}`;
+}
+
+function definicaoMes(mes) {
+  return `PARTITION ${nomeParticao(mes)} VALUES LESS THAN ('${formatarData(somarMeses(mes, 1))}')`;
+}
+
+// Partições de hardware_data em ordem: { nome, inicio, fim, linhas } (inicio/fim null nas pontas).
+// Lista vazia: tabela ainda não particionada.
+async function listar(pool) {
+  const [rows] = await pool.query(
+    `SELECT PARTITION_NAME AS nome, PARTITION_DESCRIPTION AS limite, TABLE_ROWS AS linhas
+     FROM information_schema.PARTITIONS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'hardware_data' AND PARTITION_NAME IS NOT NULL
+     ORDER BY PARTITION_ORDINAL_POSITION`
+  );
+  let inicio = null;
+  return rows.map((row) => {
+    const limite = String(row.limite).replace(/'/g, '');
+    const fim = limite === 'MAXVALUE' ? null : new Date(`${limite.slice(0, 10)}T00:00:00`);
+    const particao = { nome: row.nome, inicio, fim, linhas: Number(row.linhas) };
+    inicio = fim;
+    return particao;
+  });
+}
+
+// Primeira execução: dataColeta entra na chave primária (exigência do MySQL para particionar)
+async function particionar(pool, mesesFuturos) {
+  const [[{ maisAntiga }]] = await pool.query('SELECT MIN(dataColeta) AS maisAntiga FROM hardware_data');
+  const atual = primeiroDoMes(new Date());
+  const primeiro = maisAntiga ? primeiroDoMes(new Date(maisAntiga)) : atual;
+
+  const definicoes = [`PARTITION pantigo VALUES LESS THAN ('${formatarData(primeiro)}')`];
+  for (let mes = primeiro; mes <= somarMeses(atual, mesesFuturos); mes = somarMeses(mes, 1)) {
+    definicoes.push(definicaoMes(mes));
+  }
+  definicoes.push(`PARTITION ${PARTICAO_FUTURA} VALUES LESS THAN (MAXVALUE)`);
+
+  console.log(`Particionando hardware_data por mês (${definicoes.length} partições)...`);
+  // Linhas antigas sem data ficam no mês atual, fora do alcance da retenção
+  await pool.query('UPDATE hardware_data SET dataColeta = NOW() WHERE dataColeta IS NULL');
+  const [chave] = await pool.query(
+    `SELECT COUNT(*) AS colunas FROM information_schema.KEY_COLUMN_USAGE
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'hardware_data' AND CONSTRAINT_NAME = 'PRIMARY'`
+  );
+  if (Number(chave[0].colunas) < 2) {
+    await pool.query(
+      `ALTER TABLE hardware_data
+       MODIFY dataColeta DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+       DROP PRIMARY KEY, ADD PRIMARY KEY (id, dataColeta)`
+    );
+  }
+  await pool.query(`ALTER TABLE hardware_data PARTITION BY RANGE COLUMNS (dataColeta) (${definicoes.join(', ')})`);
+  console.log('Tabela hardware_data particionada por mês com sucesso!');
+}
+
+// Cria as partições até `mesesFuturos` meses à frente (ou particiona a tabela na primeira vez).
+// Falhas não impedem o servidor de subir: a tabela continua funcionando sem partições.
+async function garantir(pool, mesesFuturos = MESES_FUTUROS) {
+  try {
+    const particoes = await listar(pool);
+    if (particoes.length === 0) {
+      await particionar(pool, mesesFuturos);
+      return;
+    }
+
+    // pfuturo fica vazia enquanto houver meses criados à frente: reorganizá-la não copia dados
+    const ultimo = particoes[particoes.length - 2];
+    const novos = [];
+    for (let mes = ultimo.fim; mes <= somarMeses(new Date(), mesesFuturos); mes = somarMeses(mes, 1)) {
+      novos.push(definicaoMes(mes));
+    }
+    if (novos.length > 0) {
+      await pool.query(
+        `ALTER TABLE hardware_data REORGANIZE PARTITION ${PARTICAO_FUTURA} INTO
+         (${novos.join(', ')}, PARTITION ${PARTICAO_FUTURA} VALUES LESS THAN (MAXVALUE))`
+      );
+      console.log(`${novos.length} partição(ões) mensal(is) criada(s) em hardware_data.`);
+    }
+  } catch (error) {
+    console.error('Erro ao criar as partições de hardware_data:', error.message);
+  }
+}
+
+// Resume o mês em resumo_hardware_mensal antes de qualquer remoção (uma única vez por partição)
+async function resumir(pool, particao) {
+  const conexao = await pool.getConnection();
+  try {
+    await conexao.beginTransaction();
+    const [jaResumida] = await conexao.query(
+      'SELECT 1 FROM particoes_compactadas WHERE particao = ? FOR UPDATE', [particao.nome]
+    );
+    if (jaResumida.length === 0) {
+      await conexao.query(
+        `INSERT INTO resumo_hardware_mensal (mes, secretaria, setor, cadastros, maquinas)
+         SELECT DATE_FORMAT(dataColeta, '%Y-%m-01') AS mes, secretaria, setor,
+                COUNT(*), COUNT(DISTINCT nomeDispositivo)
+         FROM hardware_data PARTITION (${particao.nome})
+         GROUP BY mes, secretaria, setor
+         ON DUPLICATE KEY UPDATE cadastros = cadastros + VALUES(cadastros), maquinas = maquinas + VALUES(maquinas)`
+      );
+      await conexao.query('INSERT INTO particoes_compactadas (particao, resumidaEm) VALUES (?, NOW())',
+        [particao.nome]);
+    }
+    await conexao.commit();
+  } catch (error) {
+    await conexao.rollback();
+    throw error;
+  } finally {
+    conexao.release();
+  }
+}
+
+// Apaga linhas de hardware_data com a forma normalizada e a contribuição nas estatísticas
+async function apagarLinhas(pool, ids, lote) {
+  for (let i = 0; i < ids.length; i += lote) {
+    const parte = ids.slice(i, i + lote);
+    const conexao = await pool.getConnection();
+    try {
+      await conexao.beginTransaction();
+      const [linhas] = await conexao.query(
+        'SELECT DISTINCT nomeDispositivo FROM hardware_data WHERE id IN (?)', [parte]
+      );
+      await conexao.query('DELETE FROM hardware_data WHERE id IN (?)', [parte]);
+      await normalizacao.remover(conexao, parte);
+      // Saúde dos discos, perfil e programas de máquinas que não têm mais nenhum cadastro
+      const nomes = linhas.map((row) => row.nomeDispositivo);
+      if (nomes.length > 0) {
+        for (const tabela of ['saude_discos', 'maquinas_perfil', 'programas_maquina', 'inventario_programas']) {
+          await conexao.query(
+            `DELETE t FROM ${tabela} t
+             WHERE t.nomeDispositivo IN (?)
+               AND NOT EXISTS (SELECT 1 FROM hardware_data h WHERE h.nomeDispositivo = t.nomeDispositivo)`,
+            [nomes]
+          );
+        }
+      }
+      await conexao.commit();
+    } catch (error) {
+      await conexao.rollback();
+      throw error;
+    } finally {
+      conexao.release();
+    }
+  }
+}
+
+// Cadastros da partição que já foram substituídos por um mais recente da mesma máquina
+async function substituidos(pool, particao) {
+  const [rows] = await pool.query(
+    `SELECT h.id FROM hardware_data PARTITION (${particao.nome}) h
+     WHERE EXISTS (SELECT 1 FROM hardware_data n WHERE n.nomeDispositivo = h.nomeDispositivo AND n.id > h.id)`
+  );
+  return rows.map((row) => row.id);
+}
+
+// Cadastros da partição de máquinas sem nenhuma coleta no histórico desde `corte`
+async function inativos(pool, particao, corte) {
+  const [rows] = await pool.query(
+    `SELECT h.id FROM hardware_data PARTITION (${particao.nome}) h
+     WHERE NOT EXISTS (SELECT 1 FROM snapshots_hardware s
+                       WHERE s.nomeDispositivo = h.nomeDispositivo AND s.ultimaColeta >= ?)`,
+    [corte]
+  );
+  return rows.map((row) => row.id);
+}
+
+// Aplica a retenção às partições inteiramente anteriores a `meses` meses atrás.
+// Retorna um resumo por partição: { nome, substituidos, inativos, descartada }.
+async function aplicarRetencao(pool, { meses, descartarInativas = false, simular = false, lote = 500 }) {
+  const corte = somarMeses(primeiroDoMes(new Date()), -meses);
+  const resultado = [];
+
+  for (const particao of await listar(pool)) {
+    if (!particao.fim || particao.fim > corte) continue;
+
+    const ids = await substituidos(pool, particao);
+    const jaListados = new Set(ids);
+    const idsInativos = descartarInativas
+      ? (await inativos(pool, particao, corte)).filter((id) => !jaListados.has(id))
+      : [];
+    const item = { nome: particao.nome, substituidos: ids.length, inativos: idsInativos.length, descartada: false };
+    resultado.push(item);
+    if (simular) continue;
+
+    await resumir(pool, particao);
+    await apagarLinhas(pool, [...ids, ...idsInativos], lote);
+    await pool.query('UPDATE particoes_compactadas SET removidas = removidas + ? WHERE particao = ?',
+      [ids.length + idsInativos.length, particao.nome]);
+
+    // Partição vazia é descartada; o intervalo dela passa para a partição seguinte
+    const [[{ restantes }]] = await pool.query(
+      `SELECT COUNT(*) AS restantes FROM hardware_data PARTITION (${particao.nome})`
+    );
+    if (Number(restantes) === 0) {
+      await pool.query(`ALTER TABLE hardware_data DROP PARTITION ${particao.nome}`);
+      await pool.query('UPDATE particoes_compactadas SET descartadaEm = NOW() WHERE particao = ?', [particao.nome]);
+      item.descartada = true;
+    }
+  }
+  return resultado;
+}
+
+module.exports = {
+  criarTabelas,
+  listar,
+  garantir,
+  aplicarRetencao
+};
@@ -0,0 +1,244 @@
+const crypto = require('crypto');
+const { secoesCanonicas, canonicalizar, hashConteudo, extrairVolateis, reconstruir } = require('./secoes');
+const { gravarSecoes } = require('./historico');
+
+// Perfis de hardware da frota.
+//
+// Máquinas compradas no mesmo lote enviam exatamente o mesmo processador, RAM e
+// disco, mudando só a utilização e o espaço livre. O perfil é a combinação das
+// formas canônicas dessas três seções (lib/secoes.js, sem os valores voláteis):
+// perfis_hardware guarda cada combinação uma única vez, identificada pelo
+// SHA-256 dos hashes das seções, e o texto de cada seção fica uma única vez em
+// secoes_hardware (o mesmo armazenamento do histórico). maquinas_perfil liga
+// cada máquina ao perfil da coleta mais recente, então "quais máquinas têm este
+// hardware" é uma leitura pelo índice de perfil_id.
+//
+// Cada coleta em hardware_data guarda só o perfil_id e, em volateis, as linhas
+// de cada seção que diferem da forma canônica (utilização, espaço livre).
+// processador, disco e ram ficam nulos e são reconstruídos na leitura por
+// expandir(); cadastros anteriores continuam com o texto até serem compactados
+// (scripts/perfis_existentes.js).
+
+// Monitores ficam fora: são periféricos trocados independentemente da máquina
+const SECOES_PERFIL = ['processador', 'ram', 'disco'];
+
+// Colunas de hardware_data preenchidas por valoresCompactos, na ordem
+const COLUNAS_COMPACTAS = 'processador, disco, ram, perfil_id, volateis';
+
+async function criarTabelas(pool) {
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS perfis_hardware (
+      id INT AUTO_INCREMENT PRIMARY KEY,
+      hash CHAR(64) NOT NULL,
+      processadorHash CHAR(64),
+      ramHash CHAR(64),
+      discoHash CHAR(64),
+      criadoEm DATETIME DEFAULT CURRENT_TIMESTAMP,
+      UNIQUE INDEX idx_perfis_hash (hash)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS maquinas_perfil (
+      nomeDispositivo VARCHAR(100) PRIMARY KEY,
+      perfil_id INT NOT NULL,
+      desde DATETIME DEFAULT CURRENT_TIMESTAMP,
+      INDEX idx_maquinas_perfil (perfil_id, nomeDispositivo)
+    )
+  `);
+
+  // Tabelas criadas antes da forma compacta: o texto passa a ser opcional
+  const [colunas] = await pool.query(
+    `SELECT COUNT(*) AS total FROM information_schema.COLUMNS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'hardware_data' AND COLUMN_NAME = 'perfil_id'`
+  );
+  if (Number(colunas[0].total) === 0) {
+    console.log('Preparando hardware_data para a forma compacta (perfil_id e volateis)...');
+    await pool.query(
+      `ALTER TABLE hardware_data
+       MODIFY processador TEXT NULL, MODIFY disco TEXT NULL, MODIFY ram TEXT NULL,
+       ADD COLUMN perfil_id INT NULL AFTER ram, ADD COLUMN volateis JSON NULL AFTER perfil_id`
+    );
+  }
+  console.log('Tabelas de perfis de hardware verificadas/criadas com sucesso!');
+}
+
+function hashPerfil(hashes) {
+  return crypto.createHash('sha256')
+    .update(SECOES_PERFIL.map((secao) => `${secao}\0${hashes[secao] || ''}`).join('\n'))
+    .digest('hex');
+}
+
+// Id do perfil das seções indicadas ({ processador, ram, disco } -> hash em secoes_hardware),
+// criando o perfil se ainda não existir
+async function obterId(pool, hashes) {
+  // LAST_INSERT_ID(id) faz o insertId trazer o id do perfil que já existia
+  const [resultado] = await pool.query(
+    `INSERT INTO perfis_hardware (hash, processadorHash, ramHash, discoHash) VALUES (?, ?, ?, ?)
+     ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)`,
+    [hashPerfil(hashes), hashes.processador || null, hashes.ram || null, hashes.disco || null]
+  );
+  return resultado.insertId;
+}
+
+// Liga a máquina ao perfil das seções indicadas, criando o perfil se ainda não existir.
+// Retorna o id do perfil.
+async function vincular(pool, nomeDispositivo, hashes) {
+  if (SECOES_PERFIL.every((secao) => !hashes[secao])) return null;
+  const perfilId = await obterId(pool, hashes);
+
+  // `desde` só muda quando o perfil da máquina muda (atribuições avaliadas da esquerda para a direita)
+  await pool.query(
+    `INSERT INTO maquinas_perfil (nomeDispositivo, perfil_id) VALUES (?, ?)
+     ON DUPLICATE KEY UPDATE desde = IF(perfil_id = VALUES(perfil_id), desde, NOW()),
+                             perfil_id = VALUES(perfil_id)`,
+    [nomeDispositivo, perfilId]
+  );
+  return perfilId;
+}
+
+// Hashes das seções do perfil calculados direto do payload (linhas sem histórico)
+function hashesDe(dados) {
+  const secoes = secoesCanonicas(dados);
+  const hashes = {};
+  for (const secao of SECOES_PERFIL) {
+    hashes[secao] = secoes[secao] ? secoes[secao].hash : null;
+  }
+  return hashes;
+}
+
+// Forma compacta de uma coleta: o perfil (texto canônico em secoes_hardware) e as linhas
+// voláteis de cada seção. Retorna null se faltar alguma seção do perfil (o texto fica na linha).
+async function compactar(pool, dados) {
+  if (!SECOES_PERFIL.every((secao) => typeof dados[secao] === 'string')) return null;
+
+  const secoes = {};
+  const volateis = {};
+  for (const secao of SECOES_PERFIL) {
+    const conteudo = canonicalizar(secao, dados[secao]);
+    const diferencas = extrairVolateis(conteudo, dados[secao]);
+    if (reconstruir(conteudo, diferencas) !== dados[secao]) return null;
+    secoes[secao] = { hash: hashConteudo(secao, conteudo), conteudo };
+    if (diferencas.length > 0) volateis[secao] = diferencas;
+  }
+
+  // As seções são gravadas antes da linha que as referencia
+  await gravarSecoes(pool, secoes);
+  const hashes = Object.fromEntries(SECOES_PERFIL.map((secao) => [secao, secoes[secao].hash]));
+  return {
+    perfilId: await obterId(pool, hashes),
+    volateis: Object.keys(volateis).length > 0 ? JSON.stringify(volateis) : null
+  };
+}
+
+// Valores de COLUNAS_COMPACTAS para inserir a coleta em hardware_data (texto completo se não compactar)
+async function valoresCompactos(pool, dados) {
+  const compacta = await compactar(pool, dados);
+  if (!compacta) return [dados.processador ?? null, dados.disco ?? null, dados.ram ?? null, null, null];
+  return [null, null, null, compacta.perfilId, compacta.volateis];
+}
+
+async function conteudosDasSecoes(pool, hashes) {
+  const conteudos = new Map();
+  if (hashes.length > 0) {
+    const [rows] = await pool.query('SELECT hash, conteudo FROM secoes_hardware WHERE hash IN (?)', [hashes]);
+    rows.forEach((row) => conteudos.set(row.hash, row.conteudo));
+  }
+  return conteudos;
+}
+
+// Reconstrói processador, disco e ram das linhas compactas de hardware_data (as linhas são
+// alteradas e retornadas). A coluna volateis é removida do resultado.
+async function expandir(pool, rows) {
+  const compactas = rows.filter((row) => row.perfil_id && row.processador === null);
+  if (compactas.length > 0) {
+    const ids = [...new Set(compactas.map((row) => row.perfil_id))];
+    const [perfis] = await pool.query(
+      'SELECT id, processadorHash, ramHash, discoHash FROM perfis_hardware WHERE id IN (?)', [ids]
+    );
+    const porId = new Map(perfis.map((perfil) => [perfil.id, perfil]));
+    const conteudos = await conteudosDasSecoes(pool,
+      [...new Set(perfis.flatMap((p) => SECOES_PERFIL.map((s) => p[`${s}Hash`])).filter(Boolean))]);
+
+    for (const row of compactas) {
+      const perfil = porId.get(row.perfil_id) || {};
+      // JSON chega como texto ou já convertido, conforme a versão do driver
+      const volateis = typeof row.volateis === 'string' ? JSON.parse(row.volateis) : row.volateis || {};
+      for (const secao of SECOES_PERFIL) {
+        row[secao] = reconstruir(conteudos.get(perfil[`${secao}Hash`]) ?? '', volateis[secao]);
+      }
+    }
+  }
+  for (const row of rows) delete row.volateis;
+  return rows;
+}
+
+// Resolve o texto canônico das seções de uma lista de perfis
+async function resolverSecoes(pool, perfis) {
+  const hashes = [...new Set(perfis.flatMap((p) => SECOES_PERFIL.map((s) => p[`${s}Hash`])).filter(Boolean))];
+  const conteudos = await conteudosDasSecoes(pool, hashes);
+  return perfis.map((perfil) => {
+    const item = { id: perfil.id, hash: perfil.hash, maquinas: Number(perfil.maquinas) };
+    for (const secao of SECOES_PERFIL) {
+      const hash = perfil[`${secao}Hash`];
+      item[secao] = hash ? conteudos.get(hash) ?? null : null;
+    }
+    return item;
+  });
+}
+
+// Perfis com mais máquinas primeiro
+async function listar(pool, { limite = 50 } = {}) {
+  const [rows] = await pool.query(
+    `SELECT p.id, p.hash, p.processadorHash, p.ramHash, p.discoHash, c.maquinas
+     FROM (SELECT perfil_id, COUNT(*) AS maquinas FROM maquinas_perfil
+           GROUP BY perfil_id ORDER BY maquinas DESC LIMIT ?) c
+     JOIN perfis_hardware p ON p.id = c.perfil_id
+     ORDER BY c.maquinas DESC, p.id`,
+    [limite]
+  );
+  return resolverSecoes(pool, rows);
+}
+
+// Um perfil com as máquinas que o compartilham (secretaria e setor do cadastro mais recente).
+// Retorna null se o perfil não existir.
+async function obter(pool, perfilId) {
+  const [perfis] = await pool.query(
+    'SELECT id, hash, processadorHash, ramHash, discoHash, 0 AS maquinas FROM perfis_hardware WHERE id = ?',
+    [perfilId]
+  );
+  if (perfis.length === 0) return null;
+
+  const [maquinas] = await pool.query(
+    `SELECT m.nomeDispositivo, m.desde, h.secretaria, h.setor
+     FROM maquinas_perfil m
+     LEFT JOIN hardware_data h ON h.id = (SELECT MAX(id) FROM hardware_data WHERE nomeDispositivo = m.nomeDispositivo)
+     WHERE m.perfil_id = ?
+     ORDER BY m.nomeDispositivo`,
+    [perfilId]
+  );
+  const [perfil] = await resolverSecoes(pool, perfis);
+  perfil.maquinas = maquinas.length;
+  return { ...perfil, dispositivos: maquinas };
+}
+
+// Id do perfil atual de uma máquina (null se ainda não tem)
+async function perfilDaMaquina(pool, nomeDispositivo) {
+  const [rows] = await pool.execute(
+    'SELECT perfil_id FROM maquinas_perfil WHERE nomeDispositivo = ?', [nomeDispositivo]
+  );
+  return rows.length > 0 ? rows[0].perfil_id : null;
+}
+
+module.exports = {
+  SECOES_PERFIL,
+  COLUNAS_COMPACTAS,
+  criarTabelas,
+  vincular,
+  hashesDe,
+  compactar,
+  valoresCompactos,
+  expandir,
+  listar,
+  obter,
+  perfilDaMaquina
+};
@@ -0,0 +1,171 @@
+const crypto = require('crypto');
+
+// Programas instalados enviados pelos coletores (ver coletor-python/programas.py).
+//
+// O coletor envia { fonte, hash, fabricantes, itens: [[nome, versao, índice do fabricante]] }.
+// Cada programa (nome, versão, fabricante) é guardado uma única vez em
+// programas, identificado pelo SHA-256 dos três campos; programas_maquina liga
+// as máquinas aos programas. inventario_programas guarda o hash da última lista
+// de cada máquina: uma lista igual à anterior só renova a data, sem tocar nas
+// demais tabelas.
+
+const MAXIMO_PROGRAMAS = 20000;
+const TAMANHO_LOTE = 1000;
+
+async function criarTabelas(pool) {
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS programas (
+      id INT AUTO_INCREMENT PRIMARY KEY,
+      hash CHAR(64) NOT NULL,
+      nome VARCHAR(255) NOT NULL,
+      versao VARCHAR(100),
+      fabricante VARCHAR(255),
+      UNIQUE INDEX idx_programas_hash (hash),
+      INDEX idx_programas_nome (nome, versao)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS programas_maquina (
+      nomeDispositivo VARCHAR(100) NOT NULL,
+      programa_id INT NOT NULL,
+      PRIMARY KEY (nomeDispositivo, programa_id),
+      INDEX idx_programas_maquina_programa (programa_id)
+    )
+  `);
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS inventario_programas (
+      nomeDispositivo VARCHAR(100) PRIMARY KEY,
+      hash CHAR(64) NOT NULL,
+      fonte VARCHAR(50),
+      quantidade INT NOT NULL,
+      alteradoEm DATETIME NOT NULL,
+      atualizadoEm DATETIME NOT NULL
+    )
+  `);
+  console.log('Tabelas de programas instalados verificadas/criadas com sucesso!');
+}
+
+function textoOuNulo(valor, tamanho) {
+  return typeof valor === 'string' && valor.trim() ? valor.trim().slice(0, tamanho) : null;
+}
+
+// Expande a lista compacta do coletor em [hash, nome, versao, fabricante], sem repetições
+function expandir(programas) {
+  const fabricantes = Array.isArray(programas.fabricantes) ? programas.fabricantes : [];
+  const unicos = new Map();
+  for (const item of programas.itens.slice(0, MAXIMO_PROGRAMAS)) {
+    if (!Array.isArray(item)) continue;
+    const nome = textoOuNulo(item[0], 255);
+    if (!nome) continue;
+    const versao = textoOuNulo(item[1], 100);
+    const fabricante = Number.isInteger(item[2]) ? textoOuNulo(fabricantes[item[2]], 255) : null;
+    const hash = crypto.createHash('sha256')
+      .update(`${nome}\0${versao || ''}\0${fabricante || ''}`).digest('hex');
+    unicos.set(hash, [hash, nome, versao, fabricante]);
+  }
+  return [...unicos.values()];
+}
+
+// Substitui os programas de uma máquina pelos da coleta.
+// Retorna { alterado, quantidade } (alterado = false quando a lista é igual à anterior).
+async function registrar(pool, nomeDispositivo, programas) {
+  if (!programas || typeof programas.hash !== 'string' || !Array.isArray(programas.itens)) {
+    return { alterado: false, quantidade: 0 };
+  }
+  const hashLista = programas.hash.slice(0, 64);
+
+  const [atual] = await pool.execute(
+    'SELECT hash, quantidade FROM inventario_programas WHERE nomeDispositivo = ?', [nomeDispositivo]
+  );
+  if (atual.length > 0 && atual[0].hash === hashLista) {
+    await pool.execute(
+      'UPDATE inventario_programas SET atualizadoEm = NOW() WHERE nomeDispositivo = ?', [nomeDispositivo]
+    );
+    return { alterado: false, quantidade: atual[0].quantidade };
+  }
+
+  const linhas = expandir(programas);
+  const conexao = await pool.getConnection();
+  try {
+    await conexao.beginTransaction();
+
+    // Programas que nenhuma máquina enviou antes
+    const ids = [];
+    for (let i = 0; i < linhas.length; i += TAMANHO_LOTE) {
+      const lote = linhas.slice(i, i + TAMANHO_LOTE);
+      await conexao.query('INSERT IGNORE INTO programas (hash, nome, versao, fabricante) VALUES ?', [lote]);
+      const [rows] = await conexao.query('SELECT id FROM programas WHERE hash IN (?)', [lote.map((l) => l[0])]);
+      ids.push(...rows.map((row) => row.id));
+    }
+
+    // Só as diferenças em relação à lista anterior da máquina
+    const [vinculados] = await conexao.execute(
+      'SELECT programa_id FROM programas_maquina WHERE nomeDispositivo = ?', [nomeDispositivo]
+    );
+    const novos = new Set(ids);
+    const anteriores = new Set(vinculados.map((row) => row.programa_id));
+    const removidos = [...anteriores].filter((id) => !novos.has(id));
+    const acrescentados = ids.filter((id) => !anteriores.has(id));
+    for (let i = 0; i < removidos.length; i += TAMANHO_LOTE) {
+      await conexao.query('DELETE FROM programas_maquina WHERE nomeDispositivo = ? AND programa_id IN (?)',
+        [nomeDispositivo, removidos.slice(i, i + TAMANHO_LOTE)]);
+    }
+    for (let i = 0; i < acrescentados.length; i += TAMANHO_LOTE) {
+      await conexao.query('INSERT IGNORE INTO programas_maquina (nomeDispositivo, programa_id) VALUES ?',
+        [acrescentados.slice(i, i + TAMANHO_LOTE).map((id) => [nomeDispositivo, id])]);
+    }
+
+    await conexao.query(
+      `INSERT INTO inventario_programas (nomeDispositivo, hash, fonte, quantidade, alteradoEm, atualizadoEm)
+       VALUES (?, ?, ?, ?, NOW(), NOW())
+       ON DUPLICATE KEY UPDATE hash = VALUES(hash), fonte = VALUES(fonte), quantidade = VALUES(quantidade),
+                               alteradoEm = NOW(), atualizadoEm = NOW()`,
+      [nomeDispositivo, hashLista, textoOuNulo(programas.fonte, 50), ids.length]
+    );
+    await conexao.commit();
+    return { alterado: true, quantidade: ids.length };
+  } catch (error) {
+    await conexao.rollback();
+    throw error;
+  } finally {
+    conexao.release();
+  }
+}
+
+// Programas de uma máquina, em ordem de nome
+async function listarDaMaquina(pool, nomeDispositivo) {
+  const [rows] = await pool.execute(
+    `SELECT p.nome, p.versao, p.fabricante
+     FROM programas_maquina m JOIN programas p ON p.id = m.programa_id
+     WHERE m.nomeDispositivo = ?
+     ORDER BY p.nome, p.versao`,
+    [nomeDispositivo]
+  );
+  return rows;
+}
+
+// Máquinas com um programa (nome exato ou prefixo com `prefixo`), por versão
+async function buscar(pool, { nome, prefixo = false, versao = null }) {
+  const filtros = [prefixo ? 'p.nome LIKE ?' : 'p.nome = ?'];
+  const valores = [prefixo ? `${nome.replace(/[\\%_]/g, '\\$&')}%` : nome];
+  if (versao) {
+    filtros.push('p.versao = ?');
+    valores.push(versao);
+  }
+  const [rows] = await pool.query(
+    `SELECT p.nome, p.versao, p.fabricante, m.nomeDispositivo
+     FROM programas p JOIN programas_maquina m ON m.programa_id = p.id
+     WHERE ${filtros.join(' AND ')}
+     ORDER BY p.nome, p.versao, m.nomeDispositivo
+     LIMIT 10000`,
+    valores
+  );
+  return rows;
+}
+
+module.exports = {
+  criarTabelas,
+  registrar,
+  listarDaMaquina,
+  buscar
+};
@@ -0,0 +1,124 @@
+// Saúde dos discos enviada pelos coletores (SMART / NVMe, ver coletor-python/saude_discos.py).
+//
+// Guarda só a leitura mais recente de cada disco de cada máquina: a tabela
+// responde "quais discos da frota estão para falhar", não a série histórica.
+// A situação (ok, atencao, falha, desconhecida) já vem calculada pelo coletor.
+
+const CAMPOS_NUMERICOS = ['horasLigado', 'temperatura', 'setoresRealocados', 'setoresPendentes',
+  'setoresIncorrigiveis', 'errosIncorrigiveis', 'errosMidia', 'desgastePct', 'avisoCritico'];
+const SITUACOES = ['ok', 'atencao', 'falha', 'desconhecida'];
+const MAXIMO_DISCOS = 64;
+
+async function criarTabelas(pool) {
+  const colunas = CAMPOS_NUMERICOS.map((campo) => `${campo} BIGINT`).join(',\n      ');
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS saude_discos (
+      nomeDispositivo VARCHAR(100) NOT NULL,
+      dispositivo VARCHAR(100) NOT NULL,
+      modelo VARCHAR(200),
+      serie VARCHAR(100),
+      tipo VARCHAR(10),
+      aprovado BOOLEAN,
+      ${colunas},
+      emRepouso BOOLEAN NOT NULL DEFAULT FALSE,
+      situacao VARCHAR(20) NOT NULL,
+      motivos TEXT,
+      lidoEm DATETIME,
+      atualizadoEm DATETIME NOT NULL,
+      PRIMARY KEY (nomeDispositivo, dispositivo),
+      INDEX idx_saude_discos_situacao (situacao)
+    )
+  `);
+  console.log('Tabela de saúde dos discos verificada/criada com sucesso!');
+}
+
+function textoOuNulo(valor, tamanho) {
+  return typeof valor === 'string' && valor.trim() ? valor.trim().slice(0, tamanho) : null;
+}
+
+function inteiroOuNulo(valor) {
+  return typeof valor === 'number' && Number.isFinite(valor) ? Math.round(valor) : null;
+}
+
+// Substitui os discos de uma máquina pelos da coleta. Retorna o número de discos gravados.
+async function registrar(pool, nomeDispositivo, discos) {
+  const agora = new Date();
+  const linhas = discos
+    .filter((disco) => disco && typeof disco.dispositivo === 'string' && disco.dispositivo)
+    .slice(0, MAXIMO_DISCOS)
+    .map((disco) => [
+      nomeDispositivo,
+      disco.dispositivo.slice(0, 100),
+      textoOuNulo(disco.modelo, 200),
+      textoOuNulo(disco.serie, 100),
+      textoOuNulo(disco.tipo, 10),
+      typeof disco.aprovado === 'boolean' ? disco.aprovado : null,
+      ...CAMPOS_NUMERICOS.map((campo) => inteiroOuNulo(disco[campo])),
+      Boolean(disco.emRepouso),
+      SITUACOES.includes(disco.situacao) ? disco.situacao : 'desconhecida',
+      Array.isArray(disco.motivos) ? disco.motivos.join('; ').slice(0, 1000) : null,
+      // idadeLeitura: segundos desde a leitura SMART (o coletor pode reaproveitar leituras em cache)
+      inteiroOuNulo(disco.idadeLeitura) !== null ? new Date(agora - disco.idadeLeitura * 1000) : agora,
+      agora
+    ]);
+
+  const conexao = await pool.getConnection();
+  try {
+    await conexao.beginTransaction();
+    await conexao.execute('DELETE FROM saude_discos WHERE nomeDispositivo = ?', [nomeDispositivo]);
+    if (linhas.length > 0) {
+      await conexao.query(
+        `INSERT INTO saude_discos (nomeDispositivo, dispositivo, modelo, serie, tipo, aprovado,
+           ${CAMPOS_NUMERICOS.join(', ')}, emRepouso, situacao, motivos, lidoEm, atualizadoEm)
+         VALUES ?`,
+        [linhas]
+      );
+    }
+    await conexao.commit();
+    return linhas.length;
+  } catch (error) {
+    await conexao.rollback();
+    throw error;
+  } finally {
+    conexao.release();
+  }
+}
+
+// Discos da frota; com `situacoes`, só os nessas situações (ex.: ['falha', 'atencao'])
+async function listar(pool, { situacoes = null, secretaria = null } = {}) {
+  const condicoes = [];
+  const parametros = [];
+  if (situacoes && situacoes.length > 0) {
+    condicoes.push('s.situacao IN (?)');
+    parametros.push(situacoes);
+  }
+  if (secretaria) {
+    condicoes.push('h.secretaria = ?');
+    parametros.push(secretaria);
+  }
+
+  // Secretaria e setor do cadastro mais recente da máquina
+  const [rows] = await pool.query(
+    `SELECT s.*, h.secretaria, h.setor
+     FROM saude_discos s
+     LEFT JOIN hardware_data h ON h.id = (
+       SELECT MAX(id) FROM hardware_data WHERE nomeDispositivo = s.nomeDispositivo
+     )
+     ${condicoes.length > 0 ? `WHERE ${condicoes.join(' AND ')}` : ''}
+     ORDER BY FIELD(s.situacao, 'falha', 'atencao', 'desconhecida', 'ok'), s.nomeDispositivo, s.dispositivo`,
+    parametros
+  );
+  return rows.map((row) => ({
+    ...row,
+    aprovado: row.aprovado === null ? null : Boolean(row.aprovado),
+    emRepouso: Boolean(row.emRepouso),
+    motivos: row.motivos ? row.motivos.split('; ') : []
+  }));
+}
+
+module.exports = {
+  SITUACOES,
+  criarTabelas,
+  registrar,
+  listar
+};
@@ -0,0 +1,129 @@
+const crypto = require('crypto');
+
+// Seções de hardware enviadas pelos coletores e sua forma canônica.
+//
+// Os textos dos coletores misturam dados estáveis (modelo, capacidade) com
+// valores que mudam a cada execução (utilização da CPU, espaço livre). A forma
+// canônica remove os valores voláteis para que duas coletas do mesmo hardware
+// gerem exatamente o mesmo conteúdo e, portanto, o mesmo hash.
+//
+// extrairVolateis guarda só as linhas do texto original que diferem da forma
+// canônica (utilização, espaço livre); reconstruir refaz o texto original, byte
+// a byte, a partir da forma canônica e dessas linhas.
+
+const SECOES = ['processador', 'disco', 'ram', 'monitores'];
+
+// Acima disso (linhas canônicas x linhas originais) o texto inteiro vira uma única diferença
+const MAXIMO_CELULAS_DIFERENCA = 250000;
+
+const SUBSTITUICOES = {
+  processador: [
+    [/^Utilização atual:.*$\n?/gm, ''],                       // coletor Windows
+    [/,\s*[\d.]+%\s*utilização/g, ''],                          // coletor Go
+    [/\s*\(Utilização: [\d.]+%, Frequência: [^)]*\)/g, ''],     // fallback sem WMI
+    [/,\s*\d+(?:\.\d+)?\s*GHz(?=,|$)/g, '']                     // frequência atual (Linux)
+  ],
+  disco: [
+    [/Disco principal: [\d.]+ GB \/ ([\d.]+) GB \([\d.]+% usado\)/g, 'Disco principal: $1 GB'],
+    [/Unidade (\S+) [\d.]+ GB livre de ([\d.]+) GB \([\d.]+% usado\)/g, 'Unidade $1 $2 GB'],
+    [/Disco (\S+): [\d.]+ GB \/ ([\d.]+) GB \([\d.]+% usado\)/g, 'Disco $1: $2 GB']
+  ],
+  ram: [
+    [/^[\d.]+ GB \/ ([\d.]+) GB \([\d.]+% usado\)/gm, 'Total: $1 GB']
+  ],
+  monitores: []
+};
+
+// Texto canônico de uma seção (null quando a seção não foi enviada)
+function canonicalizar(secao, valor) {
+  if (valor === undefined || valor === null) return null;
+
+  let texto = typeof valor === 'string' ? valor : JSON.stringify(valor);
+  for (const [padrao, substituto] of SUBSTITUICOES[secao] || []) {
+    texto = texto.replace(padrao, substituto);
+  }
+  return texto.replace(/[ \t]+$/gm, '').trim();
+}
+
+function hashConteudo(secao, conteudo) {
+  return crypto.createHash('sha256').update(`${secao}\0${conteudo}`).digest('hex');
+}
+
+// { processador: { hash, conteudo }, ... } apenas para as seções presentes no payload
+function secoesCanonicas(dados) {
+  const resultado = {};
+  for (const secao of SECOES) {
+    const conteudo = canonicalizar(secao, dados[secao]);
+    if (conteudo !== null) {
+      resultado[secao] = { hash: hashConteudo(secao, conteudo), conteudo };
+    }
+  }
+  return resultado;
+}
+
+// Diferenças por linha entre a forma canônica e o texto original:
+// lista de [linha na forma canônica, linhas canônicas substituídas, linhas originais no lugar]
+function extrairVolateis(canonico, original) {
+  if (canonico === original) return [];
+  const a = canonico.split('\n');
+  const b = original.split('\n');
+  if ((a.length + 1) * (b.length + 1) > MAXIMO_CELULAS_DIFERENCA) return [[0, a.length, b]];
+
+  // Maior subsequência comum de linhas, preenchida do fim para o início
+  const largura = b.length + 1;
+  const comum = new Uint32Array((a.length + 1) * largura);
+  for (let i = a.length - 1; i >= 0; i--) {
+    for (let j = b.length - 1; j >= 0; j--) {
+      comum[i * largura + j] = a[i] === b[j]
+        ? comum[(i + 1) * largura + j + 1] + 1
+        : Math.max(comum[(i + 1) * largura + j], comum[i * largura + j + 1]);
+    }
+  }
+
+  const diferencas = [];
+  let atual = null;
+  let i = 0;
+  let j = 0;
+  while (i < a.length || j < b.length) {
+    if (i < a.length && j < b.length && a[i] === b[j]) {
+      atual = null;
+      i++;
+      j++;
+      continue;
+    }
+    if (!atual) {
+      atual = [i, 0, []];
+      diferencas.push(atual);
+    }
+    if (j < b.length && (i === a.length || comum[i * largura + j + 1] >= comum[(i + 1) * largura + j])) {
+      atual[2].push(b[j++]);
+    } else {
+      atual[1]++;
+      i++;
+    }
+  }
+  return diferencas;
+}
+
+// Texto original a partir da forma canônica e das diferenças de extrairVolateis
+function reconstruir(canonico, volateis) {
+  if (!volateis || volateis.length === 0) return canonico;
+  const a = canonico.split('\n');
+  const linhas = [];
+  let i = 0;
+  for (const [inicio, substituidas, originais] of volateis) {
+    linhas.push(...a.slice(i, inicio), ...originais);
+    i = inicio + substituidas;
+  }
+  linhas.push(...a.slice(i));
+  return linhas.join('\n');
+}
+
+module.exports = {
+  SECOES,
+  canonicalizar,
+  hashConteudo,
+  secoesCanonicas,
+  extrairVolateis,
+  reconstruir
+};
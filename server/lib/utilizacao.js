@@ -0,0 +1,119 @@
+// Série temporal de utilização enviada pelos coletores em modo agente.
+//
+// Cada linha é um agregado de uma hora de uma máquina: mínimo, média, p95 e
+// máximo de CPU, RAM e uso do disco (%) e das taxas de leitura/escrita (B/s).
+// A chave (nomeDispositivo, inicio, execucao) torna o reenvio de um lote
+// idempotente. `execucao` identifica a execução do agente: ao reiniciar no meio
+// da hora (atualização, reboot) a parte anterior da hora fica numa linha própria
+// em vez de ser sobrescrita, e a leitura combina as partes.
+
+const METRICAS = ['cpu', 'ram', 'disco', 'leitura', 'escrita'];
+const ESTATISTICAS = [['min', 'Min'], ['media', 'Media'], ['p95', 'P95'], ['max', 'Max']];
+const COLUNAS = METRICAS.flatMap((metrica) => ESTATISTICAS.map(([, sufixo]) => `${metrica}${sufixo}`));
+
+const MAXIMO_AGREGADOS = 200;
+const TAMANHO_EXECUCAO = 36;
+
+// Combinação das partes de uma hora: mínimo dos mínimos, média ponderada pelas
+// amostras, máximo dos máximos. O p95 combinado é o maior p95 das partes
+// (aproximação conservadora: o percentil exato exigiria as amostras).
+function combinar(metrica, campo, sufixo) {
+  const coluna = `${metrica}${sufixo}`;
+  if (campo === 'min') return `MIN(${coluna}) AS ${coluna}`;
+  if (campo === 'media') {
+    return `SUM(${coluna} * amostras) / NULLIF(SUM(CASE WHEN ${coluna} IS NULL THEN 0 ELSE amostras END), 0) AS ${coluna}`;
+  }
+  return `MAX(${coluna}) AS ${coluna}`;
+}
+
+async function criarTabelas(pool) {
+  const colunas = COLUNAS.map((coluna) => `${coluna} DOUBLE`).join(',\n      ');
+  await pool.query(`
+    CREATE TABLE IF NOT EXISTS utilizacao_hardware (
+      nomeDispositivo VARCHAR(100) NOT NULL,
+      inicio DATETIME NOT NULL,
+      fim DATETIME NOT NULL,
+      execucao VARCHAR(${TAMANHO_EXECUCAO}) NOT NULL DEFAULT '',
+      amostras INT NOT NULL,
+      ${colunas},
+      PRIMARY KEY (nomeDispositivo, inicio, execucao)
+    )
+  `);
+
+  // Tabelas criadas antes da coluna execucao
+  const [colunasExistentes] = await pool.query(
+    `SELECT COUNT(*) AS total FROM information_schema.COLUMNS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'utilizacao_hardware' AND COLUMN_NAME = 'execucao'`
+  );
+  if (Number(colunasExistentes[0].total) === 0) {
+    await pool.query(
+      `ALTER TABLE utilizacao_hardware
+       ADD COLUMN execucao VARCHAR(${TAMANHO_EXECUCAO}) NOT NULL DEFAULT '' AFTER fim,
+       DROP PRIMARY KEY, ADD PRIMARY KEY (nomeDispositivo, inicio, execucao)`
+    );
+  }
+  console.log('Tabela de utilização verificada/criada com sucesso!');
+}
+
+function valido(agregado) {
+  return agregado && !Number.isNaN(Date.parse(agregado.inicio)) && !Number.isNaN(Date.parse(agregado.fim));
+}
+
+function numeroOuNulo(valor) {
+  return typeof valor === 'number' && Number.isFinite(valor) ? valor : null;
+}
+
+// Grava um lote de agregados de uma execução do agente. Retorna o número de agregados aceitos.
+async function registrar(pool, nomeDispositivo, agregados, execucao = '') {
+  const idExecucao = typeof execucao === 'string' ? execucao.slice(0, TAMANHO_EXECUCAO) : '';
+  const linhas = agregados.filter(valido).map((agregado) => [
+    nomeDispositivo,
+    new Date(agregado.inicio),
+    new Date(agregado.fim),
+    idExecucao,
+    parseInt(agregado.amostras, 10) || 0,
+    ...METRICAS.flatMap((metrica) =>
+      ESTATISTICAS.map(([campo]) => numeroOuNulo((agregado[metrica] || {})[campo])))
+  ]);
+  if (linhas.length === 0) return 0;
+
+  await pool.query(
+    `INSERT INTO utilizacao_hardware (nomeDispositivo, inicio, fim, execucao, amostras, ${COLUNAS.join(', ')})
+     VALUES ?
+     ON DUPLICATE KEY UPDATE fim = VALUES(fim), amostras = VALUES(amostras),
+       ${COLUNAS.map((coluna) => `${coluna} = VALUES(${coluna})`).join(', ')}`,
+    [linhas]
+  );
+  return linhas.length;
+}
+
+// Agregados das últimas `horas` horas de uma máquina, em ordem cronológica (uma linha por hora)
+async function obter(pool, nomeDispositivo, horas) {
+  const estatisticas = METRICAS.flatMap((metrica) =>
+    ESTATISTICAS.map(([campo, sufixo]) => combinar(metrica, campo, sufixo)));
+  const [rows] = await pool.execute(
+    `SELECT inicio, MAX(fim) AS fim, SUM(amostras) AS amostras, ${estatisticas.join(', ')}
+     FROM utilizacao_hardware
+     WHERE nomeDispositivo = ? AND inicio >= NOW() - INTERVAL ? HOUR
+     GROUP BY inicio
+     ORDER BY inicio`,
+    [nomeDispositivo, String(horas)]
+  );
+  return rows.map((row) => {
+    const item = { inicio: row.inicio, fim: row.fim, amostras: Number(row.amostras) };
+    for (const metrica of METRICAS) {
+      item[metrica] = {};
+      for (const [campo, sufixo] of ESTATISTICAS) {
+        item[metrica][campo] = row[`${metrica}${sufixo}`];
+      }
+    }
+    return item;
+  });
+}
+
+module.exports = {
+  MAXIMO_AGREGADOS,
+  criarTabelas,
+  registrar,
+  obter
+};
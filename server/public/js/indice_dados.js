@@ -0,0 +1,121 @@
+// Índice de busca da tabela de /dados, construído fora da thread da página.
+//
+// Para cada campo filtrável guarda o dicionário de palavras (sem acento, em
+// minúsculas) e, para cada palavra, as posições dos registros que a contêm.
+// Uma consulta compara os termos digitados só com as palavras distintas do
+// campo, que são poucas perto do número de registros (secretarias e setores se
+// repetem, nomes compartilham "Silva", "Santos"...), e junta as posições.
+//
+// Mensagens recebidas:
+//   { tipo: 'adicionar', registros: [{ secretaria, setor, nomeCompleto }, ...] }
+//   { tipo: 'consultar', id, filtros: { secretaria, setor, nomeCompleto } }
+// Resposta de 'consultar': { tipo: 'resultado', id, total, posicoes } (Int32Array transferido),
+// com as posições em ordem crescente; sem nenhum filtro, posicoes = null (todos os registros).
+
+const CAMPOS = ['secretaria', 'setor', 'nomeCompleto'];
+
+const indices = {};
+for (const campo of CAMPOS) {
+  indices[campo] = { palavras: [], postings: new Map() };
+}
+let total = 0;
+
+// Termos já consultados por campo: digitar mais letras só reexamina as palavras que casavam antes
+const ultimaBusca = {};
+
+function normalizar(texto) {
+  return String(texto == null ? '' : texto)
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase();
+}
+
+function palavras(texto) {
+  return normalizar(texto).split(/[^a-z0-9]+/).filter(Boolean);
+}
+
+function adicionar(registros) {
+  for (const registro of registros) {
+    const posicao = total++;
+    for (const campo of CAMPOS) {
+      const indice = indices[campo];
+      for (const palavra of new Set(palavras(registro[campo]))) {
+        let lista = indice.postings.get(palavra);
+        if (!lista) {
+          lista = [];
+          indice.postings.set(palavra, lista);
+          indice.palavras.push(palavra);
+        }
+        lista.push(posicao);
+      }
+    }
+  }
+  // Palavras novas podem casar com termos já consultados
+  for (const campo of CAMPOS) delete ultimaBusca[campo];
+}
+
+// Palavras do dicionário que contêm o termo
+function palavrasCompativeis(campo, termo) {
+  const anterior = ultimaBusca[campo] && ultimaBusca[campo].get(termo.slice(0, -1));
+  const candidatas = anterior || indices[campo].palavras;
+  return candidatas.filter((palavra) => palavra.includes(termo));
+}
+
+// Marca em `contagem` os registros que casam com todos os termos do campo
+function consultarCampo(campo, texto, contagem, rodada) {
+  const termos = palavras(texto);
+  const memoria = new Map();
+  for (const termo of termos) {
+    const compativeis = palavrasCompativeis(campo, termo);
+    memoria.set(termo, compativeis);
+
+    // Cada registro é contado uma vez por termo, mesmo que várias palavras casem
+    const vistos = new Uint8Array(total);
+    for (const palavra of compativeis) {
+      for (const posicao of indices[campo].postings.get(palavra)) {
+        if (!vistos[posicao] && contagem[posicao] === rodada) {
+          vistos[posicao] = 1;
+          contagem[posicao]++;
+        }
+      }
+    }
+    rodada++;
+  }
+  ultimaBusca[campo] = memoria;
+  return rodada;
+}
+
+function consultar(filtros) {
+  const ativos = CAMPOS.filter((campo) => palavras(filtros[campo]).length > 0);
+  if (ativos.length === 0) return null;
+
+  // contagem[i] = quantos termos o registro i já satisfez; só avança quem satisfez todos os anteriores
+  const contagem = new Uint16Array(total);
+  let rodada = 0;
+  for (const campo of ativos) {
+    rodada = consultarCampo(campo, filtros[campo], contagem, rodada);
+  }
+
+  let encontrados = 0;
+  for (let i = 0; i < total; i++) {
+    if (contagem[i] === rodada) encontrados++;
+  }
+  const posicoes = new Int32Array(encontrados);
+  for (let i = 0, j = 0; i < total; i++) {
+    if (contagem[i] === rodada) posicoes[j++] = i;
+  }
+  return posicoes;
+}
+
+self.onmessage = (evento) => {
+  const mensagem = evento.data;
+  if (mensagem.tipo === 'adicionar') {
+    adicionar(mensagem.registros);
+  } else if (mensagem.tipo === 'consultar') {
+    const posicoes = consultar(mensagem.filtros || {});
+    self.postMessage(
+      { tipo: 'resultado', id: mensagem.id, total, posicoes },
+      posicoes ? [posicoes.buffer] : []
+    );
+  }
+};
@@ -0,0 +1,286 @@
+// Importa arquivos NDJSON gerados pelo coletor em modo offline (--offline).
+//
+// Uso: node scripts/importar_ndjson.js <arquivo.ndjson[.gz]>... [--lote <n>] [--historico]
+//        [--simular] [--servidor <url>]
+//
+// O arquivo é lido em fluxo, um pedaço por vez, e processado em lotes: a
+// memória usada não depende do tamanho do arquivo. Cada lote é validado,
+// comparado com os cadastros existentes (nomeDispositivo e matrícula) e
+// inserido em hardware_data numa única transação. Em seguida as linhas novas
+// são normalizadas e entram no histórico.
+//
+// --historico   máquinas já cadastradas ganham uma nova coleta no histórico
+// --simular     apenas valida e conta, sem gravar
+// --servidor    URL do servidor em execução, para invalidar o cache de leitura no fim
+
+const http = require('http');
+const { pool, setupDatabase } = require('../config/db');
+const normalizacao = require('../lib/normalizacao');
+const estatisticas = require('../lib/estatisticas');
+const historico = require('../lib/historico');
+const saudeDiscos = require('../lib/saude_discos');
+const perfis = require('../lib/perfis');
+const programas = require('../lib/programas');
+const { lerLinhas } = require('../lib/ndjson');
+
+const CAMPOS_OBRIGATORIOS = ['secretaria', 'setor', 'matricula', 'usuarioLogado', 'nomeCompleto',
+  'nomeDispositivo', 'processador', 'disco', 'ram'];
+
+// Tamanhos das colunas de hardware_data
+const TAMANHOS = {
+  secretaria: 100, setor: 100, matricula: 20, usuarioLogado: 100, nomeCompleto: 200, nomeDispositivo: 100
+};
+
+const MAXIMO_ERROS_EXIBIDOS = 20;
+
+function lerOpcoes(argv) {
+  const opcoes = { arquivos: [], lote: 500, historico: false, simular: false, servidor: null };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--lote') opcoes.lote = parseInt(argv[++i], 10) || opcoes.lote;
+    else if (argv[i] === '--historico') opcoes.historico = true;
+    else if (argv[i] === '--simular') opcoes.simular = true;
+    else if (argv[i] === '--servidor') opcoes.servidor = argv[++i];
+    else opcoes.arquivos.push(argv[i]);
+  }
+  return opcoes;
+}
+
+// Retorna a mensagem de erro do registro, ou null se for válido
+function validar(registro) {
+  if (!registro || typeof registro !== 'object' || Array.isArray(registro)) return 'não é um objeto JSON';
+  for (const campo of CAMPOS_OBRIGATORIOS) {
+    if (typeof registro[campo] !== 'string' || !registro[campo].trim()) return `campo ${campo} ausente`;
+  }
+  for (const [campo, tamanho] of Object.entries(TAMANHOS)) {
+    if (registro[campo].length > tamanho) return `campo ${campo} maior que ${tamanho} caracteres`;
+  }
+  if (registro.coletadoEm !== undefined && Number.isNaN(Date.parse(registro.coletadoEm))) {
+    return 'coletadoEm inválido';
+  }
+  return null;
+}
+
+function criarContadores() {
+  return { lidos: 0, invalidos: 0, inseridos: 0, existentes: 0, historico: 0, duplicados: 0 };
+}
+
+// Separa o lote em novos, máquinas já cadastradas e duplicados (matrícula em uso ou repetidos no lote)
+async function classificarLote(lote) {
+  const nomes = lote.map((r) => r.nomeDispositivo);
+  const matriculas = lote.map((r) => r.matricula);
+  const [rows] = await pool.query(
+    'SELECT id, nomeDispositivo, matricula FROM hardware_data WHERE nomeDispositivo IN (?) OR matricula IN (?)',
+    [nomes, matriculas]
+  );
+
+  const maquinas = new Map();
+  const matriculasExistentes = new Set();
+  for (const row of rows) {
+    if (!maquinas.has(row.nomeDispositivo) || maquinas.get(row.nomeDispositivo) < row.id) {
+      maquinas.set(row.nomeDispositivo, row.id);
+    }
+    matriculasExistentes.add(row.matricula);
+  }
+
+  const novos = [];
+  const existentes = [];
+  let duplicados = 0;
+  const nomesNoLote = new Set();
+  const matriculasNoLote = new Set();
+
+  for (const registro of lote) {
+    if (maquinas.has(registro.nomeDispositivo)) {
+      existentes.push({ id: maquinas.get(registro.nomeDispositivo), registro });
+    } else if (matriculasExistentes.has(registro.matricula) ||
+               nomesNoLote.has(registro.nomeDispositivo) || matriculasNoLote.has(registro.matricula)) {
+      duplicados++;
+    } else {
+      nomesNoLote.add(registro.nomeDispositivo);
+      matriculasNoLote.add(registro.matricula);
+      novos.push(registro);
+    }
+  }
+  return { novos, existentes, duplicados };
+}
+
+// Insere os registros novos numa única transação. Retorna os ids gerados, na ordem.
+async function inserirNovos(novos) {
+  // Perfis e seções gravados antes da transação: sem linha que os referencie, só ficam sem uso
+  const linhas = [];
+  for (const r of novos) {
+    linhas.push([
+      r.secretaria, r.setor, r.matricula, r.usuarioLogado, r.nomeCompleto, r.nomeDispositivo,
+      ...await perfis.valoresCompactos(pool, r),
+      r.monitores === undefined ? null : JSON.stringify(r.monitores),
+      r.coletadoEm ? new Date(r.coletadoEm) : new Date()
+    ]);
+  }
+
+  const conexao = await pool.getConnection();
+  try {
+    await conexao.beginTransaction();
+    const [resultado] = await conexao.query(
+      `INSERT INTO hardware_data
+       (secretaria, setor, matricula, usuarioLogado, nomeCompleto, nomeDispositivo,
+        ${perfis.COLUNAS_COMPACTAS}, monitores, dataColeta)
+       VALUES ?`,
+      [linhas]
+    );
+    await conexao.commit();
+    // Inserção de várias linhas numa instrução recebe ids consecutivos
+    return novos.map((_, i) => resultado.insertId + i);
+  } catch (error) {
+    await conexao.rollback();
+    throw error;
+  } finally {
+    conexao.release();
+  }
+}
+
+async function processarLote(lote, opcoes, contadores) {
+  const { novos, existentes, duplicados } = await classificarLote(lote);
+  contadores.duplicados += duplicados;
+  contadores.existentes += existentes.length;
+  if (opcoes.simular) {
+    contadores.inseridos += novos.length;
+    return;
+  }
+
+  if (novos.length > 0) {
+    const ids = await inserirNovos(novos);
+    contadores.inseridos += ids.length;
+    for (let i = 0; i < ids.length; i++) {
+      await normalizacao.normalizar(pool, ids[i], novos[i]);
+      const resultado = await historico.registrarSnapshot(pool, novos[i].nomeDispositivo, novos[i]);
+      await perfis.vincular(pool, novos[i].nomeDispositivo, resultado.hashes);
+      if (Array.isArray(novos[i].saudeDiscos)) {
+        await saudeDiscos.registrar(pool, novos[i].nomeDispositivo, novos[i].saudeDiscos);
+      }
+      await programas.registrar(pool, novos[i].nomeDispositivo, novos[i].programas);
+    }
+  }
+
+  if (opcoes.historico) {
+    for (const { id, registro } of existentes) {
+      const resultado = await historico.registrarSnapshot(pool, registro.nomeDispositivo, registro);
+      if (resultado.novo) {
+        await normalizacao.normalizar(pool, id, registro);
+        await perfis.vincular(pool, registro.nomeDispositivo, resultado.hashes);
+        contadores.historico++;
+      }
+      if (Array.isArray(registro.saudeDiscos)) {
+        await saudeDiscos.registrar(pool, registro.nomeDispositivo, registro.saudeDiscos);
+      }
+      await programas.registrar(pool, registro.nomeDispositivo, registro.programas);
+    }
+  }
+}
+
+async function importarArquivo(caminho, opcoes, contadores) {
+  let lote = [];
+  let numeroLinha = 0;
+  let errosExibidos = 0;
+  const inicio = Date.now();
+
+  const progresso = () => {
+    const segundos = (Date.now() - inicio) / 1000;
+    console.log(`${caminho}: ${contadores.lidos} lidos, ${contadores.inseridos} inseridos, ` +
+      `${contadores.existentes} já cadastrados, ${contadores.duplicados} duplicados, ` +
+      `${contadores.invalidos} inválidos (${(contadores.lidos / Math.max(segundos, 0.001)).toFixed(0)} registros/s)`);
+  };
+
+  for await (const linha of lerLinhas(caminho)) {
+    numeroLinha++;
+    if (!linha.trim()) continue;
+    contadores.lidos++;
+
+    let registro;
+    let erro;
+    try {
+      registro = JSON.parse(linha);
+      erro = validar(registro);
+    } catch (e) {
+      erro = 'JSON inválido';
+    }
+    if (erro) {
+      contadores.invalidos++;
+      if (errosExibidos++ < MAXIMO_ERROS_EXIBIDOS) console.warn(`${caminho}:${numeroLinha}: ${erro}`);
+      continue;
+    }
+
+    lote.push(registro);
+    if (lote.length >= opcoes.lote) {
+      await processarLote(lote, opcoes, contadores);
+      lote = [];
+      progresso();
+    }
+  }
+
+  if (lote.length > 0) {
+    await processarLote(lote, opcoes, contadores);
+  }
+  progresso();
+}
+
+// Pede ao servidor em execução que descarte as respostas de leitura em cache
+function invalidarCacheServidor(url) {
+  return new Promise((resolve) => {
+    const requisicao = http.request(`${url.replace(/\/$/, '')}/api/cache/invalidar`, { method: 'POST' }, (res) => {
+      res.resume();
+      if (res.statusCode !== 204) console.warn(`Servidor respondeu ${res.statusCode} ao invalidar o cache.`);
+      resolve();
+    });
+    requisicao.on('error', (error) => {
+      console.warn('Não foi possível invalidar o cache do servidor:', error.message);
+      resolve();
+    });
+    requisicao.end();
+  });
+}
+
+async function main() {
+  const opcoes = lerOpcoes(process.argv.slice(2));
+  if (opcoes.arquivos.length === 0) {
+    console.error('Uso: node scripts/importar_ndjson.js <arquivo.ndjson[.gz]>... [--lote <n>] [--historico] ' +
+      '[--simular] [--servidor <url>]');
+    process.exitCode = 1;
+    return;
+  }
+
+  if (!await setupDatabase()) {
+    process.exitCode = 1;
+    return;
+  }
+  await historico.criarTabelas(pool);
+  await normalizacao.criarTabelas(pool);
+  await estatisticas.criarTabelas(pool);
+  await saudeDiscos.criarTabelas(pool);
+  await perfis.criarTabelas(pool);
+  await programas.criarTabelas(pool);
+
+  const contadores = criarContadores();
+  for (const arquivo of opcoes.arquivos) {
+    // Um arquivo ilegível não impede a importação dos demais
+    try {
+      await importarArquivo(arquivo, opcoes, contadores);
+    } catch (error) {
+      console.error(`${arquivo}: importação interrompida:`, error.message);
+      process.exitCode = 1;
+    }
+  }
+
+  console.log(`Concluído${opcoes.simular ? ' (simulação)' : ''}: ${contadores.inseridos} inseridos, ` +
+    `${contadores.existentes} já cadastrados (${contadores.historico} com alteração registrada), ` +
+    `${contadores.duplicados} duplicados, ${contadores.invalidos} inválidos.`);
+
+  if (opcoes.servidor && !opcoes.simular) {
+    await invalidarCacheServidor(opcoes.servidor);
+  }
+}
+
+main()
+  .catch((error) => {
+    console.error('Erro ao importar arquivo:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => pool.end());
@@ -0,0 +1,70 @@
+// Preenche as tabelas normalizadas a partir das linhas já existentes em hardware_data.
+//
+// Uso: node scripts/normalizar_existentes.js [--desde <id>] [--lote <n>]
+//
+// Percorre hardware_data em ordem de id, em lotes, e regrava a forma normalizada
+// de cada linha e sua contribuição nas estatísticas da frota. O processo é
+// idempotente: pode ser interrompido e retomado com --desde a partir do último
+// id informado no progresso.
+
+const { pool, setupDatabase } = require('../config/db');
+const normalizacao = require('../lib/normalizacao');
+const estatisticas = require('../lib/estatisticas');
+const perfis = require('../lib/perfis');
+
+function lerOpcoes(argv) {
+  const opcoes = { desde: 0, lote: 500 };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--desde') opcoes.desde = parseInt(argv[++i], 10) || 0;
+    else if (argv[i] === '--lote') opcoes.lote = parseInt(argv[++i], 10) || opcoes.lote;
+  }
+  return opcoes;
+}
+
+async function main() {
+  const opcoes = lerOpcoes(process.argv.slice(2));
+
+  if (!await setupDatabase()) {
+    process.exitCode = 1;
+    return;
+  }
+  await normalizacao.criarTabelas(pool);
+  await estatisticas.criarTabelas(pool);
+  await perfis.criarTabelas(pool);
+
+  let ultimoId = opcoes.desde;
+  let processadas = 0;
+  let falhas = 0;
+
+  for (;;) {
+    const [rows] = await pool.query(
+      `SELECT id, processador, disco, ram, perfil_id, volateis, monitores FROM hardware_data
+       WHERE id > ? ORDER BY id LIMIT ?`,
+      [ultimoId, opcoes.lote]
+    );
+    if (rows.length === 0) break;
+    await perfis.expandir(pool, rows);
+
+    for (const row of rows) {
+      try {
+        await normalizacao.normalizar(pool, row.id, row);
+        processadas++;
+      } catch (error) {
+        falhas++;
+        console.error(`Erro ao normalizar a linha ${row.id}:`, error.message);
+      }
+      ultimoId = row.id;
+    }
+    console.log(`${processadas} linhas normalizadas (último id: ${ultimoId})`);
+  }
+
+  console.log(`Concluído: ${processadas} linhas normalizadas, ${falhas} falhas.`);
+  if (falhas > 0) process.exitCode = 1;
+}
+
+main()
+  .catch((error) => {
+    console.error('Erro ao normalizar os dados existentes:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => pool.end());
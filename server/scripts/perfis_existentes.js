@@ -0,0 +1,150 @@
+// Liga as máquinas já cadastradas aos perfis de hardware (lib/perfis.js).
+//
+// Uso: node scripts/perfis_existentes.js [--desde <nomeDispositivo>] [--lote <n>] [--sem-compactar]
+//
+// Percorre as máquinas de hardware_data em ordem de nome, em lotes. O perfil vem
+// da entrada mais recente do histórico da máquina; máquinas sem histórico usam o
+// cadastro mais recente. O processo é idempotente: pode ser interrompido e
+// retomado com --desde a partir do último nome informado no progresso.
+//
+// Em seguida compacta os cadastros que ainda guardam o texto completo: cada linha
+// passa a ter só o perfil_id e as linhas voláteis, conferidas pela reconstrução
+// antes de o texto ser apagado. Linhas já compactadas não são lidas de novo, então
+// uma execução interrompida continua de onde parou. O espaço liberado só volta ao
+// sistema de arquivos com OPTIMIZE TABLE hardware_data.
+
+const { pool, setupDatabase } = require('../config/db');
+const historico = require('../lib/historico');
+const perfis = require('../lib/perfis');
+const { secoesCanonicas } = require('../lib/secoes');
+
+function lerOpcoes(argv) {
+  const opcoes = { desde: '', lote: 500, compactar: true };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--desde') opcoes.desde = argv[++i] || '';
+    else if (argv[i] === '--lote') opcoes.lote = parseInt(argv[++i], 10) || opcoes.lote;
+    else if (argv[i] === '--sem-compactar') opcoes.compactar = false;
+  }
+  return opcoes;
+}
+
+// Hashes das seções do perfil na entrada mais recente do histórico de cada máquina
+async function hashesDoHistorico(nomes) {
+  const [rows] = await pool.query(
+    `SELECT s.nomeDispositivo, s.processadorHash, s.ramHash, s.discoHash
+     FROM snapshots_hardware s
+     JOIN (SELECT MAX(id) AS id FROM snapshots_hardware WHERE nomeDispositivo IN (?) GROUP BY nomeDispositivo) u
+       ON u.id = s.id`,
+    [nomes]
+  );
+  const resultado = new Map();
+  for (const row of rows) {
+    resultado.set(row.nomeDispositivo, { processador: row.processadorHash, ram: row.ramHash, disco: row.discoHash });
+  }
+  return resultado;
+}
+
+// Máquina sem histórico: seções do cadastro mais recente, gravadas em secoes_hardware
+async function hashesDoCadastro(nomeDispositivo) {
+  const [rows] = await pool.execute(
+    `SELECT processador, disco, ram, perfil_id, volateis FROM hardware_data
+     WHERE nomeDispositivo = ? ORDER BY id DESC LIMIT 1`,
+    [nomeDispositivo]
+  );
+  if (rows.length === 0) return null;
+  await perfis.expandir(pool, rows);
+  const secoes = secoesCanonicas(rows[0]);
+  await historico.gravarSecoes(pool, secoes);
+  return perfis.hashesDe(rows[0]);
+}
+
+// Troca o texto das linhas antigas pela forma compacta. Retorna { compactadas, falhas }.
+async function compactarCadastros(lote) {
+  let ultimoId = 0;
+  let compactadas = 0;
+  let falhas = 0;
+
+  for (;;) {
+    const [rows] = await pool.query(
+      `SELECT id, processador, disco, ram FROM hardware_data
+       WHERE id > ? AND processador IS NOT NULL ORDER BY id LIMIT ?`,
+      [ultimoId, lote]
+    );
+    if (rows.length === 0) break;
+
+    for (const row of rows) {
+      ultimoId = row.id;
+      try {
+        const compacta = await perfis.compactar(pool, row);
+        if (!compacta) continue;
+        // A condição no texto evita apagar uma linha alterada depois da leitura
+        const [resultado] = await pool.query(
+          `UPDATE hardware_data SET perfil_id = ?, volateis = ?, processador = NULL, disco = NULL, ram = NULL
+           WHERE id = ? AND processador = ? AND disco = ? AND ram = ?`,
+          [compacta.perfilId, compacta.volateis, row.id, row.processador, row.disco, row.ram]
+        );
+        compactadas += resultado.affectedRows;
+      } catch (error) {
+        falhas++;
+        console.error(`Erro ao compactar a linha ${row.id}:`, error.message);
+      }
+    }
+    console.log(`${compactadas} cadastros compactados (último id: ${ultimoId})`);
+  }
+  return { compactadas, falhas };
+}
+
+async function main() {
+  const opcoes = lerOpcoes(process.argv.slice(2));
+
+  if (!await setupDatabase()) {
+    process.exitCode = 1;
+    return;
+  }
+  await historico.criarTabelas(pool);
+  await perfis.criarTabelas(pool);
+
+  let ultimo = opcoes.desde;
+  let vinculadas = 0;
+  let falhas = 0;
+
+  for (;;) {
+    const [rows] = await pool.query(
+      `SELECT DISTINCT nomeDispositivo FROM hardware_data
+       WHERE nomeDispositivo > ? ORDER BY nomeDispositivo LIMIT ?`,
+      [ultimo, opcoes.lote]
+    );
+    if (rows.length === 0) break;
+
+    const nomes = rows.map((row) => row.nomeDispositivo);
+    const doHistorico = await hashesDoHistorico(nomes);
+    for (const nome of nomes) {
+      try {
+        const hashes = doHistorico.get(nome) || await hashesDoCadastro(nome);
+        if (hashes && await perfis.vincular(pool, nome, hashes) !== null) vinculadas++;
+      } catch (error) {
+        falhas++;
+        console.error(`Erro ao vincular o perfil de ${nome}:`, error.message);
+      }
+      ultimo = nome;
+    }
+    console.log(`${vinculadas} máquinas vinculadas (último nome: ${ultimo})`);
+  }
+
+  const [[{ total }]] = await pool.query('SELECT COUNT(*) AS total FROM perfis_hardware');
+  console.log(`Concluído: ${vinculadas} máquinas em ${total} perfis, ${falhas} falhas.`);
+
+  if (opcoes.compactar) {
+    const resultado = await compactarCadastros(opcoes.lote);
+    console.log(`Compactação concluída: ${resultado.compactadas} cadastros, ${resultado.falhas} falhas.`);
+    falhas += resultado.falhas;
+  }
+  if (falhas > 0) process.exitCode = 1;
+}
+
+main()
+  .catch((error) => {
+    console.error('Erro ao vincular os perfis de hardware:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => pool.end());
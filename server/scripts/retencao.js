@@ -0,0 +1,102 @@
+// Retenção de hardware_data: resume e compacta as partições mensais antigas.
+//
+// Uso: node scripts/retencao.js [--meses <n>] [--descartar-inativas] [--simular] [--lote <n>]
+//        [--servidor <url>]
+//
+// Cria as partições dos próximos meses e trata as partições anteriores aos
+// últimos --meses meses (padrão: RETENCAO_MESES ou 24): o mês é resumido em
+// resumo_hardware_mensal, os cadastros substituídos por um mais recente da mesma
+// máquina são apagados e a partição que ficar vazia é descartada (ver
+// lib/particoes.js). Pode ser agendado (cron) para rodar todo mês.
+//
+// --descartar-inativas  apaga também as máquinas sem coleta no histórico desde o corte
+// --simular             apenas conta o que seria apagado
+// --servidor            URL do servidor em execução, para invalidar o cache de leitura no fim
+
+const http = require('http');
+const { pool, setupDatabase } = require('../config/db');
+const normalizacao = require('../lib/normalizacao');
+const estatisticas = require('../lib/estatisticas');
+const historico = require('../lib/historico');
+const saudeDiscos = require('../lib/saude_discos');
+const perfis = require('../lib/perfis');
+const programas = require('../lib/programas');
+const particoes = require('../lib/particoes');
+
+function lerOpcoes(argv) {
+  const opcoes = {
+    meses: parseInt(process.env.RETENCAO_MESES, 10) || 24,
+    descartarInativas: false,
+    simular: false,
+    lote: 500,
+    servidor: null
+  };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--meses') opcoes.meses = parseInt(argv[++i], 10) || opcoes.meses;
+    else if (argv[i] === '--descartar-inativas') opcoes.descartarInativas = true;
+    else if (argv[i] === '--simular') opcoes.simular = true;
+    else if (argv[i] === '--lote') opcoes.lote = parseInt(argv[++i], 10) || opcoes.lote;
+    else if (argv[i] === '--servidor') opcoes.servidor = argv[++i];
+  }
+  return opcoes;
+}
+
+// Pede ao servidor em execução que descarte as respostas de leitura em cache
+function invalidarCacheServidor(url) {
+  return new Promise((resolve) => {
+    const requisicao = http.request(`${url.replace(/\/$/, '')}/api/cache/invalidar`, { method: 'POST' }, (res) => {
+      res.resume();
+      if (res.statusCode !== 204) console.warn(`Servidor respondeu ${res.statusCode} ao invalidar o cache.`);
+      resolve();
+    });
+    requisicao.on('error', (error) => {
+      console.warn('Não foi possível invalidar o cache do servidor:', error.message);
+      resolve();
+    });
+    requisicao.end();
+  });
+}
+
+async function main() {
+  const opcoes = lerOpcoes(process.argv.slice(2));
+
+  if (!await setupDatabase()) {
+    process.exitCode = 1;
+    return;
+  }
+  await historico.criarTabelas(pool);
+  await normalizacao.criarTabelas(pool);
+  await estatisticas.criarTabelas(pool);
+  await saudeDiscos.criarTabelas(pool);
+  await perfis.criarTabelas(pool);
+  await programas.criarTabelas(pool);
+  await particoes.criarTabelas(pool);
+  await particoes.garantir(pool);
+
+  if ((await particoes.listar(pool)).length === 0) {
+    console.error('hardware_data não está particionada; veja os erros acima.');
+    process.exitCode = 1;
+    return;
+  }
+
+  const resultado = await particoes.aplicarRetencao(pool, opcoes);
+  let apagados = 0;
+  for (const item of resultado) {
+    apagados += item.substituidos + item.inativos;
+    console.log(`${item.nome}: ${item.substituidos} cadastros substituídos, ${item.inativos} máquinas inativas` +
+      (item.descartada ? ', partição descartada' : ''));
+  }
+  console.log(`Concluído${opcoes.simular ? ' (simulação)' : ''}: ${resultado.length} partições anteriores a ` +
+    `${opcoes.meses} meses, ${apagados} cadastros ${opcoes.simular ? 'a apagar' : 'apagados'}.`);
+
+  if (opcoes.servidor && !opcoes.simular && apagados > 0) {
+    await invalidarCacheServidor(opcoes.servidor);
+  }
+}
+
+main()
+  .catch((error) => {
+    console.error('Erro ao aplicar a retenção:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => pool.end());
@@ -0,0 +1,94 @@
+const { test } = require('node:test');
+const assert = require('node:assert');
+const http = require('http');
+
+const admissao = require('../lib/admissao');
+
+// Servidor mínimo com o corpo lido antes do limitador, como o body-parser faz no index.js.
+// res.status/res.json fazem o papel dos métodos do Express usados pelo middleware.
+function iniciarServidor(limitador) {
+  const passar = admissao.middleware(limitador);
+  const servidor = http.createServer((req, res) => {
+    res.status = (codigo) => { res.statusCode = codigo; return res; };
+    res.json = (dados) => {
+      res.setHeader('Content-Type', 'application/json');
+      res.end(JSON.stringify(dados));
+    };
+    const partes = [];
+    req.on('data', (parte) => partes.push(parte));
+    req.on('end', () => {
+      req.body = Buffer.concat(partes).toString();
+      passar(req, res, () => res.json({ success: true, tamanho: req.body.length }));
+    });
+  });
+  return new Promise((resolve) => servidor.listen(0, '127.0.0.1', () => resolve(servidor)));
+}
+
+// Respostas recebidas, para conferir os cabeçalhos
+const respostas = [];
+
+function enviar(porta, corpo, { timeout = 4000 } = {}) {
+  return new Promise((resolve, reject) => {
+    const req = http.request({
+      host: '127.0.0.1',
+      port: porta,
+      method: 'POST',
+      path: '/api/hardware-data',
+      headers: { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(corpo) },
+      timeout
+    }, (res) => {
+      res.resume();
+      res.on('end', () => resolve(res.statusCode));
+      respostas.push(res);
+    });
+    req.on('timeout', () => req.destroy(new Error('timeout')));
+    req.on('error', reject);
+    req.end(corpo);
+  });
+}
+
+test('POSTs com corpo na fila são atendidos quando as fichas são repostas', async () => {
+  const limitador = admissao.criarLimitador('teste', { taxa: 4, rajada: 1, fila: 10 });
+  const servidor = await iniciarServidor(limitador);
+  const { port } = servidor.address();
+  const corpo = JSON.stringify({ nomeDispositivo: 'PC-TESTE', processador: 'x'.repeat(2000) });
+  try {
+    const status = await Promise.all([0, 1, 2, 3].map(() => enviar(port, corpo)));
+    assert.deepStrictEqual(status, [200, 200, 200, 200]);
+    assert.strictEqual(limitador.espera.length, 0);
+  } finally {
+    servidor.close();
+  }
+});
+
+test('fila cheia responde 429 com Retry-After', async () => {
+  const limitador = admissao.criarLimitador('teste', { taxa: 1, rajada: 1, fila: 1 });
+  const servidor = await iniciarServidor(limitador);
+  const { port } = servidor.address();
+  try {
+    const status = await Promise.all([0, 1, 2].map(() => enviar(port, '{}')));
+    assert.deepStrictEqual(status.sort(), [200, 200, 429]);
+    assert.strictEqual(limitador.rejeitadas, 1);
+    const rejeitada = respostas.find((res) => res.statusCode === 429);
+    assert.ok(parseInt(rejeitada.headers['retry-after'], 10) >= 1);
+  } finally {
+    servidor.close();
+  }
+});
+
+test('cliente que desiste enquanto espera libera a vaga', async () => {
+  const limitador = admissao.criarLimitador('teste', { taxa: 2, rajada: 1, fila: 5 });
+  const servidor = await iniciarServidor(limitador);
+  const { port } = servidor.address();
+  try {
+    assert.strictEqual(await enviar(port, '{}'), 200);
+    // Segunda requisição fica na fila e é abandonada antes da ficha seguinte (500 ms)
+    await assert.rejects(enviar(port, '{}', { timeout: 100 }), /timeout/);
+    await new Promise((resolve) => setTimeout(resolve, 50));
+    assert.strictEqual(limitador.espera[0].cancelada, true);
+    // A seguinte fica com a ficha que seria da abandonada
+    assert.strictEqual(await enviar(port, '{}'), 200);
+  } finally {
+    servidor.close();
+  }
+});
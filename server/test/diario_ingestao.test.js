@@ -0,0 +1,55 @@
+const { test } = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const diarioIngestao = require('../lib/diario_ingestao');
+
+function criar() {
+  return diarioIngestao.criarDiario(fs.mkdtempSync(path.join(os.tmpdir(), 'diario-')));
+}
+
+// Mensagem como a enviada por marcarPendentes em outro worker
+function pendentes(pid, delta, ...cadastros) {
+  return {
+    tipo: 'diario:pendentes', pid, delta,
+    nomes: cadastros.map(([nome]) => nome),
+    matriculas: cadastros.map(([, matricula]) => matricula)
+  };
+}
+
+test('cadastros pendentes em outro worker contam na verificação', () => {
+  const diario = criar();
+  assert.deepStrictEqual(diarioIngestao.pendente(diario, 'PC1', 'M1'), { maquina: false, matricula: false });
+
+  diarioIngestao.receber(diario, pendentes(101, 1, ['PC1', 'M1'], ['PC2', 'M2']));
+  assert.deepStrictEqual(diarioIngestao.pendente(diario, 'PC1', 'M9'), { maquina: true, matricula: false });
+  assert.deepStrictEqual(diarioIngestao.pendente(diario, 'PC9', 'M2'), { maquina: false, matricula: true });
+
+  // Gravado no banco pelo outro worker
+  diarioIngestao.receber(diario, pendentes(101, -1, ['PC1', 'M1']));
+  assert.strictEqual(diarioIngestao.pendente(diario, 'PC1', 'M1').maquina, false);
+  assert.strictEqual(diarioIngestao.pendente(diario, 'PC2', 'M2').maquina, true);
+});
+
+test('worker encerrado deixa de contar; o estado completo substitui os avisos', () => {
+  const diario = criar();
+  diarioIngestao.receber(diario, pendentes(101, 1, ['PC1', 'M1']));
+  diarioIngestao.receber(diario, { tipo: 'diario:encerrado', pid: 101 });
+  assert.strictEqual(diarioIngestao.pendente(diario, 'PC1', 'M1').maquina, false);
+
+  diarioIngestao.receber(diario, pendentes(102, 1, ['PC1', 'M1']));
+  diarioIngestao.receber(diario, {
+    tipo: 'diario:estado', pid: 102, para: process.pid, nomes: [['PC3', 1]], matriculas: [['M3', 1]]
+  });
+  assert.strictEqual(diarioIngestao.pendente(diario, 'PC1', 'M1').maquina, false);
+  assert.deepStrictEqual(diarioIngestao.pendente(diario, 'PC3', 'M3'), { maquina: true, matricula: true });
+});
+
+test('mensagens de outros módulos e do próprio processo são ignoradas', () => {
+  const diario = criar();
+  diarioIngestao.receber(diario, { tipo: 'cache:invalidar' });
+  diarioIngestao.receber(diario, pendentes(process.pid, 1, ['PC1', 'M1']));
+  assert.strictEqual(diario.outros.size, 0);
+});
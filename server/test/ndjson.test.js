@@ -0,0 +1,61 @@
+const { test } = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const zlib = require('zlib');
+
+const { lerLinhas } = require('../lib/ndjson');
+
+// Arquivo como o gerado por offline.anexar_registro: um membro gzip por registro
+function gravarOffline(caminho, quantidade, { cortar = 0 } = {}) {
+  const membros = [];
+  for (let i = 0; i < quantidade; i++) {
+    membros.push(zlib.gzipSync(JSON.stringify({ nomeDispositivo: `PC${i}`, texto: 'x'.repeat(200) }) + '\n'));
+  }
+  const conteudo = Buffer.concat(membros);
+  fs.writeFileSync(caminho, conteudo.subarray(0, conteudo.length - cortar));
+}
+
+async function ler(caminho) {
+  const linhas = [];
+  for await (const linha of lerLinhas(caminho)) linhas.push(linha);
+  return linhas;
+}
+
+function arquivoTemporario(nome) {
+  return path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'ndjson-')), nome);
+}
+
+test('lê todos os membros de um arquivo .gz íntegro', async () => {
+  const caminho = arquivoTemporario('coleta.ndjson.gz');
+  gravarOffline(caminho, 5);
+  const linhas = await ler(caminho);
+  assert.deepStrictEqual(linhas.map((l) => JSON.parse(l).nomeDispositivo), ['PC0', 'PC1', 'PC2', 'PC3', 'PC4']);
+});
+
+test('último membro truncado termina a leitura sem erro, com os registros completos', async () => {
+  const caminho = arquivoTemporario('coleta.ndjson.gz');
+  const avisos = [];
+  const avisar = console.warn;
+  console.warn = (mensagem) => avisos.push(mensagem);
+  try {
+    for (const cortar of [10, 60]) {
+      gravarOffline(caminho, 5, { cortar });
+      const linhas = await ler(caminho);
+      const nomes = linhas.map((l) => JSON.parse(l).nomeDispositivo);
+      assert.deepStrictEqual(nomes.slice(0, 4), ['PC0', 'PC1', 'PC2', 'PC3']);
+      assert.ok(nomes.length <= 5);
+    }
+  } finally {
+    console.warn = avisar;
+  }
+  assert.strictEqual(avisos.length, 2);
+  assert.match(avisos[0], /incompleto/);
+});
+
+test('arquivos sem compressão são lidos linha a linha', async () => {
+  const caminho = arquivoTemporario('coleta.ndjson');
+  fs.writeFileSync(caminho, '{"a":1}\n{"a":2}\n{"a":3}');
+  assert.deepStrictEqual(await ler(caminho), ['{"a":1}', '{"a":2}', '{"a":3}']);
+});
@@ -0,0 +1,50 @@
+const { test } = require('node:test');
+const assert = require('node:assert');
+
+const { canonicalizar, extrairVolateis, reconstruir } = require('../lib/secoes');
+
+// Textos no formato dos coletores Windows, Go e Linux
+const EXEMPLOS = {
+  processador: [
+    'Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz\nNúcleos: 4\nThreads: 8\nUtilização atual: 12%\n',
+    'Intel(R) Core(TM) i7-12700, 12 núcleos, 23.5% utilização',
+    'AMD Ryzen 5 5600G (Utilização: 3.2%, Frequência: 3.9 GHz)',
+    '  Intel(R) Xeon(R) Gold 6248R, 3.00 GHz, 2.41 GHz'
+  ],
+  disco: [
+    'Disco principal: 120.5 GB / 476.9 GB (25.3% usado)\nUnidade C: 80.1 GB livre de 237.9 GB (66.3% usado)\n' +
+      'Unidade D: 200.0 GB livre de 238.9 GB (16.3% usado)\nSSD Samsung 860 EVO',
+    'Disco sda: 10.0 GB / 500.0 GB (2.0% usado)\r\nDisco sdb: 900.0 GB / 1000.0 GB (90.0% usado)\r\n'
+  ],
+  ram: [
+    '6.3 GB / 15.9 GB (39.6% usado)\nDDR4 2667 MHz\n2 módulos: 8 GB Kingston, 8 GB Kingston',
+    '16 GB DDR5   \n\n'
+  ]
+};
+
+test('o texto original é reconstruído byte a byte a partir da forma canônica', () => {
+  for (const [secao, textos] of Object.entries(EXEMPLOS)) {
+    for (const original of textos) {
+      const canonico = canonicalizar(secao, original);
+      const volateis = extrairVolateis(canonico, original);
+      assert.strictEqual(reconstruir(canonico, volateis), original, `${secao}: ${JSON.stringify(original)}`);
+    }
+  }
+});
+
+test('só as linhas voláteis ficam nas diferenças', () => {
+  const original = EXEMPLOS.disco[0];
+  const volateis = extrairVolateis(canonicalizar('disco', original), original);
+  const linhas = volateis.flatMap(([, , originais]) => originais);
+  assert.ok(linhas.every((linha) => /usado/.test(linha)), JSON.stringify(linhas));
+  assert.ok(!linhas.includes('SSD Samsung 860 EVO'));
+
+  assert.deepStrictEqual(extrairVolateis('16 GB DDR5', '16 GB DDR5'), []);
+});
+
+test('textos vazios, sem linhas em comum e grandes demais para a comparação por linha', () => {
+  const longo = Array.from({ length: 600 }, (_, i) => `Unidade ${i}`).join('\n');
+  for (const [canonico, original] of [['', 'x'], ['a\nb', ''], ['a', 'b\nc\nd'], ['', ''], [longo, `${longo}\nx`]]) {
+    assert.strictEqual(reconstruir(canonico, extrairVolateis(canonico, original)), original);
+  }
+});